@@ -10,6 +10,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
+import numpy as np
 import pandas as pd
 import sys
 import os
@@ -18,12 +19,28 @@ import os
 # 복잡한 의존성을 피하고 순수 Python으로 구현
 
 from .strategy_filter import StrategyFilter, BacktestingDataCollector, StrategySignal
+from .bar_store import BarStore, to_ns
+from .market_data import get_market_data_store
+from .signal_engine import LOOKBACK_BARS, SignalArrays, compute_signal_arrays, strategy_scores
 # 한글 주석: 동적 포지션 사이징 시스템 임포트
 sys.path.append(str(Path(__file__).parent.parent))
 from risk_management.position_sizer import DynamicPositionSizer
 
 logger = logging.getLogger(__name__)
 
+# 한글 주석: 신호 이후 손절/익절을 확인하는 최대 바 수 (1분봉 기준 1시간)
+EXIT_WINDOW_BARS = 60
+
+# 타임프레임 → 분 단위 변환
+TIMEFRAME_MINUTES = {"1m": 1, "5m": 5, "1h": 60}
+
+
+def load_config(config_path: str = "config/ml_config.yaml") -> Dict:
+    """설정 파일 로드 (청크 실행 시 한 번만 읽어 러너에 전달)"""
+    import yaml
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
 class MLBacktestStrategy:
     """ML 피드백 기반 백테스팅 전략"""
     
@@ -48,24 +65,92 @@ class MLBacktestStrategy:
         self._model_manager = None
         self._cached_model = None
         
-    def generate_signals(self, bars: List[Dict]) -> List[StrategySignal]:
+    def generate_signals(self, bars: BarStore | List[Dict]) -> List[StrategySignal]:
         """
         가격 데이터로부터 거래 신호 생성
         
+        전 구간 지표를 배열로 한 번에 계산하고 조건을 만족한 바에 대해서만 신호 객체를 만든다.
+        결과는 바마다 _analyze_bar_pattern을 호출하는 방식과 같다.
+        
         Args:
-            bars: 가격 바 데이터
+            bars: 가격 바 데이터 (BarStore, dict 리스트도 허용)
             
         Returns:
             거래 신호 리스트
         """
+        if len(bars) <= LOOKBACK_BARS:  # 한글 주석: 최소 20개 바 필요
+            return []
+        if not isinstance(bars, BarStore):
+            bars = BarStore.from_bars(bars)
+        
+        arrays = compute_signal_arrays(bars.close, bars.volume)
+        
         signals = []
+        for strategy_type in ('breakout', 'trend', 'counter_trend'):
+            rows = np.flatnonzero(getattr(arrays, strategy_type))
+            if not len(rows):
+                continue
+            signals.extend(self._build_signals(strategy_type, arrays, rows, bars))
+        
+        # 한글 주석: 전략별로 만든 신호를 바 순서로 정렬 (한 바에는 신호가 최대 하나)
+        signals.sort(key=lambda signal: signal.bar_index)
+        return signals
+    
+    def _build_signals(self, strategy_type: str, arrays: SignalArrays, rows: np.ndarray,
+                       bars: BarStore) -> List[StrategySignal]:
+        """조건을 만족한 행의 신호 객체 생성 (가격/손절/익절/신뢰도/점수는 배열로 계산)"""
+        price = arrays.close[rows]
+        sma_short = arrays.sma_short[rows]
+        sma_long = arrays.sma_long[rows]
+        rsi = arrays.rsi[rows]
+        volume_spike = arrays.volume_spike[rows]
+        base_scores = strategy_scores(strategy_type, rsi, volume_spike, arrays.volatility[rows])
+        
+        if strategy_type == 'breakout':
+            stop_loss = price * 0.98
+            take_profit = price * 1.04
+            confidence = np.minimum(0.9, (sma_short - sma_long) / sma_long + 0.5)
+            risk_levels = ['medium'] * len(rows)
+            directions = None
+        elif strategy_type == 'trend':
+            # 한글 주석: 하락 추세 (숏)
+            stop_loss = price * 1.02
+            take_profit = price * 0.96
+            confidence = np.minimum(0.85, (sma_long - sma_short) / sma_long + 0.4)
+            risk_levels = ['medium'] * len(rows)
+            directions = None
+        else:
+            # 한글 주석: 과매도(rsi < 20)는 매수, 과매수는 매도 방향
+            buy = ~(rsi > 80)
+            stop_loss = price * np.where(buy, 1.03, 0.97)
+            take_profit = price * np.where(buy, 0.97, 1.03)
+            confidence = 0.6 + np.abs(50 - rsi) / 50 * 0.3
+            risk_levels = np.where(np.abs(50 - rsi) > 25, 'high', 'medium').tolist()
+            directions = np.where(rsi < 20, 1.0, -1.0).tolist()
         
-        for i, bar in enumerate(bars[20:], 20):  # 한글 주석: 최소 20개 바 필요
-            # 한글 주석: 간단한 기술적 분석 기반 신호 생성
-            signal = self._analyze_bar_pattern(bars[i-20:i+1], bar)
-            if signal:
-                signals.append(signal)
-                
+        signals = []
+        columns = zip(
+            arrays.index[rows].tolist(), price.tolist(), sma_short.tolist(), sma_long.tolist(), rsi.tolist(),
+            volume_spike.tolist(), base_scores.tolist(), stop_loss.tolist(), take_profit.tolist(),
+            confidence.tolist(), risk_levels,
+        )
+        for n, (i, current_price, short, long_, rsi_value, spike, base_score, sl, tp, conf, risk) in enumerate(columns):
+            feat = {'sma_short': short, 'sma_long': long_, 'rsi': rsi_value, 'volume_spike': float(spike), 'price': current_price}
+            if directions is not None:
+                feat['direction'] = directions[n]
+            signals.append(StrategySignal(
+                symbol=bars.symbol,
+                timestamp=bars.datetime_at(i),
+                strategy_type=strategy_type,
+                entry_price=current_price,
+                stop_loss=sl,
+                take_profit=tp,
+                score=self._compute_score(strategy_type, base_score, feat),
+                confidence=conf,
+                risk_level=risk,
+                features=feat,
+                bar_index=i,
+            ))
         return signals
     
     def _analyze_bar_pattern(self, recent_bars: List[Dict], current_bar: Dict) -> Optional[StrategySignal]:
@@ -276,17 +361,17 @@ class MLBacktestStrategy:
 class NautilusBacktestRunner:
     """노틸러스 백테스팅 실행기"""
     
-    def __init__(self, config_path: str = "config/ml_config.yaml", initial_capital: float = 10000.0):
+    def __init__(self, config_path: str = "config/ml_config.yaml", initial_capital: float = 10000.0,
+                 config: Optional[Dict] = None):
         """
         백테스팅 러너 초기화
         
         Args:
             config_path: 설정 파일 경로
             initial_capital: 초기 자본금
+            config: 이미 읽은 설정 (주어지면 config_path를 읽지 않음)
         """
-        import yaml
-        with open(config_path, 'r', encoding='utf-8') as f:
-            self.config = yaml.safe_load(f)
+        self.config = config if config is not None else load_config(config_path)
             
         self.strategy_filter = StrategyFilter(min_score=80.0)
         # 한글 주석: 동적 임계값 비활성화로 거래 발생률 상향
@@ -303,10 +388,48 @@ class NautilusBacktestRunner:
             kelly_lookback=50       # 최근 50거래로 Kelly 계산
         )
         
+        # 한글 주석: 로컬 과거 데이터 저장소 (저장된 구간이 없으면 샘플 데이터로 대체)
+        market_conf = self.config.get('market_data', {}) if isinstance(self.config, dict) else {}
+        self.market_data = get_market_data_store(market_conf.get('path', 'data/ohlcv'))
+        self.sample_fallback = bool(market_conf.get('sample_fallback', True))
+        
+    def load_bars(self, symbol: str = "BTCUSDT", days: int = 30,
+                  start_date: Optional[datetime] = None,
+                  end_date: Optional[datetime] = None,
+                  timeframe: str = "1m", seed: Optional[int] = None,
+                  warmup_bars: int = 0) -> BarStore:
+        """
+        백테스트 구간 바 조회 (로컬 저장소 우선)
+        
+        저장소에 구간 전체의 월 파티션이 있으면 디스크에서 읽고, 없으면 샘플 데이터를 생성한다.
+        sample_fallback이 꺼져 있으면 ValueError를 발생시킨다.
+        warmup_bars만큼 시작 이전 바를 함께 읽는다 (지표 계산용, 저장소에 없으면 있는 만큼만).
+        """
+        start_time, end_time = self._resolve_period(days, start_date, end_date)
+        load_start = start_time - timedelta(minutes=warmup_bars * TIMEFRAME_MINUTES.get(timeframe, 1))
+        if self.market_data.covers(symbol, timeframe, start_time, end_time):
+            bars = self.market_data.load(symbol, timeframe, load_start, end_time)
+            logger.info(f"로컬 OHLCV 로드: {symbol} {timeframe} {len(bars)}개 바")
+            return bars
+        
+        if not self.sample_fallback:
+            raise ValueError(f"로컬 OHLCV 데이터 없음: {symbol} {timeframe} {start_time} ~ {end_time} ({self.market_data.root})")
+        logger.warning(f"로컬 OHLCV 데이터 없음, 샘플 데이터 사용: {symbol} {timeframe} {start_time} ~ {end_time}")
+        return self.create_sample_data(symbol, days, start_date=load_start, end_date=end_time,
+                                       timeframe=timeframe, seed=seed)
+    
+    @staticmethod
+    def _resolve_period(days: int, start_date: Optional[datetime],
+                        end_date: Optional[datetime]) -> Tuple[datetime, datetime]:
+        """시작/종료 일시 결정 (없으면 현재 시점 기준 days일)"""
+        start_time = start_date if start_date is not None else datetime.now() - timedelta(days=days)
+        end_time = end_date if end_date is not None else datetime.now()
+        return start_time, end_time
+        
     def create_sample_data(self, symbol: str = "BTCUSDT", days: int = 30,
                            start_date: Optional[datetime] = None,
                            end_date: Optional[datetime] = None,
-                           timeframe: str = "1m") -> List[Dict]:
+                           timeframe: str = "1m", seed: Optional[int] = None) -> BarStore:
         """샘플 데이터 생성 (실제 데이터 대신 임시용)
         Args:
             symbol: 심볼
@@ -314,92 +437,79 @@ class NautilusBacktestRunner:
             start_date: 시작 일시
             end_date: 종료 일시
             timeframe: '1m' | '5m' | '1h'
+            seed: 난수 시드 (같은 시드면 같은 데이터)
+        Returns:
+            컬럼형 바 저장소 (바당 48바이트라 1년치 1분봉도 타임프레임 상향 없이 생성)
         """
-        import random
+        step_min = TIMEFRAME_MINUTES.get(timeframe, 1)
 
-        # 타임프레임 → 분 단위 변환
-        tf_to_min = {"1m": 1, "5m": 5, "1h": 60}
-        step_min = tf_to_min.get(timeframe, 1)
-
-        if start_date is None:
-            start_time = datetime.now() - timedelta(days=days)
-        else:
-            start_time = start_date
-
-        if end_date is None:
-            end_time = datetime.now()
-        else:
-            end_time = end_date
+        start_time, end_time = self._resolve_period(days, start_date, end_date)
 
         total_minutes = max(1, int((end_time - start_time).total_seconds() // 60))
         num_bars = max(1, total_minutes // step_min)
 
-        # 과도한 메모리 사용 방지 (약식 제한)
-        max_bars = 400_000
-        if num_bars > max_bars:
-            # 타임프레임을 자동 상향
-            if timeframe == "1m":
-                step_min = 5
-                timeframe = "5m"
-            elif timeframe == "5m":
-                step_min = 60
-                timeframe = "1h"
-            num_bars = max(1, total_minutes // step_min)
-
-        bars: List[Dict] = []
+        rng = np.random.default_rng(seed)
         base_price = 45000.0
-        current_price = base_price
 
-        for i in range(num_bars):
-            # 랜덤 워크 + 완만한 트렌드
-            change = random.gauss(0, 0.002)
-            if (i % (int(1440/step_min))) < (int(720/step_min)):
-                change += 0.0001
+        # 랜덤 워크 + 완만한 트렌드 (하루의 앞 절반 구간에 상승 편향)
+        index = np.arange(num_bars)
+        change = rng.normal(0, 0.002, num_bars)
+        change += np.where(index % int(1440 / step_min) < int(720 / step_min), 0.0001, 0.0)
+        close = np.maximum(base_price * np.cumprod(1 + change), 1.0)
 
-            current_price = max(current_price * (1 + change), 1.0)
+        high = close * (1 + np.abs(rng.normal(0, 0.001, num_bars)))
+        low = close * (1 - np.abs(rng.normal(0, 0.001, num_bars)))
+        open_price = close * (1 + rng.normal(0, 0.0005, num_bars))
+        volume = rng.integers(100, 10001, num_bars).astype(np.float64)
 
-            high = current_price * (1 + abs(random.gauss(0, 0.001)))
-            low = current_price * (1 - abs(random.gauss(0, 0.001)))
-            open_price = current_price * (1 + random.gauss(0, 0.0005))
-            volume = random.randint(100, 10000)
+        step_ns = step_min * 60 * 1_000_000_000
+        timestamps = to_ns(start_time) + index.astype(np.int64) * step_ns
 
-            timestamp = start_time + timedelta(minutes=i * step_min)
-            bars.append({
-                'symbol': symbol,
-                'open': open_price,
-                'high': high,
-                'low': low,
-                'close': current_price,
-                'volume': volume,
-                'timestamp': timestamp
-            })
-
-        return bars
+        return BarStore(
+            timestamps=timestamps,
+            open=open_price,
+            high=high,
+            low=low,
+            close=close,
+            volume=volume,
+            tz=start_time.tzinfo,
+            symbol=symbol,
+        )
     
     def run_backtest(self, symbol: str = "BTCUSDT", days: int = 30,
                      start_date: Optional[datetime] = None,
                      end_date: Optional[datetime] = None,
-                     timeframe: str = "1m") -> str:
+                     timeframe: str = "1m", seed: Optional[int] = None,
+                     warmup_bars: int = 0, run_label: Optional[str] = None) -> str:
         """
         백테스팅 실행
         
         Args:
             symbol: 거래 심볼
             days: 백테스팅 기간 (일)
+            seed: 샘플 데이터 난수 시드
+            warmup_bars: 시작 이전에 함께 읽을 바 수 (지표 예열용, 이 구간의 신호는 실행하지 않음)
+            run_label: 결과 파일명 접미사 (병렬 청크 실행 시 파일명 충돌 방지)
             
         Returns:
             결과 파일 경로
         """
         logger.info(f"백테스팅 시작: {symbol}, {days}일간")
         
-        # 한글 주석: 샘플 데이터 생성 (실제로는 외부 데이터 소스 사용)
-        bars = self.create_sample_data(symbol, days,
-                                       start_date=start_date,
-                                       end_date=end_date,
-                                       timeframe=timeframe)
-        
-        # 한글 주석: 전략 신호 생성
-        signals = self.strategy.generate_signals(bars)
+        # 한글 주석: 로컬 과거 데이터 조회 (없으면 샘플 데이터) - 컬럼형 저장소로 바로 받음
+        start_time, end_time = self._resolve_period(days, start_date, end_date)
+        bar_store = self.load_bars(symbol, days,
+                                   start_date=start_time,
+                                   end_date=end_time,
+                                   timeframe=timeframe,
+                                   seed=seed,
+                                   warmup_bars=warmup_bars)
+        
+        # 한글 주석: 전략 신호 생성 (예열 구간의 신호는 이전 청크 몫이므로 제외)
+        signals = self.strategy.generate_signals(bar_store)
+        if warmup_bars:
+            first_bar = int(np.searchsorted(bar_store.timestamps, to_ns(start_time), side='left'))
+            signals = [signal for signal in signals if signal.bar_index >= first_bar]
         logger.info(f"총 {len(signals)}개 신호 생성")
         
         # 한글 주석: 신호 필터링 및 거래 실행 시뮬레이션
@@ -424,7 +534,7 @@ class NautilusBacktestRunner:
                 )
                 
                 # 한글 주석: 거래 실행 시뮬레이션 (동적 포지션 크기 적용)
-                trade_result = self._simulate_trade_execution(signal, bars, position_size)
+                trade_result = self._simulate_trade_execution(signal, bar_store, position_size)
                 
                 # 한글 주석: 포지션 사이저 업데이트
                 self.position_sizer.update_capital(trade_result['pnl'], trade_result['return_pct'])
@@ -451,7 +561,8 @@ class NautilusBacktestRunner:
         results_file = None
         if executed_trades:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            results_file = f"data/backtest_results/backtest_{symbol}_{timestamp}.csv"
+            suffix = f"_{run_label}" if run_label else ""
+            results_file = f"data/backtest_results/backtest_{symbol}_{timestamp}{suffix}.csv"
             
             # CSV 저장 (호환성 유지)
             self.data_collector.export_training_data(results_file)
@@ -497,60 +608,54 @@ class NautilusBacktestRunner:
         
         return results_file
     
-    def _simulate_trade_execution(self, signal: StrategySignal, bars: List[Dict], position_size: float = 1000.0) -> Dict:
+    def _simulate_trade_execution(self, signal: StrategySignal, bars: BarStore | List[Dict], position_size: float = 1000.0) -> Dict:
         """거래 실행 시뮬레이션"""
         # 한글 주석: 실제 백테스팅 엔진 대신 간단한 시뮬레이션
         entry_price = signal.entry_price
         stop_loss = signal.stop_loss
         take_profit = signal.take_profit
+        if not isinstance(bars, BarStore):
+            bars = BarStore.from_bars(bars)
         
-        # 한글 주석: 신호 이후 가격 변동 찾기
+        # 한글 주석: 신호 이후 최대 60개 바(1시간)만 잘라서 탐색
         signal_time = signal.timestamp
-        future_bars = [b for b in bars if b['timestamp'] > signal_time][:60]  # 최대 1시간
+        start = bars.first_after(signal_time, signal.bar_index)
+        end = min(start + EXIT_WINDOW_BARS, len(bars))
         
-        if not future_bars:
+        if start >= end:
             # 한글 주석: 데이터 부족 시 중립적 결과
             exit_price = entry_price
             exit_time = signal_time + timedelta(minutes=30)
             pnl = 0
             exit_reason = "timeout"
         else:
-            # 한글 주석: 손절/익절 시뮬레이션
-            exit_price = entry_price
-            exit_time = signal_time
-            exit_reason = "timeout"
+            # 한글 주석: 손절/익절 시뮬레이션 - 첫 도달 바를 마스크 argmax로 찾음 (같은 바면 익절 우선)
+            high = bars.high[start:end]
+            low = bars.low[start:end]
+            if signal.strategy_type in ['breakout', 'counter_trend']:
+                # 한글 주석: 롱 포지션
+                profit_hit = high >= take_profit
+                stop_hit = low <= stop_loss
+            else:
+                # 한글 주석: 숏 포지션 (trend)
+                profit_hit = low <= take_profit
+                stop_hit = high >= stop_loss
             
-            for bar in future_bars:
-                high_price = bar['high']
-                low_price = bar['low']
-                
-                if signal.strategy_type in ['breakout', 'counter_trend']:
-                    # 한글 주석: 롱 포지션
-                    if high_price >= take_profit:
-                        exit_price = take_profit
-                        exit_time = bar['timestamp']
-                        exit_reason = "profit"
-                        break
-                    elif low_price <= stop_loss:
-                        exit_price = stop_loss
-                        exit_time = bar['timestamp']
-                        exit_reason = "stop_loss"
-                        break
+            exit_hit = profit_hit | stop_hit
+            if exit_hit.any():
+                offset = int(np.argmax(exit_hit))
+                if profit_hit[offset]:
+                    exit_price = take_profit
+                    exit_reason = "profit"
                 else:
-                    # 한글 주석: 숏 포지션 (trend)
-                    if low_price <= take_profit:
-                        exit_price = take_profit
-                        exit_time = bar['timestamp']
-                        exit_reason = "profit"
-                        break
-                    elif high_price >= stop_loss:
-                        exit_price = stop_loss
-                        exit_time = bar['timestamp']
-                        exit_reason = "stop_loss"
-                        break
-                        
-                exit_price = bar['close']
-                exit_time = bar['timestamp']
+                    exit_price = stop_loss
+                    exit_reason = "stop_loss"
+            else:
+                # 한글 주석: 구간 내 미도달 시 마지막 바 종가로 청산
+                offset = end - start - 1
+                exit_price = float(bars.close[end - 1])
+                exit_reason = "timeout"
+            exit_time = bars.datetime_at(start + offset)
         
         # 한글 주석: PnL 계산 (동적 포지션 크기 적용)
         if signal.strategy_type == 'trend':
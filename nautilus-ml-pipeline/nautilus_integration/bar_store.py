@@ -0,0 +1,129 @@
+"""
+컬럼형 바 저장소
+- 시간순으로 정렬된 OHLCV 바를 NumPy 배열 묶음으로 보관 (바당 48바이트)
+- 타임스탬프는 epoch 나노초(int64)로 저장해 이진 탐색 가능
+- 컬럼별 .npy 파일로 저장하고 메모리 매핑으로 다시 열 수 있음
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# 한글 주석: 저장/로드 대상 컬럼 (timestamps는 int64, 나머지는 float64)
+COLUMNS = ('timestamps', 'open', 'high', 'low', 'close', 'volume')
+META_FILE = 'meta.json'
+
+
+@dataclass
+class BarStore:
+    """타임스탬프 오름차순 OHLCV 배열 묶음"""
+    timestamps: np.ndarray  # int64 epoch ns
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    # 한글 주석: 원본 datetime의 타임존 (naive면 None) - 역변환 시 그대로 복원
+    tz: Optional[tzinfo] = None
+    symbol: str = 'BTCUSDT'
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        """컬럼 배열 전체 크기 (바이트)"""
+        return sum(getattr(self, name).nbytes for name in COLUMNS)
+
+    @classmethod
+    def from_bars(cls, bars: List[Dict]) -> "BarStore":
+        """dict 바 리스트를 배열로 변환 (바는 시간순이어야 함)"""
+        tz = bars[0]['timestamp'].tzinfo if bars else None
+        symbol = bars[0].get('symbol', 'BTCUSDT') if bars else 'BTCUSDT'
+        return cls(
+            timestamps=np.array([to_ns(bar['timestamp']) for bar in bars], dtype=np.int64),
+            open=np.array([bar['open'] for bar in bars], dtype=np.float64),
+            high=np.array([bar['high'] for bar in bars], dtype=np.float64),
+            low=np.array([bar['low'] for bar in bars], dtype=np.float64),
+            close=np.array([bar['close'] for bar in bars], dtype=np.float64),
+            volume=np.array([bar['volume'] for bar in bars], dtype=np.float64),
+            tz=tz,
+            symbol=symbol,
+        )
+
+    def to_bars(self) -> List[Dict]:
+        """dict 바 리스트로 변환 (기존 인터페이스 호환용)"""
+        return [self.bar_at(i) for i in range(len(self))]
+
+    def bar_at(self, index: int) -> Dict:
+        """index 바를 dict로 반환"""
+        return {
+            'symbol': self.symbol,
+            'open': float(self.open[index]),
+            'high': float(self.high[index]),
+            'low': float(self.low[index]),
+            'close': float(self.close[index]),
+            'volume': float(self.volume[index]),
+            'timestamp': self.datetime_at(index),
+        }
+
+    def datetime_at(self, index: int) -> datetime:
+        """index 바의 타임스탬프를 datetime으로 반환"""
+        return pd.Timestamp(int(self.timestamps[index]), tz=self.tz).to_pydatetime()
+
+    def slice(self, start: int, end: int) -> "BarStore":
+        """[start, end) 구간 (배열 복사 없이 뷰로 반환)"""
+        return BarStore(
+            **{name: getattr(self, name)[start:end] for name in COLUMNS},
+            tz=self.tz,
+            symbol=self.symbol,
+        )
+
+    def first_after(self, timestamp: datetime, hint: Optional[int] = None) -> int:
+        """
+        timestamp보다 늦은 첫 바의 인덱스
+
+        hint(신호가 발생한 바의 인덱스)가 맞으면 탐색 없이 다음 바부터 시작한다.
+        """
+        ts = to_ns(timestamp)
+        if hint is not None and 0 <= hint < len(self.timestamps) and self.timestamps[hint] == ts:
+            start = hint + 1
+            # 한글 주석: 같은 시각의 바가 이어지는 경우 건너뜀
+            while start < len(self.timestamps) and self.timestamps[start] <= ts:
+                start += 1
+            return start
+        return int(np.searchsorted(self.timestamps, ts, side='right'))
+
+    def save(self, directory: str | Path) -> Path:
+        """컬럼별 .npy 파일과 메타데이터(심볼, 타임존)를 디렉토리에 저장"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in COLUMNS:
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        meta = {'symbol': self.symbol, 'tz': str(self.tz) if self.tz is not None else None, 'rows': len(self)}
+        (directory / META_FILE).write_text(json.dumps(meta), encoding='utf-8')
+        return directory
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "BarStore":
+        """
+        save()로 저장한 디렉토리 로드
+
+        mmap=True면 컬럼을 읽기 전용 메모리 매핑으로 열어 필요한 페이지만 읽는다.
+        """
+        directory = Path(directory)
+        meta = json.loads((directory / META_FILE).read_text(encoding='utf-8'))
+        mmap_mode = 'r' if mmap else None
+        columns = {name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode) for name in COLUMNS}
+        tz = pd.Timestamp(0, tz=meta['tz']).tzinfo if meta.get('tz') else None
+        return cls(**columns, tz=tz, symbol=meta.get('symbol', 'BTCUSDT'))
+
+
+def to_ns(timestamp: datetime) -> int:
+    """datetime → epoch 나노초 (naive는 벽시계 시각 그대로)"""
+    return pd.Timestamp(timestamp).value
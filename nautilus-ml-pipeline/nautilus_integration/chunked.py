@@ -0,0 +1,151 @@
+"""
+청크 단위 백테스트 병렬 실행
+- 기간을 청크로 나누고 청크마다 결정적 시드 부여
+- ProcessPoolExecutor로 청크를 동시에 실행 (워커마다 설정은 한 번만 전달)
+- 완료 순서와 관계없이 청크 순서대로 결과 반환
+"""
+
+import asyncio
+import logging
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from .backtest_runner import NautilusBacktestRunner
+from .signal_engine import LOOKBACK_BARS
+
+logger = logging.getLogger(__name__)
+
+# 한글 주석: 청크 경계에서 지표(SMA20 등)가 유효하도록 앞 청크와 겹쳐 읽는 기본 바 수
+DEFAULT_WARMUP_BARS = LOOKBACK_BARS
+
+
+@dataclass
+class BacktestChunk:
+    """청크 하나의 실행 정보"""
+    index: int
+    symbol: str
+    start: datetime
+    end: datetime
+    timeframe: str
+    seed: int
+    warmup_bars: int = DEFAULT_WARMUP_BARS
+
+
+@dataclass
+class ChunkResult:
+    """청크 실행 결과"""
+    index: int
+    start: datetime
+    end: datetime
+    result_file: Optional[str]
+    trades: int
+    elapsed_seconds: float
+    error: Optional[str] = None
+
+
+def chunk_seed(base_seed: int, symbol: str, index: int) -> int:
+    """(기본 시드, 심볼, 청크 번호)로 정해지는 청크 시드 - 실행 순서/워커 수와 무관"""
+    return int(np.random.SeedSequence([base_seed, zlib.crc32(symbol.encode()), index]).generate_state(1)[0])
+
+
+def plan_chunks(symbol: str, start: datetime, end: datetime, chunk_days: int, timeframe: str,
+                base_seed: int = 42, warmup_bars: int = DEFAULT_WARMUP_BARS) -> List[BacktestChunk]:
+    """[start, end) 기간을 chunk_days 단위로 분할"""
+    chunks = []
+    current = start
+    while current < end:
+        chunk_end = min(current + timedelta(days=chunk_days), end)
+        index = len(chunks) + 1
+        chunks.append(BacktestChunk(
+            index=index,
+            symbol=symbol,
+            start=current,
+            end=chunk_end,
+            timeframe=timeframe,
+            seed=chunk_seed(base_seed, symbol, index),
+            warmup_bars=warmup_bars,
+        ))
+        current = chunk_end
+    return chunks
+
+
+def default_workers() -> int:
+    """머신 CPU 수 기준 워커 수"""
+    return os.cpu_count() or 1
+
+
+# 한글 주석: 워커 프로세스에서 공유하는 설정 (initializer로 한 번만 설정)
+_worker_config: Optional[Dict] = None
+
+
+def init_chunk_worker(config: Dict):
+    """워커 프로세스 초기화 - 청크마다 YAML을 다시 읽지 않도록 설정 보관"""
+    global _worker_config
+    _worker_config = config
+
+
+def run_chunk(chunk: BacktestChunk) -> ChunkResult:
+    """청크 하나 실행 (워커 프로세스에서 호출, 실패해도 예외 대신 결과로 반환)"""
+    started = time.perf_counter()
+    try:
+        runner = NautilusBacktestRunner(config=_worker_config) if _worker_config is not None else NautilusBacktestRunner()
+        result_file = runner.run_backtest(
+            symbol=chunk.symbol,
+            days=max(1, (chunk.end - chunk.start).days),
+            start_date=chunk.start,
+            end_date=chunk.end,
+            timeframe=chunk.timeframe,
+            seed=chunk.seed,
+            warmup_bars=chunk.warmup_bars,
+            run_label=f"chunk{chunk.index:02d}",
+        )
+        trades = len(runner.data_collector.executed_trades) if result_file else 0
+        return ChunkResult(chunk.index, chunk.start, chunk.end, result_file, trades, time.perf_counter() - started)
+    except Exception as e:
+        return ChunkResult(chunk.index, chunk.start, chunk.end, None, 0, time.perf_counter() - started, error=str(e))
+
+
+async def run_chunks(chunks: List[BacktestChunk], config: Dict, workers: Optional[int] = None,
+                     on_progress: Optional[Callable[[int, int, ChunkResult], None]] = None) -> List[ChunkResult]:
+    """
+    청크 실행 (workers > 1이면 프로세스 풀에서 병렬 실행)
+
+    Args:
+        chunks: 실행할 청크 목록
+        config: 러너 설정 (워커마다 한 번만 전달)
+        workers: 워커 수 (None이면 CPU 수, 청크 수를 넘지 않음)
+        on_progress: 청크 완료 시 호출 (완료 수, 전체 수, 결과)
+
+    Returns:
+        청크 순서대로 정렬된 결과
+    """
+    if not chunks:
+        return []
+    workers = max(1, min(workers or default_workers(), len(chunks)))
+    loop = asyncio.get_running_loop()
+    results: List[ChunkResult] = []
+
+    def report(result: ChunkResult):
+        results.append(result)
+        if on_progress:
+            on_progress(len(results), len(chunks), result)
+
+    if workers == 1:
+        # 한글 주석: 단일 워커는 프로세스를 띄우지 않고 스레드에서 순차 실행
+        init_chunk_worker(config)
+        for chunk in chunks:
+            report(await loop.run_in_executor(None, run_chunk, chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_chunk_worker, initargs=(config,)) as pool:
+            futures = [loop.run_in_executor(pool, run_chunk, chunk) for chunk in chunks]
+            for done in asyncio.as_completed(futures):
+                report(await done)
+
+    return sorted(results, key=lambda result: result.index)
@@ -0,0 +1,254 @@
+"""
+로컬 과거 OHLCV 데이터 저장소
+- 거래소 대신 로컬 파일(CSV / Parquet / Feather)을 가져와 심볼·타임프레임·월별 파티션으로 저장
+- 파티션은 컬럼별 .npy 파일(BarStore.save)이라 메모리 매핑으로 필요한 구간만 읽음
+- 기간 조회 시 겹치는 월 파티션만 열고(파티션 프루닝) 타임스탬프 이진 탐색으로 구간을 자름
+- 한 번 연 파티션은 프로세스 안에서 캐시해 청크 백테스트 간에 재사용
+
+디렉토리 구조:
+    {root}/{symbol}/{timeframe}/{YYYY-MM}/timestamps.npy, open.npy, ..., meta.json
+
+한글 주석: 타임스탬프는 UTC 기준 naive 시각(epoch ns)으로 저장한다. 타임존이 있는 입력은 UTC로 변환한다.
+"""
+
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bar_store import COLUMNS, BarStore, to_ns
+
+logger = logging.getLogger(__name__)
+
+# 한글 주석: 가져오기 시 타임스탬프로 인식하는 컬럼 이름 (앞쪽 우선)
+TIMESTAMP_COLUMNS = ('timestamp', 'open_time', 'datetime', 'date', 'time')
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class LocalOHLCVStore:
+    """월별 파티션 기반 로컬 OHLCV 저장소"""
+
+    def __init__(self, root: str | Path = "data/ohlcv", cache_size: int = 24):
+        """
+        Args:
+            root: 파티션 루트 디렉토리
+            cache_size: 메모리에 열어 둘 월 파티션 수 (1년치 + 여유)
+        """
+        self.root = Path(root)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str, str], BarStore]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ===== 가져오기 =====
+    def import_file(self, path: str | Path, symbol: str, timeframe: str) -> int:
+        """
+        로컬 파일을 읽어 월별 파티션으로 저장 (기존 파티션과 병합, 같은 시각은 새 값 우선)
+
+        Returns:
+            가져온 바 수
+        """
+        frame = read_ohlcv_file(path)
+        if frame.empty:
+            return 0
+
+        months = frame['timestamp'].dt.strftime('%Y-%m')
+        for month, part in frame.groupby(months, sort=True):
+            existing = self._read_partition_frame(symbol, timeframe, month)
+            if existing is not None:
+                part = pd.concat([existing, part], ignore_index=True)
+                part = part.drop_duplicates('timestamp', keep='last').sort_values('timestamp', kind='stable')
+            self._write_partition(symbol, timeframe, month, part)
+
+        logger.info(f"OHLCV 가져오기 완료: {path} → {symbol} {timeframe} ({len(frame)}개 바, {months.nunique()}개월)")
+        return len(frame)
+
+    def _write_partition(self, symbol: str, timeframe: str, month: str, frame: pd.DataFrame):
+        """파티션을 임시 디렉토리에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓴 파일을 보지 않도록)"""
+        target = self._partition_dir(symbol, timeframe, month)
+        staging = target.with_name(f"{month}.tmp-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        BarStore(
+            timestamps=frame['timestamp'].to_numpy(dtype='datetime64[ns]').astype(np.int64),
+            open=frame['open'].to_numpy(dtype=np.float64),
+            high=frame['high'].to_numpy(dtype=np.float64),
+            low=frame['low'].to_numpy(dtype=np.float64),
+            close=frame['close'].to_numpy(dtype=np.float64),
+            volume=frame['volume'].to_numpy(dtype=np.float64),
+            symbol=symbol,
+        ).save(staging)
+
+        with self._lock:
+            self._cache.pop((symbol, timeframe, month), None)
+            if target.exists():
+                retired = target.with_name(f"{month}.old-{os.getpid()}")
+                target.rename(retired)
+                staging.rename(target)
+                shutil.rmtree(retired, ignore_errors=True)
+            else:
+                staging.rename(target)
+
+    def _read_partition_frame(self, symbol: str, timeframe: str, month: str) -> Optional[pd.DataFrame]:
+        if not self._partition_dir(symbol, timeframe, month).exists():
+            return None
+        store = BarStore.load(self._partition_dir(symbol, timeframe, month), mmap=False)
+        frame = pd.DataFrame({name: getattr(store, name) for name in PRICE_COLUMNS})
+        frame.insert(0, 'timestamp', pd.to_datetime(store.timestamps))
+        return frame
+
+    # ===== 조회 =====
+    def months(self, symbol: str, timeframe: str) -> List[str]:
+        """저장된 월 파티션 목록 (YYYY-MM, 오름차순)"""
+        directory = self.root / symbol / timeframe
+        if not directory.exists():
+            return []
+        return sorted(p.name for p in directory.iterdir() if p.is_dir() and len(p.name) == 7)
+
+    def covers(self, symbol: str, timeframe: str, start: datetime, end: datetime) -> bool:
+        """[start, end) 구간의 모든 월 파티션이 있는지 여부"""
+        available = set(self.months(symbol, timeframe))
+        return bool(available) and all(month in available for month in _months_between(start, end))
+
+    def load(self, symbol: str, timeframe: str, start: datetime, end: datetime) -> BarStore:
+        """
+        [start, end) 구간 바 조회
+
+        구간이 한 달 안이면 메모리 매핑된 파티션의 뷰를 그대로 반환하고,
+        여러 달에 걸치면 잘라낸 구간만 이어 붙인다.
+        """
+        start_ns, end_ns = to_ns(start), to_ns(end)
+        pieces = []
+        for month in _months_between(start, end):
+            partition = self._partition(symbol, timeframe, month)
+            if partition is None:
+                continue
+            lo = int(np.searchsorted(partition.timestamps, start_ns, side='left'))
+            hi = int(np.searchsorted(partition.timestamps, end_ns, side='left'))
+            if hi > lo:
+                pieces.append(partition.slice(lo, hi))
+
+        if len(pieces) == 1:
+            return pieces[0]
+        if not pieces:
+            empty = np.zeros(0)
+            return BarStore(np.zeros(0, dtype=np.int64), empty, empty, empty, empty, empty, symbol=symbol)
+        return BarStore(
+            **{name: np.concatenate([getattr(piece, name) for piece in pieces]) for name in COLUMNS},
+            symbol=symbol,
+        )
+
+    def _partition(self, symbol: str, timeframe: str, month: str) -> Optional[BarStore]:
+        """월 파티션 열기 (LRU 캐시)"""
+        key = (symbol, timeframe, month)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._cache[key]
+
+        directory = self._partition_dir(symbol, timeframe, month)
+        if not directory.exists():
+            return None
+        partition = BarStore.load(directory, mmap=True)
+
+        with self._lock:
+            self.cache_misses += 1
+            self._cache[key] = partition
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return partition
+
+    def _partition_dir(self, symbol: str, timeframe: str, month: str) -> Path:
+        return self.root / symbol / timeframe / month
+
+
+def read_ohlcv_file(path: str | Path) -> pd.DataFrame:
+    """
+    CSV / Parquet / Feather 파일을 timestamp, open, high, low, close, volume 프레임으로 정규화
+
+    숫자 타임스탬프는 크기로 단위(초/밀리초/마이크로초/나노초)를 판별한다.
+    Parquet / Feather 읽기에는 pyarrow가 필요하다.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in ('.parquet', '.pq'):
+        frame = pd.read_parquet(path)
+    elif suffix in ('.feather', '.arrow'):
+        frame = pd.read_feather(path)
+    else:
+        frame = pd.read_csv(path, float_precision='round_trip')
+
+    frame = frame.rename(columns=lambda c: str(c).strip().lower())
+    if 'timestamp' not in frame.columns:
+        source = next((c for c in TIMESTAMP_COLUMNS if c in frame.columns), None)
+        if source is None:
+            raise ValueError(f"타임스탬프 컬럼이 없습니다: {path} (지원: {', '.join(TIMESTAMP_COLUMNS)})")
+        frame = frame.rename(columns={source: 'timestamp'})
+    missing = [c for c in PRICE_COLUMNS if c not in frame.columns]
+    if missing:
+        raise ValueError(f"OHLCV 컬럼 누락: {path} ({', '.join(missing)})")
+
+    frame = frame[['timestamp', *PRICE_COLUMNS]].copy()
+    frame['timestamp'] = _parse_timestamps(frame['timestamp'])
+    frame = frame.dropna(subset=['timestamp'])
+    return frame.drop_duplicates('timestamp', keep='last').sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def _parse_timestamps(values: pd.Series) -> pd.Series:
+    """타임스탬프 컬럼 → UTC 기준 naive datetime64[ns]"""
+    if pd.api.types.is_numeric_dtype(values):
+        magnitude = float(values.abs().max()) if len(values) else 0.0
+        unit = 's' if magnitude < 1e11 else 'ms' if magnitude < 1e14 else 'us' if magnitude < 1e17 else 'ns'
+        parsed = pd.to_datetime(values, unit=unit, utc=True)
+    else:
+        parsed = pd.to_datetime(values, utc=True)
+    return parsed.dt.tz_localize(None).astype('datetime64[ns]')
+
+
+def _months_between(start: datetime, end: datetime) -> List[str]:
+    """[start, end) 구간과 겹치는 월 (YYYY-MM)"""
+    first = pd.Timestamp(to_ns(start))
+    last = pd.Timestamp(to_ns(end) - 1)
+    if last < first:
+        return []
+    return [period.strftime('%Y-%m') for period in pd.period_range(first.to_period('M'), last.to_period('M'), freq='M')]
+
+
+# 한글 주석: 같은 루트를 쓰는 러너끼리 파티션 캐시 공유 (청크마다 러너를 새로 만들어도 재사용)
+_stores: Dict[str, LocalOHLCVStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_market_data_store(root: str | Path = "data/ohlcv") -> LocalOHLCVStore:
+    """루트 경로별 공유 저장소 인스턴스"""
+    key = str(Path(root).resolve())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = LocalOHLCVStore(root)
+        return _stores[key]
+
+
+if __name__ == "__main__":
+    # 한글 주석: 로컬 파일 가져오기
+    # python -m nautilus_integration.market_data BTCUSDT-1m-2024-01.csv --symbol BTCUSDT --timeframe 1m
+    import argparse
+
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description='로컬 OHLCV 파일 가져오기')
+    parser.add_argument('files', nargs='+', help='CSV / Parquet / Feather 파일')
+    parser.add_argument('--symbol', required=True, help='심볼 (예: BTCUSDT)')
+    parser.add_argument('--timeframe', default='1m', choices=['1m', '5m', '1h'], help='시간 프레임')
+    parser.add_argument('--root', default='data/ohlcv', help='저장소 루트 디렉토리')
+    args = parser.parse_args()
+
+    store = LocalOHLCVStore(args.root)
+    total = sum(store.import_file(path, args.symbol, args.timeframe) for path in args.files)
+    print(f"가져오기 완료: {total}개 바 → {store.root / args.symbol / args.timeframe}")
@@ -0,0 +1,134 @@
+"""
+배열 기반 신호 계산 엔진
+- 전체 구간의 SMA5/SMA20, 10바 평균 거래량, 단순 RSI, 10바 변동성을 한 번에 계산
+- breakout / trend / counter_trend 분기 조건을 불리언 마스크로 평가
+
+한글 주석: 윈도우 합계는 바별 계산(MLBacktestStrategy._analyze_bar_pattern)과 같은 순서로
+왼쪽부터 더하므로 부동소수점 결과가 비트 단위로 같다. 누적합(cumsum) 방식은 빠르지만
+반올림 오차가 달라져 경계값에서 신호가 바뀔 수 있어 사용하지 않는다.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# 한글 주석: 신호 계산에 필요한 최소 과거 바 수 (현재 바 포함 21개)
+LOOKBACK_BARS = 20
+RSI_PERIOD = 14
+VOLATILITY_BARS = 10
+
+# 한글 주석: 전략별 기본 점수 배율 (_calculate_strategy_score와 동일)
+STRATEGY_MULTIPLIERS = {
+    'breakout': 1.0,
+    'trend': 0.95,
+    'counter_trend': 0.85,
+}
+
+
+@dataclass
+class SignalArrays:
+    """바 인덱스 LOOKBACK_BARS부터 끝까지의 지표/조건 배열 (index[k]가 원래 바 인덱스)"""
+    index: np.ndarray
+    close: np.ndarray
+    sma_short: np.ndarray
+    sma_long: np.ndarray
+    volume_spike: np.ndarray
+    rsi: np.ndarray
+    volatility: np.ndarray
+    breakout: np.ndarray
+    trend: np.ndarray
+    counter_trend: np.ndarray
+
+
+def window_sum(values: np.ndarray, window: int, first: int) -> np.ndarray:
+    """
+    values[i-window+1] ~ values[i] 합계 (i = first .. len-1)
+
+    Python sum()과 같은 순서로 왼쪽부터 더한다.
+    """
+    n = len(values)
+    total = np.zeros(n - first)
+    for k in range(window):
+        start = first - window + 1 + k
+        total = total + values[start:start + n - first]
+    return total
+
+
+def compute_signal_arrays(close: np.ndarray, volume: np.ndarray) -> SignalArrays:
+    """종가/거래량 배열로 전 구간 신호 조건 계산"""
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    first = LOOKBACK_BARS
+    if len(close) <= first:
+        empty = np.zeros(0)
+        flags = np.zeros(0, dtype=bool)
+        return SignalArrays(np.zeros(0, dtype=np.int64), empty, empty, empty, flags, empty, empty, flags, flags, flags)
+
+    current = close[first:]
+
+    # 한글 주석: 단순 이동평균 (0 나눗셈 방지)
+    sma_short = window_sum(close, 5, first) / 5
+    sma_long = window_sum(close, 20, first) / 20
+    sma_long = np.where(sma_long == 0, 1e-9, sma_long)
+
+    # 한글 주석: 볼륨 증가 확인 (현재 바 포함 10바 평균의 1.5배 초과)
+    avg_volume = window_sum(volume, 10, first) / 10
+    volume_spike = volume[first:] > avg_volume * 1.5
+
+    # 한글 주석: 단순 RSI (최근 14개 변화량의 평균 상승/하락폭)
+    deltas = np.empty_like(close)
+    deltas[0] = 0.0
+    deltas[1:] = close[1:] - close[:-1]
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    avg_gain = window_sum(gains, RSI_PERIOD, first) / RSI_PERIOD
+    avg_loss = window_sum(losses, RSI_PERIOD, first) / RSI_PERIOD
+    avg_loss = np.where(avg_loss == 0, 1e-9, avg_loss)
+    rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    # 한글 주석: 최근 10개 종가의 수익률 표준편차 (모집단)
+    returns = np.zeros_like(close)
+    returns[1:] = (close[1:] - close[:-1]) / close[:-1]
+    count = VOLATILITY_BARS - 1
+    mean_return = window_sum(returns, count, first) / count
+    variance = np.zeros(len(current))
+    for k in range(count):
+        start = first - count + 1 + k
+        deviation = returns[start:start + len(current)] - mean_return
+        variance = variance + deviation * deviation
+    volatility = np.sqrt(variance / count)
+
+    # 한글 주석: 분기 조건 (앞 조건이 우선)
+    breakout = (sma_short > sma_long) & (rsi > 30) & (rsi < 70)
+    trend = ~breakout & (sma_short < sma_long) & (rsi > 55)
+    counter_trend = ~breakout & ~trend & ((rsi > 80) | (rsi < 20))
+
+    return SignalArrays(
+        index=np.arange(first, len(close)),
+        close=current,
+        sma_short=sma_short,
+        sma_long=sma_long,
+        volume_spike=volume_spike,
+        rsi=rsi,
+        volatility=volatility,
+        breakout=breakout,
+        trend=trend,
+        counter_trend=counter_trend,
+    )
+
+
+def strategy_scores(strategy_type: str, rsi: np.ndarray, volume_spike: np.ndarray,
+                    volatility: np.ndarray) -> np.ndarray:
+    """전략별 기본 점수 (MLBacktestStrategy._calculate_strategy_score의 배열 버전)"""
+    score = np.full(len(rsi), 70.0 * STRATEGY_MULTIPLIERS.get(strategy_type, 1.0))
+
+    # 한글 주석: RSI 기반 점수 조정
+    neutral = (rsi >= 40) & (rsi <= 60)
+    moderate = ~neutral & (rsi >= 30) & (rsi <= 70)
+    score = score + np.where(neutral, 10, np.where(moderate, 5, -5))
+
+    # 한글 주석: 볼륨 스파이크 보너스와 변동성 조정
+    score = score + np.where(volume_spike, 8, 0)
+    score = score + np.where(volatility > 0.03, -5, np.where(volatility < 0.01, 5, 0))
+
+    return np.clip(score, 50.0, 100.0)
@@ -28,6 +28,8 @@ class StrategySignal:
     risk_level: str
     # 한글 주석: 신호 생성 시점의 특징값들을 함께 저장 (ML 스코어링 용)
     features: Dict[str, float] | None = None
+    # 한글 주석: 신호가 발생한 바의 인덱스 (청산 구간 탐색 시작점)
+    bar_index: Optional[int] = None
 
 class StrategyFilter:
     """전략 점수 기반 필터링"""
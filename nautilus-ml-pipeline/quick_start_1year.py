@@ -11,6 +11,7 @@ import argparse
 import asyncio
 import logging
 from datetime import datetime
+from typing import Optional
 import sys
 from pathlib import Path
 
@@ -31,7 +32,8 @@ async def quick_start_single_symbol(
     symbol: str, 
     chunk_days: int = 30, 
     timeframe: str = "1m",
-    use_large_trainer: bool = True
+    use_large_trainer: bool = True,
+    workers: Optional[int] = None
 ):
     """
     단일 심볼 1년치 백테스트 + ML 훈련
@@ -41,6 +43,7 @@ async def quick_start_single_symbol(
         chunk_days: 청크 크기 (일)
         timeframe: 시간 프레임
         use_large_trainer: 대용량 데이터 훈련기 사용 여부
+        workers: 청크 병렬 실행 프로세스 수 (None이면 CPU 수)
     """
     logger.info(f"🚀 {symbol} 1년치 백테스트 + ML 훈련 시작")
     logger.info(f"설정: 청크 {chunk_days}일, 시간프레임 {timeframe}")
@@ -50,7 +53,7 @@ async def quick_start_single_symbol(
     try:
         # 한글 주석: 1단계 - 1년치 백테스트 실행
         logger.info("📊 1단계: 1년치 백테스트 실행 중...")
-        runner = YearLongBacktestRunner()
+        runner = YearLongBacktestRunner(workers=workers)
         
         backtest_report = await runner.run_year_long_backtest(
             symbol=symbol,
@@ -134,7 +137,8 @@ async def quick_start_single_symbol(
 async def quick_start_multiple_symbols(
     symbols: list, 
     chunk_days: int = 30,
-    timeframe: str = "1m"
+    timeframe: str = "1m",
+    workers: Optional[int] = None
 ):
     """
     여러 심볼 순차 실행
@@ -143,6 +147,7 @@ async def quick_start_multiple_symbols(
         symbols: 심볼 리스트
         chunk_days: 청크 크기
         timeframe: 시간 프레임
+        workers: 청크 병렬 실행 프로세스 수 (None이면 CPU 수)
     """
     logger.info(f"🚀 다중 심볼 1년치 백테스트 시작: {', '.join(symbols)}")
     
@@ -156,7 +161,8 @@ async def quick_start_multiple_symbols(
         result = await quick_start_single_symbol(
             symbol=symbol,
             chunk_days=chunk_days,
-            timeframe=timeframe
+            timeframe=timeframe,
+            workers=workers
         )
         
         results.append(result)
@@ -192,6 +198,7 @@ def main():
     parser.add_argument('--chunk-size', type=int, default=30, help='백테스트 청크 크기 (일)')
     parser.add_argument('--timeframe', type=str, default='1m', choices=['1m', '5m', '1h'], help='시간 프레임')
     parser.add_argument('--small-trainer', action='store_true', help='일반 훈련기 사용 (대신 대용량 훈련기)')
+    parser.add_argument('--workers', type=int, default=None, help='청크 병렬 실행 프로세스 수 (기본: CPU 수, 1이면 순차 실행)')
     
     args = parser.parse_args()
     
@@ -204,7 +211,8 @@ def main():
         results = asyncio.run(quick_start_multiple_symbols(
             symbols=symbols,
             chunk_days=args.chunk_size,
-            timeframe=args.timeframe
+            timeframe=args.timeframe,
+            workers=args.workers
         ))
         
     elif args.symbol:
@@ -215,7 +223,8 @@ def main():
             symbol=args.symbol,
             chunk_days=args.chunk_size,
             timeframe=args.timeframe,
-            use_large_trainer=not args.small_trainer
+            use_large_trainer=not args.small_trainer,
+            workers=args.workers
         ))
         
         if result['success']:
@@ -13,7 +13,8 @@ import pandas as pd
 import time
 from typing import List, Dict, Optional
 
-from nautilus_integration.backtest_runner import run_nautilus_backtest
+from nautilus_integration.backtest_runner import load_config
+from nautilus_integration.chunked import DEFAULT_WARMUP_BARS, ChunkResult, plan_chunks, run_chunks
 from ml_pipeline.data_processor import MLDataPipeline
 from ml_pipeline.model_trainer import MLModelTrainer
 from ml_pipeline.performance_monitor import PerformanceMonitor
@@ -33,8 +34,17 @@ logger = logging.getLogger(__name__)
 class YearLongBacktestRunner:
     """1년치 백테스트 실행기"""
     
-    def __init__(self):
-        """실행기 초기화"""
+    def __init__(self, workers: Optional[int] = None, base_seed: int = 42,
+                 warmup_bars: int = DEFAULT_WARMUP_BARS, config_path: str = "config/ml_config.yaml"):
+        """
+        실행기 초기화
+        
+        Args:
+            workers: 청크 병렬 실행 프로세스 수 (None이면 CPU 수, 1이면 순차 실행)
+            base_seed: 청크별 샘플 데이터 시드의 기준값 (같은 값이면 같은 결과)
+            warmup_bars: 청크 경계 지표 예열용으로 앞 구간과 겹쳐 읽을 바 수
+            config_path: 백테스트 설정 파일 (한 번만 읽어 모든 청크에 전달)
+        """
         # 한글 주석: 필요한 디렉토리 생성
         Path('data/backtest_results').mkdir(parents=True, exist_ok=True)
         Path('data/training_data').mkdir(parents=True, exist_ok=True)
@@ -45,6 +55,11 @@ class YearLongBacktestRunner:
         self.model_trainer = MLModelTrainer()
         self.performance_monitor = PerformanceMonitor()
         
+        self.workers = workers
+        self.base_seed = base_seed
+        self.warmup_bars = warmup_bars
+        self.backtest_config = load_config(config_path)
+        
         # 한글 주석: 실행 통계
         self.total_trades = 0
         self.backtest_files = []
@@ -99,59 +114,43 @@ class YearLongBacktestRunner:
         chunk_days: int, 
         timeframe: str
     ):
-        """청크 단위로 백테스트 실행"""
+        """청크 단위로 백테스트 실행 (프로세스 풀 병렬 실행 후 청크 순서대로 병합)"""
         
         # 한글 주석: 1년 전부터 현재까지의 기간 설정
         end_date = datetime.now()
         start_date = end_date - timedelta(days=365)
         
-        current_date = start_date
-        chunk_num = 1
+        chunks = plan_chunks(symbol, start_date, end_date, chunk_days, timeframe,
+                             base_seed=self.base_seed, warmup_bars=self.warmup_bars)
         
         logger.info(f"백테스트 기간: {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')}")
+        logger.info(f"청크 {len(chunks)}개, 워커 {self.workers or '자동(CPU 수)'}, 예열 {self.warmup_bars}바")
         
-        while current_date < end_date:
-            chunk_end = min(current_date + timedelta(days=chunk_days), end_date)
-            
-            logger.info(f"청크 #{chunk_num}: {current_date.strftime('%Y-%m-%d')} ~ {chunk_end.strftime('%Y-%m-%d')}")
-            
-            try:
-                # 한글 주석: 청크 백테스트 실행
-                loop = asyncio.get_event_loop()
-                result_file = await loop.run_in_executor(
-                    None, 
-                    run_nautilus_backtest,
-                    symbol,
-                    chunk_days,
-                    current_date,
-                    chunk_end,
-                    timeframe
-                )
-                
-                # 한글 주석: 결과 파일 기록 (거래가 있을 때만)
-                if result_file and Path(result_file).exists():
-                    self.backtest_files.append(result_file)
-                    
-                    # 한글 주석: 거래 수 카운트
-                    df = pd.read_csv(result_file)
-                    chunk_trades = len(df)
-                    self.total_trades += chunk_trades
-                    
-                    logger.info(f"청크 #{chunk_num} 완료: {chunk_trades}건 거래, 누적 {self.total_trades}건")
-                else:
-                    logger.info(f"청크 #{chunk_num} 구간 {current_date.strftime('%Y-%m-%d')} ~ {chunk_end.strftime('%Y-%m-%d')}: 거래 없음")
-                
-                # 한글 주석: 청크 간 휴식 (시스템 부하 방지)
-                await asyncio.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"청크 #{chunk_num} 실패: {e}")
-                # 한글 주석: 개별 청크 실패해도 계속 진행
-            
-            current_date = chunk_end
-            chunk_num += 1
+        started = time.time()
         
-        logger.info(f"총 {chunk_num-1}개 청크 완료, {self.total_trades}건 거래 생성")
+        def on_progress(done: int, total: int, result: ChunkResult):
+            elapsed = time.time() - started
+            remaining = elapsed / done * (total - done)
+            status = f"실패: {result.error}" if result.error else f"{result.trades}건 거래"
+            logger.info(f"진행률 {done}/{total} ({done / total:.0%}) - 청크 #{result.index} {status}, "
+                        f"{result.elapsed_seconds:.1f}초 (경과 {elapsed:.0f}초, 남은 시간 약 {remaining:.0f}초)")
+        
+        results = await run_chunks(chunks, self.backtest_config, workers=self.workers, on_progress=on_progress)
+        
+        # 한글 주석: 완료 순서와 무관하게 청크 순서대로 결과 병합
+        for result in results:
+            period = f"{result.start.strftime('%Y-%m-%d')} ~ {result.end.strftime('%Y-%m-%d')}"
+            if result.error:
+                # 한글 주석: 개별 청크 실패해도 계속 진행
+                logger.error(f"청크 #{result.index} 실패: {result.error}")
+            elif result.result_file and Path(result.result_file).exists():
+                self.backtest_files.append(result.result_file)
+                self.total_trades += result.trades
+                logger.info(f"청크 #{result.index} 완료 ({period}): {result.trades}건 거래, 누적 {self.total_trades}건")
+            else:
+                logger.info(f"청크 #{result.index} 구간 {period}: 거래 없음")
+        
+        logger.info(f"총 {len(results)}개 청크 완료, {self.total_trades}건 거래 생성 ({time.time() - started:.1f}초)")
     
     async def _consolidate_and_process_data(self) -> str:
         """모든 백테스트 데이터 통합 및 ML 데이터 변환"""
@@ -328,8 +327,8 @@ class YearLongBacktestRunner:
             from nautilus_integration.backtest_runner import NautilusBacktestRunner
             from datetime import datetime, timedelta
             
-            # 한글 주석: 백테스트 실행기 초기화
-            backtest_runner = NautilusBacktestRunner()
+            # 한글 주석: 백테스트 실행기 초기화 (읽어 둔 설정 재사용)
+            backtest_runner = NautilusBacktestRunner(config=self.backtest_config)
             
             # 한글 주석: 기간 설정 (현재 시점에서 과거로)
             end_date = datetime.now()
@@ -0,0 +1,199 @@
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 한글 주석: 파이프라인 루트 경로 추가 (저장소 루트에서 실행해도 import 가능)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from nautilus_integration.backtest_runner import NautilusBacktestRunner
+from nautilus_integration.bar_store import BarStore
+from nautilus_integration.market_data import LocalOHLCVStore
+from nautilus_integration.strategy_filter import StrategySignal
+
+
+def _runner():
+    return NautilusBacktestRunner(config_path=os.path.join(ROOT, "config", "ml_config.yaml"))
+
+
+def _random_bars(count, seed, start=datetime(2024, 1, 1)):
+    rng = random.Random(seed)
+    price = 100.0
+    bars = []
+    for i in range(count):
+        price *= 1 + rng.gauss(0, 0.004)
+        bars.append({
+            'symbol': 'BTCUSDT',
+            'open': price,
+            'high': price * (1 + abs(rng.gauss(0, 0.003))),
+            'low': price * (1 - abs(rng.gauss(0, 0.003))),
+            'close': price,
+            'volume': rng.randint(100, 10000),
+            'timestamp': start + timedelta(minutes=i),
+        })
+    return bars
+
+
+def _legacy_exit(signal, bars):
+    """기존 전체 스캔 구현 (청산 시점/가격/사유 비교 기준)"""
+    signal_time = signal.timestamp
+    future_bars = [b for b in bars if b['timestamp'] > signal_time][:60]
+    if not future_bars:
+        return signal.entry_price, signal_time + timedelta(minutes=30), "timeout"
+    exit_price, exit_time, exit_reason = signal.entry_price, signal_time, "timeout"
+    for bar in future_bars:
+        long_side = signal.strategy_type in ['breakout', 'counter_trend']
+        profit = bar['high'] >= signal.take_profit if long_side else bar['low'] <= signal.take_profit
+        stop = bar['low'] <= signal.stop_loss if long_side else bar['high'] >= signal.stop_loss
+        if profit:
+            return signal.take_profit, bar['timestamp'], "profit"
+        if stop:
+            return signal.stop_loss, bar['timestamp'], "stop_loss"
+        exit_price, exit_time = bar['close'], bar['timestamp']
+    return exit_price, exit_time, exit_reason
+
+
+def _signal(bars, index, strategy_type, tp_pct, sl_pct, with_index=True):
+    bar = bars[index]
+    price = bar['close']
+    short = strategy_type == 'trend'
+    return StrategySignal(
+        symbol='BTCUSDT', timestamp=bar['timestamp'], strategy_type=strategy_type,
+        entry_price=price,
+        stop_loss=price * (1 + sl_pct if short else 1 - sl_pct),
+        take_profit=price * (1 - tp_pct if short else 1 + tp_pct),
+        score=90.0, confidence=0.8, risk_level='medium',
+        bar_index=index if with_index else None,
+    )
+
+
+@pytest.mark.parametrize("tz", [None, timezone.utc])
+def test_indexed_exit_matches_full_scan(tz):
+    bars = _random_bars(3000, seed=11, start=datetime(2024, 1, 1, tzinfo=tz))
+    store = BarStore.from_bars(bars)
+    runner = _runner()
+    rng = random.Random(3)
+
+    # 한글 주석: 마지막 바 근처(구간 부족/없음)와 같은 바에서 익절·손절 동시 도달 경우 포함
+    indices = [rng.randrange(len(bars)) for _ in range(300)] + [len(bars) - 1, len(bars) - 2, len(bars) - 30]
+    for n, index in enumerate(indices):
+        strategy_type = ['breakout', 'trend', 'counter_trend'][n % 3]
+        tp_pct, sl_pct = rng.choice([(0.002, 0.002), (0.0005, 0.0005), (0.02, 0.03), (0.5, 0.5)])
+        signal = _signal(bars, index, strategy_type, tp_pct, sl_pct, with_index=n % 4 != 0)
+
+        result = runner._simulate_trade_execution(signal, store, position_size=1000.0)
+
+        exit_price, exit_time, exit_reason = _legacy_exit(signal, bars)
+        assert (result['exit_price'], result['exit_timestamp'], result['exit_reason']) == (exit_price, exit_time, exit_reason)
+        assert result['duration_minutes'] == (exit_time - signal.timestamp).total_seconds() / 60
+
+
+def _legacy_signals(strategy, bars):
+    """기존 바별 분석 구현 (신호 비교 기준)"""
+    signals = []
+    for i, bar in enumerate(bars[20:], 20):
+        signal = strategy._analyze_bar_pattern(bars[i-20:i+1], bar)
+        if signal:
+            signal.bar_index = i
+            signals.append(signal)
+    return signals
+
+
+def test_vectorized_signals_match_bar_by_bar_analysis():
+    bars = _random_bars(3000, seed=5)
+    # 한글 주석: 횡보(동일 종가)와 0 거래량 구간 포함
+    for i in range(1500, 1540):
+        bars[i] = {**bars[i], 'close': bars[1499]['close'], 'volume': 0}
+    strategy = _runner().strategy
+    # 한글 주석: ML 모델 로딩 없이 기본 점수로 비교 (점수 계산 경로는 두 구현이 동일)
+    strategy.scoring_mode = 'baseline'
+
+    signals = strategy.generate_signals(bars)
+
+    assert signals == _legacy_signals(strategy, bars)
+    assert {s.strategy_type for s in signals} == {'breakout', 'trend', 'counter_trend'}
+    assert strategy.generate_signals(bars[:21]) == _legacy_signals(strategy, bars[:21])
+    assert strategy.generate_signals(bars[:20]) == []
+
+
+def test_sample_data_is_columnar_without_downsampling(tmp_path):
+    runner = _runner()
+    start = datetime(2024, 1, 1)
+
+    store = runner.create_sample_data('ETHUSDT', start_date=start, end_date=start + timedelta(days=365), timeframe='1m')
+
+    # 한글 주석: 40만 바를 넘어도 1분봉 유지, 바당 48바이트
+    assert len(store) == 365 * 1440
+    assert store.nbytes == len(store) * 48
+    assert store.datetime_at(1) == start + timedelta(minutes=1)
+    assert store.symbol == 'ETHUSDT'
+    assert (store.low <= store.close).all() and (store.close <= store.high).all()
+
+    loaded = BarStore.load(store.save(tmp_path / 'bars'))
+    assert isinstance(loaded.close, np.memmap)
+    assert loaded.symbol == 'ETHUSDT' and loaded.tz is None
+    assert (loaded.close == store.close).all() and (loaded.timestamps == store.timestamps).all()
+
+    window = loaded.slice(0, 5000)
+    assert window.to_bars()[-1] == store.bar_at(4999)
+    runner.strategy.scoring_mode = 'baseline'
+    assert runner.strategy.generate_signals(window) == runner.strategy.generate_signals(window.to_bars())
+
+
+def _write_ohlcv_csv(path, start, count, step=timedelta(minutes=1), epoch_ms=False):
+    bars = _random_bars(count, seed=count, start=start)
+    frame = pd.DataFrame(bars).drop(columns='symbol')
+    if epoch_ms:
+        frame['timestamp'] = [int(ts.replace(tzinfo=timezone.utc).timestamp() * 1000) for ts in frame['timestamp']]
+        frame = frame.rename(columns={'timestamp': 'open_time'})
+    frame.to_csv(path, index=False)
+    return bars
+
+
+def test_local_store_loads_ranges_from_monthly_partitions(tmp_path):
+    store = LocalOHLCVStore(tmp_path / 'ohlcv')
+    start = datetime(2024, 1, 31, 12)
+    bars = _write_ohlcv_csv(tmp_path / 'a.csv', start, 3000)
+    store.import_file(tmp_path / 'a.csv', 'BTCUSDT', '1m')
+
+    assert store.months('BTCUSDT', '1m') == ['2024-01', '2024-02']
+    assert store.covers('BTCUSDT', '1m', start, start + timedelta(days=1))
+    assert not store.covers('BTCUSDT', '1m', start, datetime(2024, 3, 2))
+
+    # 한글 주석: 한 달 안 구간은 메모리 매핑 뷰, 월 경계를 넘으면 이어 붙인 배열
+    january = store.load('BTCUSDT', '1m', start, datetime(2024, 2, 1))
+    assert isinstance(january.close, np.memmap)
+    assert len(january) == 720 and january.datetime_at(0) == start
+    spanning = store.load('BTCUSDT', '1m', start + timedelta(minutes=100), start + timedelta(minutes=2100))
+    assert spanning.to_bars() == [{**bar, 'volume': float(bar['volume'])} for bar in bars[100:2100]]
+    assert store.cache_misses == 2 and store.cache_hits == 1
+
+    # 한글 주석: 밀리초 epoch 재가져오기 - 겹치는 시각은 새 값으로 교체하고 파티션 캐시 무효화
+    newer = _write_ohlcv_csv(tmp_path / 'b.csv', datetime(2024, 2, 2, 12), 10, epoch_ms=True)
+    store.import_file(tmp_path / 'b.csv', 'BTCUSDT', '1m')
+    merged = store.load('BTCUSDT', '1m', datetime(2024, 2, 2, 12), datetime(2024, 2, 2, 12, 10))
+    assert list(merged.close) == [bar['close'] for bar in newer]
+    assert len(store.load('BTCUSDT', '1m', start, start + timedelta(days=5))) == 3000
+
+
+def test_runner_reads_local_bars_and_falls_back_to_sample(tmp_path):
+    runner = _runner()
+    runner.market_data = LocalOHLCVStore(tmp_path / 'ohlcv')
+    start = datetime(2024, 1, 1)
+    _write_ohlcv_csv(tmp_path / 'a.csv', start, 1440)
+    runner.market_data.import_file(tmp_path / 'a.csv', 'BTCUSDT', '1m')
+
+    local = runner.load_bars('BTCUSDT', start_date=start, end_date=start + timedelta(hours=6))
+    assert len(local) == 360 and isinstance(local.close, np.memmap)
+
+    sample = runner.load_bars('ETHUSDT', start_date=start, end_date=start + timedelta(hours=6))
+    assert len(sample) == 360 and sample.symbol == 'ETHUSDT' and not isinstance(sample.close, np.memmap)
+
+    runner.sample_fallback = False
+    with pytest.raises(ValueError):
+        runner.load_bars('ETHUSDT', start_date=start, end_date=start + timedelta(hours=6))
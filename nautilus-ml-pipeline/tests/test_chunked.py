@@ -0,0 +1,58 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# 한글 주석: 파이프라인 루트 경로 추가 (저장소 루트에서 실행해도 import 가능)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from nautilus_integration.backtest_runner import load_config
+from nautilus_integration.chunked import plan_chunks, run_chunks
+
+
+def _config(tmp_path):
+    config = load_config(os.path.join(ROOT, "config", "ml_config.yaml"))
+    # 한글 주석: 모델 로딩 없이 기본 점수 사용, 로컬 데이터 없음 → 시드 기반 샘플 데이터
+    config['scoring']['mode'] = 'baseline'
+    config['market_data'] = {'path': str(tmp_path / 'ohlcv'), 'sample_fallback': True}
+    return config
+
+
+def test_chunks_cover_period_with_deterministic_seeds():
+    start = datetime(2024, 1, 1)
+    chunks = plan_chunks('BTCUSDT', start, start + timedelta(days=65), 30, '1m')
+
+    assert [(c.start, c.end) for c in chunks] == [
+        (start, start + timedelta(days=30)),
+        (start + timedelta(days=30), start + timedelta(days=60)),
+        (start + timedelta(days=60), start + timedelta(days=65)),
+    ]
+    assert [c.seed for c in chunks] == [c.seed for c in plan_chunks('BTCUSDT', start, start + timedelta(days=65), 30, '1m')]
+    assert len({c.seed for c in chunks}) == 3
+    assert chunks[0].seed != plan_chunks('ETHUSDT', start, start + timedelta(days=65), 30, '1m')[0].seed
+
+
+def test_parallel_chunks_match_sequential_run_in_order(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data/backtest_results')
+    config = _config(tmp_path)
+    start = datetime(2024, 1, 1)
+    chunks = plan_chunks('BTCUSDT', start, start + timedelta(days=3), 1, '1m')
+    progress = []
+
+    parallel = asyncio.run(run_chunks(chunks, config, workers=3, on_progress=lambda done, total, r: progress.append((done, total))))
+    sequential = asyncio.run(run_chunks(chunks, config, workers=1))
+
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+    assert [r.index for r in parallel] == [1, 2, 3]
+    assert all(r.error is None and r.result_file for r in parallel + sequential)
+    assert len({r.result_file for r in parallel}) == 3
+    for p, s in zip(parallel, sequential):
+        p_trades, s_trades = pd.read_csv(p.result_file), pd.read_csv(s.result_file)
+        assert p.trades == s.trades == len(p_trades)
+        pd.testing.assert_frame_equal(p_trades, s_trades)
+        # 한글 주석: 예열 구간의 신호는 실행하지 않음
+        assert pd.to_datetime(p_trades['timestamp']).min() >= p.start
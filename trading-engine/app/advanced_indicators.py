@@ -1,97 +1,54 @@
-# 고급 기술적 지표 구현
-from typing import List, Tuple
-import math
+# 고급 기술적 지표 구현 (배열 커널 기반)
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from indicator_kernels import ArrayIndicators, ArrayLike, last
 
 class AdvancedIndicators:
-    """고급 기술적 지표 계산 클래스"""
+    """
+    고급 기술적 지표 계산 클래스
+    마지막 값만 반환하는 기존 인터페이스이며, 전체 시리즈가 필요하면 ArrayIndicators를 사용한다.
+    """
     
     @staticmethod
-    def calculate_rsi(prices: List[float], period: int = 14) -> float:
+    def calculate_rsi(prices: ArrayLike, period: int = 14) -> float:
         """RSI (Relative Strength Index) 계산"""
         if len(prices) < period + 1:
             return 50.0
-        
-        gains = []
-        losses = []
-        
-        for i in range(1, len(prices)):
-            change = prices[i] - prices[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        if len(gains) < period:
-            return 50.0
-        
-        avg_gain = sum(gains[-period:]) / period
-        avg_loss = sum(losses[-period:]) / period
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        # 마지막 값은 최근 period개 변화량에만 의존
+        recent = np.asarray(prices, dtype=np.float64)[-(period + 1):]
+        return last(ArrayIndicators.rsi(recent, period), 50.0)
     
     @staticmethod
-    def calculate_macd(prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[float, float, float]:
+    def calculate_macd(prices: ArrayLike, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[float, float, float]:
         """MACD (Moving Average Convergence Divergence) 계산"""
         if len(prices) < slow:
             return 0.0, 0.0, 0.0
         
-        # EMA 계산 함수
-        def ema(data: List[float], period: int) -> List[float]:
-            if len(data) < period:
-                return data
-            
-            multiplier = 2 / (period + 1)
-            ema_values = [data[0]]  # 첫 값은 그대로
-            
-            for i in range(1, len(data)):
-                ema_val = (data[i] * multiplier) + (ema_values[-1] * (1 - multiplier))
-                ema_values.append(ema_val)
-            
-            return ema_values
-        
-        # 빠른선과 느린선 EMA 계산
-        fast_ema = ema(prices, fast)
-        slow_ema = ema(prices, slow)
-        
-        if len(fast_ema) < slow or len(slow_ema) < slow:
-            return 0.0, 0.0, 0.0
-        
-        # MACD 라인 계산
-        macd_line = fast_ema[-1] - slow_ema[-1]
+        # MACD 라인 (첫 값으로 시작하는 EMA 차이)
+        macd_line, _, _ = ArrayIndicators.macd(prices, fast, slow, signal)
+        macd_value = last(macd_line)
         
         # 시그널 라인은 MACD의 EMA (간단화)
-        signal_line = macd_line * 0.8  # 근사치
+        signal_line = macd_value * 0.8  # 근사치
         
         # 히스토그램
-        histogram = macd_line - signal_line
+        histogram = macd_value - signal_line
         
-        return macd_line, signal_line, histogram
+        return macd_value, signal_line, histogram
     
     @staticmethod
-    def calculate_stochastic(highs: List[float], lows: List[float], closes: List[float], k_period: int = 14) -> Tuple[float, float]:
+    def calculate_stochastic(highs: ArrayLike, lows: ArrayLike, closes: ArrayLike, k_period: int = 14) -> Tuple[float, float]:
         """스토캐스틱 오실레이터 계산"""
         if len(highs) < k_period or len(lows) < k_period or len(closes) < k_period:
             return 50.0, 50.0
         
-        # %K 계산
-        recent_highs = highs[-k_period:]
-        recent_lows = lows[-k_period:]
-        current_close = closes[-1]
-        
-        highest_high = max(recent_highs)
-        lowest_low = min(recent_lows)
-        
-        if highest_high == lowest_low:
-            k_percent = 50.0
-        else:
-            k_percent = ((current_close - lowest_low) / (highest_high - lowest_low)) * 100
+        # %K 계산 (최근 k_period개 구간)
+        k_series, _ = ArrayIndicators.stochastic(
+            np.asarray(highs)[-k_period:], np.asarray(lows)[-k_period:], np.asarray(closes)[-k_period:], k_period
+        )
+        k_percent = last(k_series, 50.0)
         
         # %D는 %K의 3일 이동평균 (간단화)
         d_percent = k_percent * 0.8  # 근사치
@@ -99,68 +56,27 @@ class AdvancedIndicators:
         return k_percent, d_percent
     
     @staticmethod
-    def detect_support_resistance(highs: List[float], lows: List[float], period: int = 20) -> Tuple[List[float], List[float]]:
+    def detect_support_resistance(highs: ArrayLike, lows: ArrayLike, period: int = 20) -> Tuple[List[float], List[float]]:
         """지지선과 저항선 감지"""
         if len(highs) < period or len(lows) < period:
             return [], []
         
-        supports = []
-        resistances = []
-        
-        # 간단한 지지/저항 감지 (극값 기반)
-        for i in range(period//2, len(lows) - period//2):
-            # 지지선 감지 (저점)
-            is_support = True
-            current_low = lows[i]
-            
-            for j in range(i - period//2, i + period//2 + 1):
-                if j != i and lows[j] < current_low:
-                    is_support = False
-                    break
-            
-            if is_support:
-                supports.append(current_low)
-        
-        for i in range(period//2, len(highs) - period//2):
-            # 저항선 감지 (고점)
-            is_resistance = True
-            current_high = highs[i]
-            
-            for j in range(i - period//2, i + period//2 + 1):
-                if j != i and highs[j] > current_high:
-                    is_resistance = False
-                    break
-            
-            if is_resistance:
-                resistances.append(current_high)
+        # 간단한 지지/저항 감지 (중심 윈도우 극값 기반)
+        lows_array = np.asarray(lows, dtype=np.float64)
+        highs_array = np.asarray(highs, dtype=np.float64)
+        supports = lows_array[ArrayIndicators.local_extrema(lows_array, period, maximum=False)]
+        resistances = highs_array[ArrayIndicators.local_extrema(highs_array, period, maximum=True)]
         
-        return supports, resistances
+        return supports.tolist(), resistances.tolist()
     
     @staticmethod
-    def detect_trendline(highs: List[float], lows: List[float], prices: List[float]) -> float:
+    def detect_trendline(highs: ArrayLike, lows: ArrayLike, prices: ArrayLike) -> float:
         """간단한 트렌드라인 감지"""
         if len(prices) < 20:
             return 0.0
         
-        # 최근 20개 데이터로 간단한 선형회귀
-        n = min(20, len(prices))
-        recent_prices = prices[-n:]
-        
-        x_sum = sum(range(n))
-        y_sum = sum(recent_prices)
-        xy_sum = sum(i * recent_prices[i] for i in range(n))
-        x2_sum = sum(i * i for i in range(n))
-        
-        # 기울기 계산
-        slope = (n * xy_sum - x_sum * y_sum) / (n * x2_sum - x_sum * x_sum) if (n * x2_sum - x_sum * x_sum) != 0 else 0
-        
-        # 절편 계산
-        intercept = (y_sum - slope * x_sum) / n
-        
-        # 현재 시점의 트렌드라인 값
-        trendline_value = slope * (n - 1) + intercept
-        
-        return trendline_value
+        # 최근 20개 데이터로 간단한 선형회귀, 현재 시점의 트렌드라인 값
+        return last(ArrayIndicators.linear_trend(np.asarray(prices)[-20:], 20))
     
     @staticmethod
     def calculate_fibonacci_levels(high: float, low: float) -> Dict[str, float]:
@@ -0,0 +1,280 @@
+# 주간 패턴 분석 백그라운드 작업 큐
+# 요청은 작업 ID를 즉시 받고, 제한된 수의 워커가 집계와 LLM 분석을 실행한다.
+# 서버 오류(5xx)는 지수 백오프로 재시도하고 (토큰 예산 초과는 재시도하지 않음), 작업 상태는 프로세스 메모리에 보관한다.
+# 분석 결과는 동시에 끝난 작업끼리 모아 save_weekly_analyses 한 번으로 저장한다.
+import asyncio
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from database import SessionLocal
+from pattern_analyzers import TokenBudgetExceededError
+from pattern_storage import SAVE_CHUNK_SIZE, WeeklyAnalysisRow, save_weekly_analyses
+from schemas import AnalysisJobResponse, WeeklyAnalysisResponse
+from weekly_analysis import run_weekly_analysis
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "4"))
+ANALYSIS_MAX_ATTEMPTS = int(os.getenv("ANALYSIS_MAX_ATTEMPTS", "3"))
+ANALYSIS_RETRY_DELAY = float(os.getenv("ANALYSIS_RETRY_DELAY", "5"))  # 초, 재시도마다 2배
+MAX_RETAINED_JOBS = 10000
+# 분석 결과를 모아 저장하기까지 기다리는 시간 (초)
+ANALYSIS_SAVE_DELAY = float(os.getenv("ANALYSIS_SAVE_DELAY", "0.05"))
+
+Runner = Callable[[str, date, date], Awaitable[WeeklyAnalysisResponse]]
+
+
+def _save_with_session(rows: List[WeeklyAnalysisRow]) -> Dict[Tuple[str, date, date], int]:
+    db = SessionLocal()
+    try:
+        return save_weekly_analyses(db, rows)
+    finally:
+        db.close()
+
+
+class AnalysisResultSaver:
+    """
+    여러 작업의 분석 결과를 모아 save_weekly_analyses 한 번으로 저장
+
+    저장 요청은 delay초 동안(또는 max_batch건이 찰 때까지) 모았다가 함께 저장하고,
+    각 요청은 자기 summary_id를 받는다. 저장에 실패하면 모은 요청 모두 None을 받는다.
+    """
+
+    def __init__(
+        self,
+        writer: Callable[[List[WeeklyAnalysisRow]], Dict[Tuple[str, date, date], int]] = _save_with_session,
+        delay: float = ANALYSIS_SAVE_DELAY,
+        max_batch: int = SAVE_CHUNK_SIZE,
+    ):
+        self._writer = writer
+        self._delay = delay
+        self._max_batch = max_batch
+        self._pending: List[Tuple[WeeklyAnalysisRow, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+        self.batches = 0
+
+    async def save(self, user_id: str, start_date: date, end_date: date, result: Dict) -> Optional[int]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((user_id, start_date, end_date, result), future))
+        if len(self._pending) >= self._max_batch:
+            self._spawn(self._flush())
+        elif self._timer is None:
+            self._timer = self._spawn(self._flush_later())
+        return await future
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+        return task
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self._delay)
+        self._timer = None
+        await self._flush()
+
+    async def _flush(self) -> None:
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        try:
+            summary_ids = await run_in_threadpool(self._writer, [row for row, _ in batch])
+        except Exception as e:
+            logger.error(f"주간 분석 결과 일괄 저장 실패 ({len(batch)}건): {e}")
+            summary_ids = {}
+        for (user_id, start_date, end_date, _), future in batch:
+            if not future.done():
+                future.set_result(summary_ids.get((_normalize_user_id(user_id), start_date, end_date)))
+
+
+def _normalize_user_id(user_id: str) -> str:
+    # save_weekly_analyses가 반환하는 키 형식 (소문자 하이픈 UUID)
+    try:
+        return str(uuid.UUID(str(user_id)))
+    except ValueError:
+        return str(user_id)
+
+
+# 백그라운드 작업 공용 결과 저장기
+analysis_saver = AnalysisResultSaver()
+
+
+async def _run_with_session(user_id: str, start_date: date, end_date: date) -> WeeklyAnalysisResponse:
+    """작업마다 새 DB 세션으로 주간 분석 실행 (결과 저장은 다른 작업과 모아서 한 번에)"""
+    db = SessionLocal()
+    try:
+        return await run_weekly_analysis(db, user_id, start_date, end_date, save=analysis_saver.save)
+    finally:
+        db.close()
+
+
+class AnalysisJob:
+    """주간 분석 작업 상태"""
+
+    def __init__(self, user_id: str, start_date: date, end_date: date):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.status = "queued"  # queued, running, retrying, succeeded, failed
+        self.attempts = 0
+        self.result: Optional[WeeklyAnalysisResponse] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.updated_at = self.created_at
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_response(self) -> AnalysisJobResponse:
+        return AnalysisJobResponse(
+            job_id=self.id,
+            status=self.status,
+            user_id=self.user_id,
+            start=self.start_date.isoformat(),
+            end=self.end_date.isoformat(),
+            attempts=self.attempts,
+            result=self.result,
+            error=self.error,
+            created_at=self.created_at.isoformat(),
+            updated_at=self.updated_at.isoformat(),
+        )
+
+
+class AnalysisJobQueue:
+    """제한된 워커 풀로 주간 분석 작업을 실행하는 큐"""
+
+    def __init__(
+        self,
+        workers: int = ANALYSIS_WORKERS,
+        max_attempts: int = ANALYSIS_MAX_ATTEMPTS,
+        retry_delay: float = ANALYSIS_RETRY_DELAY,
+        runner: Runner = _run_with_session,
+    ):
+        self._workers = workers
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._runner = runner
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        # 같은 사용자/기간의 진행 중 작업 (중복 제출 시 재사용)
+        self._active: Dict[tuple, AnalysisJob] = {}
+
+    async def start(self) -> None:
+        """워커 시작 (이미 실행 중이면 무시)"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self._workers)]
+        # 워커 시작 전에 제출된 작업
+        for job in self._jobs.values():
+            if job.status == "queued":
+                self._queue.put_nowait(job)
+        logger.info(f"주간 분석 작업 워커 시작: {self._workers}개")
+
+    async def stop(self) -> None:
+        """워커 종료 (진행 중 작업은 취소)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def submit(self, user_id: str, start_date: date, end_date: date) -> AnalysisJob:
+        """작업 등록 (같은 사용자/기간 작업이 진행 중이면 그 작업 반환)"""
+        key = (user_id, start_date, end_date)
+        active = self._active.get(key)
+        if active is not None and not active.finished:
+            return active
+
+        job = AnalysisJob(user_id, start_date, end_date)
+        self._jobs[job.id] = job
+        self._active[key] = job
+        self._evict_finished()
+        if self._queue is not None:
+            self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[AnalysisJob]:
+        return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        """상태별 작업 수와 대기열 길이"""
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        counts["pending"] = self._queue.qsize() if self._queue is not None else 0
+        return counts
+
+    def _evict_finished(self) -> None:
+        """보관 한도를 넘으면 오래된 완료 작업부터 삭제"""
+        if len(self._jobs) <= MAX_RETAINED_JOBS:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.finished]:
+            del self._jobs[job_id]
+            if len(self._jobs) <= MAX_RETAINED_JOBS:
+                break
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: AnalysisJob) -> None:
+        while True:
+            job.attempts += 1
+            job.status = "running"
+            job.updated_at = datetime.utcnow()
+            try:
+                job.result = await self._runner(job.user_id, job.start_date, job.end_date)
+                job.status = "succeeded"
+                job.error = None
+            except asyncio.CancelledError:
+                job.status = "failed"
+                job.error = "서버 종료로 작업이 취소되었습니다."
+                raise
+            except Exception as e:
+                # 잘못된 요청/데이터 없음/예산 초과(4xx)는 재시도해도 결과가 같음
+                if isinstance(e, HTTPException):
+                    retryable = e.status_code >= 500
+                else:
+                    retryable = not isinstance(e, TokenBudgetExceededError)
+                job.error = e.detail if isinstance(e, HTTPException) else str(e)
+                if retryable and job.attempts < self._max_attempts:
+                    job.status = "retrying"
+                    job.updated_at = datetime.utcnow()
+                    logger.warning(f"주간 분석 작업 재시도 예정: job_id={job.id}, 시도={job.attempts}, 오류={job.error}")
+                    await asyncio.sleep(self._retry_delay * 2 ** (job.attempts - 1))
+                    continue
+                job.status = "failed"
+                logger.error(f"주간 분석 작업 실패: job_id={job.id}, 시도={job.attempts}, 오류={job.error}")
+            finally:
+                job.updated_at = datetime.utcnow()
+                if job.finished:
+                    self._release(job)
+            return
+
+    def _release(self, job: AnalysisJob) -> None:
+        """끝난 작업을 진행 중 목록에서 제거 (같은 키로 새 작업이 등록됐으면 유지)"""
+        key = (job.user_id, job.start_date, job.end_date)
+        if self._active.get(key) is job:
+            del self._active[key]
+
+
+# 전역 작업 큐
+analysis_jobs = AnalysisJobQueue()
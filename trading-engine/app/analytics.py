@@ -1,6 +1,6 @@
 # 주간 거래 데이터 분석 및 집계 기능
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 import csv
@@ -13,38 +13,115 @@ def get_week_period_dates(start_date: date, end_date: date) -> Tuple[date, date]
     prev_start = prev_end - timedelta(days=period_length)
     return prev_start, prev_end
 
-def aggregate_strategy_performance(db: Session, user_id: str, start_date: date, end_date: date) -> str:
-    """전략별 성과 집계 및 CSV 문자열 생성"""
-    query = text("""
-        SELECT 
-            trading_type as strategy,
-            COUNT(*) as total_trades,
-            COUNT(CASE WHEN pnl > 0 THEN 1 END) as winning_trades,
-            ROUND(AVG(CASE WHEN pnl > 0 THEN pnl ELSE NULL END)::numeric, 2) as avg_win,
-            ROUND(AVG(CASE WHEN pnl <= 0 THEN pnl ELSE NULL END)::numeric, 2) as avg_loss,
-            ROUND(AVG(pnl)::numeric, 2) as avg_pnl,
-            ROUND(SUM(pnl)::numeric, 2) as total_pnl,
-            ROUND(AVG(final_score), 1) as avg_score
-        FROM trades 
-        WHERE user_id::text = :user_id 
-        AND DATE(entry_time) BETWEEN :start_date AND :end_date
-        AND trading_type IS NOT NULL
-        GROUP BY trading_type
-        ORDER BY total_trades DESC
-    """)
-    
-    result = db.execute(query, {
-        "user_id": user_id, 
-        "start_date": start_date, 
-        "end_date": end_date
+# 전략별/시간대별/전체 집계(GROUPING SETS)와 금기룰 위반 집계를 두 기간에 대해 한 번에 계산
+# 원본 trades 대신 일별 집계 테이블(trades_daily_rollup)을 읽으므로 비용이 거래 수가 아니라 일수에 비례한다
+PERIOD_AGGREGATES_QUERY = text("""
+    WITH scoped AS (
+        SELECT
+            trading_type, hour as hour_of_day, violations,
+            trade_count, pnl_count, pnl_sum, win_count, win_pnl_sum, loss_count, loss_pnl_sum, score_count, score_sum,
+            CASE WHEN day >= :start_day THEN 'this' ELSE 'last' END as period
+        FROM trades_daily_rollup
+        WHERE user_id = CAST(:user_id AS uuid)
+        AND day >= :range_start AND day < :end_day
+    )
+    SELECT
+        CASE
+            WHEN GROUPING(trading_type) = 0 THEN 'strategy'
+            WHEN GROUPING(hour_of_day) = 0 THEN 'time'
+            ELSE 'total'
+        END as section,
+        period,
+        trading_type as strategy,
+        hour_of_day,
+        NULL::text as rule_code,
+        SUM(trade_count) as total_trades,
+        SUM(win_count) as winning_trades,
+        ROUND((SUM(win_pnl_sum) / NULLIF(SUM(win_count), 0))::numeric, 2) as avg_win,
+        ROUND((SUM(loss_pnl_sum) / NULLIF(SUM(loss_count), 0))::numeric, 2) as avg_loss,
+        ROUND((SUM(pnl_sum) / NULLIF(SUM(pnl_count), 0))::numeric, 2) as avg_pnl,
+        CASE WHEN SUM(pnl_count) > 0 THEN ROUND(SUM(pnl_sum)::numeric, 2) END as total_pnl,
+        ROUND((SUM(score_sum) / NULLIF(SUM(score_count), 0))::numeric, 1) as avg_score,
+        NULL::bigint as violation_count,
+        NULL::bigint as trades_with_violation,
+        NULL::numeric as avg_penalty,
+        NULL::numeric as total_penalty
+    FROM scoped
+    GROUP BY GROUPING SETS ((period, trading_type), (period, hour_of_day), (period))
+
+    UNION ALL
+
+    SELECT
+        'penalty', s.period, NULL, NULL, v.key,
+        NULL, NULL, NULL, NULL, NULL, NULL, NULL,
+        SUM((v.value->>'count')::bigint),
+        SUM((v.value->>'trades')::bigint),
+        ROUND(SUM((v.value->>'penalty_sum')::numeric) / NULLIF(SUM((v.value->>'penalty_count')::bigint), 0), 1),
+        ROUND(SUM((v.value->>'penalty_sum')::numeric), 1)
+    FROM scoped s
+    CROSS JOIN LATERAL jsonb_each(s.violations) as v
+    GROUP BY s.period, v.key
+""")
+
+def get_active_user_ids(db: Session, start_date: date, end_date: date) -> List[str]:
+    """기간 [start_date, end_date] 안에 거래가 있는 사용자 ID 목록 (일별 집계 테이블 기준)"""
+    result = db.execute(text("""
+        SELECT DISTINCT user_id
+        FROM trades_daily_rollup
+        WHERE day >= :start_day AND day < :end_day
+        ORDER BY user_id
+    """), {"start_day": start_date, "end_day": end_date + timedelta(days=1)}).fetchall()
+    return [str(row.user_id) for row in result]
+
+def fetch_period_aggregates(
+    db: Session,
+    user_id: str,
+    start_date: date,
+    end_date: date,
+    prev_start: Optional[date] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    기간 집계 조회 (일별 집계 테이블에서 단일 쿼리)
+
+    prev_start를 주면 [prev_start, start_date) 구간을 지난 기간('last')으로 함께 집계한다.
+    (get_week_period_dates처럼 두 기간이 이어져 있어야 한다)
+
+    Returns:
+        {'this'|'last': {'strategy': [...], 'time': [...], 'penalty': [...], 'total_trades': int}}
+        각 목록은 거래(위반) 수 내림차순이며, 시간대는 2건 이상인 것만 포함한다.
+    """
+    result = db.execute(PERIOD_AGGREGATES_QUERY, {
+        "user_id": user_id,
+        "start_day": start_date,
+        "end_day": end_date + timedelta(days=1),
+        "range_start": prev_start or start_date
     }).fetchall()
-    
-    # CSV 형식 문자열 생성
+
+    periods = {period: {"strategy": [], "time": [], "penalty": [], "total_trades": 0} for period in ("this", "last")}
+    for row in result:
+        bucket = periods[row.period]
+        if row.section == "total":
+            bucket["total_trades"] = row.total_trades
+        elif row.section == "strategy" and row.strategy is None:
+            continue
+        elif row.section == "time" and row.total_trades < 2:
+            continue  # 최소 2건 이상인 시간대만
+        else:
+            bucket[row.section].append(row)
+
+    for bucket in periods.values():
+        bucket["strategy"].sort(key=lambda r: r.total_trades, reverse=True)
+        bucket["time"].sort(key=lambda r: r.total_trades, reverse=True)
+        bucket["penalty"].sort(key=lambda r: r.violation_count, reverse=True)
+    return periods
+
+def format_strategy_csv(rows: List[Any]) -> str:
+    """전략별 성과 CSV 문자열 생성"""
     output = io.StringIO()
     writer = csv.writer(output)
     writer.writerow(['strategy', 'total_trades', 'winning_trades', 'win_rate', 'avg_win', 'avg_loss', 'avg_pnl', 'total_pnl', 'avg_score'])
     
-    for row in result:
+    for row in rows:
         win_rate = round((row.winning_trades / row.total_trades * 100), 1) if row.total_trades > 0 else 0
         writer.writerow([
             row.strategy, row.total_trades, row.winning_trades, f"{win_rate}%",
@@ -53,49 +130,13 @@ def aggregate_strategy_performance(db: Session, user_id: str, start_date: date,
     
     return output.getvalue().strip()
 
-def aggregate_penalty_violations(db: Session, user_id: str, start_date: date, end_date: date) -> str:
-    """금기룰 위반율 집계 및 CSV 문자열 생성"""
-    query = text("""
-        SELECT 
-            fv.rule_code,
-            COUNT(*) as violation_count,
-            COUNT(DISTINCT t.id) as trades_with_violation,
-            ROUND(AVG(fv.penalty_score), 1) as avg_penalty,
-            ROUND(SUM(fv.penalty_score), 1) as total_penalty
-        FROM trades t
-        CROSS JOIN LATERAL jsonb_array_elements(COALESCE(t.forbidden_violations, '[]'::jsonb)) as fv_data
-        JOIN LATERAL jsonb_to_record(fv_data) as fv(rule_code text, penalty_score numeric) ON true
-        WHERE t.user_id::text = :user_id 
-        AND DATE(t.entry_time) BETWEEN :start_date AND :end_date
-        GROUP BY fv.rule_code
-        ORDER BY violation_count DESC
-    """)
-    
-    result = db.execute(query, {
-        "user_id": user_id, 
-        "start_date": start_date, 
-        "end_date": end_date
-    }).fetchall()
-    
-    # 전체 거래 수 조회
-    total_trades_query = text("""
-        SELECT COUNT(*) as total 
-        FROM trades 
-        WHERE user_id::text = :user_id 
-        AND DATE(entry_time) BETWEEN :start_date AND :end_date
-    """)
-    total_trades = db.execute(total_trades_query, {
-        "user_id": user_id, 
-        "start_date": start_date, 
-        "end_date": end_date
-    }).scalar()
-    
-    # CSV 형식 문자열 생성
+def format_penalty_csv(rows: List[Any], total_trades: int) -> str:
+    """금기룰 위반율 CSV 문자열 생성"""
     output = io.StringIO()
     writer = csv.writer(output)
     writer.writerow(['rule_code', 'violation_count', 'trades_with_violation', 'violation_rate', 'avg_penalty', 'total_penalty'])
     
-    for row in result:
+    for row in rows:
         violation_rate = round((row.trades_with_violation / total_trades * 100), 1) if total_trades > 0 else 0
         writer.writerow([
             row.rule_code, row.violation_count, row.trades_with_violation, 
@@ -104,36 +145,13 @@ def aggregate_penalty_violations(db: Session, user_id: str, start_date: date, en
     
     return output.getvalue().strip()
 
-def aggregate_time_performance(db: Session, user_id: str, start_date: date, end_date: date) -> str:
-    """시간대별 성과 집계 및 CSV 문자열 생성"""
-    query = text("""
-        SELECT 
-            EXTRACT(HOUR FROM entry_time) as hour_of_day,
-            COUNT(*) as total_trades,
-            COUNT(CASE WHEN pnl > 0 THEN 1 END) as winning_trades,
-            ROUND(AVG(pnl)::numeric, 2) as avg_pnl,
-            ROUND(SUM(pnl)::numeric, 2) as total_pnl,
-            ROUND(AVG(final_score), 1) as avg_score
-        FROM trades 
-        WHERE user_id::text = :user_id 
-        AND DATE(entry_time) BETWEEN :start_date AND :end_date
-        GROUP BY EXTRACT(HOUR FROM entry_time)
-        HAVING COUNT(*) >= 2  -- 최소 2건 이상인 시간대만
-        ORDER BY total_trades DESC
-    """)
-    
-    result = db.execute(query, {
-        "user_id": user_id, 
-        "start_date": start_date, 
-        "end_date": end_date
-    }).fetchall()
-    
-    # CSV 형식 문자열 생성
+def format_time_csv(rows: List[Any]) -> str:
+    """시간대별 성과 CSV 문자열 생성"""
     output = io.StringIO()
     writer = csv.writer(output)
     writer.writerow(['hour_of_day', 'total_trades', 'winning_trades', 'win_rate', 'avg_pnl', 'total_pnl', 'avg_score'])
     
-    for row in result:
+    for row in rows:
         win_rate = round((row.winning_trades / row.total_trades * 100), 1) if row.total_trades > 0 else 0
         writer.writerow([
             f"{int(row.hour_of_day):02d}:00", row.total_trades, row.winning_trades, 
@@ -142,24 +160,31 @@ def aggregate_time_performance(db: Session, user_id: str, start_date: date, end_
     
     return output.getvalue().strip()
 
+def aggregate_strategy_performance(db: Session, user_id: str, start_date: date, end_date: date) -> str:
+    """전략별 성과 집계 및 CSV 문자열 생성"""
+    return format_strategy_csv(fetch_period_aggregates(db, user_id, start_date, end_date)["this"]["strategy"])
+
+def aggregate_penalty_violations(db: Session, user_id: str, start_date: date, end_date: date) -> str:
+    """금기룰 위반율 집계 및 CSV 문자열 생성"""
+    period = fetch_period_aggregates(db, user_id, start_date, end_date)["this"]
+    return format_penalty_csv(period["penalty"], period["total_trades"])
+
+def aggregate_time_performance(db: Session, user_id: str, start_date: date, end_date: date) -> str:
+    """시간대별 성과 집계 및 CSV 문자열 생성"""
+    return format_time_csv(fetch_period_aggregates(db, user_id, start_date, end_date)["this"]["time"])
+
 def generate_weekly_analysis_data(db: Session, user_id: str, start_date: date, end_date: date) -> Dict[str, str]:
-    """주간 분석을 위한 모든 집계 데이터 생성"""
-    # 이번 주 데이터
-    this_week_strategy = aggregate_strategy_performance(db, user_id, start_date, end_date)
-    this_week_penalty = aggregate_penalty_violations(db, user_id, start_date, end_date)
-    this_week_time = aggregate_time_performance(db, user_id, start_date, end_date)
-    
-    # 지난 주 데이터 (동일 기간 길이)
-    prev_start, prev_end = get_week_period_dates(start_date, end_date)
-    last_week_strategy = aggregate_strategy_performance(db, user_id, prev_start, prev_end)
-    last_week_penalty = aggregate_penalty_violations(db, user_id, prev_start, prev_end)
-    last_week_time = aggregate_time_performance(db, user_id, prev_start, prev_end)
+    """주간 분석을 위한 모든 집계 데이터 생성 (이번 주와 지난 주를 한 번의 쿼리로 집계)"""
+    # 지난 주 기간 (동일 기간 길이, 이번 주 바로 앞)
+    prev_start, _ = get_week_period_dates(start_date, end_date)
+    periods = fetch_period_aggregates(db, user_id, start_date, end_date, prev_start)
+    this_week, last_week = periods["this"], periods["last"]
     
     return {
-        "this_week_strategy_csv": this_week_strategy,
-        "this_week_penalty_csv": this_week_penalty,
-        "this_week_time_csv": this_week_time,
-        "last_week_strategy_csv": last_week_strategy,
-        "last_week_penalty_csv": last_week_penalty,
-        "last_week_time_csv": last_week_time
-    }
\ No newline at end of file
+        "this_week_strategy_csv": format_strategy_csv(this_week["strategy"]),
+        "this_week_penalty_csv": format_penalty_csv(this_week["penalty"], this_week["total_trades"]),
+        "this_week_time_csv": format_time_csv(this_week["time"]),
+        "last_week_strategy_csv": format_strategy_csv(last_week["strategy"]),
+        "last_week_penalty_csv": format_penalty_csv(last_week["penalty"], last_week["total_trades"]),
+        "last_week_time_csv": format_time_csv(last_week["time"])
+    }
@@ -0,0 +1,157 @@
+# 지표 커널 벤치마크
+# 기존 순수 파이썬 루프 구현과 ArrayIndicators 커널의 결과/속도를 비교한다.
+#
+# 실행: python benchmark_indicators.py [--sizes 1000 10000 100000] [--symbols 200]
+import argparse
+import math
+import time
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from indicator_kernels import ArrayIndicators, last
+
+
+# 기존 구현 (비교 기준)
+
+def legacy_rsi(prices: List[float], period: int = 14) -> float:
+    gains, losses = [], []
+    for i in range(1, len(prices)):
+        change = prices[i] - prices[i - 1]
+        gains.append(change if change > 0 else 0)
+        losses.append(0 if change > 0 else abs(change))
+    avg_gain = sum(gains[-period:]) / period
+    avg_loss = sum(losses[-period:]) / period
+    if avg_loss == 0:
+        return 100.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def legacy_macd_line(prices: List[float], fast: int = 12, slow: int = 26) -> float:
+    def ema(data: List[float], period: int) -> List[float]:
+        multiplier = 2 / (period + 1)
+        values = [data[0]]
+        for i in range(1, len(data)):
+            values.append((data[i] * multiplier) + (values[-1] * (1 - multiplier)))
+        return values
+    return ema(prices, fast)[-1] - ema(prices, slow)[-1]
+
+
+def legacy_stochastic_k(highs: List[float], lows: List[float], closes: List[float], k_period: int = 14) -> float:
+    highest, lowest = max(highs[-k_period:]), min(lows[-k_period:])
+    if highest == lowest:
+        return 50.0
+    return (closes[-1] - lowest) / (highest - lowest) * 100
+
+
+def legacy_support_resistance(highs: List[float], lows: List[float], period: int = 20) -> Tuple[List[float], List[float]]:
+    half = period // 2
+    supports = [lows[i] for i in range(half, len(lows) - half)
+                if all(lows[j] >= lows[i] for j in range(i - half, i + half + 1) if j != i)]
+    resistances = [highs[i] for i in range(half, len(highs) - half)
+                   if all(highs[j] <= highs[i] for j in range(i - half, i + half + 1) if j != i)]
+    return supports, resistances
+
+
+def legacy_atr(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
+    true_ranges = []
+    for i in range(1, len(highs)):
+        true_ranges.append(max(highs[i] - lows[i], abs(highs[i] - closes[i - 1]), abs(lows[i] - closes[i - 1])))
+    return sum(true_ranges[-period:]) / period
+
+
+def legacy_bollinger(prices: List[float], period: int = 20, std_dev: float = 2) -> Tuple[float, float, float]:
+    recent = prices[-period:]
+    sma = sum(recent) / period
+    std = (sum((p - sma) ** 2 for p in recent) / period) ** 0.5
+    return sma + std_dev * std, sma, sma - std_dev * std
+
+
+def make_bars(n: int, seed: int = 0) -> Dict[str, np.ndarray]:
+    """랜덤 워크 OHLCV 생성"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    spread = rng.uniform(0.1, 1.0, (2, n))
+    return {
+        "high": close + spread[0],
+        "low": close - spread[1],
+        "close": close,
+        "volume": rng.uniform(100, 200, n),
+    }
+
+
+def _timed(fn: Callable, repeat: int = 3) -> Tuple[float, object]:
+    best, result = math.inf, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _check(name: str, expected, actual, tol: float = 1e-8) -> None:
+    expected, actual = np.atleast_1d(expected), np.atleast_1d(actual)
+    if expected.shape != actual.shape or not np.allclose(expected, actual, rtol=tol, atol=tol):
+        raise AssertionError(f"{name} 결과 불일치: {expected[:5]} != {actual[:5]}")
+
+
+def run_size(n: int) -> None:
+    bars = make_bars(n)
+    highs, lows, closes = (bars[k].tolist() for k in ("high", "low", "close"))
+    cases = [
+        ("rsi", lambda: legacy_rsi(closes), lambda: last(ArrayIndicators.rsi(bars["close"], 14))),
+        ("macd", lambda: legacy_macd_line(closes), lambda: last(ArrayIndicators.macd(bars["close"])[0])),
+        ("stochastic", lambda: legacy_stochastic_k(highs, lows, closes),
+         lambda: last(ArrayIndicators.stochastic(bars["high"], bars["low"], bars["close"])[0])),
+        ("support/resistance", lambda: legacy_support_resistance(highs, lows),
+         lambda: (bars["low"][ArrayIndicators.local_extrema(bars["low"], 20)].tolist(),
+                  bars["high"][ArrayIndicators.local_extrema(bars["high"], 20, maximum=True)].tolist())),
+        ("atr", lambda: legacy_atr(highs, lows, closes),
+         lambda: last(ArrayIndicators.atr(bars["high"], bars["low"], bars["close"], 14))),
+        ("bollinger", lambda: legacy_bollinger(closes),
+         lambda: tuple(last(s) for s in ArrayIndicators.bollinger_bands(bars["close"], 20))),
+    ]
+
+    print(f"\n[{n:,}봉] 기존(마지막 값) vs 커널(전체 시리즈)")
+    for name, legacy_fn, kernel_fn in cases:
+        legacy_time, expected = _timed(legacy_fn)
+        kernel_time, actual = _timed(kernel_fn)
+        if name == "support/resistance":
+            _check(name + " 지지", expected[0], actual[0])
+            _check(name + " 저항", expected[1], actual[1])
+        else:
+            _check(name, expected, actual)
+        print(f"  {name:<20} 기존 {legacy_time * 1000:9.2f}ms  커널 {kernel_time * 1000:8.2f}ms  "
+              f"x{legacy_time / max(kernel_time, 1e-9):7.1f}")
+
+
+def run_batch(symbols: int, n: int) -> None:
+    universe = {f"SYM{i}": make_bars(n, seed=i) for i in range(symbols)}
+
+    def legacy_loop():
+        out = {}
+        for symbol, bars in universe.items():
+            highs, lows, closes = (bars[k].tolist() for k in ("high", "low", "close"))
+            out[symbol] = (legacy_rsi(closes), legacy_atr(highs, lows, closes), legacy_bollinger(closes))
+        return out
+
+    legacy_time, _ = _timed(legacy_loop)
+    batch_time, results = _timed(lambda: ArrayIndicators.compute_batch(universe))
+    assert len(results) == symbols
+    print(f"\n[배치] {symbols}개 심볼 x {n:,}봉: 기존 루프(3개 지표) {legacy_time * 1000:.1f}ms, "
+          f"compute_batch(전체 지표) {batch_time * 1000:.1f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="지표 커널 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--symbols", type=int, default=200)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        run_size(n)
+    run_batch(args.symbols, 1_000)
+
+
+if __name__ == "__main__":
+    main()
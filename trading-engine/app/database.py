@@ -1,15 +1,18 @@
 # 데이터베이스 연결 및 스키마 정의
-from sqlalchemy import create_engine, Column, BigInteger, UUID, Date, Text, DateTime, Integer, Float, ForeignKey, ARRAY
+from sqlalchemy import create_engine, Column, BigInteger, UUID, Date, Text, DateTime, Integer, Float, ForeignKey, ARRAY, Index, Sequence, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
+import logging
 import os
 from dotenv import load_dotenv
 
 # .env 로드 (셸 값을 .env로 덮어쓰기)
 load_dotenv(override=True)
 
+logger = logging.getLogger(__name__)
+
 # PostgreSQL 연결 설정
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://localhost:5432/trading_journal")
 
@@ -31,6 +34,11 @@ class PatternsSummaryWeekly(Base):
     summary_json = Column(JSONB, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # 사용자/기간당 한 건 (일괄 저장의 ON CONFLICT 대상)
+        Index("uq_patterns_summary_weekly_user_period", "user_id", "period_start", "period_end", unique=True),
+    )
+
 class PatternHistory(Base):
     """패턴 히스토리 테이블"""
     __tablename__ = "pattern_history"
@@ -46,6 +54,13 @@ class PatternHistory(Base):
     summary_id = Column(BigInteger, ForeignKey("patterns_summary_weekly.id"))
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        # 사용자/기간/패턴 타입당 한 건 (일괄 저장의 ON CONFLICT 대상)
+        Index("uq_pattern_history_user_period_type", "user_id", "period_start", "period_end", "pattern_type", unique=True),
+        # 히스토리 키셋 페이지네이션용 (period_end, id 내림차순)
+        Index("ix_pattern_history_user_type_period_end", "user_id", "pattern_type", period_end.desc(), id.desc()),
+    )
+
 
 class TradeModel(Base):
     """거래 기록 테이블"""
@@ -73,10 +88,131 @@ class TradeModel(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # 목록 키셋 페이지네이션 및 사용자별 기간 조회용 (entry_time, id 내림차순)
+        Index("ix_trades_user_entry_time_id", "user_id", entry_time.desc(), id.desc()),
+        Index("ix_trades_entry_time_id", entry_time.desc(), id.desc()),
+    )
+
+# 거래 ID 시퀀스 (단건/일괄 등록 공용, 저장 전에 ID를 받아 응답과 스코어링에 사용)
+TRADE_ID_SEQUENCE = Sequence("trade_id_seq", metadata=Base.metadata)
+
+class TradesDailyRollup(Base):
+    """사용자별 일/전략/시간대 거래 집계 테이블 (거래 저장 시 증분 갱신, trade_rollup.py로 재구축)"""
+    __tablename__ = "trades_daily_rollup"
+
+    user_id = Column(UUID, primary_key=True)
+    day = Column(Date, primary_key=True)  # entry_time 기준 날짜
+    trading_type = Column(Text, primary_key=True)
+    hour = Column(Integer, primary_key=True)  # entry_time 기준 시간(0~23)
+    trade_count = Column(Integer, nullable=False, default=0)
+    pnl_count = Column(Integer, nullable=False, default=0)  # pnl이 있는 거래 수
+    pnl_sum = Column(Float, nullable=False, default=0.0)
+    win_count = Column(Integer, nullable=False, default=0)  # pnl > 0
+    win_pnl_sum = Column(Float, nullable=False, default=0.0)
+    loss_count = Column(Integer, nullable=False, default=0)  # pnl <= 0
+    loss_pnl_sum = Column(Float, nullable=False, default=0.0)
+    score_count = Column(Integer, nullable=False, default=0)  # final_score가 있는 거래 수
+    score_sum = Column(Float, nullable=False, default=0.0)
+    # 금기룰별 위반 집계 {rule_code: {count, trades, penalty_sum, penalty_count}}
+    violations = Column(JSONB, nullable=False, default=dict)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class LlmAnalysisCache(Base):
+    """LLM 패턴 분석 결과 캐시 테이블 (입력 해시 기반, 만료 시각 이후 삭제)"""
+    __tablename__ = "llm_analysis_cache"
+
+    cache_key = Column(Text, primary_key=True)  # SHA-256(모델, 프롬프트 버전, 프롬프트)
+    model = Column(Text, nullable=False)
+    prompt_version = Column(Text, nullable=False)
+    result_json = Column(JSONB, nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
 # 테이블 생성
+# 스키마 생성 직렬화용 advisory lock 키 (여러 워커가 동시에 시작해도 DDL은 한 번에 하나씩)
+SCHEMA_LOCK_KEY = 7_342_019
+_tables_created = False
+
+# 유니크 인덱스를 기존 테이블에 추가하기 전에 실행할 중복 정리 (키마다 가장 최근 id만 남김)
+UNIQUE_INDEX_DEDUPE = {
+    "uq_patterns_summary_weekly_user_period": [
+        # 지워질 요약을 가리키는 히스토리는 남는 요약으로 옮김
+        """
+        UPDATE pattern_history h SET summary_id = k.keep_id
+        FROM (
+            SELECT id, MAX(id) OVER (PARTITION BY user_id, period_start, period_end) AS keep_id
+            FROM patterns_summary_weekly
+        ) k
+        WHERE h.summary_id = k.id AND k.id <> k.keep_id
+        """,
+        """
+        DELETE FROM patterns_summary_weekly s USING patterns_summary_weekly newer
+        WHERE s.user_id = newer.user_id AND s.period_start = newer.period_start
+          AND s.period_end = newer.period_end AND s.id < newer.id
+        """,
+    ],
+    "uq_pattern_history_user_period_type": [
+        """
+        DELETE FROM pattern_history h USING pattern_history newer
+        WHERE h.user_id = newer.user_id AND h.period_start = newer.period_start
+          AND h.period_end = newer.period_end AND h.pattern_type = newer.pattern_type AND h.id < newer.id
+        """,
+    ],
+}
+
+def _dedupe_for_unique_index(conn, index: Index) -> None:
+    """기존 테이블에 유니크 인덱스를 처음 만들 때 중복 행 정리 (중복이 있으면 인덱스 생성이 실패함)"""
+    statements = UNIQUE_INDEX_DEDUPE.get(index.name)
+    if not statements:
+        return
+    existing = {i["name"] for i in inspect(conn).get_indexes(index.table.name)}
+    if index.name in existing:
+        return
+    removed = 0
+    for statement in statements:
+        result = conn.execute(text(statement))
+        if statement.lstrip().startswith("DELETE"):
+            removed += result.rowcount
+    if removed:
+        logger.warning(f"유니크 인덱스 {index.name} 생성 전 중복 행 {removed}건 삭제 (키마다 최근 행 유지)")
+
 def create_tables():
-    """데이터베이스 테이블 생성"""
-    Base.metadata.create_all(bind=engine)
+    """
+    데이터베이스 테이블 생성 (기존 테이블에 없는 인덱스도 추가, 유니크 인덱스는 중복 행을 먼저 정리)
+
+    일별 거래 집계 테이블이 비어 있으면 trades로 채운다.
+
+    같은 프로세스에서는 한 번만 실행하고, 프로세스 간에는 advisory lock으로 직렬화한다.
+    """
+    global _tables_created
+    if _tables_created:
+        return
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+        Base.metadata.create_all(bind=conn)
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                _dedupe_for_unique_index(conn, index)
+                index.create(bind=conn, checkfirst=True)
+        # 시퀀스 도입 전 시각 기반 ID보다 큰 값부터 발급
+        conn.execute(text("""
+            SELECT setval('trade_id_seq', GREATEST(
+                (SELECT COALESCE(MAX(id), 0) FROM trades),
+                (SELECT last_value FROM trade_id_seq)
+            ))
+        """))
+        # 집계 테이블 도입 전 거래 백필 (trade_rollup이 이 모듈을 import하므로 여기서 import)
+        from trade_rollup import backfill_rollup_if_empty
+        backfill_rollup_if_empty(conn)
+    _tables_created = True
+
+def create_tables_on_startup():
+    """서버 시작 시 테이블 생성 (실행기가 워커 시작 전에 이미 생성했으면 SKIP_CREATE_TABLES=1로 생략)"""
+    if os.getenv("SKIP_CREATE_TABLES") == "1":
+        return
+    create_tables()
 
 # DB 세션 의존성
 def get_db():
@@ -0,0 +1,237 @@
+# 배열 기반 기술적 지표 커널
+# 모든 커널은 (봉 수,) 또는 (봉 수, 심볼 수) 배열을 받아 같은 모양의 전체 시리즈를 반환한다.
+# 데이터가 부족한 구간은 NaN으로 채운다.
+from typing import Dict, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+def _as_array(values: ArrayLike) -> np.ndarray:
+    """입력을 float64 배열로 변환"""
+    return np.asarray(values, dtype=np.float64)
+
+
+def _rolling(values: np.ndarray, period: int, reducer) -> np.ndarray:
+    """
+    길이 period 윈도우 집계 (sliding_window_view, 복사 없음)
+
+    윈도우에 NaN이 있으면 결과도 NaN이다 (pandas rolling, min_periods=period와 동일).
+    """
+    out = np.full(values.shape, np.nan)
+    if len(values) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(values, period, axis=0)
+        out[period - 1:] = reducer(windows, axis=-1)
+    return out
+
+
+def _frame(values: np.ndarray) -> pd.DataFrame:
+    """시간 축이 0번 축인 DataFrame (1차원 입력은 열 하나)"""
+    return pd.DataFrame(values.reshape(len(values), -1))
+
+
+def _like(result: pd.DataFrame, values: np.ndarray) -> np.ndarray:
+    """입력과 같은 차원의 배열로 되돌림"""
+    out = result.to_numpy(copy=True)
+    return out[:, 0] if values.ndim == 1 else out
+
+
+def last(series: np.ndarray, default: float = 0.0) -> Union[float, np.ndarray]:
+    """시리즈의 마지막 값 (NaN이면 default, 2차원이면 심볼별 배열)"""
+    if len(series) == 0:
+        return default
+    value = series[-1]
+    if np.ndim(value) == 0:
+        return default if np.isnan(value) else float(value)
+    return np.where(np.isnan(value), default, value)
+
+
+class ArrayIndicators:
+    """NumPy 배열 기반 기술적 지표 커널"""
+
+    @staticmethod
+    def sma(prices: ArrayLike, period: int) -> np.ndarray:
+        """단순 이동평균"""
+        return _rolling(_as_array(prices), period, np.mean)
+
+    @staticmethod
+    def rolling_std(prices: ArrayLike, period: int) -> np.ndarray:
+        """이동 표준편차 (모집단, ddof=0)"""
+        return _rolling(_as_array(prices), period, np.std)
+
+    @staticmethod
+    def rolling_max(values: ArrayLike, period: int) -> np.ndarray:
+        """이동 최댓값"""
+        return _rolling(_as_array(values), period, np.max)
+
+    @staticmethod
+    def rolling_min(values: ArrayLike, period: int) -> np.ndarray:
+        """이동 최솟값"""
+        return _rolling(_as_array(values), period, np.min)
+
+    @staticmethod
+    def ema(prices: ArrayLike, period: int) -> np.ndarray:
+        """지수 이동평균 (첫 값으로 시작하는 재귀식, adjust=False - 재귀식이므로 pandas C 구현 사용)"""
+        values = _as_array(prices)
+        return _like(_frame(values).ewm(alpha=2 / (period + 1), adjust=False).mean(), values)
+
+    @staticmethod
+    def rsi(prices: ArrayLike, period: int = 14) -> np.ndarray:
+        """
+        RSI (최근 period개 상승/하락폭의 단순 평균)
+
+        i번째 값은 i번째 봉까지의 변화량으로 계산하며, 평균 하락폭이 0이면 100이다.
+        """
+        values = _as_array(prices)
+        change = np.full(values.shape, np.nan)
+        change[1:] = np.diff(values, axis=0)
+        gains = _rolling(np.where(change > 0, change, 0.0), period, np.mean)
+        losses = _rolling(np.where(change < 0, -change, 0.0), period, np.mean)
+        gains[:period] = np.nan
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - 100 / (1 + gains / losses)
+        return np.where((losses == 0) & ~np.isnan(gains), 100.0, rsi)
+
+    @staticmethod
+    def macd(prices: ArrayLike, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """MACD (MACD 라인, 시그널 라인(MACD의 EMA), 히스토그램)"""
+        values = _as_array(prices)
+        macd_line = ArrayIndicators.ema(values, fast) - ArrayIndicators.ema(values, slow)
+        signal_line = ArrayIndicators.ema(macd_line, signal)
+        macd_line[:slow - 1] = np.nan
+        signal_line[:slow - 1] = np.nan
+        return macd_line, signal_line, macd_line - signal_line
+
+    @staticmethod
+    def stochastic(highs: ArrayLike, lows: ArrayLike, closes: ArrayLike, k_period: int = 14, d_period: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+        """스토캐스틱 (%K, %K의 d_period 이동평균 %D), 고가=저가 구간은 50"""
+        closes = _as_array(closes)
+        highest = ArrayIndicators.rolling_max(highs, k_period)
+        lowest = ArrayIndicators.rolling_min(lows, k_period)
+        span = highest - lowest
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = np.where(span == 0, 50.0, (closes - lowest) / span * 100)
+        return k, ArrayIndicators.sma(k, d_period)
+
+    @staticmethod
+    def true_range(highs: ArrayLike, lows: ArrayLike, closes: ArrayLike) -> np.ndarray:
+        """True Range (첫 봉은 이전 종가가 없으므로 NaN)"""
+        highs, lows, closes = _as_array(highs), _as_array(lows), _as_array(closes)
+        tr = np.full(highs.shape, np.nan)
+        prev_close = closes[:-1]
+        tr[1:] = np.maximum.reduce([
+            highs[1:] - lows[1:],
+            np.abs(highs[1:] - prev_close),
+            np.abs(lows[1:] - prev_close),
+        ])
+        return tr
+
+    @staticmethod
+    def atr(highs: ArrayLike, lows: ArrayLike, closes: ArrayLike, period: int = 14) -> np.ndarray:
+        """ATR (True Range 단순 이동평균)"""
+        return ArrayIndicators.sma(ArrayIndicators.true_range(highs, lows, closes), period)
+
+    @staticmethod
+    def bollinger_bands(prices: ArrayLike, period: int = 20, std_dev: float = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """볼린저 밴드 (상단, 중단, 하단)"""
+        middle = ArrayIndicators.sma(prices, period)
+        std = ArrayIndicators.rolling_std(prices, period)
+        return middle + std_dev * std, middle, middle - std_dev * std
+
+    @staticmethod
+    def linear_trend(prices: ArrayLike, period: int = 20) -> np.ndarray:
+        """최근 period개 종가 선형회귀선의 마지막 시점 값"""
+        values = _as_array(prices)
+        x = np.arange(period, dtype=np.float64)
+        x_centered = x - x.mean()
+        denom = (x_centered ** 2).sum()
+
+        out = np.full(values.shape, np.nan)
+        if len(values) >= period:
+            windows = np.lib.stride_tricks.sliding_window_view(values, period, axis=0)
+            mean = windows.mean(axis=-1)
+            slope = (windows * x_centered).sum(axis=-1) / denom
+            out[period - 1:] = mean + slope * (period - 1 - x.mean())
+        return out
+
+    @staticmethod
+    def local_extrema(values: ArrayLike, period: int = 20, maximum: bool = False) -> np.ndarray:
+        """
+        중심 윈도우(좌우 period//2봉)의 극값인 위치 마스크
+
+        maximum=False면 저점(지지), True면 고점(저항)을 찾는다.
+        """
+        values = _as_array(values)
+        half = period // 2
+        mask = np.zeros(values.shape, dtype=bool)
+        if len(values) < 2 * half + 1:
+            return mask
+        windows = np.lib.stride_tricks.sliding_window_view(values, 2 * half + 1, axis=0)
+        extreme = windows.max(axis=-1) if maximum else windows.min(axis=-1)
+        mask[half:len(values) - half] = values[half:len(values) - half] == extreme
+        return mask
+
+    @staticmethod
+    def compute_all(bars: Mapping[str, ArrayLike]) -> Dict[str, np.ndarray]:
+        """
+        OHLCV 배열(open/high/low/close/volume)로 주요 지표 전체 시리즈 계산
+
+        배열이 (봉 수, 심볼 수) 모양이면 모든 심볼을 한 번에 계산한다.
+        """
+        closes, highs, lows = _as_array(bars["close"]), _as_array(bars["high"]), _as_array(bars["low"])
+        upper, middle, lower = ArrayIndicators.bollinger_bands(closes, 20)
+        macd_line, signal_line, histogram = ArrayIndicators.macd(closes)
+        stoch_k, stoch_d = ArrayIndicators.stochastic(highs, lows, closes)
+        series = {
+            "rsi": ArrayIndicators.rsi(closes, 14),
+            "macd": macd_line,
+            "macd_signal": signal_line,
+            "macd_histogram": histogram,
+            "stoch_k": stoch_k,
+            "stoch_d": stoch_d,
+            "atr": ArrayIndicators.atr(highs, lows, closes, 14),
+            "bollinger_upper": upper,
+            "bollinger_middle": middle,
+            "bollinger_lower": lower,
+            "sma_20": middle,
+            "range_high_20": ArrayIndicators.rolling_max(highs, 20),
+            "trendline": ArrayIndicators.linear_trend(closes, 20),
+        }
+        if "volume" in bars:
+            series["volume_sma_20"] = ArrayIndicators.sma(bars["volume"], 20)
+        return series
+
+    @staticmethod
+    def compute_batch(
+        symbol_bars: Mapping[str, Mapping[str, ArrayLike]],
+        include_series: bool = False,
+    ) -> Dict[str, Dict[str, Union[float, np.ndarray]]]:
+        """
+        여러 심볼의 지표를 한 번에 계산
+
+        길이가 같은 심볼끼리 (봉 수, 심볼 수) 배열로 묶어 커널을 한 번씩만 실행한다.
+
+        Returns:
+            {심볼: {지표: 마지막 값}} (include_series=True면 마지막 값 대신 전체 시리즈)
+        """
+        groups: Dict[int, list] = {}
+        for symbol, bars in symbol_bars.items():
+            groups.setdefault(len(bars["close"]), []).append(symbol)
+
+        results: Dict[str, Dict[str, Union[float, np.ndarray]]] = {}
+        for symbols in groups.values():
+            columns = [c for c in ("open", "high", "low", "close", "volume") if all(c in symbol_bars[s] for s in symbols)]
+            stacked = {
+                column: np.column_stack([_as_array(symbol_bars[s][column]) for s in symbols])
+                for column in columns
+            }
+            series = ArrayIndicators.compute_all(stacked)
+            for j, symbol in enumerate(symbols):
+                results[symbol] = {
+                    name: values[:, j] if include_series else last(values[:, j], np.nan)
+                    for name, values in series.items()
+                }
+        return results
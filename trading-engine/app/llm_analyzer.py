@@ -1,7 +1,8 @@
 # GPT-4o mini 호출 및 패턴 분석 기능
+import hashlib
 import json
 import os
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from openai import AsyncOpenAI
 from openai import APIConnectionError, APIStatusError, RateLimitError, AuthenticationError
 import logging
@@ -9,9 +10,20 @@ import logging
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
-# OpenAI API 클라이언트 설정
-_OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = AsyncOpenAI(api_key=_OPENAI_API_KEY)
+# OpenAI API 클라이언트 (첫 호출 시 생성 - 로컬 백엔드와 테스트는 API 키 없이 import 가능)
+_client: Optional[AsyncOpenAI] = None
+
+def get_client() -> AsyncOpenAI:
+    """OpenAI 클라이언트 (OPENAI_API_KEY가 없으면 openai.OpenAIError)"""
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
+
+LLM_MODEL = "gpt-4o-mini"
+MAX_COMPLETION_TOKENS = 1500
+# 프롬프트(시스템/사용자 템플릿)나 응답 형식을 바꾸면 올려서 이전 캐시 결과를 무효화
+PROMPT_VERSION = "weekly-v1"
 
 SYSTEM_PROMPT = """
 너는 트레이딩 성과 분석 전문가다.
@@ -64,24 +76,52 @@ def create_user_prompt(analysis_data: Dict[str, str]) -> str:
 을 JSON 형식으로 작성하라.
 """
 
+def analysis_cache_key(analysis_data: Dict[str, str], model: str = LLM_MODEL) -> str:
+    """분석 입력(사용자 프롬프트), 모델, 프롬프트 버전으로 만든 캐시 키 (SHA-256)"""
+    payload = json.dumps({
+        "model": model,
+        "prompt_version": PROMPT_VERSION,
+        "system": SYSTEM_PROMPT,
+        "user": create_user_prompt(analysis_data),
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 async def analyze_patterns_with_gpt(analysis_data: Dict[str, str], max_retries: int = 1) -> Optional[Dict]:
     """GPT-4o mini를 사용하여 패턴 분석 수행"""
+    result, _, _ = await request_pattern_analysis(analysis_data, max_retries)
+    return result
+
+async def request_pattern_analysis(
+    analysis_data: Dict[str, str],
+    max_retries: int = 1,
+    model: str = LLM_MODEL
+) -> Tuple[Optional[Dict], int, int]:
+    """
+    GPT 패턴 분석 호출
+
+    Returns:
+        (분석 결과 - 실패 시 None, 사용한 프롬프트 토큰 수, 사용한 응답 토큰 수 - 재시도 포함)
+    """
     user_prompt = create_user_prompt(analysis_data)
+    prompt_tokens = completion_tokens = 0
     
     for attempt in range(max_retries + 1):
         try:
             logger.info(f"GPT 호출 시도 {attempt + 1}/{max_retries + 1}")
             
-            response = await client.chat.completions.create(
-                model="gpt-4o-mini",
+            response = await get_client().chat.completions.create(
+                model=model,
                 messages=[
                     {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": user_prompt}
                 ],
                 response_format={"type": "json_object"},
                 temperature=0.3,
-                max_tokens=1500
+                max_tokens=MAX_COMPLETION_TOKENS
             )
+            if response.usage:
+                prompt_tokens += response.usage.prompt_tokens
+                completion_tokens += response.usage.completion_tokens
             
             # 응답 파싱
             content = response.choices[0].message.content.strip()
@@ -105,7 +145,7 @@ async def analyze_patterns_with_gpt(analysis_data: Dict[str, str], max_retries:
                         raise ValueError(f"패턴 '{pattern_key}'에 필수 키 '{req_key}'가 없음")
             
             logger.info("GPT 응답 검증 완료")
-            return result
+            return result, prompt_tokens, completion_tokens
             
         except (APIConnectionError, APIStatusError, RateLimitError, AuthenticationError) as e:
             error_msg = f"OpenAI API 오류 (시도 {attempt + 1}): {e}"
@@ -121,24 +161,24 @@ async def analyze_patterns_with_gpt(analysis_data: Dict[str, str], max_retries:
                 
             if attempt == max_retries:
                 logger.error("최대 재시도 횟수 초과. GPT 분석 실패")
-                return None
+                return None, prompt_tokens, completion_tokens
                 
         except json.JSONDecodeError as e:
             logger.error(f"JSON 파싱 오류 (시도 {attempt + 1}): {e}")
             logger.error(f"응답 내용: {content if 'content' in locals() else 'N/A'}")
             if attempt == max_retries:
                 logger.error("최대 재시도 횟수 초과. GPT 응답 형식 오류")
-                return None
+                return None, prompt_tokens, completion_tokens
                 
         except Exception as e:
             logger.error(f"알 수 없는 오류 (시도 {attempt + 1}): {e}")
             if attempt == max_retries:
                 logger.error("최대 재시도 횟수 초과. 시스템 오류")
-                return None
+                return None, prompt_tokens, completion_tokens
     
     # 한글 주석: 모든 재시도 실패 시 명확한 실패 로그
     logger.error("GPT 패턴 분석 완전 실패 - 모든 재시도 소진")
-    return None
+    return None, prompt_tokens, completion_tokens
 
 def validate_analysis_result(result: Dict) -> bool:
     """분석 결과 유효성 검증"""
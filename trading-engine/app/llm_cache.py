@@ -0,0 +1,146 @@
+# LLM 패턴 분석 결과 캐시
+# 집계 입력이 같으면 (사용자/기간이 달라도) 이전 분석 결과를 재사용하고,
+# 같은 입력의 동시 요청은 LLM 호출 하나를 공유한다.
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from database import LlmAnalysisCache, SessionLocal
+from llm_analyzer import PROMPT_VERSION, analysis_cache_key, validate_analysis_result
+from pattern_analyzers import analysis_dispatcher
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+EVICT_INTERVAL_SECONDS = 3600
+
+
+class AnalysisCache:
+    """입력 해시 기반 LLM 분석 결과 캐시 (DB 저장, TTL 만료, 동시 요청 합치기)"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        analyzer: Callable[[Dict[str, str]], Awaitable[Optional[Dict]]] = analysis_dispatcher.dispatch,
+        model: str = analysis_dispatcher.model,
+        ttl: int = LLM_CACHE_TTL_SECONDS,
+    ):
+        self._session_factory = session_factory
+        self._analyzer = analyzer
+        self._model = model
+        self._ttl = ttl
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._next_eviction = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get_or_analyze(self, analysis_data: Dict[str, str]) -> Optional[Dict]:
+        """
+        캐시된 분석 결과 반환, 없으면 LLM 분석 후 저장
+
+        같은 키의 분석이 진행 중이면 새로 호출하지 않고 그 결과를 기다린다.
+        유효성 검증을 통과한 결과만 저장한다.
+        """
+        key = analysis_cache_key(analysis_data, self._model)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        cached = await run_in_threadpool(self._load, key)
+        if cached is not None:
+            self.hits += 1
+            logger.info(f"LLM 분석 캐시 적중: {key[:12]}")
+            return cached
+
+        # DB 조회 중 다른 요청이 먼저 분석을 시작했을 수 있음
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task)
+
+        self.misses += 1
+        task = asyncio.ensure_future(self._analyze_and_store(key, analysis_data))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 요청이 취소되어도 분석과 저장은 끝까지 진행 (기다리던 다른 요청이 있을 수 있음)
+        return await asyncio.shield(task)
+
+    async def _analyze_and_store(self, key: str, analysis_data: Dict[str, str]) -> Optional[Dict]:
+        result = await self._analyzer(analysis_data)
+        if result and validate_analysis_result(result):
+            try:
+                await run_in_threadpool(self._store, key, result)
+            except Exception as e:
+                logger.error(f"LLM 분석 캐시 저장 실패: {e}")
+        return result
+
+    def _load(self, key: str) -> Optional[Dict]:
+        db = self._session_factory()
+        try:
+            record = db.query(LlmAnalysisCache).filter(
+                LlmAnalysisCache.cache_key == key,
+                LlmAnalysisCache.expires_at > datetime.utcnow()
+            ).first()
+            if record is None:
+                return None
+            result = record.result_json
+            record.hit_count = LlmAnalysisCache.hit_count + 1
+            db.commit()
+            return result
+        except Exception as e:
+            logger.error(f"LLM 분석 캐시 조회 실패: {e}")
+            db.rollback()
+            return None
+        finally:
+            db.close()
+
+    def _store(self, key: str, result: Dict) -> None:
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self._ttl)
+        statement = insert(LlmAnalysisCache).values(
+            cache_key=key,
+            model=self._model,
+            prompt_version=PROMPT_VERSION,
+            result_json=result,
+            hit_count=0,
+            created_at=now,
+            expires_at=expires_at,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[LlmAnalysisCache.cache_key],
+            set_={"result_json": statement.excluded.result_json, "created_at": now, "expires_at": expires_at},
+        )
+        db = self._session_factory()
+        try:
+            db.execute(statement)
+            # 만료된 항목은 EVICT_INTERVAL_SECONDS마다 한 번씩 정리
+            if time.monotonic() >= self._next_eviction:
+                self._next_eviction = time.monotonic() + EVICT_INTERVAL_SECONDS
+                evicted = db.query(LlmAnalysisCache).filter(
+                    LlmAnalysisCache.expires_at <= now
+                ).delete(synchronize_session=False)
+                if evicted:
+                    logger.info(f"만료된 LLM 분석 캐시 삭제: {evicted}건")
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 적중/미스/합쳐진 요청 수"""
+        return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced, "inflight": len(self._inflight)}
+
+
+# 전역 캐시 인스턴스
+analysis_cache = AnalysisCache()
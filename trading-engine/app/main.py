@@ -30,9 +30,13 @@ app.add_middleware(
 )
 
 from routes_trades import router as trades_router  # noqa: E402
-from routes_patterns import router as patterns_router  # noqa: E402
+from routes_patterns import router as patterns_router, jobs_router as pattern_jobs_router  # noqa: E402
+from pattern_analyzers import analysis_dispatcher  # noqa: E402
+from llm_cache import analysis_cache  # noqa: E402
+from analysis_jobs import analysis_jobs  # noqa: E402
 app.include_router(trades_router)
 app.include_router(patterns_router)
+app.include_router(pattern_jobs_router)
 
 @app.get("/")
 async def root():
@@ -61,6 +65,11 @@ async def get_status():
                 "fastapi": "running",
                 "kafka": "connected",
                 "freqtrade": "running"
+            },
+            "pattern_analysis": {
+                "dispatcher": analysis_dispatcher.summary(),
+                "cache": analysis_cache.stats(),
+                "jobs": analysis_jobs.stats()
             }
         }
     except Exception as e:
@@ -1,19 +1,142 @@
 # 시장 데이터 및 기술적 분석 기능
-import requests
+import asyncio
+import time
+from collections import OrderedDict
+import httpx
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import logging
 
+from fastapi.concurrency import run_in_threadpool
+
+from indicator_kernels import ArrayIndicators, ArrayLike
+from market_store import (
+    LOOKAHEAD_MS,
+    LOOKBACK_MS,
+    MARKET_STORE_DIR,
+    OhlcvStore,
+    candle_columns,
+    indicators_at,
+    snapshot_columns,
+)
+
 logger = logging.getLogger(__name__)
 
+# 로컬 저장소에서 지표 스냅샷을 읽는 interval (거래 지표 기본값)
+SNAPSHOT_INTERVAL = "1h"
+
+# 바이낸스 interval 문자열 -> 밀리초 (과거 구간 캐시 판단용)
+_INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "6h": 21_600_000,
+    "12h": 43_200_000, "1d": 86_400_000,
+}
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    """클라이언트 종료 (연결이 이미 닫힌 루프에 묶여 있으면 실패할 수 있으므로 오류는 무시)"""
+    try:
+        await client.aclose()
+    except Exception as e:
+        logger.debug(f"이전 이벤트 루프의 HTTP 클라이언트 종료 실패: {e}")
+
 class MarketDataProvider:
-    """시장 데이터 제공자 - 바이낸스 API 연동"""
+    """
+    시장 데이터 제공자 - 바이낸스 API 연동
+    keep-alive 연결 풀을 재사용하는 비동기 클라이언트로, 심볼 목록과 캔들 응답을 캐시한다.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        symbol_ttl: float = 3600,
+        klines_ttl: float = 60,
+        max_cached_klines: int = 512,
+        client: Optional[httpx.AsyncClient] = None
+    ):
         self.base_url = "https://api.binance.com/api/v3"
+        self.symbol_ttl = symbol_ttl
+        self.klines_ttl = klines_ttl
+        self.max_cached_klines = max_cached_klines
+        self._client = client
+        self._owns_client = client is None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._symbols: Set[str] = set()
+        self._symbols_loaded_at = 0.0
+        self._symbols_lock: Optional[asyncio.Lock] = None
+        # 루프 변경으로 교체된 클라이언트의 종료 작업 (완료 전 GC 방지)
+        self._closing: Set[asyncio.Task] = set()
+        self._klines_cache: "OrderedDict[Tuple, Tuple[Optional[float], List[Dict]]]" = OrderedDict()
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """공용 AsyncClient (이벤트 루프가 바뀌면 이전 클라이언트를 닫고 새로 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._owns_client and (self._client is None or self._client.is_closed or self._loop is not loop):
+            if self._client is not None and not self._client.is_closed:
+                self._discard_client(self._client, self._loop, loop)
+            self._client = httpx.AsyncClient(
+                timeout=10,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20)
+            )
+        if self._loop is not loop:
+            self._loop = loop
+            self._symbols_lock = asyncio.Lock()
+        return self._client
+    
+    def _discard_client(
+        self,
+        client: httpx.AsyncClient,
+        old_loop: Optional[asyncio.AbstractEventLoop],
+        loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        """이전 루프의 클라이언트 종료 (그 루프가 아직 돌고 있으면 그 루프에서, 아니면 현재 루프에서 닫음)"""
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_aclose_quietly(client), old_loop)
+            return
+        task = loop.create_task(_aclose_quietly(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def close(self) -> None:
+        """연결 풀 종료"""
+        if self._owns_client and self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None if self._owns_client else self._client
+        self._loop = None
+    
+    async def get_symbols(self) -> Set[str]:
+        """거래 중인 심볼 목록 (exchangeInfo, symbol_ttl 동안 캐시)"""
+        if self._symbols and time.monotonic() - self._symbols_loaded_at < self.symbol_ttl:
+            return self._symbols
         
-    def get_klines(
+        client = self._get_client()
+        async with self._symbols_lock:
+            # 대기하는 동안 다른 요청이 갱신했으면 그대로 사용
+            if self._symbols and time.monotonic() - self._symbols_loaded_at < self.symbol_ttl:
+                return self._symbols
+            try:
+                response = await client.get(f"{self.base_url}/exchangeInfo")
+                response.raise_for_status()
+                self._symbols = {
+                    item["symbol"] for item in response.json()["symbols"]
+                    if item.get("status") == "TRADING"
+                }
+                self._symbols_loaded_at = time.monotonic()
+                logger.info(f"거래소 심볼 목록 갱신: {len(self._symbols)}개")
+            except Exception as e:
+                logger.error(f"거래소 심볼 목록 조회 실패: {e}")
+        
+        return self._symbols
+    
+    def _klines_expiry(self, interval: str, end_ms: Optional[int]) -> Optional[float]:
+        """캐시 만료 시각 (종료 캔들까지 모두 마감된 과거 구간은 만료 없음)"""
+        now_ms = time.time() * 1000
+        interval_ms = _INTERVAL_MS.get(interval)
+        if end_ms is not None and interval_ms is not None and end_ms + interval_ms <= now_ms:
+            return None
+        return time.monotonic() + self.klines_ttl
+    
+    async def get_klines(
         self, 
         symbol: str, 
         interval: str = "1h", 
@@ -21,9 +144,8 @@ class MarketDataProvider:
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None
     ) -> List[Dict]:
-        """캔들스틱 데이터 조회"""
+        """캔들스틱 데이터 조회 ((심볼, interval, 개수, 구간) 단위 캐시)"""
         try:
-            url = f"{self.base_url}/klines"
             params = {
                 "symbol": symbol.upper(),
                 "interval": interval,
@@ -35,7 +157,13 @@ class MarketDataProvider:
             if end_time:
                 params["endTime"] = int(end_time.timestamp() * 1000)
             
-            response = requests.get(url, params=params, timeout=10)
+            key = (params["symbol"], interval, params["limit"], params.get("startTime"), params.get("endTime"))
+            cached = self._klines_cache.get(key)
+            if cached is not None and (cached[0] is None or cached[0] > time.monotonic()):
+                self._klines_cache.move_to_end(key)
+                return cached[1]
+            
+            response = await self._get_client().get(f"{self.base_url}/klines", params=params)
             response.raise_for_status()
             
             raw_data = response.json()
@@ -58,6 +186,10 @@ class MarketDataProvider:
                 }
                 klines.append(kline)
             
+            self._klines_cache[key] = (self._klines_expiry(interval, params.get("endTime")), klines)
+            while len(self._klines_cache) > self.max_cached_klines:
+                self._klines_cache.popitem(last=False)
+            
             logger.info(f"캔들스틱 데이터 조회 성공: {symbol} {interval} {len(klines)}개")
             return klines
             
@@ -65,13 +197,36 @@ class MarketDataProvider:
             logger.error(f"캔들스틱 데이터 조회 실패: {symbol} - {e}")
             return []
     
-    def get_24hr_ticker(self, symbol: str) -> Dict:
+    async def get_klines_range(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: datetime,
+        end_time: datetime
+    ) -> List[Dict]:
+        """구간 전체 캔들 조회 (1000개 단위로 나누어 요청, 각 요청은 캐시 사용)"""
+        interval_ms = _INTERVAL_MS.get(interval)
+        if interval_ms is None:
+            return await self.get_klines(symbol, interval, 1000, start_time, end_time)
+        
+        klines: List[Dict] = []
+        cursor = start_time
+        while cursor <= end_time:
+            page = await self.get_klines(symbol, interval, 1000, cursor, end_time)
+            if not page:
+                break
+            klines.extend(page)
+            if len(page) < 1000:
+                break
+            cursor = page[-1]["open_time"] + timedelta(milliseconds=interval_ms)
+        return klines
+    
+    async def get_24hr_ticker(self, symbol: str) -> Dict:
         """24시간 가격 변동 정보"""
         try:
-            url = f"{self.base_url}/ticker/24hr"
-            params = {"symbol": symbol.upper()}
-            
-            response = requests.get(url, params=params, timeout=10)
+            response = await self._get_client().get(
+                f"{self.base_url}/ticker/24hr", params={"symbol": symbol.upper()}
+            )
             response.raise_for_status()
             
             data = response.json()
@@ -95,44 +250,40 @@ class MarketDataProvider:
             return {}
 
 class TechnicalAnalyzer:
-    """기술적 분석 도구"""
+    """
+    기술적 분석 도구
+    마지막 값만 반환하는 기존 인터페이스이며, 전체 시리즈가 필요하면 ArrayIndicators를 사용한다.
+    """
     
     @staticmethod
-    def calculate_sma(prices: List[float], period: int) -> float:
+    def calculate_sma(prices: ArrayLike, period: int) -> float:
         """단순 이동평균 계산"""
         if len(prices) < period:
             return 0.0
-        return sum(prices[-period:]) / period
+        return float(np.mean(np.asarray(prices, dtype=np.float64)[-period:]))
     
     @staticmethod
-    def calculate_atr(highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> float:
+    def calculate_atr(highs: ArrayLike, lows: ArrayLike, closes: ArrayLike, period: int = 14) -> float:
         """ATR (Average True Range) 계산"""
         if len(highs) < period + 1 or len(lows) < period + 1 or len(closes) < period + 1:
             return 0.0
         
-        true_ranges = []
-        for i in range(1, len(highs)):
-            tr1 = highs[i] - lows[i]
-            tr2 = abs(highs[i] - closes[i-1])
-            tr3 = abs(lows[i] - closes[i-1])
-            true_ranges.append(max(tr1, tr2, tr3))
-        
-        if len(true_ranges) < period:
-            return 0.0
-            
-        return sum(true_ranges[-period:]) / period
+        # 필요한 구간(period + 1봉)만 잘라 True Range를 한 번에 계산
+        window = period + 1
+        true_ranges = ArrayIndicators.true_range(
+            np.asarray(highs)[-window:], np.asarray(lows)[-window:], np.asarray(closes)[-window:]
+        )
+        return float(np.mean(true_ranges[1:]))
     
     @staticmethod
-    def calculate_bollinger_bands(prices: List[float], period: int = 20, std_dev: float = 2) -> Tuple[float, float, float]:
+    def calculate_bollinger_bands(prices: ArrayLike, period: int = 20, std_dev: float = 2) -> Tuple[float, float, float]:
         """볼린저 밴드 계산 (상단, 중단, 하단)"""
         if len(prices) < period:
             return 0.0, 0.0, 0.0
         
-        recent_prices = prices[-period:]
-        sma = sum(recent_prices) / period
-        
-        variance = sum((price - sma) ** 2 for price in recent_prices) / period
-        std = variance ** 0.5
+        recent_prices = np.asarray(prices, dtype=np.float64)[-period:]
+        sma = float(recent_prices.mean())
+        std = float(recent_prices.std())
         
         upper_band = sma + (std_dev * std)
         lower_band = sma - (std_dev * std)
@@ -147,11 +298,11 @@ class TechnicalAnalyzer:
         return current_volume / avg_volume
     
     @staticmethod
-    def find_range_high(highs: List[float], period: int = 20) -> float:
+    def find_range_high(highs: ArrayLike, period: int = 20) -> float:
         """최근 N일간 고점 찾기"""
-        if len(highs) < period:
-            return max(highs) if highs else 0.0
-        return max(highs[-period:])
+        if len(highs) == 0:
+            return 0.0
+        return float(np.max(np.asarray(highs, dtype=np.float64)[-period:]))
     
     @staticmethod
     def calculate_wick_ratio(open_price: float, high: float, low: float, close: float) -> Tuple[float, float]:
@@ -173,26 +324,121 @@ class TechnicalAnalyzer:
         return upper_wick_ratio, lower_wick_ratio
 
 class MarketDataService:
-    """통합 시장 데이터 서비스"""
+    """
+    통합 시장 데이터 서비스
+    로컬 캔들 저장소(MARKET_STORE_DIR)가 있으면 1h 거래 지표는 저장소의 스냅샷에서 읽고,
+    저장소가 덮지 못하는 거래(아직 마감되지 않은 캔들이 필요한 경우 등)만 거래소에서 계산한다.
+    """
     
-    def __init__(self):
+    def __init__(self, store: Optional[OhlcvStore] = None):
         self.provider = MarketDataProvider()
         self.analyzer = TechnicalAnalyzer()
+        self.store = store if store is not None else (OhlcvStore(MARKET_STORE_DIR) if MARKET_STORE_DIR else None)
+        self._store_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._store_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
     
-    def get_trade_indicators(
+    def _store_lock(self, symbol: str, interval: str) -> asyncio.Lock:
+        """심볼/interval별 저장소 동기화 잠금 (이벤트 루프가 바뀌면 새로 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._store_loop is not loop:
+            self._store_loop = loop
+            self._store_locks = {}
+        return self._store_locks.setdefault((symbol, interval), asyncio.Lock())
+    
+    async def sync_candles(self, symbol: str, interval: str, start_time: datetime, end_time: datetime) -> bool:
+        """
+        저장소에 없는 구간의 마감 캔들만 받아 채움
+
+        Returns:
+            요청 구간이 모두 저장되었는지 (조회 실패 또는 미마감 캔들이 남으면 False)
+        """
+        if self.store is None or interval not in _INTERVAL_MS:
+            return False
+        symbol = symbol.upper()
+        start_ms, end_ms = round(start_time.timestamp() * 1000), round(end_time.timestamp() * 1000)
+        async with self._store_lock(symbol, interval):
+            cols = await run_in_threadpool(self.store.load, symbol, interval)
+            for range_start, range_end in OhlcvStore.missing_ranges(cols, start_ms, end_ms):
+                now_ms = time.time() * 1000
+                klines = await self.provider.get_klines_range(
+                    symbol, interval,
+                    datetime.fromtimestamp(range_start / 1000), datetime.fromtimestamp(range_end / 1000)
+                )
+                if not klines:
+                    # 조회 실패와 상장 전 구간을 구분할 수 없으므로 저장 구간으로 기록하지 않음
+                    return False
+                closed = [k for k in klines if k["close_time"].timestamp() * 1000 < now_ms]
+                if not closed:
+                    return False
+                # 받은 마지막 마감 캔들까지만 저장 구간으로 기록
+                # (진행 중 캔들과 중간에 조회가 끊긴 뒤쪽 구간은 다음 동기화에서 다시 받음)
+                interval_ms = _INTERVAL_MS[interval]
+                last_open = closed[-1]["open_time"].timestamp() * 1000
+                covered_to = int(min(range_end, last_open + interval_ms - 1))
+                if covered_to < range_start:
+                    return False
+                await run_in_threadpool(self.store.merge, symbol, interval, closed, range_start, covered_to)
+            cols = await run_in_threadpool(self.store.load, symbol, interval)
+        return OhlcvStore.covers(cols, start_ms, end_ms)
+    
+    async def _indicators_from_store(self, symbol: str, entries: List[Tuple[datetime, float]]) -> List[Optional[Dict]]:
+        """
+        저장소 스냅샷으로 거래 지표 조회 (부족한 과거 구간은 먼저 채움)
+
+        Returns:
+            entries 순서의 지표 딕셔너리 (저장소로 계산할 수 없는 거래는 None)
+        """
+        results: List[Optional[Dict]] = [None] * len(entries)
+        if self.store is None or not entries:
+            return results
+        symbol = symbol.upper()
+        interval_ms = _INTERVAL_MS[SNAPSHOT_INTERVAL]
+        entry_ms = np.array([t.timestamp() * 1000 for t, _ in entries])
+        prices = np.array([price for _, price in entries], dtype=np.float64)
+        # 구간 마지막 캔들(진입 1시간 후)이 마감된 거래만 스냅샷으로 계산 가능
+        window_end = entry_ms + LOOKAHEAD_MS
+        eligible = (window_end // interval_ms + 1) * interval_ms <= time.time() * 1000
+        if not eligible.any():
+            return results
+        
+        start_ms, end_ms = entry_ms[eligible].min() - LOOKBACK_MS, window_end[eligible].max()
+        cols = await run_in_threadpool(self.store.load, symbol, SNAPSHOT_INTERVAL)
+        if not OhlcvStore.covers(cols, start_ms, end_ms):
+            await self.sync_candles(
+                symbol, SNAPSHOT_INTERVAL,
+                datetime.fromtimestamp(start_ms / 1000), datetime.fromtimestamp(end_ms / 1000)
+            )
+            cols = await run_in_threadpool(self.store.load, symbol, SNAPSHOT_INTERVAL)
+        if cols is None:
+            return results
+        
+        covered = eligible & OhlcvStore.covers(cols, entry_ms - LOOKBACK_MS, window_end)
+        indices = np.flatnonzero(covered)
+        for i, indicators in zip(indices, indicators_at(cols, entry_ms[indices], prices[indices])):
+            results[i] = indicators
+        return results
+    
+    async def get_trade_indicators(
         self, 
         symbol: str, 
         entry_time: datetime,
         entry_price: float,
         interval: str = "1h"
     ) -> Dict:
-        """거래 시점의 기술적 지표 계산"""
+        """거래 시점의 기술적 지표 계산 (저장소가 덮는 거래는 스냅샷 조회)"""
+        if interval == SNAPSHOT_INTERVAL and self.store is not None:
+            try:
+                stored = await self._indicators_from_store(symbol, [(entry_time, entry_price)])
+                if stored[0] is not None:
+                    return stored[0]
+            except Exception as e:
+                logger.error(f"저장소 지표 조회 실패: {symbol} @ {entry_time} - {e}")
         try:
             # 충분한 데이터를 위해 100개 캔들 조회
             end_time = entry_time + timedelta(hours=1)  # 진입 시간 이후 1시간
             start_time = entry_time - timedelta(days=7)  # 7일 전부터
             
-            klines = self.provider.get_klines(
+            klines = await self.provider.get_klines(
                 symbol=symbol,
                 interval=interval,
                 limit=200,
@@ -252,6 +498,62 @@ class MarketDataService:
             logger.error(f"기술적 지표 계산 실패: {symbol} @ {entry_time} - {e}")
             return {}
     
+    async def get_trade_indicators_batch(
+        self,
+        symbol: str,
+        entries: List[Tuple[datetime, float]],
+        interval: str = "1h"
+    ) -> List[Dict]:
+        """
+        같은 심볼 여러 거래의 기술적 지표를 한 번에 계산
+
+        저장소가 덮는 거래는 스냅샷에서 읽는다. 나머지는 모든 진입 시점을 덮는 캔들 구간을 한 번만 조회하고
+        지표 시리즈를 한 번 계산한 뒤, 거래별 구간(진입 7일 전 ~ 1시간 후)의 마지막 값을 뽑는다.
+        결과는 get_trade_indicators와 같다.
+
+        Returns:
+            entries 순서의 지표 딕셔너리 목록 (계산할 수 없는 거래는 빈 딕셔너리)
+        """
+        if not entries:
+            return []
+        results: List[Optional[Dict]] = [None] * len(entries)
+        if interval == SNAPSHOT_INTERVAL and self.store is not None:
+            try:
+                results = await self._indicators_from_store(symbol, entries)
+            except Exception as e:
+                logger.error(f"저장소 지표 일괄 조회 실패: {symbol} - {e}")
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        try:
+            entry_times = [entries[i][0] for i in pending]
+            klines = await self.provider.get_klines_range(
+                symbol, interval,
+                min(entry_times) - timedelta(milliseconds=LOOKBACK_MS),
+                max(entry_times) + timedelta(milliseconds=LOOKAHEAD_MS)
+            )
+            if not klines:
+                return [result if result is not None else {} for result in results]
+            
+            # 지표 시리즈는 조회 구간 전체에서 한 번만 계산
+            cols = candle_columns(klines)
+            cols.update(snapshot_columns(cols))
+            computed = indicators_at(
+                cols,
+                np.array([t.timestamp() * 1000 for t in entry_times]),
+                np.array([entries[i][1] for i in pending], dtype=np.float64)
+            )
+            for i, indicators in zip(pending, computed):
+                results[i] = indicators
+            
+            logger.info(f"기술적 지표 일괄 계산 완료: {symbol} {len(pending)}건")
+            return results
+            
+        except Exception as e:
+            logger.error(f"기술적 지표 일괄 계산 실패: {symbol} - {e}")
+            return [result if result is not None else {} for result in results]
+    
     def _determine_trend(self, closes: List[float], period: int) -> str:
         """트렌드 방향 결정 (이동평균 기반)"""
         if len(closes) < period + 5:
@@ -269,10 +571,15 @@ class MarketDataService:
         else:
             return "sideways"
     
-    def validate_symbol(self, symbol: str) -> bool:
-        """심볼 유효성 검사"""
+    async def validate_symbol(self, symbol: str) -> bool:
+        """심볼 유효성 검사 (캐시된 거래소 심볼 목록 조회)"""
         try:
-            ticker = self.provider.get_24hr_ticker(symbol)
+            symbols = await self.provider.get_symbols()
+            if symbols:
+                return symbol.upper() in symbols
+            
+            # 심볼 목록을 가져오지 못한 경우 티커 조회로 확인
+            ticker = await self.provider.get_24hr_ticker(symbol)
             return bool(ticker)
         except:
             return False
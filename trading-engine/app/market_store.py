@@ -0,0 +1,300 @@
+# 로컬 OHLCV 저장소와 캔들별 지표 스냅샷
+# 심볼/interval마다 마감된 캔들과 그 캔들 시점의 지표 시리즈 값을 열 단위 .npz 파일 하나로 보관한다.
+# 부족한 구간만 거래소에서 받아 증분으로 채우고, 새로 들어온 캔들(과 그 영향을 받는 뒤쪽 캔들)의 스냅샷만 계산한다.
+# 거래 지표는 진입 시각으로 캔들 위치를 이분 탐색해 스냅샷을 읽으므로 네트워크 호출 없이 O(log n)이다.
+#
+# 미리 채우기: python market_store.py sync SYMBOL --start YYYY-MM-DD [--end YYYY-MM-DD] [--interval 1h]
+import argparse
+import asyncio
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from indicator_kernels import ArrayIndicators
+
+logger = logging.getLogger(__name__)
+
+MARKET_STORE_DIR = os.getenv("MARKET_STORE_DIR", "")  # 비우면 저장소 사용 안 함
+
+# get_trade_indicators의 조회 구간 (진입 7일 전 ~ 1시간 후, 최대 200개 캔들)
+LOOKBACK_MS = 7 * 86_400_000
+LOOKAHEAD_MS = 3_600_000
+MAX_WINDOW = 200
+# 스냅샷 하나가 참조하는 과거 캔들 수 (200 SMA와 5캔들 전 값)
+SNAPSHOT_WARMUP = 205
+
+CANDLE_COLUMNS = ("open_ms", "close_ms", "open", "high", "low", "close", "volume")
+SNAPSHOT_COLUMNS = ("volume_sma", "atr", "bb_upper", "bb_middle", "bb_lower", "range_high", "trend_50", "trend_200")
+
+Columns = Dict[str, np.ndarray]
+
+
+def candle_columns(klines: Sequence[Dict]) -> Columns:
+    """MarketDataProvider.get_klines 결과를 열 배열로 변환 (시각은 epoch 밀리초)"""
+    return {
+        "open_ms": np.array([round(k["open_time"].timestamp() * 1000) for k in klines], dtype=np.int64),
+        "close_ms": np.array([round(k["close_time"].timestamp() * 1000) for k in klines], dtype=np.int64),
+        **{
+            field: np.array([k[field] for k in klines], dtype=np.float64)
+            for field in ("open", "high", "low", "close", "volume")
+        },
+    }
+
+
+def trend_series(closes: np.ndarray, period: int) -> np.ndarray:
+    """캔들별 추세 (종가와 SMA, 5캔들 전 SMA 비교, 데이터가 부족하면 sideways)"""
+    sma = ArrayIndicators.sma(closes, period)
+    previous = np.full(sma.shape, np.nan)
+    previous[5:] = sma[:-5]
+    up = (closes > sma) & (sma > previous)
+    down = (closes < sma) & (sma < previous)
+    return np.where(up, "up", np.where(down, "down", "sideways"))
+
+
+def snapshot_columns(cols: Columns) -> Columns:
+    """
+    캔들별 지표 스냅샷 (각 캔들이 마감된 시점의 값, 조회 구간과 무관)
+
+    거래별 구간 길이 조건은 indicators_at에서 적용한다.
+    """
+    highs, lows, closes = cols["high"], cols["low"], cols["close"]
+    upper, middle, lower = ArrayIndicators.bollinger_bands(closes, 20)
+    return {
+        "volume_sma": ArrayIndicators.sma(cols["volume"], 20),
+        "atr": ArrayIndicators.atr(highs, lows, closes, 14),
+        "bb_upper": upper,
+        "bb_middle": middle,
+        "bb_lower": lower,
+        "range_high": ArrayIndicators.rolling_max(highs, 20),
+        "trend_50": trend_series(closes, 50),
+        "trend_200": trend_series(closes, 200),
+    }
+
+
+def indicators_at(cols: Columns, entry_ms: np.ndarray, prices: np.ndarray) -> List[Dict]:
+    """
+    진입 시각별 거래 지표 (스냅샷 조회, get_trade_indicators와 같은 규칙)
+
+    거래 구간은 진입 7일 전 ~ 1시간 후 캔들(최대 200개)이고, 값은 구간 마지막 캔들의 스냅샷이다.
+    구간이 지표 기간보다 짧으면 0(추세는 sideways)으로 둔다.
+
+    Returns:
+        거래별 지표 딕셔너리 (구간에 캔들이 없으면 빈 딕셔너리)
+    """
+    open_ms, close_ms = cols["open_ms"], cols["close_ms"]
+    if len(open_ms) == 0:
+        return [{} for _ in entry_ms]
+
+    lo = np.searchsorted(open_ms, entry_ms - LOOKBACK_MS, side="left")
+    hi = np.searchsorted(open_ms, entry_ms + LOOKAHEAD_MS, side="right")
+    hi = np.minimum(hi, lo + MAX_WINDOW)
+    length = hi - lo
+    last = np.maximum(hi - 1, 0)
+
+    average_volume = np.where(length >= 20, cols["volume_sma"][last], 0.0)
+    atr = np.where(length >= 15, cols["atr"][last], 0.0)
+    has_bands = length >= 20
+    upper = np.where(has_bands, cols["bb_upper"][last], 0.0)
+    middle = np.where(has_bands, cols["bb_middle"][last], 0.0)
+    lower = np.where(has_bands, cols["bb_lower"][last], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bollinger_percent = np.where(upper > lower, (prices - lower) / (upper - lower), 0.5)
+    trend_50 = np.where(length >= 55, cols["trend_50"][last], "sideways")
+    trend_200 = np.where(length >= 205, cols["trend_200"][last], "sideways")
+
+    # 진입 캔들: 진입 시각을 포함하는 캔들, 없으면 구간 내 가장 가까운 캔들
+    candidate = np.clip(np.searchsorted(open_ms, entry_ms, side="right") - 1, 0, len(open_ms) - 1)
+    contains = (open_ms[candidate] <= entry_ms) & (entry_ms <= close_ms[candidate]) & (candidate >= lo) & (candidate < hi)
+
+    # 캔들 품질 (calculate_wick_ratio와 동일: 몸통이 없으면 0)
+    opens, highs, lows, closes = cols["open"], cols["high"], cols["low"], cols["close"]
+
+    results: List[Dict] = []
+    for i in range(len(entry_ms)):
+        if length[i] == 0:
+            results.append({})
+            continue
+
+        j = int(candidate[i])
+        if not contains[i]:
+            window = np.arange(lo[i], hi[i])
+            j = int(window[np.argmin(np.abs(open_ms[window] - entry_ms[i]))])
+
+        # 현재 캔들을 제외한 최근 20개 고점 (구간이 짧으면 구간 전체)
+        if length[i] - 1 >= 20:
+            prev_range_high = float(cols["range_high"][last[i] - 1])
+        elif length[i] > 1:
+            prev_range_high = float(highs[lo[i]:last[i]].max())
+        else:
+            prev_range_high = 0.0
+
+        body = abs(closes[j] - opens[j])
+        if body == 0:
+            upper_wick = lower_wick = 0.0
+        elif closes[j] > opens[j]:
+            upper_wick, lower_wick = (highs[j] - closes[j]) / body, (opens[j] - lows[j]) / body
+        else:
+            upper_wick, lower_wick = (highs[j] - opens[j]) / body, (closes[j] - lows[j]) / body
+
+        results.append({
+            "volume": float(cols["volume"][j]),
+            "averageVolume": float(average_volume[i]),
+            "prevRangeHigh": prev_range_high,
+            "atr": float(atr[i]),
+            "htfTrend": str(trend_50[i]),
+            "htfTrend2": str(trend_200[i]),
+            "bollingerUpper": float(upper[i]),
+            "bollingerMiddle": float(middle[i]),
+            "bollingerLower": float(lower[i]),
+            "bollingerPercent": float(bollinger_percent[i]),
+            "entryCandleUpperWickRatio": float(upper_wick),
+            "entryCandleLowerWickRatio": float(lower_wick),
+        })
+    return results
+
+
+class OhlcvStore:
+    """
+    심볼/interval별 마감 캔들 + 지표 스냅샷 저장소 ({root}/{interval}/{SYMBOL}.npz)
+
+    파일마다 받은 구간 [covered_from, covered_to]를 함께 저장한다 (이 구간의 캔들은 모두 보관됨).
+    쓰기는 임시 파일 교체로 원자적이고, 다른 프로세스가 바꾼 파일은 수정 시각으로 감지해 다시 읽는다.
+    """
+
+    def __init__(self, root: str, max_cached: int = 64):
+        self.root = root
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, int], Columns]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, interval, f"{symbol.upper()}.npz")
+
+    def load(self, symbol: str, interval: str) -> Optional[Columns]:
+        """저장된 열 배열 (없으면 None)"""
+        key = (symbol.upper(), interval)
+        path = self._path(symbol, interval)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(key)
+                return cached[1]
+        with np.load(path, allow_pickle=False) as data:
+            cols = {name: data[name] for name in data.files}
+        with self._lock:
+            self._cache[key] = (version, cols)
+            while len(self._cache) > self.max_cached:
+                self._cache.popitem(last=False)
+        return cols
+
+    @staticmethod
+    def covers(cols: Optional[Columns], start_ms, end_ms):
+        """[start_ms, end_ms] 구간의 캔들이 모두 저장되어 있는지 (배열이면 원소별)"""
+        if cols is None:
+            return np.zeros(np.shape(start_ms), dtype=bool) if np.ndim(start_ms) else False
+        return (int(cols["covered_from"]) <= start_ms) & (end_ms <= int(cols["covered_to"]))
+
+    @staticmethod
+    def missing_ranges(cols: Optional[Columns], start_ms: int, end_ms: int) -> List[Tuple[int, int]]:
+        """
+        [start_ms, end_ms]를 덮기 위해 받아야 할 구간 목록
+
+        저장 구간을 연속으로 유지하도록, 요청 구간과 떨어져 있으면 그 사이도 함께 받는다.
+        """
+        if cols is None:
+            return [(start_ms, end_ms)]
+        covered_from, covered_to = int(cols["covered_from"]), int(cols["covered_to"])
+        ranges = []
+        if start_ms < covered_from:
+            ranges.append((start_ms, covered_from - 1))
+        if end_ms > covered_to:
+            ranges.append((covered_to + 1, end_ms))
+        return ranges
+
+    def merge(self, symbol: str, interval: str, klines: Sequence[Dict], covered_from: int, covered_to: int) -> Columns:
+        """
+        마감 캔들을 병합하고 파일 저장 (받은 구간 [covered_from, covered_to]는 저장 구간에 합침)
+
+        스냅샷은 새 캔들과, 새 캔들이 참조 구간(SNAPSHOT_WARMUP)에 들어가는 뒤쪽 캔들만 다시 계산한다.
+        """
+        old = self.load(symbol, interval)
+        new = candle_columns(klines)
+        if old is None:
+            old = {name: new[name][:0] for name in CANDLE_COLUMNS}
+            old.update({name: np.full(0, np.nan) for name in SNAPSHOT_COLUMNS if not name.startswith("trend")})
+            old.update({name: np.full(0, "", dtype="<U8") for name in ("trend_50", "trend_200")})
+            old["covered_from"], old["covered_to"] = np.int64(covered_from), np.int64(covered_to)
+
+        # 기존 캔들 우선 (마감 캔들은 바뀌지 않음), 새 캔들은 스냅샷 자리만 만들어 둠
+        fresh = ~np.isin(new["open_ms"], old["open_ms"])
+        count = int(fresh.sum())
+        combined: Columns = {name: np.concatenate([old[name], new[name][fresh]]) for name in CANDLE_COLUMNS}
+        for name in SNAPSHOT_COLUMNS:
+            combined[name] = np.concatenate([old[name], np.zeros(count, dtype=old[name].dtype)])
+        order = np.argsort(combined["open_ms"], kind="stable")
+        combined = {name: values[order] for name, values in combined.items()}
+
+        if count:
+            positions = np.flatnonzero(order >= len(old["open_ms"]))
+            first, end = int(positions[0]), min(len(order), int(positions[-1]) + SNAPSHOT_WARMUP + 1)
+            start = max(0, first - SNAPSHOT_WARMUP)
+            snapshot = snapshot_columns({name: combined[name][start:end] for name in CANDLE_COLUMNS})
+            for name in SNAPSHOT_COLUMNS:
+                combined[name][first:end] = snapshot[name][first - start:]
+
+        # 저장 구간과 이어지는 경우에만 합침 (떨어져 있으면 사이 구간이 비어 있으므로 기존 구간 유지)
+        old_from, old_to = int(old["covered_from"]), int(old["covered_to"])
+        if covered_from <= old_to + 1 and covered_to >= old_from - 1:
+            old_from, old_to = min(old_from, covered_from), max(old_to, covered_to)
+        combined["covered_from"], combined["covered_to"] = np.int64(old_from), np.int64(old_to)
+        self._save(symbol, interval, combined)
+        logger.info(f"캔들 저장소 갱신: {symbol} {interval} +{count}개 (총 {len(order)}개)")
+        return combined
+
+    def _save(self, symbol: str, interval: str, cols: Columns) -> None:
+        path = self._path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp.npz"
+        np.savez(tmp_path, **cols)
+        os.replace(tmp_path, path)
+        stat = os.stat(path)
+        with self._lock:
+            self._cache[(symbol.upper(), interval)] = ((stat.st_mtime_ns, stat.st_size), cols)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="로컬 캔들 저장소 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    sync = subparsers.add_parser("sync", help="구간 캔들을 받아 저장소 채우기")
+    sync.add_argument("symbol")
+    sync.add_argument("--start", type=datetime.fromisoformat, required=True)
+    sync.add_argument("--end", type=datetime.fromisoformat, default=None)
+    sync.add_argument("--interval", default="1h")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if not MARKET_STORE_DIR:
+        parser.error("MARKET_STORE_DIR 환경 변수를 설정하세요.")
+    from market_data import market_service
+
+    async def run() -> None:
+        try:
+            await market_service.sync_candles(args.symbol, args.interval, args.start, args.end or datetime.now())
+        finally:
+            await market_service.provider.close()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
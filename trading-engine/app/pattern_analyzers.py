@@ -0,0 +1,306 @@
+# 패턴 분석 백엔드와 호출 디스패처
+# 백엔드는 analyze(analysis_data) 하나만 구현하면 되며, OpenAI 백엔드와 오프라인/테스트용 규칙 기반 백엔드를 제공한다.
+# 디스패처는 동시 호출 수, 분당 요청/토큰 수, 전체 토큰 예산을 제한하고 호출별 지연/토큰 지표를 기록한다.
+import asyncio
+import csv
+import io
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Callable, Deque, Dict, List, NamedTuple, Optional
+
+from llm_analyzer import (
+    LLM_MODEL, MAX_COMPLETION_TOKENS, SYSTEM_PROMPT,
+    create_user_prompt, request_pattern_analysis,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisOutcome(NamedTuple):
+    """백엔드 호출 결과 (실패 시 result=None)"""
+    result: Optional[Dict]
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 대략 추정 (UTF-8 4바이트당 1토큰, 한글이 섞여도 보수적으로 큰 값)"""
+    return max(1, len(text.encode("utf-8")) // 4)
+
+
+class TokenBudgetExceededError(Exception):
+    """전체 토큰 예산을 넘어 분석 호출을 보내지 않음 (예산이 다시 늘기 전까지 재시도해도 같은 결과)"""
+
+
+class PatternAnalyzer(ABC):
+    """패턴 분석 백엔드 인터페이스"""
+
+    name = "base"
+    model = ""
+
+    @abstractmethod
+    async def analyze(self, analysis_data: Dict[str, str]) -> AnalysisOutcome:
+        """분석 1건 실행 (실패 시 result=None)"""
+
+    def estimate_tokens(self, analysis_data: Dict[str, str]) -> int:
+        """호출 전 예상 사용 토큰 수 (속도/예산 제한용)"""
+        return 0
+
+
+class OpenAIPatternAnalyzer(PatternAnalyzer):
+    """OpenAI Chat Completions 백엔드"""
+
+    name = "openai"
+
+    def __init__(self, model: str = LLM_MODEL, max_retries: int = 1):
+        self.model = model
+        self.max_retries = max_retries
+
+    async def analyze(self, analysis_data: Dict[str, str]) -> AnalysisOutcome:
+        return AnalysisOutcome(*await request_pattern_analysis(analysis_data, self.max_retries, self.model))
+
+    def estimate_tokens(self, analysis_data: Dict[str, str]) -> int:
+        return estimate_tokens(SYSTEM_PROMPT + create_user_prompt(analysis_data)) + MAX_COMPLETION_TOKENS
+
+
+def _read_csv(text: str) -> List[Dict[str, str]]:
+    return list(csv.DictReader(io.StringIO(text or "")))
+
+
+def _number(value: Optional[str]) -> float:
+    try:
+        return float(str(value).rstrip("%"))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class LocalPatternAnalyzer(PatternAnalyzer):
+    """
+    규칙 기반 로컬 백엔드 (네트워크 없이 같은 입력에 항상 같은 결과)
+
+    전략/시간대 중 총 손익이 가장 낮은 것과 높은 것을 손실/수익 패턴으로, 지난 주 대비 승률·손익·금기룰 위반율이
+    나아진 항목을 개선점으로 뽑는다.
+    """
+
+    name = "local"
+    model = "local-rules-v1"
+
+    async def analyze(self, analysis_data: Dict[str, str]) -> AnalysisOutcome:
+        return AnalysisOutcome(self.build_result(analysis_data))
+
+    def build_result(self, analysis_data: Dict[str, str]) -> Dict:
+        this_strategy = _read_csv(analysis_data.get("this_week_strategy_csv", ""))
+        last_strategy = _read_csv(analysis_data.get("last_week_strategy_csv", ""))
+        this_time = _read_csv(analysis_data.get("this_week_time_csv", ""))
+        this_penalty = _read_csv(analysis_data.get("this_week_penalty_csv", ""))
+        last_penalty = _read_csv(analysis_data.get("last_week_penalty_csv", ""))
+
+        candidates = [(f"{row['strategy']} 전략", row) for row in this_strategy]
+        candidates += [(f"{row['hour_of_day']} 시간대", row) for row in this_time]
+        # 손익이 같으면 이름순으로 골라 결과가 입력 순서에 좌우되지 않게 함
+        candidates.sort(key=lambda c: (_number(c[1].get("total_pnl")), c[0]))
+        worst_rule = max(this_penalty, key=lambda r: (_number(r.get("violation_rate")), r["rule_code"]), default=None)
+
+        return {
+            "improvements": self._improvements(this_strategy, last_strategy, this_penalty, last_penalty),
+            "top_loss_pattern": self._pattern(candidates[0] if candidates else None, worst_rule, loss=True),
+            "top_profit_pattern": self._pattern(candidates[-1] if candidates else None, None, loss=False),
+        }
+
+    @staticmethod
+    def _improvements(this_strategy, last_strategy, this_penalty, last_penalty) -> List[str]:
+        improvements = []
+        last_by_strategy = {row["strategy"]: row for row in last_strategy}
+        for row in sorted(this_strategy, key=lambda r: r["strategy"]):
+            previous = last_by_strategy.get(row["strategy"])
+            if previous is None:
+                continue
+            if _number(row["win_rate"]) > _number(previous["win_rate"]):
+                improvements.append(f"{row['strategy']} 전략 승률이 {previous['win_rate']}에서 {row['win_rate']}로 올랐습니다")
+            if _number(row["total_pnl"]) > _number(previous["total_pnl"]):
+                improvements.append(f"{row['strategy']} 전략 총 손익이 {previous['total_pnl']}에서 {row['total_pnl']}로 늘었습니다")
+
+        this_by_rule = {row["rule_code"]: row for row in this_penalty}
+        for row in sorted(last_penalty, key=lambda r: r["rule_code"]):
+            current = this_by_rule.get(row["rule_code"])
+            current_rate = current["violation_rate"] if current else "0%"
+            if _number(current_rate) < _number(row["violation_rate"]):
+                improvements.append(f"금기룰 {row['rule_code']} 위반율이 {row['violation_rate']}에서 {current_rate}로 줄었습니다")
+
+        return improvements or ["지난 주 대비 뚜렷하게 개선된 지표가 없습니다"]
+
+    @staticmethod
+    def _pattern(candidate, worst_rule: Optional[Dict[str, str]], loss: bool) -> Dict:
+        if candidate is None:
+            return {"title": "데이터 부족", "why": "이번 주 집계된 거래가 없습니다", "actions": ["거래 기록을 먼저 쌓으세요"]}
+
+        label, row = candidate
+        why = f"{label} {row['total_trades']}건, 승률 {row['win_rate']}, 총 손익 {row['total_pnl']}, 평균 점수 {row['avg_score']}"
+        if loss:
+            actions = [f"{label} 진입 빈도와 비중을 줄이기", "진입 전 손절 기준과 손익비를 다시 확인하기"]
+            if worst_rule is not None:
+                actions.append(f"금기룰 {worst_rule['rule_code']} 위반 줄이기 (위반율 {worst_rule['violation_rate']})")
+            return {"title": f"{label} 손실", "why": why, "actions": actions}
+        return {
+            "title": f"{label} 수익",
+            "why": why,
+            "actions": [f"{label} 진입 조건을 유지하기", "같은 조건의 거래 기록을 계속 비교하기"],
+        }
+
+
+class _RateLimiter:
+    """분당 허용량 기반 토큰 버킷 (대기 순서대로 통과)"""
+
+    def __init__(self, per_minute: float, clock: Callable[[], float] = time.monotonic):
+        self.capacity = per_minute
+        self._rate = per_minute / 60.0
+        self._clock = clock
+        self._level = per_minute
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount: float = 1) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._level = min(self.capacity, self._level + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._level >= amount:
+                    self._level -= amount
+                    return
+                await asyncio.sleep((amount - self._level) / self._rate)
+
+
+class AnalysisDispatcher:
+    """
+    패턴 분석 호출 디스패처
+
+    - 동시 호출 수(max_concurrency), 분당 요청 수, 분당 토큰 수 제한
+    - 전체 토큰 예산(token_budget)을 넘는 호출은 보내지 않고 TokenBudgetExceededError 발생
+    - 같은 입력의 중복 호출 합치기는 AnalysisCache(llm_cache)가 담당한다
+    """
+
+    def __init__(
+        self,
+        analyzer: PatternAnalyzer,
+        max_concurrency: int = 4,
+        requests_per_minute: Optional[float] = 60,
+        tokens_per_minute: Optional[float] = None,
+        token_budget: Optional[int] = None,
+        max_metrics: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.analyzer = analyzer
+        self.token_budget = token_budget
+        self.tokens_used = 0
+        self._reserved = 0
+        self._clock = clock
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._requests = _RateLimiter(requests_per_minute, clock) if requests_per_minute else None
+        self._tokens = _RateLimiter(tokens_per_minute, clock) if tokens_per_minute else None
+        self.metrics: Deque[Dict] = deque(maxlen=max_metrics)
+        self.calls = 0
+        self.failures = 0
+        self.budget_rejections = 0
+
+    @property
+    def model(self) -> str:
+        return self.analyzer.model
+
+    async def dispatch(self, analysis_data: Dict[str, str]) -> Optional[Dict]:
+        """
+        분석 1건 실행 (제한 대기 후 호출, 백엔드 실패는 None)
+
+        Raises:
+            TokenBudgetExceededError: 예상 토큰까지 더하면 전체 예산을 넘는 경우
+        """
+        estimated = self.analyzer.estimate_tokens(analysis_data)
+        # 진행 중 호출의 예상 토큰까지 예약해 동시 호출이 예산을 함께 넘지 않게 함
+        if self.token_budget is not None and self.tokens_used + self._reserved + estimated > self.token_budget:
+            self.budget_rejections += 1
+            logger.warning(f"토큰 예산 초과로 분석 생략: 사용 {self.tokens_used}/{self.token_budget}, 예상 {estimated}")
+            raise TokenBudgetExceededError(
+                f"토큰 예산 초과: 사용 {self.tokens_used}/{self.token_budget}, 예상 {estimated}"
+            )
+        self._reserved += estimated
+
+        # 대기 중 취소되거나 제한기에서 예외가 나도 예약은 반드시 해제
+        try:
+            async with self._semaphore:
+                if self._requests:
+                    await self._requests.acquire(1)
+                if self._tokens and estimated:
+                    await self._tokens.acquire(estimated)
+
+                started = self._clock()
+                error = None
+                try:
+                    outcome = await self.analyzer.analyze(analysis_data)
+                except Exception as e:
+                    logger.error(f"패턴 분석 백엔드 오류 ({self.analyzer.name}): {e}")
+                    outcome, error = AnalysisOutcome(None), str(e)
+                latency_ms = (self._clock() - started) * 1000
+        finally:
+            self._reserved -= estimated
+
+        self.calls += 1
+        if outcome.result is None:
+            self.failures += 1
+        self.tokens_used += outcome.prompt_tokens + outcome.completion_tokens
+        self.metrics.append({
+            "backend": self.analyzer.name,
+            "model": self.analyzer.model,
+            "latency_ms": round(latency_ms, 1),
+            "prompt_tokens": outcome.prompt_tokens,
+            "completion_tokens": outcome.completion_tokens,
+            "success": outcome.result is not None,
+            "error": error,
+        })
+        return outcome.result
+
+    def summary(self) -> Dict:
+        """누적 호출 수, 토큰 사용량, 최근 호출 지연 분포"""
+        latencies = sorted(m["latency_ms"] for m in self.metrics)
+
+        def percentile(p: float) -> Optional[float]:
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else None
+
+        return {
+            "backend": self.analyzer.name,
+            "model": self.analyzer.model,
+            "calls": self.calls,
+            "failures": self.failures,
+            "budget_rejections": self.budget_rejections,
+            "tokens_used": self.tokens_used,
+            "token_budget": self.token_budget,
+            "latency_ms_p50": percentile(0.5),
+            "latency_ms_p95": percentile(0.95),
+        }
+
+
+def create_analyzer(backend: str) -> PatternAnalyzer:
+    """백엔드 이름으로 분석기 생성 ('openai' 또는 'local')"""
+    if backend == "local":
+        return LocalPatternAnalyzer()
+    if backend != "openai":
+        logger.warning(f"알 수 없는 패턴 분석 백엔드 '{backend}', openai 사용")
+    return OpenAIPatternAnalyzer()
+
+
+def _optional_number(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+# 전역 디스패처 (PATTERN_ANALYZER_BACKEND=local이면 네트워크 없이 동작)
+analysis_dispatcher = AnalysisDispatcher(
+    create_analyzer(os.getenv("PATTERN_ANALYZER_BACKEND", "openai")),
+    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+    requests_per_minute=_optional_number("LLM_REQUESTS_PER_MINUTE") or 60,
+    tokens_per_minute=_optional_number("LLM_TOKENS_PER_MINUTE"),
+    token_budget=int(os.getenv("LLM_TOKEN_BUDGET")) if os.getenv("LLM_TOKEN_BUDGET") else None,
+)
@@ -1,12 +1,128 @@
 # 패턴 분석 결과 DB 저장 기능
-from datetime import date
-from typing import Dict, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 from database import PatternsSummaryWeekly, PatternHistory
+from trade_queries import decode_cursor, encode_cursor
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 
+SAVE_CHUNK_SIZE = 1000  # 문장당 사용자/기간 수 (바인드 파라미터 한도 이내)
+
+# pattern_history에 저장하는 (pattern_type, 분석 결과 필드)
+PATTERN_FIELDS = [("loss", "top_loss_pattern"), ("profit", "top_profit_pattern")]
+
+# 히스토리 응답에 필요한 컬럼만 조회
+HISTORY_COLUMNS = [
+    PatternHistory.id, PatternHistory.period_start, PatternHistory.period_end,
+    PatternHistory.pattern_type, PatternHistory.title, PatternHistory.why,
+    PatternHistory.actions, PatternHistory.summary_id, PatternHistory.created_at,
+]
+
+# (user_id, period_start, period_end, 분석 결과)
+WeeklyAnalysisRow = Tuple[str, date, date, Dict]
+
+def save_weekly_analyses(db: Session, analyses: List[WeeklyAnalysisRow]) -> Dict[Tuple[str, date, date], int]:
+    """
+    여러 사용자의 주간 분석 결과를 일괄 저장 (같은 사용자/기간은 덮어쓰기)
+
+    테이블마다 INSERT ... ON CONFLICT 한 문장으로 저장한다 (SAVE_CHUNK_SIZE명 단위).
+    같은 사용자/기간이 여러 번 들어오면 마지막 결과만 저장한다.
+
+    Returns:
+        {(user_id, period_start, period_end): summary_id}
+
+    Raises:
+        ValueError: user_id가 UUID 형식이 아닌 경우
+        SQLAlchemyError: 저장 실패 (롤백 후 전달)
+    """
+    # 한 문장 안에 같은 충돌 키가 두 번 나오면 ON CONFLICT DO UPDATE가 실패하므로 미리 합침
+    latest: Dict[Tuple[str, date, date], Dict] = {}
+    for user_id, period_start, period_end, analysis_result in analyses:
+        latest[(str(uuid.UUID(str(user_id))), period_start, period_end)] = analysis_result
+
+    keys = list(latest)
+    summary_ids: Dict[Tuple[str, date, date], int] = {}
+    try:
+        for start in range(0, len(keys), SAVE_CHUNK_SIZE):
+            chunk = keys[start:start + SAVE_CHUNK_SIZE]
+            now = datetime.utcnow()
+
+            # 1. patterns_summary_weekly 저장 후 생성/갱신된 행의 ID 회수
+            summary_stmt = insert(PatternsSummaryWeekly).values([
+                {
+                    "user_id": user_id,
+                    "period_start": period_start,
+                    "period_end": period_end,
+                    "summary_json": latest[(user_id, period_start, period_end)],
+                    "created_at": now,
+                }
+                for user_id, period_start, period_end in chunk
+            ])
+            summary_stmt = summary_stmt.on_conflict_do_update(
+                index_elements=[
+                    PatternsSummaryWeekly.user_id,
+                    PatternsSummaryWeekly.period_start,
+                    PatternsSummaryWeekly.period_end,
+                ],
+                set_={
+                    "summary_json": summary_stmt.excluded.summary_json,
+                    "created_at": summary_stmt.excluded.created_at,
+                },
+            ).returning(
+                PatternsSummaryWeekly.id,
+                PatternsSummaryWeekly.user_id,
+                PatternsSummaryWeekly.period_start,
+                PatternsSummaryWeekly.period_end,
+            )
+            for row in db.execute(summary_stmt):
+                summary_ids[(str(row.user_id), row.period_start, row.period_end)] = row.id
+
+            # 2. pattern_history에 손실/수익 패턴 저장
+            history_rows = []
+            for key in chunk:
+                user_id, period_start, period_end = key
+                for pattern_type, field in PATTERN_FIELDS:
+                    pattern_data = latest[key][field]
+                    history_rows.append({
+                        "user_id": user_id,
+                        "period_start": period_start,
+                        "period_end": period_end,
+                        "pattern_type": pattern_type,
+                        "title": pattern_data["title"],
+                        "why": pattern_data["why"],
+                        "actions": pattern_data["actions"],
+                        "summary_id": summary_ids[key],
+                        "created_at": now,
+                    })
+            history_stmt = insert(PatternHistory).values(history_rows)
+            history_stmt = history_stmt.on_conflict_do_update(
+                index_elements=[
+                    PatternHistory.user_id,
+                    PatternHistory.period_start,
+                    PatternHistory.period_end,
+                    PatternHistory.pattern_type,
+                ],
+                set_={
+                    column: getattr(history_stmt.excluded, column)
+                    for column in ("title", "why", "actions", "summary_id", "created_at")
+                },
+            )
+            db.execute(history_stmt)
+
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+
+    logger.info(f"주간 분석 결과 일괄 저장 완료: {len(summary_ids)}건")
+    return summary_ids
+
 def save_weekly_analysis(
     db: Session, 
     user_id: str, 
@@ -16,53 +132,9 @@ def save_weekly_analysis(
 ) -> Optional[int]:
     """주간 분석 결과를 DB에 저장하고 summary_id 반환"""
     try:
-        # 1. patterns_summary_weekly 테이블에 전체 결과 저장
-        summary_record = PatternsSummaryWeekly(
-            user_id=user_id,
-            period_start=period_start,
-            period_end=period_end,
-            summary_json=analysis_result
-        )
-        
-        db.add(summary_record)
-        db.flush()  # ID 생성을 위해 flush
-        
-        summary_id = summary_record.id
-        logger.info(f"주간 분석 요약 저장 완료: summary_id={summary_id}")
-        
-        # 2. pattern_history 테이블에 개별 패턴 저장
-        patterns_to_save = [
-            {
-                "type": "loss",
-                "data": analysis_result["top_loss_pattern"]
-            },
-            {
-                "type": "profit", 
-                "data": analysis_result["top_profit_pattern"]
-            }
-        ]
-        
-        for pattern_info in patterns_to_save:
-            pattern_data = pattern_info["data"]
-            
-            pattern_record = PatternHistory(
-                user_id=user_id,
-                period_start=period_start,
-                period_end=period_end,
-                pattern_type=pattern_info["type"],
-                title=pattern_data["title"],
-                why=pattern_data["why"],
-                actions=pattern_data["actions"],
-                summary_id=summary_id
-            )
-            
-            db.add(pattern_record)
-            logger.info(f"패턴 히스토리 저장: type={pattern_info['type']}, title={pattern_data['title']}")
-        
-        # 커밋
-        db.commit()
-        logger.info(f"주간 분석 결과 저장 완료: user_id={user_id}, period={period_start}~{period_end}")
-        
+        summary_ids = save_weekly_analyses(db, [(user_id, period_start, period_end, analysis_result)])
+        summary_id = next(iter(summary_ids.values()), None)
+        logger.info(f"주간 분석 결과 저장 완료: user_id={user_id}, period={period_start}~{period_end}, summary_id={summary_id}")
         return summary_id
         
     except Exception as e:
@@ -94,39 +166,67 @@ def get_weekly_analysis(
         logger.error(f"주간 분석 결과 조회 실패: {e}")
         return None
 
+def get_pattern_history_page(
+    db: Session,
+    user_id: str,
+    pattern_type: Optional[str] = None,
+    limit: int = 10,
+    cursor: Optional[str] = None
+) -> Tuple[list, Optional[str]]:
+    """
+    패턴 히스토리 한 페이지 조회 (period_end, id 내림차순 키셋 페이지네이션)
+
+    Returns:
+        (히스토리 목록, 다음 페이지 커서 또는 None)
+
+    Raises:
+        ValueError: 커서 형식이 잘못된 경우
+    """
+    query = db.query(*HISTORY_COLUMNS).filter(PatternHistory.user_id == user_id)
+
+    if pattern_type:
+        query = query.filter(PatternHistory.pattern_type == pattern_type)
+
+    if cursor:
+        period_end, history_id = decode_cursor(cursor, date.fromisoformat)
+        query = query.filter(
+            tuple_(PatternHistory.period_end, PatternHistory.id) < tuple_(period_end, history_id)
+        )
+
+    # 다음 페이지 존재 여부 확인용으로 한 건 더 조회
+    rows = query.order_by(
+        PatternHistory.period_end.desc(),
+        PatternHistory.id.desc()
+    ).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    result = [
+        {
+            "id": row.id,
+            "period_start": row.period_start.isoformat(),
+            "period_end": row.period_end.isoformat(),
+            "pattern_type": row.pattern_type,
+            "title": row.title,
+            "why": row.why,
+            "actions": row.actions,
+            "summary_id": row.summary_id,
+            "created_at": row.created_at.isoformat()
+        }
+        for row in rows
+    ]
+    next_cursor = encode_cursor(rows[-1].period_end, rows[-1].id) if has_more else None
+    return result, next_cursor
+
 def get_pattern_history(
     db: Session, 
     user_id: str, 
     pattern_type: Optional[str] = None,
     limit: int = 10
 ) -> list:
-    """패턴 히스토리 조회"""
+    """패턴 히스토리 조회 (첫 페이지)"""
     try:
-        query = db.query(PatternHistory).filter(
-            PatternHistory.user_id == user_id
-        )
-        
-        if pattern_type:
-            query = query.filter(PatternHistory.pattern_type == pattern_type)
-        
-        records = query.order_by(
-            PatternHistory.period_end.desc()
-        ).limit(limit).all()
-        
-        result = []
-        for record in records:
-            result.append({
-                "id": record.id,
-                "period_start": record.period_start.isoformat(),
-                "period_end": record.period_end.isoformat(),
-                "pattern_type": record.pattern_type,
-                "title": record.title,
-                "why": record.why,
-                "actions": record.actions,
-                "summary_id": record.summary_id,
-                "created_at": record.created_at.isoformat()
-            })
-        
+        result, _ = get_pattern_history_page(db, user_id, pattern_type, limit)
         return result
         
     except Exception as e:
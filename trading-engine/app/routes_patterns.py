@@ -1,32 +1,47 @@
 # 패턴 분석 관련 API 라우터
-from datetime import datetime, date
+from datetime import date, timedelta
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from database import get_db, create_tables
+from database import get_db, create_tables_on_startup
 from schemas import (
     WeeklyAnalysisRequest, 
     WeeklyAnalysisResponse, 
     WeeklyAnalysisResult,
     PatternHistoryResponse,
-    PatternHistoryItem
+    PatternHistoryItem,
+    AnalysisJobResponse,
+    BatchAnalysisRequest,
+    BatchAnalysisResponse
 )
-from analytics import generate_weekly_analysis_data
-from llm_analyzer import analyze_patterns_with_gpt, validate_analysis_result
-from pattern_storage import save_weekly_analysis, get_weekly_analysis, get_pattern_history
+from analytics import get_active_user_ids
+from analysis_jobs import analysis_jobs
+from pattern_storage import get_pattern_history_page
+from weekly_analysis import parse_analysis_period, parse_date_range, run_weekly_analysis
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/patterns", tags=["patterns"])
+# 백그라운드 작업 라우터 (작업 상태가 프로세스 메모리에 있어 단일 프로세스에서만 포함)
+jobs_router = APIRouter(prefix="/patterns", tags=["patterns"])
 
 # 애플리케이션 시작 시 테이블 생성
 @router.on_event("startup")
 async def startup_event():
-    create_tables()
+    create_tables_on_startup()
     logger.info("패턴 분석 테이블 생성 완료")
 
+@jobs_router.on_event("startup")
+async def start_analysis_jobs():
+    await analysis_jobs.start()
+
+@jobs_router.on_event("shutdown")
+async def stop_analysis_jobs():
+    await analysis_jobs.stop()
+
 @router.post("/weekly/analyze", response_model=WeeklyAnalysisResponse)
 async def analyze_weekly_patterns(
     request: WeeklyAnalysisRequest,
@@ -35,77 +50,8 @@ async def analyze_weekly_patterns(
 ):
     """주간 거래 패턴 분석 수행"""
     try:
-        # 날짜 파싱
-        try:
-            start_date = datetime.strptime(request.start, "%Y-%m-%d").date()
-            end_date = datetime.strptime(request.end, "%Y-%m-%d").date()
-        except ValueError:
-            raise HTTPException(
-                status_code=400, 
-                detail="날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식을 사용하세요."
-            )
-        
-        # 기간 유효성 검사
-        if start_date >= end_date:
-            raise HTTPException(
-                status_code=400,
-                detail="시작 날짜는 종료 날짜보다 이전이어야 합니다."
-            )
-        
-        # 기존 분석 결과 확인
-        existing_analysis = get_weekly_analysis(db, request.user_id, start_date, end_date)
-        if existing_analysis:
-            logger.info(f"기존 분석 결과 반환: user_id={request.user_id}, period={start_date}~{end_date}")
-            return WeeklyAnalysisResponse(
-                success=True,
-                analysis=WeeklyAnalysisResult(**existing_analysis),
-                message="기존 분석 결과를 반환했습니다."
-            )
-        
-        # 주간 집계 데이터 생성
-        logger.info(f"주간 분석 데이터 생성 시작: user_id={request.user_id}")
-        analysis_data = generate_weekly_analysis_data(db, request.user_id, start_date, end_date)
-        
-        # 데이터 유효성 검사
-        if not any(analysis_data.values()):
-            raise HTTPException(
-                status_code=404,
-                detail="분석할 거래 데이터가 없습니다."
-            )
-        
-        # GPT 분석 수행
-        logger.info("GPT 패턴 분석 시작")
-        gpt_result = await analyze_patterns_with_gpt(analysis_data)
-        
-        if not gpt_result:
-            raise HTTPException(
-                status_code=500,
-                detail="패턴 분석에 실패했습니다. 잠시 후 다시 시도해주세요."
-            )
-        
-        # 결과 유효성 검증
-        if not validate_analysis_result(gpt_result):
-            logger.error(f"GPT 응답 유효성 검증 실패: {gpt_result}")
-            raise HTTPException(
-                status_code=500,
-                detail="분석 결과 형식이 올바르지 않습니다."
-            )
-        
-        # DB 저장
-        summary_id = save_weekly_analysis(db, request.user_id, start_date, end_date, gpt_result)
-        
-        if not summary_id:
-            logger.error("분석 결과 DB 저장 실패")
-            # 저장 실패해도 분석 결과는 반환
-            
-        logger.info(f"주간 패턴 분석 완료: user_id={request.user_id}, summary_id={summary_id}")
-        
-        return WeeklyAnalysisResponse(
-            success=True,
-            summary_id=summary_id,
-            analysis=WeeklyAnalysisResult(**gpt_result),
-            message="주간 패턴 분석이 완료되었습니다."
-        )
+        start_date, end_date = parse_analysis_period(request.user_id, request.start, request.end)
+        return await run_weekly_analysis(db, request.user_id, start_date, end_date)
         
     except HTTPException:
         raise
@@ -116,14 +62,52 @@ async def analyze_weekly_patterns(
             detail="서버 내부 오류가 발생했습니다."
         )
 
+@jobs_router.post("/weekly/jobs", response_model=AnalysisJobResponse, status_code=202)
+async def submit_weekly_analysis_job(request: WeeklyAnalysisRequest):
+    """주간 패턴 분석 작업 등록 (작업 ID 즉시 반환, 결과는 상태 조회로 확인)"""
+    start_date, end_date = parse_analysis_period(request.user_id, request.start, request.end)
+    job = analysis_jobs.submit(request.user_id, start_date, end_date)
+    return job.to_response()
+
+@jobs_router.post("/weekly/jobs/batch", response_model=BatchAnalysisResponse, status_code=202)
+async def submit_weekly_analysis_batch(
+    request: BatchAnalysisRequest,
+    db: Session = Depends(get_db)
+):
+    """기간 내 거래가 있는 모든 사용자의 주간 분석 작업 등록 (주 마감 후 호출, 기본 기간은 지난주 월~일)"""
+    if request.start and request.end:
+        start_date, end_date = parse_date_range(request.start, request.end)
+    elif request.start or request.end:
+        raise HTTPException(status_code=400, detail="start와 end는 함께 지정해야 합니다.")
+    else:
+        this_monday = date.today() - timedelta(days=date.today().weekday())
+        start_date, end_date = this_monday - timedelta(days=7), this_monday - timedelta(days=1)
+    
+    user_ids = await run_in_threadpool(get_active_user_ids, db, start_date, end_date)
+    jobs = [analysis_jobs.submit(user_id, start_date, end_date).to_response() for user_id in user_ids]
+    logger.info(f"주간 분석 일괄 작업 등록: {len(jobs)}명, period={start_date}~{end_date}")
+    return BatchAnalysisResponse(start=start_date.isoformat(), end=end_date.isoformat(), total=len(jobs), jobs=jobs)
+
+@jobs_router.get("/weekly/jobs/{job_id}", response_model=AnalysisJobResponse)
+async def get_weekly_analysis_job(job_id: str):
+    """주간 패턴 분석 작업 상태 및 결과 조회"""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail="요청한 작업을 찾을 수 없습니다."
+        )
+    return job.to_response()
+
 @router.get("/history", response_model=PatternHistoryResponse)
 async def get_patterns_history(
     user_id: str,
     pattern_type: Optional[str] = None,  # 'loss' or 'profit'
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,  # 이전 응답의 next_cursor
     db: Session = Depends(get_db)
 ):
-    """패턴 히스토리 조회"""
+    """패턴 히스토리 조회 (cursor로 다음 페이지 조회)"""
     try:
         # 패턴 타입 유효성 검사
         if pattern_type and pattern_type not in ['loss', 'profit']:
@@ -133,13 +117,17 @@ async def get_patterns_history(
             )
         
         # 히스토리 조회
-        patterns_data = get_pattern_history(db, user_id, pattern_type, limit)
+        try:
+            patterns_data, next_cursor = get_pattern_history_page(db, user_id, pattern_type, limit, cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         patterns = [PatternHistoryItem(**pattern) for pattern in patterns_data]
         
         return PatternHistoryResponse(
             patterns=patterns,
-            total=len(patterns)
+            total=len(patterns),
+            next_cursor=next_cursor
         )
         
     except HTTPException:
@@ -1,59 +1,56 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from datetime import datetime
-from schemas import Trade, CreateTradeRequest, TradesResponse
-from scoring import compute_strategy_score, compute_forbidden_points
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from typing import Literal, Optional
+from schemas import Trade, CreateTradeRequest, TradesResponse, BulkCreateTradesRequest, BulkTradesResponse
 from market_data import market_service
+from trade_import import allocate_trade_ids, build_trade, trade_to_row, import_trades, parse_csv, parse_ndjson
+from trade_rollup import apply_rollup
+from trade_queries import count_trades, invalidate_trade_counts, list_trade_page, parse_user_id
 from sqlalchemy.orm import Session
 from database import get_db, TradeModel
 
 router = APIRouter()
 
+@router.on_event("shutdown")
+async def close_market_data():
+    """시장 데이터 연결 풀 종료"""
+    await market_service.provider.close()
+
 @router.get('/trades', response_model=TradesResponse)
 def list_trades(
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="이전 응답의 nextCursor (지정 시 offset 무시)"),
+    userId: Optional[str] = Query(None),
+    includeDetails: bool = Query(True, description="false면 indicators/strategyScore를 생략"),
     db: Session = Depends(get_db),
 ):
-    query = db.query(TradeModel).order_by(TradeModel.entry_time.desc())
-    total = query.count()
-    records = query.offset(offset).limit(limit).all()
-    trades = [
-        Trade(
-            id=str(t.id),
-            symbol=t.symbol,
-            type=t.type,
-            tradingType=t.trading_type,
-            quantity=t.quantity,
-            entryPrice=t.entry_price,
-            exitPrice=t.exit_price,
-            entryTime=t.entry_time,
-            exitTime=t.exit_time,
-            memo=t.memo,
-            pnl=t.pnl,
-            status=t.status,
-            stopLoss=t.stop_loss,
-            indicators=t.indicators,
-            strategyScore=t.strategy_score,
-            forbiddenPenalty=t.forbidden_penalty,
-            finalScore=t.final_score,
-            createdAt=t.created_at,
-            updatedAt=t.updated_at,
-        )
-        for t in records
-    ]
-    return TradesResponse(trades=trades, total=total, page=(offset // limit) + 1, limit=limit)
+    try:
+        user_id = parse_user_id(userId)
+        trades, next_cursor = list_trade_page(db, limit, cursor, offset, user_id, includeDetails)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total, estimated = count_trades(db, user_id)
+    return TradesResponse(
+        trades=trades,
+        total=total,
+        page=(offset // limit) + 1 if not cursor else 0,
+        limit=limit,
+        totalEstimated=estimated,
+        nextCursor=next_cursor,
+    )
 
 @router.post('/trades', response_model=Trade, status_code=201)
-def create_trade(req: CreateTradeRequest, db: Session = Depends(get_db)):
+async def create_trade(req: CreateTradeRequest, db: Session = Depends(get_db)):
     """거래 생성 및 스코어링 (자동 차트 데이터 연동)"""
-    # 심볼 유효성 검사
-    if not market_service.validate_symbol(req.symbol):
+    # 심볼 유효성 검사 (캐시된 심볼 목록 조회)
+    if not await market_service.validate_symbol(req.symbol):
         raise HTTPException(status_code=400, detail=f"유효하지 않은 심볼입니다: {req.symbol}")
     
     # 자동 기술적 지표 계산 (indicators가 없거나 부분적인 경우)
     auto_indicators = {}
     try:
-        auto_indicators = market_service.get_trade_indicators(
+        auto_indicators = await market_service.get_trade_indicators(
             symbol=req.symbol,
             entry_time=req.entryTime,
             entry_price=req.entryPrice
@@ -61,68 +58,44 @@ def create_trade(req: CreateTradeRequest, db: Session = Depends(get_db)):
     except Exception as e:
         print(f"기술적 지표 자동 계산 실패: {e}")
     
-    # 기존 indicators와 자동 계산된 indicators 병합 (기존 값 우선)
-    final_indicators = auto_indicators.copy()
-    if req.indicators:
-        final_indicators.update({k: v for k, v in req.indicators.dict().items() if v is not None})
-    
-    # 간단 손익 계산
-    pnl = None
-    if req.exitPrice is not None:
-        pnl = (
-            (req.exitPrice - req.entryPrice) * req.quantity
-            if req.type == 'buy'
-            else (req.entryPrice - req.exitPrice) * req.quantity
-        )
+    # 기존 indicators와 자동 계산된 indicators 병합 (기존 값 우선) 후 스코어링
+    # ID는 일괄 등록과 같은 시퀀스에서 발급
+    (trade_id,) = await run_in_threadpool(allocate_trade_ids, db, 1)
+    trade = build_trade(req, str(trade_id), auto_indicators)
+    # 동기 세션 작업은 이벤트 루프 밖에서 실행
+    await run_in_threadpool(_save_trade, db, trade_to_row(trade))
+    invalidate_trade_counts()
+    return trade
 
-    trade = Trade(
-        id=str(int(datetime.utcnow().timestamp() * 1000)),
-        symbol=req.symbol,
-        type=req.type,
-        tradingType=req.tradingType,
-        quantity=req.quantity,
-        entryPrice=req.entryPrice,
-        exitPrice=req.exitPrice,
-        entryTime=req.entryTime,
-        exitTime=req.exitTime,
-        memo=req.memo,
-        pnl=pnl,
-        status='closed' if req.exitPrice is not None else 'open',
-        stopLoss=req.stopLoss,
-        indicators=final_indicators,
-        createdAt=datetime.utcnow(),
-        updatedAt=datetime.utcnow(),
-    )
+def _save_trade(db: Session, row: dict) -> None:
+    """거래 레코드 저장 (일별 집계도 같은 트랜잭션에서 갱신)"""
+    db.add(TradeModel(**row))
+    apply_rollup(db, [row])
+    db.commit()
 
-    strategy = compute_strategy_score(trade)
-    if strategy:
-        trade.strategyScore = strategy
-    forbidden_points = compute_forbidden_points()
-    trade.forbiddenPenalty = 40 - forbidden_points
-    base = strategy.totalScore if strategy else 0
-    trade.finalScore = base + forbidden_points
+@router.post('/trades/bulk', response_model=BulkTradesResponse)
+async def create_trades_bulk(req: BulkCreateTradesRequest, db: Session = Depends(get_db)):
+    """거래 일괄 생성 (심볼별 지표 일괄 계산, 배치 INSERT, 행 단위 오류 보고)"""
+    return await _import(req.trades, db, req.userId)
 
-    db_trade = TradeModel(
-        id=int(trade.id),
-        symbol=trade.symbol,
-        type=trade.type,
-        trading_type=trade.tradingType,
-        quantity=trade.quantity,
-        entry_price=trade.entryPrice,
-        exit_price=trade.exitPrice,
-        entry_time=trade.entryTime,
-        exit_time=trade.exitTime,
-        memo=trade.memo,
-        pnl=trade.pnl,
-        status=trade.status,
-        stop_loss=trade.stopLoss,
-        indicators=trade.indicators.dict() if trade.indicators else None,
-        strategy_score=trade.strategyScore.dict() if trade.strategyScore else None,
-        forbidden_penalty=trade.forbiddenPenalty,
-        final_score=trade.finalScore,
-        created_at=trade.createdAt,
-        updated_at=trade.updatedAt,
-    )
-    db.add(db_trade)
-    db.commit()
-    return trade
+@router.post('/trades/import', response_model=BulkTradesResponse)
+async def import_trades_file(
+    request: Request,
+    format: Literal['csv', 'ndjson'] = Query('csv'),
+    userId: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """CSV/NDJSON 본문으로 거래 일괄 가져오기 (CSV 헤더는 거래 생성 요청 필드명)"""
+    body = (await request.body()).decode('utf-8-sig', errors='replace')
+    items = parse_csv(body) if format == 'csv' else parse_ndjson(body)
+    return await _import(items, db, userId)
+
+async def _import(items, db: Session, user_id: Optional[str]) -> BulkTradesResponse:
+    """일괄 등록 실행 (건수 초과는 413)"""
+    try:
+        result = await import_trades(items, db, user_id)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if result.inserted:
+        invalidate_trade_counts(user_id)
+    return result
@@ -87,6 +87,8 @@ class TradesResponse(BaseModel):
     total: int
     page: int
     limit: int
+    totalEstimated: bool = False  # total이 캐시된 통계 추정치인 경우
+    nextCursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
 
 # 주간 패턴 분석 스키마
 class WeeklyAnalysisRequest(BaseModel):
@@ -110,6 +112,29 @@ class WeeklyAnalysisResponse(BaseModel):
     analysis: Optional[WeeklyAnalysisResult] = None
     message: Optional[str] = None
 
+# 주간 패턴 분석 작업 스키마
+class AnalysisJobResponse(BaseModel):
+    job_id: str
+    status: Literal['queued', 'running', 'retrying', 'succeeded', 'failed']
+    user_id: str
+    start: str
+    end: str
+    attempts: int
+    result: Optional[WeeklyAnalysisResponse] = None
+    error: Optional[str] = None
+    created_at: str
+    updated_at: str
+
+class BatchAnalysisRequest(BaseModel):
+    start: Optional[str] = None  # YYYY-MM-DD, 생략 시 지난주 월요일
+    end: Optional[str] = None    # YYYY-MM-DD, 생략 시 지난주 일요일
+
+class BatchAnalysisResponse(BaseModel):
+    start: str
+    end: str
+    total: int
+    jobs: List[AnalysisJobResponse]
+
 class PatternHistoryItem(BaseModel):
     id: int
     period_start: str
@@ -123,4 +148,22 @@ class PatternHistoryItem(BaseModel):
 
 class PatternHistoryResponse(BaseModel):
     patterns: List[PatternHistoryItem]
-    total: int
\ No newline at end of file
+    total: int
+    next_cursor: Optional[str] = None  # 다음 페이지가 없으면 None
+
+# 거래 일괄 등록 스키마
+class BulkCreateTradesRequest(BaseModel):
+    trades: List[Dict[str, Any]]  # 행 단위로 검증하여 일부 오류가 전체 요청을 막지 않도록 함
+    userId: Optional[str] = None
+
+class BulkTradeRowResult(BaseModel):
+    index: int
+    success: bool
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkTradesResponse(BaseModel):
+    total: int
+    inserted: int
+    failed: int
+    results: List[BulkTradeRowResult]
@@ -1,5 +1,6 @@
 from datetime import datetime
-from typing import List
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+import numpy as np
 from schemas import Trade, Indicators, StrategyScoreResult, StrategyCriterionScore
 
 TOTAL_STRATEGY_POINTS = 60
@@ -26,12 +27,49 @@ TREND_WEIGHTS = {
     'trail_stop_quality': 0.25,
 }
 
+STRATEGY_WEIGHTS = {
+    'breakout': BREAKOUT_WEIGHTS,
+    'trend': TREND_WEIGHTS,
+    'counter_trend': COUNTER_TREND_WEIGHTS,
+}
+CRITERION_DESCRIPTIONS = {
+    'breakout': {
+        'volume_confirmed': '돌파봉 거래량 증가',
+        'breakout_validity': '박스/추세선 돌파 유효성',
+        'pullback_control': '돌파 실패 시 손실 제한',
+        'entry_candle_quality': '엔트리 캔들 품질(윗꼬리)',
+    },
+    'trend': {
+        'htf_alignment': '상위 TF 추세 일치',
+        'htf_alignment2': '보조 상위 TF 추세 일치',
+        'pullback_entry': '되돌림 후 진입',
+        'trail_stop_quality': '트레일링 스탑 품질',
+    },
+    'counter_trend': {
+        'extreme_deviation': '극단 이탈 진입',
+        'reversion_confirmation': '반전 신호 확인',
+        'tight_rr': '짧은 손절로 RR 확보',
+        'entry_candle_quality': '엔트리 캔들 품질',
+        'bollinger_position': '볼린저 밴드 위치',
+    },
+}
+
+# 기준별 점수 사다리: (임계값, 만점 대비 비율) 내림차순, 행 단위/배치 스코어러 공용
+BREAKOUT_VOLUME_LADDER = [(1.5, 1.0), (1.4, 0.83), (1.3, 0.66), (1.2, 0.5), (1.1, 0.33)]  # 거래량/평균 거래량
+BREAKOUT_OVER_LADDER = [(0.02, 1.0), (0.015, 0.8), (0.01, 0.6), (0.005, 0.4)]  # 기준가 대비 돌파 폭
+STOP_LOSS_LADDER = [(1 - 0.02, 1.0), (1 - 0.025, 0.8), (1 - 0.03, 0.6)]  # 1 - 손절 폭 비율
+WICK_LADDER = [(1 - 0.0, 1.0), (1 - 0.2, 0.8), (1 - 0.3, 0.6), (1 - 0.5, 0.3)]  # 1 - 꼬리 비율
+
 def clamp(v: float, lo: float = 0.0, hi: float = 100.0) -> float:
     return max(lo, min(hi, v))
 
 def max_points(weight: float) -> int:
     return round(TOTAL_STRATEGY_POINTS * weight)
 
+def ladder(max_pts: int, steps: list[tuple[float, float]]) -> list[tuple[float, int]]:
+    """비율 사다리를 점수 임계값 목록으로 변환"""
+    return [(threshold, round(max_pts * fraction)) for threshold, fraction in steps]
+
 def score_by_thresholds(value: float, thresholds: list[tuple[float, int]], default_score: int = 0) -> int:
     for threshold, score in thresholds:
         if value >= threshold:
@@ -49,6 +87,7 @@ def breakout_reference(ind: Indicators) -> float | None:
 
 def score_breakout(trade: Trade, ind: Indicators) -> StrategyScoreResult:
     crits: List[StrategyCriterionScore] = []
+    desc = CRITERION_DESCRIPTIONS['breakout']
 
     # 1) 거래량
     vol_max = max_points(BREAKOUT_WEIGHTS['volume_confirmed'])
@@ -57,15 +96,9 @@ def score_breakout(trade: Trade, ind: Indicators) -> StrategyScoreResult:
     if ind.volume is not None and ind.averageVolume and ind.averageVolume > 0:
         ratio = ind.volume / ind.averageVolume
         vol_ratio = clamp(ratio / 1.5, 0, 1)
-        vol_score = score_by_thresholds(ratio, [
-            (1.5, vol_max),
-            (1.4, round(vol_max * 0.83)),
-            (1.3, round(vol_max * 0.66)),
-            (1.2, round(vol_max * 0.5)),
-            (1.1, round(vol_max * 0.33)),
-        ], 0)
+        vol_score = score_by_thresholds(ratio, ladder(vol_max, BREAKOUT_VOLUME_LADDER), 0)
     crits.append(StrategyCriterionScore(
-        code='volume_confirmed', description='돌파봉 거래량 증가', weight=BREAKOUT_WEIGHTS['volume_confirmed'],
+        code='volume_confirmed', description=desc['volume_confirmed'], weight=BREAKOUT_WEIGHTS['volume_confirmed'],
         ratio=round(vol_ratio, 2), score=vol_score, maxPoints=vol_max
     ))
 
@@ -78,14 +111,9 @@ def score_breakout(trade: Trade, ind: Indicators) -> StrategyScoreResult:
         over = trade.entryPrice - ref
         over_ratio = over / ref
         brk_ratio = clamp(over_ratio / 0.01, 0, 1)
-        brk_score = score_by_thresholds(over_ratio, [
-            (0.02, brk_max),
-            (0.015, round(brk_max * 0.8)),
-            (0.01, round(brk_max * 0.6)),
-            (0.005, round(brk_max * 0.4)),
-        ], 0)
+        brk_score = score_by_thresholds(over_ratio, ladder(brk_max, BREAKOUT_OVER_LADDER), 0)
     crits.append(StrategyCriterionScore(
-        code='breakout_validity', description='박스/추세선 돌파 유효성', weight=BREAKOUT_WEIGHTS['breakout_validity'],
+        code='breakout_validity', description=desc['breakout_validity'], weight=BREAKOUT_WEIGHTS['breakout_validity'],
         ratio=round(brk_ratio, 2), score=brk_score, maxPoints=brk_max
     ))
 
@@ -99,16 +127,12 @@ def score_breakout(trade: Trade, ind: Indicators) -> StrategyScoreResult:
     if trade.stopLoss is not None:
         sl_ratio = abs(trade.entryPrice - trade.stopLoss) / trade.entryPrice
         pb_ratio = clamp(0.02 / max(sl_ratio, 0.0001), 0, 1)
-        pb_score = score_by_thresholds(1 - sl_ratio, [
-            (1 - 0.02, pb_max),
-            (1 - 0.025, round(pb_max * 0.8)),
-            (1 - 0.03, round(pb_max * 0.6)),
-        ], round(pb_max * 0.5) if within else 0)
+        pb_score = score_by_thresholds(1 - sl_ratio, ladder(pb_max, STOP_LOSS_LADDER), round(pb_max * 0.5) if within else 0)
     elif within:
         pb_ratio = 1.0
         pb_score = pb_max
     crits.append(StrategyCriterionScore(
-        code='pullback_control', description='돌파 실패 시 손실 제한', weight=BREAKOUT_WEIGHTS['pullback_control'],
+        code='pullback_control', description=desc['pullback_control'], weight=BREAKOUT_WEIGHTS['pullback_control'],
         ratio=round(pb_ratio, 2), score=pb_score, maxPoints=pb_max
     ))
 
@@ -120,14 +144,9 @@ def score_breakout(trade: Trade, ind: Indicators) -> StrategyScoreResult:
         # upper wick 0 → 만점, 0.2 → 80%, 0.3 → 60%, 0.5 → 30%
         w = ind.entryCandleUpperWickRatio
         ec_ratio = clamp(1 - w / 0.2, 0, 1)  # 0.2를 기준 만점 스케일
-        ec_score = score_by_thresholds(1 - w, [
-            (1 - 0.0, ec_max),
-            (1 - 0.2, round(ec_max * 0.8)),
-            (1 - 0.3, round(ec_max * 0.6)),
-            (1 - 0.5, round(ec_max * 0.3)),
-        ], 0)
+        ec_score = score_by_thresholds(1 - w, ladder(ec_max, WICK_LADDER), 0)
     crits.append(StrategyCriterionScore(
-        code='entry_candle_quality', description='엔트리 캔들 품질(윗꼬리)', weight=BREAKOUT_WEIGHTS['entry_candle_quality'],
+        code='entry_candle_quality', description=desc['entry_candle_quality'], weight=BREAKOUT_WEIGHTS['entry_candle_quality'],
         ratio=round(ec_ratio, 2), score=ec_score, maxPoints=ec_max
     ))
 
@@ -136,33 +155,34 @@ def score_breakout(trade: Trade, ind: Indicators) -> StrategyScoreResult:
 
 def score_trend(trade: Trade, ind: Indicators) -> StrategyScoreResult:
     crits: List[StrategyCriterionScore] = []
+    desc = CRITERION_DESCRIPTIONS['trend']
 
     align_max = max_points(TREND_WEIGHTS['htf_alignment'])
     expected = 'up' if trade.type == 'buy' else 'down'
     aligned = 1.0 if ind.htfTrend == expected else 0.0
     crits.append(StrategyCriterionScore(
-        code='htf_alignment', description='상위 TF 추세 일치', weight=TREND_WEIGHTS['htf_alignment'],
+        code='htf_alignment', description=desc['htf_alignment'], weight=TREND_WEIGHTS['htf_alignment'],
         ratio=aligned, score=round(align_max * aligned), maxPoints=align_max
     ))
 
     align2_max = max_points(TREND_WEIGHTS['htf_alignment2'])
     aligned2 = 1.0 if ind.htfTrend2 == expected else 0.0
     crits.append(StrategyCriterionScore(
-        code='htf_alignment2', description='보조 상위 TF 추세 일치', weight=TREND_WEIGHTS['htf_alignment2'],
+        code='htf_alignment2', description=desc['htf_alignment2'], weight=TREND_WEIGHTS['htf_alignment2'],
         ratio=aligned2, score=round(align2_max * aligned2), maxPoints=align2_max
     ))
 
     pull_max = max_points(TREND_WEIGHTS['pullback_entry'])
     pull = 1.0 if ind.pullbackOk else 0.0
     crits.append(StrategyCriterionScore(
-        code='pullback_entry', description='되돌림 후 진입', weight=TREND_WEIGHTS['pullback_entry'],
+        code='pullback_entry', description=desc['pullback_entry'], weight=TREND_WEIGHTS['pullback_entry'],
         ratio=pull, score=round(pull_max * pull), maxPoints=pull_max
     ))
 
     ts_max = max_points(TREND_WEIGHTS['trail_stop_quality'])
     ts = 1.0 if ind.trailStopCorrect else 0.0
     crits.append(StrategyCriterionScore(
-        code='trail_stop_quality', description='트레일링 스탑 품질', weight=TREND_WEIGHTS['trail_stop_quality'],
+        code='trail_stop_quality', description=desc['trail_stop_quality'], weight=TREND_WEIGHTS['trail_stop_quality'],
         ratio=ts, score=round(ts_max * ts), maxPoints=ts_max
     ))
 
@@ -171,25 +191,26 @@ def score_trend(trade: Trade, ind: Indicators) -> StrategyScoreResult:
 
 def score_counter(trade: Trade, ind: Indicators) -> StrategyScoreResult:
     crits: List[StrategyCriterionScore] = []
+    desc = CRITERION_DESCRIPTIONS['counter_trend']
 
     dev_max = max_points(COUNTER_TREND_WEIGHTS['extreme_deviation'])
     dev_ratio = clamp(((ind.zscore or 0) - 2) / 1, 0, 1)
     crits.append(StrategyCriterionScore(
-        code='extreme_deviation', description='극단 이탈 진입', weight=COUNTER_TREND_WEIGHTS['extreme_deviation'],
+        code='extreme_deviation', description=desc['extreme_deviation'], weight=COUNTER_TREND_WEIGHTS['extreme_deviation'],
         ratio=round(dev_ratio, 2), score=round(dev_max * dev_ratio), maxPoints=dev_max
     ))
 
     rev_max = max_points(COUNTER_TREND_WEIGHTS['reversion_confirmation'])
     rev = 1.0 if ind.reversalSignal else 0.0
     crits.append(StrategyCriterionScore(
-        code='reversion_confirmation', description='반전 신호 확인', weight=COUNTER_TREND_WEIGHTS['reversion_confirmation'],
+        code='reversion_confirmation', description=desc['reversion_confirmation'], weight=COUNTER_TREND_WEIGHTS['reversion_confirmation'],
         ratio=rev, score=round(rev_max * rev), maxPoints=rev_max
     ))
 
     rr_max = max_points(COUNTER_TREND_WEIGHTS['tight_rr'])
     rr_ratio = clamp(((ind.riskReward or 0) - 1.5) / 0.5, 0, 1)
     crits.append(StrategyCriterionScore(
-        code='tight_rr', description='짧은 손절로 RR 확보', weight=COUNTER_TREND_WEIGHTS['tight_rr'],
+        code='tight_rr', description=desc['tight_rr'], weight=COUNTER_TREND_WEIGHTS['tight_rr'],
         ratio=round(rr_ratio, 2), score=round(rr_max * rr_ratio), maxPoints=rr_max
     ))
 
@@ -201,14 +222,9 @@ def score_counter(trade: Trade, ind: Indicators) -> StrategyScoreResult:
     if wick is not None and wick >= 0:
         # wick 0 → 만점, 0.2 → 80%, 0.3 → 60%, 0.5 → 30%
         ec_ratio = clamp(1 - wick / 0.2, 0, 1)
-        ec_score = score_by_thresholds(1 - wick, [
-            (1 - 0.0, ec_max),
-            (1 - 0.2, round(ec_max * 0.8)),
-            (1 - 0.3, round(ec_max * 0.6)),
-            (1 - 0.5, round(ec_max * 0.3)),
-        ], 0)
+        ec_score = score_by_thresholds(1 - wick, ladder(ec_max, WICK_LADDER), 0)
     crits.append(StrategyCriterionScore(
-        code='entry_candle_quality', description='엔트리 캔들 품질', weight=COUNTER_TREND_WEIGHTS['entry_candle_quality'],
+        code='entry_candle_quality', description=desc['entry_candle_quality'], weight=COUNTER_TREND_WEIGHTS['entry_candle_quality'],
         ratio=round(ec_ratio, 2), score=ec_score, maxPoints=ec_max
     ))
 
@@ -225,7 +241,7 @@ def score_counter(trade: Trade, ind: Indicators) -> StrategyScoreResult:
             bp_ratio = clamp(ind.bollingerPercent, 0, 1)
         bp_score = round(bp_max * bp_ratio)
     crits.append(StrategyCriterionScore(
-        code='bollinger_position', description='볼린저 밴드 위치', weight=COUNTER_TREND_WEIGHTS['bollinger_position'],
+        code='bollinger_position', description=desc['bollinger_position'], weight=COUNTER_TREND_WEIGHTS['bollinger_position'],
         ratio=round(bp_ratio, 2), score=bp_score, maxPoints=bp_max
     ))
 
@@ -242,6 +258,177 @@ def compute_strategy_score(trade: Trade) -> StrategyScoreResult | None:
         return score_counter(trade, ind)
     return None
 
+# ---- 열 단위 배치 스코어링 (가중치 변경 후 재스코어링/백필용, 행 단위 함수와 결과 동일) ----
+# 입력은 필드별 배열: 값 없음(None)은 NaN, bool 필드는 1.0/0.0/NaN, 추세 필드(htfTrend 등)와 side는 object 배열
+
+CATEGORICAL_FIELDS = {'htfTrend', 'htfTrend2'}
+
+class BatchScores(NamedTuple):
+    strategy: str
+    criteria: Dict[str, Tuple[np.ndarray, np.ndarray]]  # code -> (ratio, score), 기준 정의 순서
+    total: np.ndarray
+
+def batch_columns(
+    sides: Sequence[str],
+    entry_prices: Sequence[float],
+    stop_losses: Sequence[Optional[float]],
+    indicators: Sequence[Optional[Mapping[str, Any]]],
+) -> Dict[str, np.ndarray]:
+    """거래별 값(지표는 Indicators 필드 딕셔너리)을 배치 스코어러 입력 배열로 변환"""
+    cols = {
+        'side': np.array(sides, dtype=object),
+        'entryPrice': np.array(entry_prices, dtype=float),
+        'stopLoss': np.array(stop_losses, dtype=float),
+    }
+    for field in Indicators.model_fields:
+        values = [(ind or {}).get(field) for ind in indicators]
+        cols[field] = np.array(values, dtype=object if field in CATEGORICAL_FIELDS else float)
+    return cols
+
+def ladder_scores(values: np.ndarray, thresholds: list[tuple[float, int]], default_score: Any = 0) -> np.ndarray:
+    """score_by_thresholds 배열 버전 (NaN 입력은 호출 측에서 마스킹)"""
+    # 내림차순 임계값 중 값 이하인 가장 큰 임계값의 점수 = 오름차순 searchsorted 위치
+    ascending = np.array([t for t, _ in reversed(thresholds)])
+    table = np.array([0] + [score for _, score in reversed(thresholds)])
+    idx = np.searchsorted(ascending, values, side='right')
+    return np.where(idx == 0, default_score, table[idx])
+
+def _round_points(max_pts: int, ratio: np.ndarray) -> np.ndarray:
+    # round()와 같은 반올림(짝수 반올림)
+    return np.round(max_pts * ratio).astype(int)
+
+def _flag(values: np.ndarray) -> np.ndarray:
+    # bool 필드가 True인 경우만 1.0 (None/False는 0.0)
+    return (values == 1.0).astype(float)
+
+def score_breakout_batch(cols: Dict[str, np.ndarray]) -> BatchScores:
+    entry, stop = cols['entryPrice'], cols['stopLoss']
+
+    # 1) 거래량
+    vol_max = max_points(BREAKOUT_WEIGHTS['volume_confirmed'])
+    avg = cols['averageVolume']
+    valid = ~np.isnan(cols['volume']) & (avg > 0)
+    ratio = cols['volume'] / np.where(valid, avg, 1.0)
+    vol_ratio = np.where(valid, np.clip(ratio / 1.5, 0, 1), 0.0)
+    vol_score = np.where(valid, ladder_scores(ratio, ladder(vol_max, BREAKOUT_VOLUME_LADDER)), 0)
+
+    # 2) 돌파 유효성 (breakout_reference와 동일한 기준가)
+    brk_max = max_points(BREAKOUT_WEIGHTS['breakout_validity'])
+    base = np.fmax(cols['prevRangeHigh'], cols['trendlineHigh'])
+    atr = cols['atr']
+    ref = np.where(atr > 0, base + atr * 0.1, base * (1.001))
+    valid = ref > 0
+    over_ratio = (entry - ref) / np.where(valid, ref, 1.0)
+    brk_ratio = np.where(valid, np.clip(over_ratio / 0.01, 0, 1), 0.0)
+    brk_score = np.where(valid, ladder_scores(over_ratio, ladder(brk_max, BREAKOUT_OVER_LADDER)), 0)
+
+    # 3) 손실 제한
+    pb_max = max_points(BREAKOUT_WEIGHTS['pullback_control'])
+    has_stop = ~np.isnan(stop)
+    sl_ratio = np.abs(entry - stop) / entry
+    within = _flag(cols['stopLossWithinLimit']).astype(bool) | (has_stop & (sl_ratio <= 0.02))
+    pb_ratio = np.where(
+        has_stop, np.clip(0.02 / np.maximum(sl_ratio, 0.0001), 0, 1), np.where(within, 1.0, 0.0)
+    )
+    pb_score = np.where(
+        has_stop,
+        ladder_scores(1 - sl_ratio, ladder(pb_max, STOP_LOSS_LADDER), np.where(within, round(pb_max * 0.5), 0)),
+        np.where(within, pb_max, 0),
+    )
+
+    # 4) 엔트리 캔들 품질(윗꼬리)
+    ec_max = max_points(BREAKOUT_WEIGHTS['entry_candle_quality'])
+    w = cols['entryCandleUpperWickRatio']
+    valid = w >= 0
+    ec_ratio = np.where(valid, np.clip(1 - w / 0.2, 0, 1), 0.0)
+    ec_score = np.where(valid, ladder_scores(1 - w, ladder(ec_max, WICK_LADDER)), 0)
+
+    return _batch_result('breakout', {
+        'volume_confirmed': (vol_ratio, vol_score),
+        'breakout_validity': (brk_ratio, brk_score),
+        'pullback_control': (pb_ratio, pb_score),
+        'entry_candle_quality': (ec_ratio, ec_score),
+    })
+
+def score_trend_batch(cols: Dict[str, np.ndarray]) -> BatchScores:
+    expected = np.where(cols['side'] == 'buy', 'up', 'down')
+    ratios = {
+        'htf_alignment': (cols['htfTrend'] == expected).astype(float),
+        'htf_alignment2': (cols['htfTrend2'] == expected).astype(float),
+        'pullback_entry': _flag(cols['pullbackOk']),
+        'trail_stop_quality': _flag(cols['trailStopCorrect']),
+    }
+    return _batch_result('trend', {
+        code: (ratio, _round_points(max_points(TREND_WEIGHTS[code]), ratio)) for code, ratio in ratios.items()
+    })
+
+def score_counter_batch(cols: Dict[str, np.ndarray]) -> BatchScores:
+    buy = cols['side'] == 'buy'
+    crits = {}
+
+    dev_ratio = np.clip((np.nan_to_num(cols['zscore']) - 2) / 1, 0, 1)
+    crits['extreme_deviation'] = (dev_ratio, _round_points(max_points(COUNTER_TREND_WEIGHTS['extreme_deviation']), dev_ratio))
+
+    rev = _flag(cols['reversalSignal'])
+    crits['reversion_confirmation'] = (rev, _round_points(max_points(COUNTER_TREND_WEIGHTS['reversion_confirmation']), rev))
+
+    rr_ratio = np.clip((np.nan_to_num(cols['riskReward']) - 1.5) / 0.5, 0, 1)
+    crits['tight_rr'] = (rr_ratio, _round_points(max_points(COUNTER_TREND_WEIGHTS['tight_rr']), rr_ratio))
+
+    # 엔트리 캔들 품질(롱: 아랫꼬리, 숏: 윗꼬리)
+    ec_max = max_points(COUNTER_TREND_WEIGHTS['entry_candle_quality'])
+    wick = np.where(buy, cols['entryCandleLowerWickRatio'], cols['entryCandleUpperWickRatio'])
+    valid = wick >= 0
+    ec_ratio = np.where(valid, np.clip(1 - wick / 0.2, 0, 1), 0.0)
+    ec_score = np.where(valid, ladder_scores(1 - wick, ladder(ec_max, WICK_LADDER)), 0)
+    crits['entry_candle_quality'] = (ec_ratio, ec_score)
+
+    # 볼린저 포지션(롱: 하단 근접, 숏: 상단 근접)
+    bp = cols['bollingerPercent']
+    valid = ~np.isnan(bp)
+    bp_ratio = np.where(valid, np.where(buy, np.clip(1 - bp, 0, 1), np.clip(bp, 0, 1)), 0.0)
+    bp_score = np.where(valid, _round_points(max_points(COUNTER_TREND_WEIGHTS['bollinger_position']), bp_ratio), 0)
+    crits['bollinger_position'] = (bp_ratio, bp_score)
+
+    return _batch_result('counter_trend', crits)
+
+def _batch_result(strategy: str, crits: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> BatchScores:
+    crits = {code: (ratio, score.astype(int)) for code, (ratio, score) in crits.items()}
+    total = np.clip(sum(score for _, score in crits.values()), 0, TOTAL_STRATEGY_POINTS).astype(int)
+    return BatchScores(strategy=strategy, criteria=crits, total=total)
+
+BATCH_SCORERS = {
+    'breakout': score_breakout_batch,
+    'trend': score_trend_batch,
+    'counter_trend': score_counter_batch,
+}
+
+def score_batch(trading_type: str, cols: Dict[str, np.ndarray]) -> BatchScores:
+    """같은 전략 거래들의 기준별/총점 배열 계산 (0으로 나누기 등 경고는 마스킹된 값이므로 무시)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return BATCH_SCORERS[trading_type](cols)
+
+def batch_score_dicts(batch: BatchScores) -> List[Dict[str, Any]]:
+    """배치 결과를 거래별 StrategyScoreResult 딕셔너리(strategy_score 컬럼 형식)로 변환"""
+    weights = STRATEGY_WEIGHTS[batch.strategy]
+    descriptions = CRITERION_DESCRIPTIONS[batch.strategy]
+    columns = [
+        (code, descriptions[code], weights[code], max_points(weights[code]), ratio.tolist(), score.tolist())
+        for code, (ratio, score) in batch.criteria.items()
+    ]
+    return [
+        {
+            'strategy': batch.strategy,
+            'totalScore': total,
+            'criteria': [
+                {'code': code, 'description': desc, 'weight': weight,
+                 'ratio': round(ratios[i], 2), 'score': scores[i], 'maxPoints': max_pts}
+                for code, desc, weight, max_pts, ratios, scores in columns
+            ],
+        }
+        for i, total in enumerate(batch.total.tolist())
+    ]
+
 # 금기룰 점수는 추후 실제 규칙 엔진 도입 시 교체 (현재는 프론트와 동일 컨셉)
 from schemas import StrategyScoreResult  # for typing reuse
 
@@ -0,0 +1,255 @@
+# 거래 일괄 등록
+# 심볼별로 캔들 구간을 한 번만 조회해 지표를 한꺼번에 계산하고, 배치 INSERT로 저장한다.
+# 행 단위 오류(검증 실패, 잘못된 심볼, DB 제약 위반)는 결과에 기록하고 나머지 행은 계속 처리한다.
+import asyncio
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import insert, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from database import TRADE_ID_SEQUENCE, TradeModel
+from market_data import market_service
+from schemas import BulkTradeRowResult, BulkTradesResponse, CreateTradeRequest, Trade
+from scoring import compute_forbidden_points, compute_strategy_score
+from trade_rollup import apply_rollup, to_utc_naive
+
+logger = logging.getLogger(__name__)
+
+MAX_BULK_TRADES = 5000
+INSERT_CHUNK_SIZE = 1000
+
+
+def build_trade(req: CreateTradeRequest, trade_id: str, auto_indicators: Dict) -> Trade:
+    """요청과 자동 계산 지표로 거래 생성 및 스코어링 (요청에 있는 지표 값 우선)"""
+    final_indicators = auto_indicators.copy()
+    if req.indicators:
+        final_indicators.update({k: v for k, v in req.indicators.dict().items() if v is not None})
+
+    # 간단 손익 계산
+    pnl = None
+    if req.exitPrice is not None:
+        pnl = (
+            (req.exitPrice - req.entryPrice) * req.quantity
+            if req.type == 'buy'
+            else (req.entryPrice - req.exitPrice) * req.quantity
+        )
+
+    trade = Trade(
+        id=trade_id,
+        symbol=req.symbol,
+        type=req.type,
+        tradingType=req.tradingType,
+        quantity=req.quantity,
+        entryPrice=req.entryPrice,
+        exitPrice=req.exitPrice,
+        entryTime=req.entryTime,
+        exitTime=req.exitTime,
+        memo=req.memo,
+        pnl=pnl,
+        status='closed' if req.exitPrice is not None else 'open',
+        stopLoss=req.stopLoss,
+        indicators=final_indicators,
+        createdAt=datetime.utcnow(),
+        updatedAt=datetime.utcnow(),
+    )
+
+    strategy = compute_strategy_score(trade)
+    if strategy:
+        trade.strategyScore = strategy
+    forbidden_points = compute_forbidden_points()
+    trade.forbiddenPenalty = 40 - forbidden_points
+    base = strategy.totalScore if strategy else 0
+    trade.finalScore = base + forbidden_points
+    return trade
+
+
+def trade_to_row(trade: Trade, user_id: Optional[str] = None) -> Dict[str, Any]:
+    """Trade를 trades 테이블 컬럼 값 딕셔너리로 변환"""
+    row = {
+        "id": int(trade.id),
+        "symbol": trade.symbol,
+        "type": trade.type,
+        "trading_type": trade.tradingType,
+        "quantity": trade.quantity,
+        "entry_price": trade.entryPrice,
+        "exit_price": trade.exitPrice,
+        # 저장 컬럼은 타임존 없는 UTC 시각 (세션 타임존에 따라 값이 바뀌지 않도록 미리 변환)
+        "entry_time": to_utc_naive(trade.entryTime),
+        "exit_time": to_utc_naive(trade.exitTime),
+        "memo": trade.memo,
+        "pnl": trade.pnl,
+        "status": trade.status,
+        "stop_loss": trade.stopLoss,
+        "indicators": trade.indicators.dict() if trade.indicators else None,
+        "strategy_score": trade.strategyScore.dict() if trade.strategyScore else None,
+        "forbidden_penalty": trade.forbiddenPenalty,
+        "final_score": trade.finalScore,
+        "created_at": trade.createdAt,
+        "updated_at": trade.updatedAt,
+    }
+    if user_id is not None:
+        row["user_id"] = user_id
+    return row
+
+
+def parse_csv(text: str) -> List[Any]:
+    """
+    CSV 본문을 거래 딕셔너리 목록으로 변환
+
+    헤더는 CreateTradeRequest 필드명을 사용하고, 빈 칸은 값 없음으로 본다.
+    indicators 컬럼은 JSON 객체 문자열이다. 해석할 수 없는 행은 예외 객체로 남겨 행 단위 오류로 보고한다.
+    """
+    items: List[Any] = []
+    for record in csv.DictReader(io.StringIO(text)):
+        item = {k.strip(): v.strip() for k, v in record.items() if k and v is not None and v.strip() != ""}
+        if "indicators" in item:
+            try:
+                item["indicators"] = json.loads(item["indicators"])
+            except json.JSONDecodeError as e:
+                items.append(ValueError(f"indicators JSON 파싱 실패: {e}"))
+                continue
+        items.append(item)
+    return items
+
+
+def parse_ndjson(text: str) -> List[Any]:
+    """NDJSON 본문(한 줄에 거래 하나)을 거래 딕셔너리 목록으로 변환 (빈 줄은 무시)"""
+    items: List[Any] = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            items.append(ValueError(f"JSON 파싱 실패: {e}"))
+            continue
+        items.append(item if isinstance(item, dict) else ValueError("거래는 JSON 객체여야 합니다"))
+    return items
+
+
+def _validation_message(error: ValidationError) -> str:
+    """pydantic 검증 오류를 한 줄 메시지로 요약"""
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors())
+
+
+async def import_trades(items: List[Any], db: Session, user_id: Optional[str] = None) -> BulkTradesResponse:
+    """
+    거래 일괄 생성
+
+    1. 행별 요청 검증 (실패 행은 오류로 기록)
+    2. 심볼별로 묶어 심볼 검증과 지표 계산을 심볼당 한 번씩 수행 (심볼 간에는 동시 실행)
+    3. 스코어링 후 청크 단위 배치 INSERT, 한 번만 커밋
+
+    Raises:
+        ValueError: 요청 건수가 MAX_BULK_TRADES를 넘는 경우
+    """
+    if len(items) > MAX_BULK_TRADES:
+        raise ValueError(f"한 번에 등록할 수 있는 거래는 최대 {MAX_BULK_TRADES}건입니다 (요청 {len(items)}건)")
+
+    errors: Dict[int, str] = {}
+    by_symbol: Dict[str, List[Tuple[int, CreateTradeRequest]]] = {}
+    for index, item in enumerate(items):
+        if isinstance(item, Exception):
+            errors[index] = str(item)
+            continue
+        try:
+            req = CreateTradeRequest(**item)
+        except ValidationError as e:
+            errors[index] = _validation_message(e)
+            continue
+        by_symbol.setdefault(req.symbol.upper(), []).append((index, req))
+
+    async def indicators_for(symbol: str, group: List[Tuple[int, CreateTradeRequest]]) -> Optional[List[Dict]]:
+        if not await market_service.validate_symbol(symbol):
+            return None
+        return await market_service.get_trade_indicators_batch(
+            symbol, [(req.entryTime, req.entryPrice) for _, req in group]
+        )
+
+    symbols = list(by_symbol)
+    batches = await asyncio.gather(*(indicators_for(s, by_symbol[s]) for s in symbols))
+
+    # 단건 등록과 같은 시퀀스에서 ID 발급 (동시 요청끼리도 겹치지 않음)
+    candidates = sum(len(by_symbol[s]) for s, batch in zip(symbols, batches) if batch is not None)
+    ids = iter(await run_in_threadpool(allocate_trade_ids, db, candidates))
+    trades: Dict[int, Trade] = {}
+    rows: List[Tuple[int, Dict[str, Any]]] = []
+    for symbol, batch in zip(symbols, batches):
+        for position, (index, req) in enumerate(by_symbol[symbol]):
+            if batch is None:
+                errors[index] = f"유효하지 않은 심볼입니다: {req.symbol}"
+                continue
+            try:
+                trade = build_trade(req, str(next(ids)), batch[position])
+            except Exception as e:
+                errors[index] = f"스코어링 실패: {e}"
+                continue
+            trades[index] = trade
+            rows.append((index, trade_to_row(trade, user_id)))
+
+    rows.sort(key=lambda r: r[0])
+    if rows:
+        # 동기 세션 작업은 이벤트 루프 밖에서 실행
+        errors.update(await run_in_threadpool(_insert_rows, db, rows))
+
+    results = [
+        BulkTradeRowResult(index=i, success=False, error=errors[i]) if i in errors
+        else BulkTradeRowResult(index=i, success=True, id=trades[i].id)
+        for i in range(len(items))
+    ]
+    inserted = sum(1 for r in results if r.success)
+    logger.info(f"거래 일괄 등록 완료: {inserted}/{len(items)}건 ({len(symbols)}개 심볼)")
+    return BulkTradesResponse(total=len(items), inserted=inserted, failed=len(items) - inserted, results=results)
+
+
+def allocate_trade_ids(db: Session, count: int) -> List[int]:
+    """거래 ID를 시퀀스에서 count개 발급 (한 번의 쿼리)"""
+    if count <= 0:
+        return []
+    result = db.execute(
+        text(f"SELECT nextval('{TRADE_ID_SEQUENCE.name}') FROM generate_series(1, :count)"), {"count": count}
+    )
+    return [row[0] for row in result]
+
+
+def _insert_rows(db: Session, rows: List[Tuple[int, Dict[str, Any]]]) -> Dict[int, str]:
+    """
+    청크 단위 배치 INSERT (청크마다 세이브포인트)
+
+    청크가 실패하면 해당 청크만 행 단위로 다시 넣어 문제 행을 찾아낸다.
+    저장된 행은 커밋 전에 일별 집계(trades_daily_rollup)에도 반영한다.
+
+    Returns:
+        {행 번호: 오류 메시지}
+    """
+    failed: Dict[int, str] = {}
+    try:
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + INSERT_CHUNK_SIZE]
+            try:
+                with db.begin_nested():
+                    db.execute(insert(TradeModel), [row for _, row in chunk])
+            except SQLAlchemyError:
+                for index, row in chunk:
+                    try:
+                        with db.begin_nested():
+                            db.execute(insert(TradeModel), [row])
+                    except SQLAlchemyError as e:
+                        failed[index] = f"저장 실패: {str(getattr(e, 'orig', None) or e).splitlines()[0]}"
+        # 저장된 행만 일별 집계에 반영 (같은 트랜잭션)
+        apply_rollup(db, [row for index, row in rows if index not in failed])
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        logger.error(f"거래 일괄 저장 실패: {e}")
+        message = f"저장 실패: {str(getattr(e, 'orig', None) or e).splitlines()[0]}"
+        return {index: message for index, _ in rows}
+    return failed
@@ -0,0 +1,162 @@
+# 거래 목록 조회 (키셋 페이지네이션, 전체 건수 캐시)
+# (entry_time, id) 내림차순 커서로 다음 페이지를 찾으므로 깊은 페이지도 첫 페이지와 비용이 같다.
+import base64
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, text, tuple_
+from sqlalchemy.orm import Session
+
+from database import TradeModel
+from schemas import Trade
+
+logger = logging.getLogger(__name__)
+
+COUNT_CACHE_TTL = 30.0  # 초
+ESTIMATE_MIN_ROWS = 100_000  # 전체 테이블 건수가 이보다 많으면 통계 기반 추정치 사용
+
+# JSONB 컬럼(indicators, strategy_score, forbidden_violations)을 제외한 목록용 컬럼
+SUMMARY_COLUMNS = [
+    TradeModel.id, TradeModel.symbol, TradeModel.type, TradeModel.trading_type, TradeModel.quantity,
+    TradeModel.entry_price, TradeModel.exit_price, TradeModel.entry_time, TradeModel.exit_time,
+    TradeModel.memo, TradeModel.pnl, TradeModel.status, TradeModel.stop_loss,
+    TradeModel.forbidden_penalty, TradeModel.final_score, TradeModel.created_at, TradeModel.updated_at,
+]
+DETAIL_COLUMNS = [TradeModel.indicators, TradeModel.strategy_score]
+
+_count_cache: Dict[Optional[uuid.UUID], Tuple[float, int, bool]] = {}
+_count_lock = threading.Lock()
+
+
+def parse_user_id(user_id: Optional[str]) -> Optional[uuid.UUID]:
+    """사용자 ID를 UUID로 변환 (형식 오류는 ValueError)"""
+    return uuid.UUID(user_id) if user_id else None
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """마지막 행의 (정렬 값, id)를 불투명 커서 문자열로 인코딩 (정렬 값은 datetime 또는 date)"""
+    raw = f"{sort_value.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parse: Callable[[str], Any] = datetime.fromisoformat) -> Tuple[Any, int]:
+    """커서 문자열 해석 (형식 오류는 ValueError)"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        sort_value, row_id = raw.rsplit("|", 1)
+        return parse(sort_value), int(row_id)
+    except Exception:
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+
+
+def invalidate_trade_counts(user_id: Optional[str] = None) -> None:
+    """거래 생성 후 건수 캐시 무효화 (사용자 지정 시 해당 사용자와 전체 건수만)"""
+    with _count_lock:
+        if user_id is None:
+            _count_cache.clear()
+            return
+        try:
+            _count_cache.pop(parse_user_id(user_id), None)
+        except ValueError:
+            pass
+        _count_cache.pop(None, None)
+
+
+def count_trades(db: Session, user_id: Optional[uuid.UUID] = None) -> Tuple[int, bool]:
+    """
+    거래 건수 조회 (COUNT_CACHE_TTL 동안 캐시)
+
+    사용자 필터가 없고 테이블이 충분히 크면 pg_class 통계 추정치를 사용한다.
+
+    Returns:
+        (건수, 추정치 여부)
+    """
+    now = time.monotonic()
+    with _count_lock:
+        cached = _count_cache.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1], cached[2]
+
+    estimated = False
+    total = None
+    if user_id is None:
+        try:
+            reltuples = db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'trades'::regclass")
+            ).scalar()
+            if reltuples is not None and reltuples >= ESTIMATE_MIN_ROWS:
+                total, estimated = int(reltuples), True
+        except Exception as e:
+            logger.error(f"거래 건수 추정 실패: {e}")
+    if total is None:
+        query = db.query(func.count(TradeModel.id))
+        if user_id is not None:
+            query = query.filter(TradeModel.user_id == user_id)
+        total = query.scalar() or 0
+
+    with _count_lock:
+        _count_cache[user_id] = (now + COUNT_CACHE_TTL, total, estimated)
+    return total, estimated
+
+
+def list_trade_page(
+    db: Session,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    user_id: Optional[uuid.UUID] = None,
+    include_details: bool = True,
+) -> Tuple[List[Trade], Optional[str]]:
+    """
+    거래 한 페이지 조회 (entry_time, id 내림차순)
+
+    cursor가 있으면 키셋 조건으로 이어서 조회하고 offset은 무시한다.
+    include_details=False면 JSONB 컬럼을 읽지 않는다.
+
+    Returns:
+        (거래 목록, 다음 페이지 커서 - 마지막 페이지면 None)
+    """
+    columns = SUMMARY_COLUMNS + (DETAIL_COLUMNS if include_details else [])
+    query = db.query(*columns)
+    if user_id is not None:
+        query = query.filter(TradeModel.user_id == user_id)
+    if cursor:
+        entry_time, trade_id = decode_cursor(cursor)
+        # 행 비교는 (user_id, entry_time, id) 인덱스 범위 검색으로 처리된다
+        query = query.filter(tuple_(TradeModel.entry_time, TradeModel.id) < tuple_(entry_time, trade_id))
+    elif offset:
+        query = query.offset(offset)
+    rows = query.order_by(TradeModel.entry_time.desc(), TradeModel.id.desc()).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    trades = [
+        Trade(
+            id=str(t.id),
+            symbol=t.symbol,
+            type=t.type,
+            tradingType=t.trading_type,
+            quantity=t.quantity,
+            entryPrice=t.entry_price,
+            exitPrice=t.exit_price,
+            entryTime=t.entry_time,
+            exitTime=t.exit_time,
+            memo=t.memo,
+            pnl=t.pnl,
+            status=t.status,
+            stopLoss=t.stop_loss,
+            indicators=t.indicators if include_details else None,
+            strategyScore=t.strategy_score if include_details else None,
+            forbiddenPenalty=t.forbidden_penalty,
+            finalScore=t.final_score,
+            createdAt=t.created_at,
+            updatedAt=t.updated_at,
+        )
+        for t in rows
+    ]
+    next_cursor = encode_cursor(rows[-1].entry_time, rows[-1].id) if has_more else None
+    return trades, next_cursor
@@ -0,0 +1,134 @@
+# 거래 전략 점수 재계산 (가중치 변경 후 전체 이력 재스코어링)
+# trades를 id 순 키셋으로 배치 조회해 열 단위 배치 스코어러로 계산하고, 점수가 바뀐 행만 배치 UPDATE한다.
+# final_score가 바뀌면 일별 집계(score_sum)도 달라지므로 마지막에 해당 범위 집계를 재구축한다.
+#
+# 실행: python trade_rescore.py rescore [--user-id UUID] [--batch-size N] [--dry-run]
+import argparse
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from database import TradeModel
+from scoring import (
+    BATCH_SCORERS,
+    TOTAL_FORBIDDEN_POINTS,
+    batch_columns,
+    batch_score_dicts,
+    compute_forbidden_points,
+    score_batch,
+)
+from trade_rollup import rebuild_rollup
+
+logger = logging.getLogger(__name__)
+
+RESCORE_BATCH_SIZE = 5000
+
+# 재계산에 필요한 컬럼만 조회
+RESCORE_COLUMNS = [
+    TradeModel.id, TradeModel.type, TradeModel.trading_type, TradeModel.entry_price,
+    TradeModel.stop_loss, TradeModel.indicators, TradeModel.strategy_score,
+    TradeModel.forbidden_penalty, TradeModel.final_score,
+]
+
+
+def rescore_rows(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    조회한 거래 행들의 전략 점수를 전략별로 묶어 다시 계산
+
+    Returns:
+        점수가 바뀐 행의 UPDATE 값 목록 [{id, strategy_score, final_score}]
+    """
+    by_strategy: Dict[str, List[Any]] = {}
+    for row in rows:
+        if row.trading_type in BATCH_SCORERS:
+            by_strategy.setdefault(row.trading_type, []).append(row)
+
+    updates = []
+    for trading_type, group in by_strategy.items():
+        cols = batch_columns(
+            [row.type for row in group],
+            [row.entry_price for row in group],
+            [row.stop_loss for row in group],
+            [row.indicators for row in group],
+        )
+        batch = score_batch(trading_type, cols)
+        for row, strategy_score in zip(group, batch_score_dicts(batch)):
+            # 금기룰 점수는 저장된 감점 기준 (없으면 현재 규칙의 점수)
+            forbidden_points = (
+                TOTAL_FORBIDDEN_POINTS - row.forbidden_penalty
+                if row.forbidden_penalty is not None
+                else compute_forbidden_points()
+            )
+            final_score = strategy_score['totalScore'] + forbidden_points
+            if strategy_score != row.strategy_score or final_score != row.final_score:
+                updates.append({"id": row.id, "strategy_score": strategy_score, "final_score": final_score})
+    return updates
+
+
+def rescore_trades(
+    db: Session,
+    user_id: Optional[str] = None,
+    batch_size: int = RESCORE_BATCH_SIZE,
+    dry_run: bool = False
+) -> Dict[str, int]:
+    """
+    전체(또는 사용자별) 거래 재스코어링 (배치마다 커밋)
+
+    Returns:
+        {"scanned": 조회한 거래 수, "updated": 점수가 바뀐 거래 수}
+    """
+    scanned = updated = 0
+    last_id = None
+    try:
+        while True:
+            query = db.query(*RESCORE_COLUMNS)
+            if user_id:
+                query = query.filter(TradeModel.user_id == user_id)
+            if last_id is not None:
+                query = query.filter(TradeModel.id > last_id)
+            rows = query.order_by(TradeModel.id).limit(batch_size).all()
+            if not rows:
+                break
+
+            updates = rescore_rows(rows)
+            if updates and not dry_run:
+                db.execute(update(TradeModel), updates)
+                db.commit()
+            scanned += len(rows)
+            updated += len(updates)
+            last_id = rows[-1].id
+            logger.info(f"거래 재스코어링 진행: {scanned}건 조회, {updated}건 변경")
+    except Exception as e:
+        logger.error(f"거래 재스코어링 실패: {e}")
+        db.rollback()
+        raise
+
+    if updated and not dry_run:
+        rebuild_rollup(db, user_id)
+    logger.info(f"거래 재스코어링 완료: {scanned}건 중 {updated}건 변경 (dry_run={dry_run})")
+    return {"scanned": scanned, "updated": updated}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="거래 전략 점수 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rescore = subparsers.add_parser("rescore", help="현재 가중치로 trades 점수 재계산")
+    rescore.add_argument("--user-id")
+    rescore.add_argument("--batch-size", type=int, default=RESCORE_BATCH_SIZE)
+    rescore.add_argument("--dry-run", action="store_true", help="변경 건수만 집계하고 저장하지 않음")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    from database import SessionLocal, create_tables
+    create_tables()
+    db = SessionLocal()
+    try:
+        rescore_trades(db, args.user_id, args.batch_size, args.dry_run)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# 일별 거래 집계(trades_daily_rollup) 관리
+# 거래 저장 시 같은 트랜잭션에서 증분 갱신하고, 백필/복구는 trades에서 재구축한다.
+# 집계 테이블이 비어 있으면 create_tables가 시작 시 trades 전체로 한 번 채운다.
+#
+# 재구축 실행: python trade_rollup.py rebuild [--user-id UUID] [--start YYYY-MM-DD] [--end YYYY-MM-DD]
+import argparse
+import logging
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import literal_column, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from database import TradesDailyRollup
+
+logger = logging.getLogger(__name__)
+
+# 증분 갱신(공유 잠금)과 재구축(배타 잠금)을 직렬화하는 advisory lock 키
+# 재구축은 진행 중인 증분 트랜잭션이 끝나길 기다리고, 재구축 중 새 증분은 재구축 커밋 후에 반영된다
+ROLLUP_LOCK_KEY = 7_342_020
+
+SUM_COLUMNS = [
+    "trade_count", "pnl_count", "pnl_sum", "win_count", "win_pnl_sum",
+    "loss_count", "loss_pnl_sum", "score_count", "score_sum",
+]
+
+# 기존 행과 새 증분의 금기룰 위반 집계를 키 단위로 합산
+MERGE_VIOLATIONS_SQL = """(
+    SELECT COALESCE(jsonb_object_agg(k, jsonb_build_object(
+        'count', COALESCE((trades_daily_rollup.violations->k->>'count')::bigint, 0) + COALESCE((excluded.violations->k->>'count')::bigint, 0),
+        'trades', COALESCE((trades_daily_rollup.violations->k->>'trades')::bigint, 0) + COALESCE((excluded.violations->k->>'trades')::bigint, 0),
+        'penalty_sum', COALESCE((trades_daily_rollup.violations->k->>'penalty_sum')::numeric, 0) + COALESCE((excluded.violations->k->>'penalty_sum')::numeric, 0),
+        'penalty_count', COALESCE((trades_daily_rollup.violations->k->>'penalty_count')::bigint, 0) + COALESCE((excluded.violations->k->>'penalty_count')::bigint, 0)
+    )), '{}'::jsonb)
+    FROM (
+        SELECT jsonb_object_keys(trades_daily_rollup.violations)
+        UNION
+        SELECT jsonb_object_keys(excluded.violations)
+    ) as keys(k)
+)"""
+
+# trades에서 범위 내 집계를 다시 계산 (인자가 NULL이면 해당 조건 없음)
+REBUILD_SCOPE_SQL = """
+    (CAST(:user_id AS uuid) IS NULL OR user_id = CAST(:user_id AS uuid))
+    AND (CAST(:start_day AS date) IS NULL OR day >= CAST(:start_day AS date))
+    AND (CAST(:end_day AS date) IS NULL OR day <= CAST(:end_day AS date))
+"""
+
+REBUILD_QUERY = text(f"""
+    WITH scoped AS (
+        SELECT
+            id, user_id, trading_type, pnl, final_score, forbidden_violations,
+            entry_time::date as day,
+            EXTRACT(HOUR FROM entry_time)::int as hour
+        FROM trades
+        WHERE (CAST(:user_id AS uuid) IS NULL OR user_id = CAST(:user_id AS uuid))
+        AND (CAST(:start_day AS date) IS NULL OR entry_time >= CAST(:start_day AS date))
+        AND (CAST(:end_day AS date) IS NULL OR entry_time < CAST(:end_day AS date) + 1)
+    ),
+    rule_stats AS (
+        SELECT
+            s.user_id, s.day, s.trading_type, s.hour, fv.rule_code,
+            COUNT(*) as violation_count,
+            COUNT(DISTINCT s.id) as trades_with_violation,
+            COALESCE(SUM(fv.penalty_score), 0) as penalty_sum,
+            COUNT(fv.penalty_score) as penalty_count
+        FROM scoped s
+        CROSS JOIN LATERAL jsonb_array_elements(COALESCE(s.forbidden_violations, '[]'::jsonb)) as fv_data
+        JOIN LATERAL jsonb_to_record(fv_data) as fv(rule_code text, penalty_score numeric) ON true
+        WHERE fv.rule_code IS NOT NULL
+        GROUP BY s.user_id, s.day, s.trading_type, s.hour, fv.rule_code
+    ),
+    trade_stats AS (
+        SELECT
+            user_id, day, trading_type, hour,
+            COUNT(*) as trade_count,
+            COUNT(pnl) as pnl_count,
+            COALESCE(SUM(pnl), 0) as pnl_sum,
+            COUNT(*) FILTER (WHERE pnl > 0) as win_count,
+            COALESCE(SUM(pnl) FILTER (WHERE pnl > 0), 0) as win_pnl_sum,
+            COUNT(*) FILTER (WHERE pnl <= 0) as loss_count,
+            COALESCE(SUM(pnl) FILTER (WHERE pnl <= 0), 0) as loss_pnl_sum,
+            COUNT(final_score) as score_count,
+            COALESCE(SUM(final_score), 0) as score_sum
+        FROM scoped
+        GROUP BY user_id, day, trading_type, hour
+    ),
+    violation_stats AS (
+        SELECT
+            user_id, day, trading_type, hour,
+            jsonb_object_agg(rule_code, jsonb_build_object(
+                'count', violation_count, 'trades', trades_with_violation,
+                'penalty_sum', penalty_sum, 'penalty_count', penalty_count
+            )) as violations
+        FROM rule_stats
+        GROUP BY user_id, day, trading_type, hour
+    )
+    INSERT INTO trades_daily_rollup (
+        user_id, day, trading_type, hour, {", ".join(SUM_COLUMNS)}, violations, updated_at
+    )
+    SELECT
+        t.user_id, t.day, t.trading_type, t.hour, {", ".join("t." + c for c in SUM_COLUMNS)},
+        COALESCE(v.violations, '{{}}'::jsonb), now()
+    FROM trade_stats t
+    LEFT JOIN violation_stats v
+        ON v.user_id = t.user_id AND v.day = t.day AND v.trading_type = t.trading_type AND v.hour = t.hour
+""")
+
+
+def to_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    저장 형식(timestamp without time zone, UTC 기준)으로 변환
+
+    타임존이 있는 값은 UTC로 바꾼 뒤 타임존을 떼고, naive 값은 UTC로 보고 그대로 둔다.
+    증분 집계 키와 재구축(entry_time::date, EXTRACT(HOUR ...))이 같은 날짜/시간을 보도록 저장과 집계 모두 이 값을 쓴다.
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def rollup_deltas(rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    거래 행(trades 컬럼 딕셔너리)들을 집계 키별 증분으로 묶음
+
+    user_id가 없는 거래는 집계 키를 만들 수 없으므로 제외한다.
+    """
+    groups: Dict[Tuple[str, date, str, int], Dict[str, Any]] = {}
+    for row in rows:
+        if not row.get("user_id"):
+            continue
+        entry_time: datetime = to_utc_naive(row["entry_time"])
+        key = (str(row["user_id"]), entry_time.date(), row["trading_type"], entry_time.hour)
+        delta = groups.get(key)
+        if delta is None:
+            delta = dict(zip(("user_id", "day", "trading_type", "hour"), key))
+            delta.update({column: 0 for column in SUM_COLUMNS}, violations={})
+            groups[key] = delta
+
+        delta["trade_count"] += 1
+        pnl = row.get("pnl")
+        if pnl is not None:
+            delta["pnl_count"] += 1
+            delta["pnl_sum"] += pnl
+            if pnl > 0:
+                delta["win_count"] += 1
+                delta["win_pnl_sum"] += pnl
+            else:
+                delta["loss_count"] += 1
+                delta["loss_pnl_sum"] += pnl
+        if row.get("final_score") is not None:
+            delta["score_count"] += 1
+            delta["score_sum"] += row["final_score"]
+
+        seen = set()
+        for violation in row.get("forbidden_violations") or []:
+            rule_code = violation.get("rule_code")
+            if rule_code is None:
+                continue
+            stats = delta["violations"].setdefault(
+                rule_code, {"count": 0, "trades": 0, "penalty_sum": 0, "penalty_count": 0}
+            )
+            stats["count"] += 1
+            if rule_code not in seen:
+                stats["trades"] += 1
+                seen.add(rule_code)
+            if violation.get("penalty_score") is not None:
+                stats["penalty_sum"] += violation["penalty_score"]
+                stats["penalty_count"] += 1
+    return list(groups.values())
+
+
+def apply_rollup(db: Session, rows: Iterable[Dict[str, Any]]) -> int:
+    """
+    저장한 거래를 집계 테이블에 증분 반영 (호출자의 트랜잭션 안에서 실행, 커밋하지 않음)
+
+    Returns:
+        갱신한 집계 행 수
+    """
+    deltas = rollup_deltas(rows)
+    if not deltas:
+        return 0
+    db.execute(text("SELECT pg_advisory_xact_lock_shared(:key)"), {"key": ROLLUP_LOCK_KEY})
+    statement = insert(TradesDailyRollup).values(deltas)
+    table = TradesDailyRollup.__table__
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.day, table.c.trading_type, table.c.hour],
+        set_={
+            **{column: table.c[column] + statement.excluded[column] for column in SUM_COLUMNS},
+            "violations": literal_column(MERGE_VIOLATIONS_SQL),
+            "updated_at": datetime.utcnow(),
+        },
+    )
+    db.execute(statement)
+    return len(deltas)
+
+
+def rebuild_rollup(
+    db: Session,
+    user_id: Optional[str] = None,
+    start_day: Optional[date] = None,
+    end_day: Optional[date] = None
+) -> int:
+    """
+    trades에서 집계 테이블 재구축 (범위 내 기존 집계를 지우고 다시 계산한 뒤 커밋)
+
+    재구축 중에는 ROLLUP_LOCK_KEY 배타 잠금으로 apply_rollup을 막아, 지운 뒤 새로 생긴 키와 충돌하지 않게 한다.
+
+    Returns:
+        재구축된 집계 행 수
+    """
+    params = {"user_id": user_id, "start_day": start_day, "end_day": end_day}
+    try:
+        db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ROLLUP_LOCK_KEY})
+        db.execute(text(f"DELETE FROM trades_daily_rollup WHERE {REBUILD_SCOPE_SQL}"), params)
+        inserted = db.execute(REBUILD_QUERY, params).rowcount
+        db.commit()
+        logger.info(f"일별 거래 집계 재구축 완료: {inserted}행 (user_id={user_id}, {start_day}~{end_day})")
+        return inserted
+    except Exception as e:
+        logger.error(f"일별 거래 집계 재구축 실패: {e}")
+        db.rollback()
+        raise
+
+
+def backfill_rollup_if_empty(conn) -> int:
+    """
+    집계 테이블이 비어 있으면 trades 전체로 채움 (create_tables의 스키마 잠금 트랜잭션 안에서 호출)
+
+    집계 테이블 도입 전에 쌓인 거래도 주간 분석/일괄 작업 대상 조회에 바로 보이도록 한다.
+
+    Returns:
+        채운 집계 행 수 (이미 채워져 있으면 0)
+    """
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ROLLUP_LOCK_KEY})
+    if conn.execute(text("SELECT EXISTS (SELECT 1 FROM trades_daily_rollup)")).scalar():
+        return 0
+    inserted = conn.execute(REBUILD_QUERY, {"user_id": None, "start_day": None, "end_day": None}).rowcount
+    if inserted:
+        logger.info(f"일별 거래 집계 초기 백필 완료: {inserted}행")
+    return inserted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="일별 거래 집계 관리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild = subparsers.add_parser("rebuild", help="trades에서 집계 재구축")
+    rebuild.add_argument("--user-id")
+    rebuild.add_argument("--start", type=date.fromisoformat)
+    rebuild.add_argument("--end", type=date.fromisoformat)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    from database import SessionLocal, create_tables
+    create_tables()
+    db = SessionLocal()
+    try:
+        rebuild_rollup(db, args.user_id, args.start, args.end)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# 주간 패턴 분석 실행 (HTTP 요청과 백그라운드 작업 공용)
+from datetime import datetime, date
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+import logging
+import uuid
+
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from analytics import generate_weekly_analysis_data
+from llm_analyzer import validate_analysis_result
+from llm_cache import analysis_cache
+from pattern_analyzers import TokenBudgetExceededError
+from pattern_storage import save_weekly_analysis, get_weekly_analysis
+from schemas import WeeklyAnalysisResponse, WeeklyAnalysisResult
+
+logger = logging.getLogger(__name__)
+
+# (user_id, 시작일, 종료일, 분석 결과) -> summary_id (실패 시 None)
+AnalysisSaver = Callable[[str, date, date, Dict], Awaitable[Optional[int]]]
+
+def parse_date_range(start: str, end: str) -> Tuple[date, date]:
+    """YYYY-MM-DD 기간 파싱과 순서 검증 (잘못된 입력은 400)"""
+    # 날짜 파싱
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d").date()
+        end_date = datetime.strptime(end, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식을 사용하세요."
+        )
+
+    # 기간 유효성 검사
+    if start_date >= end_date:
+        raise HTTPException(
+            status_code=400,
+            detail="시작 날짜는 종료 날짜보다 이전이어야 합니다."
+        )
+    return start_date, end_date
+
+def parse_analysis_period(user_id: str, start: str, end: str) -> Tuple[date, date]:
+    """분석 요청의 사용자 ID와 기간 검증 (잘못된 입력은 400)"""
+    start_date, end_date = parse_date_range(start, end)
+
+    # 사용자 ID 형식 검사 (trades.user_id는 uuid 컬럼)
+    try:
+        uuid.UUID(user_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="user_id는 UUID 형식이어야 합니다."
+        )
+    return start_date, end_date
+
+async def run_weekly_analysis(
+    db: Session,
+    user_id: str,
+    start_date: date,
+    end_date: date,
+    save: Optional[AnalysisSaver] = None
+) -> WeeklyAnalysisResponse:
+    """
+    주간 패턴 분석 수행 (기존 결과 재사용 → 집계 → LLM 분석 → 저장)
+
+    동기 세션 작업은 스레드풀에서 실행한다. save를 주면 결과 저장을 그쪽에 맡긴다
+    (백그라운드 작업은 여러 사용자의 결과를 모아 한 번에 저장).
+
+    Raises:
+        HTTPException: 분석할 데이터가 없으면 404, 토큰 예산 초과는 429, 분석 실패는 500
+    """
+    # 기존 분석 결과 확인
+    existing_analysis = await run_in_threadpool(get_weekly_analysis, db, user_id, start_date, end_date)
+    if existing_analysis:
+        logger.info(f"기존 분석 결과 반환: user_id={user_id}, period={start_date}~{end_date}")
+        return WeeklyAnalysisResponse(
+            success=True,
+            analysis=WeeklyAnalysisResult(**existing_analysis),
+            message="기존 분석 결과를 반환했습니다."
+        )
+
+    # 주간 집계 데이터 생성
+    logger.info(f"주간 분석 데이터 생성 시작: user_id={user_id}")
+    analysis_data = await run_in_threadpool(generate_weekly_analysis_data, db, user_id, start_date, end_date)
+
+    # 데이터 유효성 검사
+    if not any(analysis_data.values()):
+        raise HTTPException(
+            status_code=404,
+            detail="분석할 거래 데이터가 없습니다."
+        )
+
+    # GPT 분석 수행 (같은 집계 입력의 이전 결과가 있으면 재사용)
+    logger.info("GPT 패턴 분석 시작")
+    try:
+        gpt_result = await analysis_cache.get_or_analyze(analysis_data)
+    except TokenBudgetExceededError as e:
+        logger.warning(f"주간 패턴 분석 거절: user_id={user_id}, {e}")
+        raise HTTPException(
+            status_code=429,
+            detail="LLM 토큰 예산을 모두 사용했습니다. 예산을 늘리거나 서버를 재시작한 뒤 다시 시도하세요."
+        )
+
+    if not gpt_result:
+        raise HTTPException(
+            status_code=500,
+            detail="패턴 분석에 실패했습니다. 잠시 후 다시 시도해주세요."
+        )
+
+    # 결과 유효성 검증
+    if not validate_analysis_result(gpt_result):
+        logger.error(f"GPT 응답 유효성 검증 실패: {gpt_result}")
+        raise HTTPException(
+            status_code=500,
+            detail="분석 결과 형식이 올바르지 않습니다."
+        )
+
+    # DB 저장
+    if save is not None:
+        summary_id = await save(user_id, start_date, end_date, gpt_result)
+    else:
+        summary_id = await run_in_threadpool(save_weekly_analysis, db, user_id, start_date, end_date, gpt_result)
+
+    if not summary_id:
+        logger.error("분석 결과 DB 저장 실패")
+        # 저장 실패해도 분석 결과는 반환
+
+    logger.info(f"주간 패턴 분석 완료: user_id={user_id}, summary_id={summary_id}")
+
+    return WeeklyAnalysisResponse(
+        success=True,
+        summary_id=summary_id,
+        analysis=WeeklyAnalysisResult(**gpt_result),
+        message="주간 패턴 분석이 완료되었습니다."
+    )
@@ -0,0 +1,156 @@
+"""
+컬럼형 캔들 블록
+OHLCV 데이터를 하나의 float64 배열로 보관하여 캔들별 객체/딕셔너리 생성을 생략
+"""
+
+from typing import TYPE_CHECKING, Any, List, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from models import Candle
+
+OHLCV_COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+MIN_CANDLES = 20
+MAX_CANDLES = 1000
+
+
+def validate_ohlcv(values: np.ndarray) -> None:
+    """
+    (n, 6) OHLCV 배열을 벡터 연산으로 검증
+
+    Candle/ScoreRequest 모델의 검증 규칙을 캔들 단위 루프 없이 한 번에 확인한다.
+
+    Raises:
+        ValueError: 검증 규칙을 위반한 경우
+    """
+    if values.ndim != 2 or values.shape[1] != len(OHLCV_COLUMNS):
+        raise ValueError("캔들 배열은 (n, 6) 형태여야 합니다")
+
+    n = values.shape[0]
+    if n < MIN_CANDLES:
+        raise ValueError(f"최소 {MIN_CANDLES}개의 캔들 데이터가 필요합니다")
+    if n > MAX_CANDLES:
+        raise ValueError(f"캔들 데이터는 최대 {MAX_CANDLES}개까지 허용됩니다")
+
+    if not np.isfinite(values).all():
+        raise ValueError("캔들 데이터에 유효하지 않은 숫자가 포함되어 있습니다")
+
+    timestamp, open_, high, low, close, volume = values.T
+
+    if (values[:, 1:5] <= 0).any():
+        raise ValueError("가격은 0보다 커야 합니다")
+    if (volume < 0).any():
+        raise ValueError("거래량은 0 이상이어야 합니다")
+    if (high < low).any():
+        raise ValueError("고가는 저가보다 크거나 같아야 합니다")
+    if (high < np.maximum(open_, close)).any():
+        raise ValueError("고가는 시가와 종가보다 크거나 같아야 합니다")
+    if (low > np.minimum(open_, close)).any():
+        raise ValueError("저가는 시가와 종가보다 작거나 같아야 합니다")
+    if n > 1 and (np.diff(timestamp) <= 0).any():
+        raise ValueError("캔들은 시간순으로 정렬되어야 합니다")
+
+
+class CandleBlock:
+    """
+    컬럼형 캔들 컨테이너
+    timestamp/open/high/low/close/volume 순서의 (n, 6) float64 배열 하나를 공유
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: np.ndarray, validate: bool = True):
+        values = np.ascontiguousarray(values, dtype=np.float64)
+        if validate:
+            validate_ohlcv(values)
+        self.values = values
+
+    @classmethod
+    def from_columns(
+        cls,
+        timestamp: Sequence[int],
+        open: Sequence[float],
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float],
+        volume: Sequence[float],
+        validate: bool = True,
+    ) -> "CandleBlock":
+        """병렬 배열(컬럼)로부터 블록 생성"""
+        columns = (timestamp, open, high, low, close, volume)
+        length = len(timestamp)
+        if any(len(column) != length for column in columns):
+            raise ValueError("모든 캔들 컬럼의 길이가 같아야 합니다")
+
+        values = np.empty((length, len(OHLCV_COLUMNS)), dtype=np.float64)
+        for i, column in enumerate(columns):
+            values[:, i] = column
+        return cls(values, validate=validate)
+
+    @classmethod
+    def from_candles(cls, candles: List["Candle"], validate: bool = True) -> "CandleBlock":
+        """기존 Candle 모델 리스트로부터 블록 생성 (하위 호환용)"""
+        values = np.array(
+            [(c.timestamp, c.open, c.high, c.low, c.close, c.volume) for c in candles],
+            dtype=np.float64,
+        ).reshape(-1, len(OHLCV_COLUMNS))
+        return cls(values, validate=validate)
+
+    @classmethod
+    def from_klines(cls, klines: List[List[Any]], validate: bool = True) -> "CandleBlock":
+        """바이낸스 klines 응답(문자열 가격 포함)을 그대로 블록으로 변환"""
+        values = np.array([k[:6] for k in klines], dtype=np.float64).reshape(-1, len(OHLCV_COLUMNS))
+        return cls(values, validate=validate)
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self.values[:, 0]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.values[:, 1]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.values[:, 2]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.values[:, 3]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.values[:, 4]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.values[:, 5]
+
+    @property
+    def last_timestamp(self) -> int:
+        return int(self.values[-1, 0]) if len(self) else 0
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """스코어러에서 사용하는 DataFrame으로 변환 (가격 컬럼은 블록을 그대로 사용)"""
+        df = pd.DataFrame(self.values[:, 1:], columns=list(OHLCV_COLUMNS[1:]))
+        df.insert(0, "timestamp", pd.to_datetime(self.values[:, 0].astype(np.int64), unit="ms"))
+        return df
+
+
+def as_candle_block(candles: Union["CandleBlock", List["Candle"], Any]) -> CandleBlock:
+    """
+    스코어러 입력을 CandleBlock으로 정규화
+
+    CandleBlock, 컬럼형 요청(CandleColumns), 기존 Candle 리스트를 모두 허용한다.
+    Candle 리스트는 ScoreRequest에서 이미 검증되었으므로 다시 검증하지 않는다.
+    """
+    if isinstance(candles, CandleBlock):
+        return candles
+    if hasattr(candles, "to_block"):
+        return candles.to_block()
+    return CandleBlock.from_candles(list(candles), validate=False)
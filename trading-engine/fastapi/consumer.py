@@ -0,0 +1,51 @@
+"""
+전용 Kafka 컨슈머 프로세스
+HTTP 워커(SERVICE_ROLE=api)와 분리해 trade.raw 소비와 trade.score 발행만 실행한다.
+컨슈머 그룹 하나에 프로세스 하나만 두므로 HTTP 워커 수를 늘려도 컨슈머가 중복 생성되지 않는다.
+
+실행: python consumer.py (serve.py가 HTTP 워커와 함께 띄운다)
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import sys
+
+os.environ["SERVICE_ROLE"] = "consumer"
+
+import main  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+async def run() -> int:
+    """컨슈머를 시작하고 SIGTERM/SIGINT 또는 소비 태스크 종료까지 대기"""
+    if not await main.start_kafka():
+        return 1
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    heartbeat = asyncio.create_task(main.heartbeat_loop()) if main.worker_registry else None
+    stopper = asyncio.create_task(stop.wait())
+    logger.info(f"전용 Kafka 컨슈머 시작: pid={os.getpid()}, 모드={main.KAFKA_CONSUMER_MODE}")
+    try:
+        await asyncio.wait([main.consumer_task, stopper], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        stopper.cancel()
+        if heartbeat:
+            heartbeat.cancel()
+            main.worker_registry.remove()
+        await main.stop_kafka()
+        await main.kline_client.close()
+        main.scoring_executor.shutdown(wait=False)
+    logger.info("전용 Kafka 컨슈머 종료")
+    # 신호 없이 소비 태스크가 끝났으면 실행기가 다시 띄우도록 실패로 종료
+    return 0 if stop.is_set() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run()))
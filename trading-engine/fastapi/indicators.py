@@ -0,0 +1,229 @@
+"""
+공유 지표 엔진
+캔들 윈도우별로 지표 시리즈를 한 번만 계산하고 모든 스코어러가 재사용하도록 메모이제이션
+"""
+
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from candle_block import CandleBlock, as_candle_block
+from metrics import FRAME_BUILD_SECONDS
+
+if TYPE_CHECKING:
+    from streaming_indicators import StreamingIndicatorStore
+
+
+class IndicatorFrame:
+    """
+    하나의 캔들 윈도우에 대한 지표 시리즈 모음
+    각 시리즈는 (지표 이름, 파라미터) 단위로 최초 요청 시 계산되어 캐시된다.
+    반환된 시리즈는 여러 스코어러가 공유하므로 수정하지 않는다.
+    """
+
+    def __init__(self, block: CandleBlock):
+        self.block = block
+        self.df = block.to_dataframe()
+        self._series: Dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.block)
+
+    def _memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """key에 해당하는 값이 없을 때만 계산"""
+        try:
+            return self._series[key]
+        except KeyError:
+            value = compute()
+            self._series[key] = value
+            return value
+
+    # 기본 롤링 연산
+
+    def sma(self, window: int, column: str = "close") -> pd.Series:
+        """단순 이동평균"""
+        return self._memo(("sma", column, window), lambda: self.df[column].rolling(window).mean())
+
+    def rolling_std(self, window: int, column: str = "close") -> pd.Series:
+        """이동 표준편차 (ddof=1)"""
+        return self._memo(("std", column, window), lambda: self.df[column].rolling(window).std())
+
+    def rolling_max(self, window: int, column: str = "high") -> pd.Series:
+        """이동 최댓값"""
+        return self._memo(("max", column, window), lambda: self.df[column].rolling(window).max())
+
+    def rolling_min(self, window: int, column: str = "low") -> pd.Series:
+        """이동 최솟값"""
+        return self._memo(("min", column, window), lambda: self.df[column].rolling(window).min())
+
+    def ema(self, span: int, column: str = "close") -> pd.Series:
+        """지수 이동평균 (pandas ewm, adjust=True)"""
+        return self._memo(("ema", column, span), lambda: self.df[column].ewm(span=span).mean())
+
+    def pct_change(self, periods: int, column: str = "close") -> pd.Series:
+        """N봉 수익률"""
+        return self._memo(("pct", column, periods), lambda: self.df[column].pct_change(periods=periods))
+
+    # 기술적 지표
+
+    def true_range(self) -> pd.Series:
+        """True Range (첫 봉은 고가-저가)"""
+        def compute():
+            high, low, close = self.df["high"], self.df["low"], self.df["close"]
+            prev_close = close.shift(1)
+            return pd.concat(
+                [high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1
+            ).max(axis=1)
+        return self._memo(("tr",), compute)
+
+    def atr(self, period: int = 14) -> pd.Series:
+        """ATR (True Range 단순 이동평균)"""
+        return self._memo(("atr", period), lambda: self.true_range().rolling(period).mean())
+
+    def atr_wilder(self, period: int = 14) -> pd.Series:
+        """Wilder ATR (True Range RMA)"""
+        return self._memo(
+            ("atr_wilder", period),
+            lambda: self.true_range().ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+        )
+
+    def rsi(self, period: int = 14) -> pd.Series:
+        """RSI (상승/하락폭 단순 이동평균 방식)"""
+        def compute():
+            delta = self.df["close"].diff()
+            gain = delta.where(delta > 0, 0).rolling(window=period).mean()
+            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+            return 100 - (100 / (1 + gain / loss))
+        return self._memo(("rsi", period), compute)
+
+    def rsi_wilder(self, period: int = 14) -> pd.Series:
+        """Wilder RSI (상승/하락폭 RMA 방식)"""
+        def compute():
+            delta = self.df["close"].diff()
+            gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+            loss = (-delta).clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+            return 100 - (100 / (1 + gain / loss))
+        return self._memo(("rsi_wilder", period), compute)
+
+    def cci(self, period: int = 14) -> pd.Series:
+        """CCI (평균 절대 편차를 슬라이딩 윈도우로 한 번에 계산)"""
+        def compute():
+            typical_price = (self.df["high"] + self.df["low"] + self.df["close"]) / 3
+            sma = typical_price.rolling(period).mean()
+            values = typical_price.to_numpy()
+            mad = np.full(len(values), np.nan)
+            if len(values) >= period:
+                windows = np.lib.stride_tricks.sliding_window_view(values, period)
+                mad[period - 1:] = np.abs(windows - windows.mean(axis=1, keepdims=True)).mean(axis=1)
+            return (typical_price - sma) / (0.015 * pd.Series(mad, index=typical_price.index))
+        return self._memo(("cci", period), compute)
+
+    def macd_hist(self, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.Series:
+        """MACD 히스토그램"""
+        def compute():
+            macd = self.ema(fast) - self.ema(slow)
+            return macd - macd.ewm(span=signal).mean()
+        return self._memo(("macd_hist", fast, slow, signal), compute)
+
+    def bb_width(self, period: int = 20, num_std: float = 2) -> pd.Series:
+        """볼린저 밴드 폭 ((상단-하단)/중단)"""
+        def compute():
+            sma = self.sma(period)
+            std = self.rolling_std(period)
+            return ((sma + std * num_std) - (sma - std * num_std)) / sma
+        return self._memo(("bb_width", period, num_std), compute)
+
+    def adx(self, period: int = 14) -> pd.Series:
+        """ADX (기존 TrendScorer의 간이 구현과 동일한 방식)"""
+        def compute():
+            plus_dm = self.df["high"].diff()
+            minus_dm = self.df["low"].diff()
+            plus_dm = plus_dm.where(plus_dm > minus_dm, 0)
+            minus_dm = minus_dm.where(minus_dm > plus_dm, 0)
+
+            atr = self.atr(period)
+            plus_di = 100 * (plus_dm.rolling(period).mean() / atr)
+            minus_di = 100 * (minus_dm.rolling(period).mean() / atr)
+
+            dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+            return dx.rolling(period).mean()
+        return self._memo(("adx", period), compute)
+
+
+class IndicatorEngine:
+    """
+    지표 프레임 LRU 캐시
+    (심볼, 타임프레임, 윈도우 길이, 첫 캔들 시간, 마지막 캔들 값) 단위로 IndicatorFrame을 재사용
+
+    streaming 저장소를 지정하면 새 프레임을 윈도우 전체 재계산 대신 심볼별 증분 지표 상태에서 만든다.
+    """
+
+    def __init__(self, max_entries: int = 256, streaming: Optional["StreamingIndicatorStore"] = None):
+        self.max_entries = max_entries
+        self.streaming = streaming
+        self._frames: "OrderedDict[Tuple, IndicatorFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _window_key(symbol: str, timeframe: str, block: CandleBlock) -> Tuple:
+        """
+        캔들 윈도우 식별 키
+
+        진행 중인 마지막 봉은 시간이 같아도 값이 바뀌므로 마지막 행 값 전체를 키에 포함한다.
+        """
+        if not len(block):
+            return (symbol, timeframe, 0)
+        return (symbol, timeframe, len(block), block.values[0, 0], block.values[-1].tobytes())
+
+    def frame(self, block: CandleBlock, symbol: str = "", timeframe: str = "") -> IndicatorFrame:
+        """캔들 블록에 대한 IndicatorFrame 반환 (없으면 생성)"""
+        key = self._window_key(symbol, timeframe, block)
+        with self._lock:
+            frame = self._frames.get(key)
+            if frame is not None:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return frame
+            self.misses += 1
+
+        if self.streaming is not None and symbol:
+            with FRAME_BUILD_SECONDS.time(source="streaming"):
+                frame = self.streaming.frame(block, symbol, timeframe)
+        else:
+            with FRAME_BUILD_SECONDS.time(source="full"):
+                frame = IndicatorFrame(block)
+        with self._lock:
+            frame = self._frames.setdefault(key, frame)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+        return frame
+
+    def frame_for_request(self, request: Any) -> IndicatorFrame:
+        """ScoreRequest/ColumnarScoreRequest에서 IndicatorFrame 조회"""
+        timeframe = getattr(request.timeframe, "value", request.timeframe)
+        return self.frame(as_candle_block(request.candles), request.symbol, timeframe)
+
+    def clear(self) -> None:
+        """캐시 초기화"""
+        with self._lock:
+            self._frames.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def last_value(series: pd.Series, default: float = 0.0, offset: int = 1) -> float:
+    """시리즈 끝에서 offset번째 값 (NaN/범위 밖이면 default)"""
+    if len(series) < offset:
+        return default
+    value = series.iloc[-offset]
+    return default if pd.isna(value) else value
+
+
+# 전역 지표 엔진 (모든 스코어러가 공유)
+indicator_engine = IndicatorEngine()
@@ -0,0 +1,169 @@
+"""
+바이낸스 캔들(kline) 조회 클라이언트
+keep-alive 연결 풀을 재사용하고, 봉 마감 구간 단위로 응답을 캐시하며
+같은 키에 대한 동시 요청은 하나의 조회로 합친다.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import httpx
+
+from candle_block import CandleBlock
+from shared_state import SharedBlockCache
+
+logger = logging.getLogger(__name__)
+
+BINANCE_KLINES_URL = "https://api.binance.com/api/v3/klines"
+
+# 바이낸스 interval 문자열 -> 밀리초
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+CacheKey = Tuple[str, str, int, int]
+
+
+class KlineClient:
+    """
+    캐시/요청 병합을 지원하는 비동기 kline 클라이언트
+
+    캐시 키는 (심볼, interval, limit, 마지막 마감 봉 경계)이다. 새 봉이 마감되면 키가 바뀌므로
+    같은 심볼에 대한 거래가 몰려도 거래소 조회는 봉 마감마다 한 번 정도만 발생한다.
+    shared_cache(SharedBlockCache)를 주면 로컬 캐시에 없는 항목을 다른 워커 프로세스가 받아 둔 블록에서 찾는다.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BINANCE_KLINES_URL,
+        timeout: float = 10.0,
+        max_connections: int = 20,
+        ttl: Optional[float] = None,
+        max_entries: int = 512,
+        client: Optional[httpx.AsyncClient] = None,
+        clock: Callable[[], float] = time.time,
+        shared_cache: Optional[SharedBlockCache] = None,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._client = client
+        self._clock = clock
+        self._shared = shared_cache
+        self._cache: Dict[CacheKey, Tuple[float, CandleBlock]] = {}
+        self._inflight: Dict[CacheKey, "asyncio.Task[CandleBlock]"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.shared_hits = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """keep-alive 연결 풀을 가진 공용 AsyncClient (최초 사용 시 생성)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """연결 풀 종료 및 캐시 정리"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._cache.clear()
+
+    def _boundary(self, interval: str) -> int:
+        """현재 시각 기준 마지막 봉 마감 경계 (밀리초)"""
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"지원하지 않는 interval: {interval}")
+        step = INTERVAL_MS[interval]
+        return int(self._clock() * 1000) // step * step
+
+    def _ttl_for(self, interval: str) -> float:
+        """캐시 유효 시간 (기본값은 봉 하나의 길이)"""
+        return self.ttl if self.ttl is not None else INTERVAL_MS[interval] / 1000
+
+    async def get_klines(self, symbol: str, interval: str = "5m", limit: int = 100) -> CandleBlock:
+        """
+        캔들 블록 조회 (캐시 -> 공유 캐시 -> 진행 중인 조회 -> 거래소 순)
+
+        Raises:
+            httpx.HTTPError: 거래소 조회 실패 (실패 결과는 캐시하지 않는다)
+        """
+        key = (symbol, interval, limit, self._boundary(interval))
+        now = self._clock()
+
+        cached = self._cache.get(key)
+        if cached is not None and now - cached[0] < self._ttl_for(interval):
+            self.hits += 1
+            return cached[1]
+
+        if self._shared is not None:
+            shared = self._shared.get(key)
+            if shared is not None and now - shared[0] < self._ttl_for(interval):
+                self.hits += 1
+                self.shared_hits += 1
+                self._store(key, shared[1], stored_at=shared[0])
+                return shared[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.hits += 1
+
+        # 대기 중인 요청 하나가 취소되어도 공유 조회는 계속 진행되도록 shield
+        return await asyncio.shield(task)
+
+    async def _fetch(self, key: CacheKey) -> CandleBlock:
+        """거래소에서 캔들을 조회하고 캐시에 저장"""
+        symbol, interval, limit, _ = key
+        self.fetches += 1
+        resp = await self._get_client().get(
+            self.base_url, params={"symbol": symbol, "interval": interval, "limit": limit}
+        )
+        resp.raise_for_status()
+
+        # 캔들별 Candle 모델 생성 없이 응답 배열을 바로 float64 블록으로 변환
+        block = CandleBlock.from_klines(resp.json())
+        stored_at = self._clock()
+        self._store(key, block, stored_at)
+        if self._shared is not None:
+            self._shared.put(key, stored_at, block)
+        return block
+
+    def _store(self, key: CacheKey, block: CandleBlock, stored_at: Optional[float] = None) -> None:
+        """캐시 저장 (이전 봉 경계의 항목은 제거)"""
+        stale = [k for k in self._cache if k[:3] == key[:3] and k[3] != key[3]]
+        for k in stale:
+            del self._cache[k]
+        self._cache[key] = (self._clock() if stored_at is None else stored_at, block)
+        while len(self._cache) > self.max_entries:
+            self._cache.pop(next(iter(self._cache)))
+
+    def clear(self) -> None:
+        """캐시 초기화"""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.shared_hits = 0
@@ -8,17 +8,33 @@ import json
 import logging
 import os
 import sys
-from typing import Dict, Any, List
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Callable
 from datetime import datetime
+import httpx
 import numpy as np
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import aiokafka
 from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
 
-from models import ScoreRequest, ScoreResponse, Candle, TradeInfo, TimeframeEnum, TradeScoreResponse
+from models import (
+    ScoreRequest, ScoreResponse, TradeInfo, TimeframeEnum, TradeScoreResponse, ColumnarScoreRequest,
+    MultiStrategyScoreResponse
+)
+from candle_block import CandleBlock
+from indicators import IndicatorEngine
+from kline_client import KlineClient
+from shared_state import SharedBlockCache, WorkerRegistry
+from metrics import (
+    registry as metrics_registry, CACHE_REQUESTS, CANDLE_FETCH_SECONDS, CONSUMER_BATCH_SECONDS, CONSUMER_LAG,
+    CONSUMER_MESSAGES, INFLIGHT_REQUESTS, REQUEST_SECONDS, SCORING_JOBS, SCORING_SECONDS, SERIALIZE_SECONDS
+)
+from streaming_indicators import StreamingIndicatorStore
 from scorer import BreakoutScorer
 from strategy_scorers import BreakoutScorer as NewBreakoutScorer, TrendScorer, MeanReversionScorer
 
@@ -26,6 +42,9 @@ from strategy_scorers import BreakoutScorer as NewBreakoutScorer, TrendScorer, M
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 요청/메시지 단위 로그 레벨 (REQUEST_LOG_LEVEL=debug면 INFO 운영 환경에서 포맷팅 없이 생략)
+REQUEST_LOG_LEVEL = logging.DEBUG if os.getenv("REQUEST_LOG_LEVEL", "info").lower() == "debug" else logging.INFO
+
 def convert_numpy_types(obj):
     """numpy 타입을 Python 기본 타입으로 변환"""
     if isinstance(obj, np.integer):
@@ -57,31 +76,115 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 실행 역할: all(HTTP + Kafka 컨슈머, 단일 프로세스), api(HTTP만), consumer(Kafka 컨슈머만, consumer.py)
+SERVICE_ROLE = os.getenv("SERVICE_ROLE", "all")
+# serve.py로 띄운 HTTP 워커 수 (단일 프로세스 실행은 1)
+API_WORKERS = int(os.getenv("API_WORKERS", "1"))
+# 워커가 여럿이면 프로세스 메모리 상태(패턴 분석 작업 큐, LLM 속도/토큰 예산 제한, 증분 지표)가 워커마다 갈라짐
+MULTI_WORKER = SERVICE_ROLE == "api" and API_WORKERS > 1
+
 # app 디렉토리의 라우터 포함 (거래 기록 및 패턴 분석)
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 from app.routes_trades import router as trades_router
-from app.routes_patterns import router as patterns_router
-from app.database import create_tables
+from app.routes_patterns import router as patterns_router, jobs_router as pattern_jobs_router
 app.include_router(trades_router)
-app.include_router(patterns_router)
+
+
+def include_pattern_routes(application: FastAPI) -> bool:
+    """
+    패턴 분석 라우터 포함 (멀티 워커에서는 백그라운드 작업 라우터 /patterns/weekly/jobs*를 제외)
+
+    작업 상태가 프로세스 메모리에 있어, 워커가 여럿이면 다른 워커에 등록된 작업은 404가 된다.
+    동기 분석(/weekly/analyze)과 히스토리 조회는 DB만 사용하므로 항상 포함한다.
+
+    Returns:
+        작업 라우터 포함 여부
+    """
+    application.include_router(patterns_router)
+    if MULTI_WORKER:
+        logger.warning(f"HTTP 워커 {API_WORKERS}개 실행 중이므로 /patterns/weekly/jobs 라우터를 포함하지 않습니다 (작업 큐는 단일 프로세스로 실행하세요)")
+        return False
+    application.include_router(pattern_jobs_router)
+    return True
+
+
+include_pattern_routes(app)
 
 # 전역 변수
 kafka_producer: AIOKafkaProducer = None
 kafka_consumer: AIOKafkaConsumer = None
+consumer_task: asyncio.Task = None
+heartbeat_task: asyncio.Task = None
 scorer = BreakoutScorer()
 
+
+
+def create_live_indicator_engine() -> IndicatorEngine:
+    """
+    거래소에서 조회한 실시간 캔들용 지표 엔진
+
+    단일 프로세스에서는 심볼별 증분 지표 상태를 사용한다. 증분 상태는 그 프로세스가 처리한 캔들 이력에 따라
+    달라지므로, 멀티 워커에서는 어느 워커가 받아도 같은 점수가 나오도록 윈도우 전체 재계산을 사용한다.
+    """
+    if MULTI_WORKER:
+        return IndicatorEngine()
+    return IndicatorEngine(
+        streaming=StreamingIndicatorStore(capacity=int(os.getenv("STREAM_INDICATOR_CAPACITY", "256")))
+    )
+
+
+live_indicator_engine = create_live_indicator_engine()
+live_scorer = BreakoutScorer(live_indicator_engine)
+
 # 새로운 스코어러들
-breakout_scorer = NewBreakoutScorer()
-trend_scorer = TrendScorer()
-mean_reversion_scorer = MeanReversionScorer()
+breakout_scorer = NewBreakoutScorer(live_indicator_engine)
+trend_scorer = TrendScorer(live_indicator_engine)
+mean_reversion_scorer = MeanReversionScorer(live_indicator_engine)
 
-@app.on_event("startup")
-async def startup_event():
-    """애플리케이션 시작 시 실행"""
-    global kafka_producer, kafka_consumer
-    # 데이터베이스 테이블 생성
-    create_tables()
+# CPU 바운드 스코어링을 이벤트 루프 밖에서 실행하기 위한 스레드 풀
+scoring_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SCORING_WORKERS", str(min(8, (os.cpu_count() or 1) + 2)))),
+    thread_name_prefix="scoring"
+)
+
+# 멀티 워커 공유 상태 디렉토리 (캔들 캐시, 워커 하트비트). 비어 있으면 프로세스 내 상태만 사용
+SHARED_STATE_DIR = os.getenv("SHARED_STATE_DIR", "")
+WORKER_HEARTBEAT_SECONDS = float(os.getenv("WORKER_HEARTBEAT_SECONDS", "5"))
+# 스코어링 스레드 풀에 대기/실행 중인 작업이 이 수 이상이면 준비 안 됨(503)으로 응답
+READY_MAX_SCORING_JOBS = int(os.getenv("READY_MAX_SCORING_JOBS", "64"))
+
+shared_block_cache = SharedBlockCache(SHARED_STATE_DIR) if SHARED_STATE_DIR else None
+worker_registry = WorkerRegistry(SHARED_STATE_DIR) if SHARED_STATE_DIR else None
+
+# 이 워커의 부하 (진행 중 HTTP 요청, 누적 요청, 스코어링 대기/실행 작업)
+worker_load: Dict[str, int] = {"inflight": 0, "requests": 0, "scoring": 0}
+
+# 거래소 캔들 조회 클라이언트 (keep-alive 연결 풀 + 봉 마감 단위 캐시, 워커 간 공유 캐시)
+kline_client = KlineClient(
+    max_connections=int(os.getenv("KLINE_MAX_CONNECTIONS", "20")),
+    shared_cache=shared_block_cache
+)
+
+# Kafka 컨슈머 모드: batch(getmany 배치 + 병렬 처리) 또는 single(메시지 단위 처리)
+KAFKA_CONSUMER_MODE = os.getenv("KAFKA_CONSUMER_MODE", "batch")
+KAFKA_BATCH_MAX_RECORDS = int(os.getenv("KAFKA_BATCH_MAX_RECORDS", "200"))
+KAFKA_BATCH_TIMEOUT_MS = int(os.getenv("KAFKA_BATCH_TIMEOUT_MS", "500"))
 
+# 배치 컨슈머 처리 통계 (/api/v1/status 에서 조회)
+consumer_stats: Dict[str, Any] = {
+    "mode": KAFKA_CONSUMER_MODE,
+    "batches": 0,
+    "messages": 0,
+    "published": 0,
+    "skipped": 0,
+    "failed_batches": 0,
+    "lag": {},
+    "last_timings_ms": {},
+}
+
+async def start_kafka() -> bool:
+    """Kafka 프로듀서/컨슈머 시작 후 백그라운드 소비 태스크 실행 (실패 시 False)"""
+    global kafka_producer, kafka_consumer, consumer_task
     try:
         # Kafka 프로듀서 초기화
         kafka_producer = AIOKafkaProducer(
@@ -96,21 +199,32 @@ async def startup_event():
             'trade.raw',
             bootstrap_servers=os.getenv("KAFKA_BROKER", "kafka:9092"),
             group_id='fastapi_scorer_group',
+            # 배치 모드는 발행이 확인된 뒤 직접 커밋한다
+            enable_auto_commit=KAFKA_CONSUMER_MODE != "batch",
             value_deserializer=lambda m: json.loads(m.decode('utf-8'))
         )
         await kafka_consumer.start()
         logger.info("Kafka 컨슈머가 시작되었습니다.")
         
         # 백그라운드에서 메시지 처리 시작
-        asyncio.create_task(process_trade_messages())
+        if KAFKA_CONSUMER_MODE == "batch":
+            consumer_task = asyncio.create_task(process_trade_batches())
+        else:
+            consumer_task = asyncio.create_task(process_trade_messages())
+        return True
         
     except Exception as e:
         logger.error(f"Kafka 연결 중 오류 발생: {e}")
+        return False
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """애플리케이션 종료 시 실행"""
-    global kafka_producer, kafka_consumer
+async def stop_kafka():
+    """소비 태스크 취소 후 Kafka 프로듀서/컨슈머 종료"""
+    global kafka_producer, kafka_consumer, consumer_task
+    
+    if consumer_task:
+        consumer_task.cancel()
+        await asyncio.gather(consumer_task, return_exceptions=True)
+        consumer_task = None
     
     try:
         if kafka_producer:
@@ -123,6 +237,95 @@ async def shutdown_event():
             
     except Exception as e:
         logger.error(f"Kafka 종료 중 오류 발생: {e}")
+    kafka_producer = kafka_consumer = None
+
+def worker_status() -> Dict[str, Any]:
+    """이 워커의 역할/부하/캐시/컨슈머 상태 (하트비트와 /ready 응답에 사용)"""
+    status = {
+        "role": SERVICE_ROLE,
+        "inflight_requests": worker_load["inflight"],
+        "total_requests": worker_load["requests"],
+        "scoring_jobs": worker_load["scoring"],
+        "kline_cache": {
+            "hits": kline_client.hits,
+            "misses": kline_client.misses,
+            "shared_hits": kline_client.shared_hits,
+        },
+    }
+    if SERVICE_ROLE != "api":
+        status["kafka"] = "connected" if kafka_producer and kafka_consumer else "disconnected"
+        status["consumer_lag"] = sum(consumer_stats["lag"].values())
+        status["consumer_messages"] = consumer_stats["messages"]
+    return status
+
+def collect_runtime_metrics() -> None:
+    """카운터로 누적 중인 캐시/컨슈머/부하 상태를 지표에 반영 (스냅샷 직전 호출)"""
+    kline_local_hits = kline_client.hits - kline_client.shared_hits
+    CACHE_REQUESTS.set_total(kline_local_hits, cache="kline", result="hit")
+    CACHE_REQUESTS.set_total(kline_client.shared_hits, cache="kline", result="shared_hit")
+    CACHE_REQUESTS.set_total(kline_client.misses, cache="kline", result="miss")
+    engines = {id(engine): engine for engine in (scorer.engine, live_indicator_engine)}.values()
+    CACHE_REQUESTS.set_total(sum(e.hits for e in engines), cache="indicator_frame", result="hit")
+    CACHE_REQUESTS.set_total(sum(e.misses for e in engines), cache="indicator_frame", result="miss")
+
+    for partition, lag in consumer_stats["lag"].items():
+        CONSUMER_LAG.set(lag, partition=partition)
+    for result in ("messages", "published", "skipped", "failed_batches"):
+        CONSUMER_MESSAGES.set_total(consumer_stats[result], result=result)
+
+    INFLIGHT_REQUESTS.set(worker_load["inflight"])
+    SCORING_JOBS.set(worker_load["scoring"])
+
+async def heartbeat_loop():
+    """공유 레지스트리에 이 워커 상태와 지표 스냅샷을 주기적으로 기록"""
+    while True:
+        collect_runtime_metrics()
+        worker_registry.publish({**worker_status(), "metrics": metrics_registry.snapshot()})
+        await asyncio.sleep(WORKER_HEARTBEAT_SECONDS)
+
+@app.on_event("startup")
+async def startup_event():
+    """애플리케이션 시작 시 실행"""
+    global heartbeat_task
+    # 데이터베이스 테이블은 포함된 패턴 라우터의 startup에서 생성한다 (중복 실행 방지)
+    if worker_registry:
+        heartbeat_task = asyncio.create_task(heartbeat_loop())
+    # api 역할은 HTTP만 처리하고 trade.raw 소비는 전용 컨슈머 프로세스(consumer.py)가 맡는다
+    if SERVICE_ROLE == "all":
+        await start_kafka()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """애플리케이션 종료 시 실행"""
+    await stop_kafka()
+    
+    if heartbeat_task:
+        heartbeat_task.cancel()
+        worker_registry.remove()
+    await kline_client.close()
+    scoring_executor.shutdown(wait=False)
+
+@app.middleware("http")
+async def track_worker_load(request, call_next):
+    """진행 중/누적 HTTP 요청 수와 요청 처리 시간 집계"""
+    worker_load["inflight"] += 1
+    worker_load["requests"] += 1
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        worker_load["inflight"] -= 1
+        # 경로 파라미터별로 시계열이 늘어나지 않도록 라우트 경로 템플릿을 레이블로 사용
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            path=getattr(route, "path", "unmatched"),
+            status=status
+        )
 
 @app.get("/")
 async def root():
@@ -138,14 +341,59 @@ async def root():
 async def health_check():
     """헬스 체크 엔드포인트"""
     kafka_status = "connected" if kafka_producer and kafka_consumer else "disconnected"
+    if SERVICE_ROLE == "api":
+        kafka_status = "consumer_process"  # 전용 컨슈머 프로세스가 담당
     
     return {
         "status": "healthy",
+        "role": SERVICE_ROLE,
         "kafka_broker": os.getenv("KAFKA_BROKER", "kafka:9092"),
         "kafka_status": kafka_status,
         "timestamp": datetime.now().isoformat()
     }
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    준비 상태 확인 엔드포인트 (로드 밸런서용)
+
+    이 워커의 스코어링 작업 수가 READY_MAX_SCORING_JOBS 미만이면 200, 아니면 503을 반환한다.
+    공유 상태를 사용하면 하트비트가 살아 있는 모든 워커(컨슈머 프로세스 포함)의 부하도 함께 반환한다.
+    """
+    pid = os.getpid()
+    status = {**worker_status(), "pid": pid}
+    ready = worker_load["scoring"] < READY_MAX_SCORING_JOBS
+    # 이 워커는 하트비트 대신 현재 값을 사용
+    workers = [
+        {key: value for key, value in w.items() if key != "metrics"}
+        for w in (worker_registry.workers() if worker_registry else []) if w["pid"] != pid
+    ]
+    workers = sorted(workers + [status], key=lambda w: w["pid"])
+    
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "overloaded",
+            "worker": status,
+            "workers": workers,
+            "timestamp": datetime.now().isoformat()
+        }
+    )
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """
+    Prometheus 텍스트 형식 지표
+
+    공유 상태를 사용하면 하트비트가 살아 있는 모든 워커(컨슈머 프로세스 포함)의 지표를 합산한다.
+    """
+    collect_runtime_metrics()
+    pid = os.getpid()
+    snapshots = [metrics_registry.snapshot()]
+    if worker_registry:
+        snapshots += [w["metrics"] for w in worker_registry.workers() if w["pid"] != pid and "metrics" in w]
+    return PlainTextResponse(metrics_registry.render(snapshots), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/v1/status")
 async def get_status():
     """시스템 상태 조회"""
@@ -159,6 +407,7 @@ async def get_status():
                 "kafka": kafka_status,
                 "freqtrade": "running"
             },
+            "kafka_consumer": consumer_stats,
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
@@ -177,26 +426,27 @@ async def calculate_score(request: ScoreRequest):
         점수 계산 결과
     """
     try:
-        logger.info(f"점수 계산 요청: {request.symbol}, 캔들 수: {len(request.candles)}")
+        logger.log(REQUEST_LOG_LEVEL, "점수 계산 요청: %s, 캔들 수: %s", request.symbol, len(request.candles))
         
         # 점수 계산
-        result = scorer.breakout_score(request)
+        result = await _run_scorer(scorer.breakout_score, request)
         
         if "error" in result:
             raise HTTPException(status_code=400, detail=result["error"])
         
         # ScoreResponse 형식으로 변환
-        response = ScoreResponse(
-            symbol=result["symbol"],
-            timestamp=datetime.fromisoformat(result["timestamp"]),
-            score=result["total_score"],
-            signal=result["signal"],
-            confidence=result["confidence"],
-            indicators=result.get("indicators"),
-            reasoning=result.get("reasoning")
-        )
+        with SERIALIZE_SECONDS.time(endpoint="score"):
+            response = ScoreResponse(
+                symbol=result["symbol"],
+                timestamp=datetime.fromisoformat(result["timestamp"]),
+                score=result["total_score"],
+                signal=result["signal"],
+                confidence=result["confidence"],
+                indicators=result.get("indicators"),
+                reasoning=result.get("reasoning")
+            )
         
-        logger.info(f"점수 계산 완료: {result['symbol']}, 점수: {result['total_score']:.3f}, 신호: {result['signal']}")
+        logger.log(REQUEST_LOG_LEVEL, "점수 계산 완료: %s, 점수: %.3f, 신호: %s", result['symbol'], result['total_score'], result['signal'])
         
         return response
         
@@ -206,6 +456,77 @@ async def calculate_score(request: ScoreRequest):
         logger.error(f"점수 계산 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail="점수 계산 중 오류가 발생했습니다")
 
+@app.post("/score/columnar", response_model=ScoreResponse)
+async def calculate_score_columnar(request: ColumnarScoreRequest):
+    """
+    컬럼형 캔들 입력을 받는 돌파매매 점수 계산 엔드포인트
+    
+    캔들을 병렬 배열(timestamp/open/high/low/close/volume)로 받아
+    캔들별 모델 생성 없이 하나의 float64 블록으로 스코어러에 전달한다.
+    
+    Args:
+        request: 컬럼형 점수 계산 요청 데이터
+        
+    Returns:
+        점수 계산 결과
+    """
+    try:
+        logger.log(REQUEST_LOG_LEVEL, "컬럼형 점수 계산 요청: %s, 캔들 수: %s", request.symbol, len(request.candles.timestamp))
+        
+        result = await _run_scorer(scorer.breakout_score, request)
+        
+        if "error" in result:
+            raise HTTPException(status_code=400, detail=result["error"])
+        
+        with SERIALIZE_SECONDS.time(endpoint="score_columnar"):
+            response = ScoreResponse(
+                symbol=result["symbol"],
+                timestamp=datetime.fromisoformat(result["timestamp"]),
+                score=result["total_score"],
+                signal=result["signal"],
+                confidence=result["confidence"],
+                indicators=result.get("indicators"),
+                reasoning=result.get("reasoning")
+            )
+        return response
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"컬럼형 점수 계산 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail="점수 계산 중 오류가 발생했습니다")
+
+async def _run_scorer(score_fn: Callable[[Any], Dict[str, Any]], request: Any) -> Dict[str, Any]:
+    """스코어러를 스코어링 스레드 풀에서 실행 (이벤트 루프 블로킹 방지)"""
+    loop = asyncio.get_running_loop()
+    worker_load["scoring"] += 1
+    try:
+        with SCORING_SECONDS.time(scorer=f"{score_fn.__module__}.{score_fn.__qualname__}"):
+            return await loop.run_in_executor(scoring_executor, score_fn, request)
+    finally:
+        worker_load["scoring"] -= 1
+
+def _build_score_request(
+    symbol: str,
+    candles: CandleBlock,
+    strategy_name: str,
+    parameters: Dict[str, Any] = None
+) -> ScoreRequest:
+    """
+    이미 검증된 캔들 블록으로 ScoreRequest 생성
+    
+    블록은 생성 시 벡터 검증을 거치므로 캔들별 pydantic 검증을 다시 수행하지 않는다.
+    """
+    return ScoreRequest.model_construct(
+        symbol=symbol,
+        timeframe=TimeframeEnum.FIVE_MINUTES,
+        candles=candles,
+        strategy_name=strategy_name,
+        parameters=parameters,
+        include_indicators=True,
+        include_signals=True
+    )
+
 async def process_trade_messages():
     """
     Kafka에서 trade.raw 토픽의 메시지를 소비하고
@@ -222,7 +543,7 @@ async def process_trade_messages():
             try:
                 # 메시지 파싱
                 trade_data = message.value
-                logger.info(f"메시지 수신: {trade_data}")
+                logger.log(REQUEST_LOG_LEVEL, "메시지 수신: %s", trade_data)
                 
                 # 거래 정보 검증
                 if not _validate_trade_message(trade_data):
@@ -237,18 +558,15 @@ async def process_trade_messages():
                     continue
                 
                 # 점수 계산 요청 생성
-                score_request = ScoreRequest(
-                    symbol=trade_data["pair"],
-                    timeframe=TimeframeEnum.FIVE_MINUTES,
-                    candles=candles,
-                    strategy_name=trade_data.get("strategy", "BreakoutStrategy"),
-                    parameters=trade_data.get("parameters"),
-                    include_indicators=True,
-                    include_signals=True
+                score_request = _build_score_request(
+                    trade_data["pair"],
+                    candles,
+                    trade_data.get("strategy", "BreakoutStrategy"),
+                    trade_data.get("parameters")
                 )
                 
                 # 점수 계산
-                score_result = scorer.breakout_score(score_request)
+                score_result = await _run_scorer(live_scorer.breakout_score, score_request)
                 
                 if "error" in score_result:
                     logger.error(f"점수 계산 오류: {score_result['error']}")
@@ -264,7 +582,7 @@ async def process_trade_messages():
                     value=score_result
                 )
                 
-                logger.info(f"점수 계산 결과 발행: {trade_data['pair']}, 점수: {score_result['total_score']:.3f}")
+                logger.log(REQUEST_LOG_LEVEL, "점수 계산 결과 발행: %s, 점수: %.3f", trade_data['pair'], score_result['total_score'])
                 
             except Exception as e:
                 logger.error(f"메시지 처리 중 오류 발생: {e}")
@@ -273,6 +591,137 @@ async def process_trade_messages():
     except Exception as e:
         logger.error(f"Kafka 메시지 처리 중 오류 발생: {e}")
 
+async def process_trade_batches():
+    """
+    trade.raw 메시지를 getmany로 배치 단위 소비하는 비동기 함수
+
+    배치 처리가 성공하면(발행 확인 포함) 오프셋을 수동 커밋하고,
+    실패하면 배치 시작 오프셋으로 되돌려 다시 처리한다.
+    """
+    global kafka_producer, kafka_consumer
+
+    if not kafka_consumer or not kafka_producer:
+        logger.error("Kafka 연결이 설정되지 않았습니다.")
+        return
+
+    while True:
+        try:
+            batches = await kafka_consumer.getmany(
+                timeout_ms=KAFKA_BATCH_TIMEOUT_MS, max_records=KAFKA_BATCH_MAX_RECORDS
+            )
+            records = [message for messages in batches.values() for message in messages]
+            if not records:
+                continue
+
+            try:
+                timings = await _process_trade_batch(records)
+                await kafka_consumer.commit()
+            except Exception as e:
+                consumer_stats["failed_batches"] += 1
+                logger.error(f"배치 처리 중 오류 발생, 오프셋을 되돌립니다: {e}")
+                for tp, messages in batches.items():
+                    kafka_consumer.seek(tp, messages[0].offset)
+                await asyncio.sleep(1)
+                continue
+
+            lag = _consumer_lag(batches)
+            consumer_stats["batches"] += 1
+            consumer_stats["messages"] += len(records)
+            consumer_stats["lag"].update(lag)
+            consumer_stats["last_timings_ms"] = timings
+            for stage, elapsed_ms in timings.items():
+                CONSUMER_BATCH_SECONDS.observe(elapsed_ms / 1000, stage=stage)
+            logger.log(
+                REQUEST_LOG_LEVEL, "배치 처리 완료: %s건, 지연(lag): %s, 단계별 소요(ms): %s",
+                len(records), sum(lag.values()), timings
+            )
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Kafka 메시지 처리 중 오류 발생: {e}")
+            await asyncio.sleep(1)
+
+async def _process_trade_batch(records: List[Any]) -> Dict[str, float]:
+    """
+    메시지 배치 처리: 검증 -> 페어별 캔들 조회 -> 병렬 점수 계산 -> 일괄 발행
+
+    Returns:
+        단계별 소요 시간 (밀리초)
+
+    Raises:
+        Exception: 결과 발행 실패 (배치 전체를 재처리해야 하는 경우)
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    # 유효한 메시지를 페어별로 묶어 캔들 조회를 공유
+    trades_by_pair: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for message in records:
+        trade_data = message.value
+        if not _validate_trade_message(trade_data):
+            logger.warning(f"유효하지 않은 거래 메시지: {trade_data}")
+            consumer_stats["skipped"] += 1
+            continue
+        trades_by_pair[trade_data["pair"]].append(trade_data)
+
+    pairs = list(trades_by_pair)
+    stage = time.perf_counter()
+    fetched = await asyncio.gather(
+        *(_get_candles_for_trade(trades_by_pair[pair][0]) for pair in pairs),
+        return_exceptions=True
+    )
+    timings["fetch"] = round((time.perf_counter() - stage) * 1000, 2)
+
+    # 점수 계산은 스코어링 스레드 풀에서 병렬 수행
+    jobs = []
+    for pair, candles in zip(pairs, fetched):
+        if isinstance(candles, Exception) or not candles:
+            logger.warning(f"캔들 데이터를 가져올 수 없음: {pair}")
+            consumer_stats["skipped"] += len(trades_by_pair[pair])
+            continue
+        for trade_data in trades_by_pair[pair]:
+            score_request = _build_score_request(
+                pair,
+                candles,
+                trade_data.get("strategy", "BreakoutStrategy"),
+                trade_data.get("parameters")
+            )
+            jobs.append((trade_data, _run_scorer(live_scorer.breakout_score, score_request)))
+
+    stage = time.perf_counter()
+    results = await asyncio.gather(*(job for _, job in jobs), return_exceptions=True)
+    timings["score"] = round((time.perf_counter() - stage) * 1000, 2)
+
+    # 비차단 send로 모두 큐에 넣은 뒤 전송 확인을 한 번에 대기
+    stage = time.perf_counter()
+    pending = []
+    for (trade_data, _), score_result in zip(jobs, results):
+        if isinstance(score_result, Exception) or "error" in score_result:
+            error = score_result if isinstance(score_result, Exception) else score_result["error"]
+            logger.error(f"점수 계산 오류: {error}")
+            consumer_stats["skipped"] += 1
+            continue
+
+        score_result["trade_info"] = trade_data
+        score_result["processed_at"] = datetime.now().isoformat()
+        pending.append(await kafka_producer.send('trade.score', value=score_result))
+
+    await asyncio.gather(*pending)
+    consumer_stats["published"] += len(pending)
+    timings["publish"] = round((time.perf_counter() - stage) * 1000, 2)
+    timings["total"] = round((time.perf_counter() - started) * 1000, 2)
+    return timings
+
+def _consumer_lag(batches: Dict[Any, List[Any]]) -> Dict[str, int]:
+    """파티션별 컨슈머 지연 (최신 오프셋 - 처리한 마지막 오프셋)"""
+    lag = {}
+    for tp, messages in batches.items():
+        highwater = kafka_consumer.highwater(tp)
+        if highwater is not None and messages:
+            lag[f"{tp.topic}-{tp.partition}"] = max(0, highwater - (messages[-1].offset + 1))
+    return lag
+
 def _validate_trade_message(trade_data: Dict[str, Any]) -> bool:
     """거래 메시지 유효성 검사"""
     required_fields = ["pair", "side", "amount", "price", "timestamp"]
@@ -291,36 +740,14 @@ def _validate_trade_message(trade_data: Dict[str, Any]) -> bool:
     
     return True
 
-async def _get_candles_for_trade(trade_data: Dict[str, Any]) -> List[Candle]:
-    """거래소 API에서 캔들 데이터를 조회한다."""
+async def _get_candles_for_trade(trade_data: Dict[str, Any]) -> CandleBlock:
+    """거래소 API에서 캔들 데이터를 조회하여 컬럼형 블록으로 반환한다."""
     symbol = trade_data["pair"].replace("/", "")
-    url = "https://api.binance.com/api/v3/klines"
-    params = {"symbol": symbol, "interval": "5m", "limit": 100}
 
     try:
-        import httpx
-
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-
-        candles: List[Candle] = []
-        for c in data:
-            candles.append(
-                Candle(
-                    timestamp=c[0],
-                    open=float(c[1]),
-                    high=float(c[2]),
-                    low=float(c[3]),
-                    close=float(c[4]),
-                    volume=float(c[5]),
-                    symbol=trade_data["pair"],
-                    timeframe=TimeframeEnum.FIVE_MINUTES,
-                )
-            )
-
-        return candles
+        # 공용 연결 풀 + 봉 마감 단위 캐시를 사용 (동시 요청은 한 번의 조회로 병합)
+        with CANDLE_FETCH_SECONDS.time():
+            return await kline_client.get_klines(symbol, interval="5m", limit=100)
 
     except httpx.HTTPError as e:
         logger.error(f"캔들 데이터 HTTP 오류: {e}")
@@ -344,52 +771,39 @@ async def trade_score_endpoint(trade_info: TradeInfo):
     거래 정보를 받아서 점수를 계산하는 엔드포인트
     """
     try:
-        logger.info(f"거래 점수 계산 요청: {trade_info.pair}")
+        logger.log(REQUEST_LOG_LEVEL, "거래 점수 계산 요청: %s", trade_info.pair)
         
         # 거래 정보를 딕셔너리로 변환
-        trade_data = {
-            "pair": trade_info.pair,
-            "side": trade_info.side,
-            "amount": trade_info.amount,
-            "price": trade_info.price,
-            "timestamp": trade_info.timestamp.isoformat(),
-            "strategy": trade_info.strategy,
-            "confidence": trade_info.confidence,
-            "stop_loss": trade_info.stop_loss,
-            "take_profit": trade_info.take_profit,
-            "metadata": trade_info.metadata
-        }
+        trade_data = _trade_info_to_dict(trade_info)
         
-        logger.info("캔들 데이터 가져오기 시작")
+        logger.log(REQUEST_LOG_LEVEL, "캔들 데이터 가져오기 시작")
         # 캔들 데이터 가져오기
         candles = await _get_candles_for_trade(trade_data)
-        logger.info(f"캔들 데이터 가져오기 완료: {len(candles)}개")
+        logger.log(REQUEST_LOG_LEVEL, "캔들 데이터 가져오기 완료: %s개", len(candles))
         
         if not candles:
             raise HTTPException(status_code=400, detail="캔들 데이터를 가져올 수 없습니다")
         
-        logger.info("점수 계산 요청 생성")
+        logger.log(REQUEST_LOG_LEVEL, "점수 계산 요청 생성")
         # 점수 계산 요청 생성
-        score_request = ScoreRequest(
-            symbol=trade_info.pair,
-            timeframe=TimeframeEnum.FIVE_MINUTES,
-            candles=candles,
-            strategy_name=trade_info.strategy,
-            parameters=trade_info.metadata,
-            include_indicators=True,
-            include_signals=True
+        score_request = _build_score_request(
+            trade_info.pair,
+            candles,
+            trade_info.strategy,
+            trade_info.metadata
         )
         
-        logger.info("점수 계산 시작")
+        logger.log(REQUEST_LOG_LEVEL, "점수 계산 시작")
         # 점수 계산
-        result = scorer.breakout_score(score_request)
-        logger.info("점수 계산 완료")
+        result = await _run_scorer(live_scorer.breakout_score, score_request)
+        logger.log(REQUEST_LOG_LEVEL, "점수 계산 완료")
         
         if "error" in result:
             logger.error(f"점수 계산 오류: {result['error']}")
             raise HTTPException(status_code=400, detail=result["error"])
         
-        logger.info("응답 데이터 구성")
+        logger.log(REQUEST_LOG_LEVEL, "응답 데이터 구성")
+        serialize_started = time.perf_counter()
         
         # 실제 계산된 점수 사용 (numpy 타입 변환)
         actual_score = float(result.get("total_score", 0.0)) if hasattr(result.get("total_score", 0.0), 'item') else float(result.get("total_score", 0.0))
@@ -412,7 +826,7 @@ async def trade_score_endpoint(trade_info: TradeInfo):
         # indicators 변환
         actual_indicators = result.get("indicators", {})
         
-        logger.info("응답 구성 시작")
+        logger.log(REQUEST_LOG_LEVEL, "응답 구성 시작")
         
         # 실제 계산된 값 사용 (100점 만점으로 표시)
         response = {
@@ -425,24 +839,14 @@ async def trade_score_endpoint(trade_info: TradeInfo):
             "confidence": actual_confidence,
             "indicators": actual_indicators,
             "reasoning": actual_reasoning,
-            "trade_info": {
-                "pair": trade_info.pair,
-                "side": trade_info.side,
-                "amount": trade_info.amount,
-                "price": trade_info.price,
-                "timestamp": trade_info.timestamp.isoformat(),
-                "strategy": trade_info.strategy,
-                "confidence": trade_info.confidence,
-                "stop_loss": trade_info.stop_loss,
-                "take_profit": trade_info.take_profit,
-                "metadata": trade_info.metadata
-            },
+            "trade_info": trade_data,
             "processed_at": datetime.now().isoformat(),
             "sub_scores": actual_sub_scores
         }
         
-        logger.info("응답 구성 완료")
-        logger.info(f"응답 전송: {response['symbol']}, 점수: {response['total_score']}")
+        SERIALIZE_SECONDS.observe(time.perf_counter() - serialize_started, endpoint="trade")
+        logger.log(REQUEST_LOG_LEVEL, "응답 구성 완료")
+        logger.log(REQUEST_LOG_LEVEL, "응답 전송: %s, 점수: %s", response['symbol'], response['total_score'])
         return response
         
     except HTTPException:
@@ -457,52 +861,39 @@ async def breakout_score_endpoint(trade_info: TradeInfo):
     돌파매매 점수 계산 엔드포인트
     """
     try:
-        logger.info(f"돌파매매 점수 계산 요청: {trade_info.pair}")
+        logger.log(REQUEST_LOG_LEVEL, "돌파매매 점수 계산 요청: %s", trade_info.pair)
         
         # 거래 정보를 딕셔너리로 변환
-        trade_data = {
-            "pair": trade_info.pair,
-            "side": trade_info.side,
-            "amount": trade_info.amount,
-            "price": trade_info.price,
-            "timestamp": trade_info.timestamp.isoformat(),
-            "strategy": trade_info.strategy,
-            "confidence": trade_info.confidence,
-            "stop_loss": trade_info.stop_loss,
-            "take_profit": trade_info.take_profit,
-            "metadata": trade_info.metadata
-        }
+        trade_data = _trade_info_to_dict(trade_info)
         
-        logger.info("캔들 데이터 가져오기 시작")
+        logger.log(REQUEST_LOG_LEVEL, "캔들 데이터 가져오기 시작")
         # 캔들 데이터 가져오기
         candles = await _get_candles_for_trade(trade_data)
-        logger.info(f"캔들 데이터 가져오기 완료: {len(candles)}개")
+        logger.log(REQUEST_LOG_LEVEL, "캔들 데이터 가져오기 완료: %s개", len(candles))
         
         if not candles:
             raise HTTPException(status_code=400, detail="캔들 데이터를 가져올 수 없습니다")
         
-        logger.info("돌파매매 점수 계산 요청 생성")
+        logger.log(REQUEST_LOG_LEVEL, "돌파매매 점수 계산 요청 생성")
         # 점수 계산 요청 생성
-        score_request = ScoreRequest(
-            symbol=trade_info.pair,
-            timeframe=TimeframeEnum.FIVE_MINUTES,
-            candles=candles,
-            strategy_name="BreakoutStrategy",
-            parameters=trade_info.metadata,
-            include_indicators=True,
-            include_signals=True
+        score_request = _build_score_request(
+            trade_info.pair,
+            candles,
+            "BreakoutStrategy",
+            trade_info.metadata
         )
         
-        logger.info("돌파매매 점수 계산 시작")
+        logger.log(REQUEST_LOG_LEVEL, "돌파매매 점수 계산 시작")
         # 돌파매매 점수 계산
-        result = breakout_scorer.calculate_score(score_request)
-        logger.info("돌파매매 점수 계산 완료")
+        result = await _run_scorer(breakout_scorer.calculate_score, score_request)
+        logger.log(REQUEST_LOG_LEVEL, "돌파매매 점수 계산 완료")
         
         if "error" in result:
             logger.error(f"돌파매매 점수 계산 오류: {result['error']}")
             raise HTTPException(status_code=400, detail=result["error"])
         
-        logger.info("응답 데이터 구성")
+        logger.log(REQUEST_LOG_LEVEL, "응답 데이터 구성")
+        serialize_started = time.perf_counter()
         
         # 실제 계산된 점수 사용
         actual_score = float(result.get("total_score", 0.0))
@@ -513,7 +904,7 @@ async def breakout_score_endpoint(trade_info: TradeInfo):
         # sub_scores 변환
         actual_sub_scores = result.get("sub_scores", {})
         
-        logger.info("응답 구성 시작")
+        logger.log(REQUEST_LOG_LEVEL, "응답 구성 시작")
         
         # 실제 계산된 값 사용
         response = {
@@ -525,24 +916,14 @@ async def breakout_score_endpoint(trade_info: TradeInfo):
             "confidence": actual_confidence,
             "indicators": {},
             "reasoning": actual_reasoning,
-            "trade_info": {
-                "pair": trade_info.pair,
-                "side": trade_info.side,
-                "amount": trade_info.amount,
-                "price": trade_info.price,
-                "timestamp": trade_info.timestamp.isoformat(),
-                "strategy": trade_info.strategy,
-                "confidence": trade_info.confidence,
-                "stop_loss": trade_info.stop_loss,
-                "take_profit": trade_info.take_profit,
-                "metadata": trade_info.metadata
-            },
+            "trade_info": trade_data,
             "processed_at": datetime.now().isoformat(),
             "sub_scores": actual_sub_scores
         }
         
-        logger.info("응답 구성 완료")
-        logger.info(f"응답 전송: {response['symbol']}, 점수: {response['total_score']}")
+        SERIALIZE_SECONDS.observe(time.perf_counter() - serialize_started, endpoint="breakout")
+        logger.log(REQUEST_LOG_LEVEL, "응답 구성 완료")
+        logger.log(REQUEST_LOG_LEVEL, "응답 전송: %s, 점수: %s", response['symbol'], response['total_score'])
         return response
         
     except HTTPException:
@@ -557,52 +938,39 @@ async def trend_score_endpoint(trade_info: TradeInfo):
     추세매매 점수 계산 엔드포인트
     """
     try:
-        logger.info(f"추세매매 점수 계산 요청: {trade_info.pair}")
+        logger.log(REQUEST_LOG_LEVEL, "추세매매 점수 계산 요청: %s", trade_info.pair)
         
         # 거래 정보를 딕셔너리로 변환
-        trade_data = {
-            "pair": trade_info.pair,
-            "side": trade_info.side,
-            "amount": trade_info.amount,
-            "price": trade_info.price,
-            "timestamp": trade_info.timestamp.isoformat(),
-            "strategy": trade_info.strategy,
-            "confidence": trade_info.confidence,
-            "stop_loss": trade_info.stop_loss,
-            "take_profit": trade_info.take_profit,
-            "metadata": trade_info.metadata
-        }
+        trade_data = _trade_info_to_dict(trade_info)
         
-        logger.info("캔들 데이터 가져오기 시작")
+        logger.log(REQUEST_LOG_LEVEL, "캔들 데이터 가져오기 시작")
         # 캔들 데이터 가져오기
         candles = await _get_candles_for_trade(trade_data)
-        logger.info(f"캔들 데이터 가져오기 완료: {len(candles)}개")
+        logger.log(REQUEST_LOG_LEVEL, "캔들 데이터 가져오기 완료: %s개", len(candles))
         
         if not candles:
             raise HTTPException(status_code=400, detail="캔들 데이터를 가져올 수 없습니다")
         
-        logger.info("추세매매 점수 계산 요청 생성")
+        logger.log(REQUEST_LOG_LEVEL, "추세매매 점수 계산 요청 생성")
         # 점수 계산 요청 생성
-        score_request = ScoreRequest(
-            symbol=trade_info.pair,
-            timeframe=TimeframeEnum.FIVE_MINUTES,
-            candles=candles,
-            strategy_name="TrendStrategy",
-            parameters=trade_info.metadata,
-            include_indicators=True,
-            include_signals=True
+        score_request = _build_score_request(
+            trade_info.pair,
+            candles,
+            "TrendStrategy",
+            trade_info.metadata
         )
         
-        logger.info("추세매매 점수 계산 시작")
+        logger.log(REQUEST_LOG_LEVEL, "추세매매 점수 계산 시작")
         # 추세매매 점수 계산
-        result = trend_scorer.calculate_score(score_request)
-        logger.info("추세매매 점수 계산 완료")
+        result = await _run_scorer(trend_scorer.calculate_score, score_request)
+        logger.log(REQUEST_LOG_LEVEL, "추세매매 점수 계산 완료")
         
         if "error" in result:
             logger.error(f"추세매매 점수 계산 오류: {result['error']}")
             raise HTTPException(status_code=400, detail=result["error"])
         
-        logger.info("응답 데이터 구성")
+        logger.log(REQUEST_LOG_LEVEL, "응답 데이터 구성")
+        serialize_started = time.perf_counter()
         
         # 실제 계산된 점수 사용
         actual_score = float(result.get("total_score", 0.0))
@@ -613,7 +981,7 @@ async def trend_score_endpoint(trade_info: TradeInfo):
         # sub_scores 변환
         actual_sub_scores = result.get("sub_scores", {})
         
-        logger.info("응답 구성 시작")
+        logger.log(REQUEST_LOG_LEVEL, "응답 구성 시작")
         
         # 실제 계산된 값 사용
         response = {
@@ -625,24 +993,14 @@ async def trend_score_endpoint(trade_info: TradeInfo):
             "confidence": actual_confidence,
             "indicators": {},
             "reasoning": actual_reasoning,
-            "trade_info": {
-                "pair": trade_info.pair,
-                "side": trade_info.side,
-                "amount": trade_info.amount,
-                "price": trade_info.price,
-                "timestamp": trade_info.timestamp.isoformat(),
-                "strategy": trade_info.strategy,
-                "confidence": trade_info.confidence,
-                "stop_loss": trade_info.stop_loss,
-                "take_profit": trade_info.take_profit,
-                "metadata": trade_info.metadata
-            },
+            "trade_info": trade_data,
             "processed_at": datetime.now().isoformat(),
             "sub_scores": actual_sub_scores
         }
         
-        logger.info("응답 구성 완료")
-        logger.info(f"응답 전송: {response['symbol']}, 점수: {response['total_score']}")
+        SERIALIZE_SECONDS.observe(time.perf_counter() - serialize_started, endpoint="trend")
+        logger.log(REQUEST_LOG_LEVEL, "응답 구성 완료")
+        logger.log(REQUEST_LOG_LEVEL, "응답 전송: %s, 점수: %s", response['symbol'], response['total_score'])
         return response
         
     except HTTPException:
@@ -657,52 +1015,39 @@ async def mean_reversion_score_endpoint(trade_info: TradeInfo):
     역추세매매 점수 계산 엔드포인트
     """
     try:
-        logger.info(f"역추세매매 점수 계산 요청: {trade_info.pair}")
+        logger.log(REQUEST_LOG_LEVEL, "역추세매매 점수 계산 요청: %s", trade_info.pair)
         
         # 거래 정보를 딕셔너리로 변환
-        trade_data = {
-            "pair": trade_info.pair,
-            "side": trade_info.side,
-            "amount": trade_info.amount,
-            "price": trade_info.price,
-            "timestamp": trade_info.timestamp.isoformat(),
-            "strategy": trade_info.strategy,
-            "confidence": trade_info.confidence,
-            "stop_loss": trade_info.stop_loss,
-            "take_profit": trade_info.take_profit,
-            "metadata": trade_info.metadata
-        }
+        trade_data = _trade_info_to_dict(trade_info)
         
-        logger.info("캔들 데이터 가져오기 시작")
+        logger.log(REQUEST_LOG_LEVEL, "캔들 데이터 가져오기 시작")
         # 캔들 데이터 가져오기
         candles = await _get_candles_for_trade(trade_data)
-        logger.info(f"캔들 데이터 가져오기 완료: {len(candles)}개")
+        logger.log(REQUEST_LOG_LEVEL, "캔들 데이터 가져오기 완료: %s개", len(candles))
         
         if not candles:
             raise HTTPException(status_code=400, detail="캔들 데이터를 가져올 수 없습니다")
         
-        logger.info("역추세매매 점수 계산 요청 생성")
+        logger.log(REQUEST_LOG_LEVEL, "역추세매매 점수 계산 요청 생성")
         # 점수 계산 요청 생성
-        score_request = ScoreRequest(
-            symbol=trade_info.pair,
-            timeframe=TimeframeEnum.FIVE_MINUTES,
-            candles=candles,
-            strategy_name="MeanReversionStrategy",
-            parameters=trade_info.metadata,
-            include_indicators=True,
-            include_signals=True
+        score_request = _build_score_request(
+            trade_info.pair,
+            candles,
+            "MeanReversionStrategy",
+            trade_info.metadata
         )
         
-        logger.info("역추세매매 점수 계산 시작")
+        logger.log(REQUEST_LOG_LEVEL, "역추세매매 점수 계산 시작")
         # 역추세매매 점수 계산
-        result = mean_reversion_scorer.calculate_score(score_request)
-        logger.info("역추세매매 점수 계산 완료")
+        result = await _run_scorer(mean_reversion_scorer.calculate_score, score_request)
+        logger.log(REQUEST_LOG_LEVEL, "역추세매매 점수 계산 완료")
         
         if "error" in result:
             logger.error(f"역추세매매 점수 계산 오류: {result['error']}")
             raise HTTPException(status_code=400, detail=result["error"])
         
-        logger.info("응답 데이터 구성")
+        logger.log(REQUEST_LOG_LEVEL, "응답 데이터 구성")
+        serialize_started = time.perf_counter()
         
         # 실제 계산된 점수 사용
         actual_score = float(result.get("total_score", 0.0))
@@ -713,7 +1058,7 @@ async def mean_reversion_score_endpoint(trade_info: TradeInfo):
         # sub_scores 변환
         actual_sub_scores = result.get("sub_scores", {})
         
-        logger.info("응답 구성 시작")
+        logger.log(REQUEST_LOG_LEVEL, "응답 구성 시작")
         
         # 실제 계산된 값 사용
         response = {
@@ -725,24 +1070,14 @@ async def mean_reversion_score_endpoint(trade_info: TradeInfo):
             "confidence": actual_confidence,
             "indicators": {},
             "reasoning": actual_reasoning,
-            "trade_info": {
-                "pair": trade_info.pair,
-                "side": trade_info.side,
-                "amount": trade_info.amount,
-                "price": trade_info.price,
-                "timestamp": trade_info.timestamp.isoformat(),
-                "strategy": trade_info.strategy,
-                "confidence": trade_info.confidence,
-                "stop_loss": trade_info.stop_loss,
-                "take_profit": trade_info.take_profit,
-                "metadata": trade_info.metadata
-            },
+            "trade_info": trade_data,
             "processed_at": datetime.now().isoformat(),
             "sub_scores": actual_sub_scores
         }
         
-        logger.info("응답 구성 완료")
-        logger.info(f"응답 전송: {response['symbol']}, 점수: {response['total_score']}")
+        SERIALIZE_SECONDS.observe(time.perf_counter() - serialize_started, endpoint="mean_reversion")
+        logger.log(REQUEST_LOG_LEVEL, "응답 구성 완료")
+        logger.log(REQUEST_LOG_LEVEL, "응답 전송: %s, 점수: %s", response['symbol'], response['total_score'])
         return response
         
     except HTTPException:
@@ -751,6 +1086,94 @@ async def mean_reversion_score_endpoint(trade_info: TradeInfo):
         logger.error(f"역추세매매 점수 계산 중 오류 발생: {e}")
         raise HTTPException(status_code=500, detail="역추세매매 점수 계산 중 오류가 발생했습니다")
 
+@app.post("/api/v1/trade/strategies", response_model=MultiStrategyScoreResponse)
+async def multi_strategy_score_endpoint(trade_info: TradeInfo):
+    """
+    돌파/추세/역추세 점수를 한 번에 계산하는 엔드포인트
+    
+    캔들은 한 번만 조회하고, 세 전략 스코어러는 스코어링 스레드 풀에서 동시에 실행한다.
+    """
+    try:
+        logger.log(REQUEST_LOG_LEVEL, "다중 전략 점수 계산 요청: %s", trade_info.pair)
+        
+        trade_data = _trade_info_to_dict(trade_info)
+        
+        candles = await _get_candles_for_trade(trade_data)
+        
+        if not candles:
+            raise HTTPException(status_code=400, detail="캔들 데이터를 가져올 수 없습니다")
+        
+        score_request = _build_score_request(
+            trade_info.pair,
+            candles,
+            trade_info.strategy,
+            trade_info.metadata
+        )
+        
+        # 동시 실행 전에 공유 지표 프레임을 먼저 만들어 세 스코어러가 같은 프레임을 사용하도록 함
+        # (캐시 미스 시 프레임 계산은 CPU 작업이므로 스코어링 스레드 풀에서 실행)
+        await asyncio.get_running_loop().run_in_executor(
+            scoring_executor, live_indicator_engine.frame_for_request, score_request
+        )
+        
+        strategy_scorers = {
+            "breakout": breakout_scorer,
+            "trend": trend_scorer,
+            "mean_reversion": mean_reversion_scorer,
+        }
+        results = await asyncio.gather(*(
+            _run_scorer(strategy_scorer.calculate_score, score_request)
+            for strategy_scorer in strategy_scorers.values()
+        ))
+        
+        scores = {}
+        serialize_started = time.perf_counter()
+        for name, result in zip(strategy_scorers, results):
+            if "error" in result:
+                logger.error(f"{name} 점수 계산 오류: {result['error']}")
+                raise HTTPException(status_code=400, detail=result["error"])
+            
+            scores[name] = {
+                "total_score": float(result.get("total_score", 0.0)),
+                "signal": result.get("signal", "hold"),
+                "confidence": float(result.get("confidence", 0.0)),
+                "reasoning": result.get("reasoning", ""),
+                "sub_scores": result.get("sub_scores", {})
+            }
+        SERIALIZE_SECONDS.observe(time.perf_counter() - serialize_started, endpoint="strategies")
+        
+        logger.log(REQUEST_LOG_LEVEL, "다중 전략 점수 계산 완료: %s", trade_info.pair)
+        
+        return {
+            "status": "success",
+            "symbol": trade_info.pair,
+            "timestamp": datetime.now().isoformat(),
+            "scores": scores,
+            "trade_info": trade_data,
+            "processed_at": datetime.now().isoformat()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"다중 전략 점수 계산 중 오류 발생: {e}")
+        raise HTTPException(status_code=500, detail="다중 전략 점수 계산 중 오류가 발생했습니다")
+
+def _trade_info_to_dict(trade_info: TradeInfo) -> Dict[str, Any]:
+    """TradeInfo를 캔들 조회/응답용 딕셔너리로 변환"""
+    return {
+        "pair": trade_info.pair,
+        "side": trade_info.side,
+        "amount": trade_info.amount,
+        "price": trade_info.price,
+        "timestamp": trade_info.timestamp.isoformat(),
+        "strategy": trade_info.strategy,
+        "confidence": trade_info.confidence,
+        "stop_loss": trade_info.stop_loss,
+        "take_profit": trade_info.take_profit,
+        "metadata": trade_info.metadata
+    }
+
 if __name__ == "__main__":
     import uvicorn
     
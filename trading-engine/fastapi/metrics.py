@@ -0,0 +1,275 @@
+"""
+스코어링 지연/캐시/컨슈머 지표 수집 및 Prometheus 텍스트 형식 출력
+카운터/게이지/히스토그램을 프로세스 메모리에 모으고, 멀티 워커 모드에서는 워커별 스냅샷을
+하트비트로 공유해 /metrics 응답에서 합산한다.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# METRICS_ENABLED=false면 관측을 기록하지 않는다 (측정 자체의 오버헤드 제거용)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() != "false"
+
+# 초 단위 지연 버킷 (0.1ms ~ 10s)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 레이블 불일치: {sorted(labels)} != {sorted(self.labelnames)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    """단조 증가 카운터 (외부에서 누적된 값은 set_total로 반영)"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def samples(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(Counter):
+    """현재 값 게이지 (워커 간 합산)"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        self.set_total(value, **labels)
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블별 [버킷별 개수..., +Inf 개수, 합계]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """with 블록 실행 시간(초) 기록"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Dict[LabelValues, List[float]]:
+        with self._lock:
+            return {key: list(counts) for key, counts in self._values.items()}
+
+
+class HitRatio(_Metric):
+    """캐시 조회 카운터에서 계산하는 적중률 게이지 (워커 합산 후 계산하므로 자체 값은 없음)"""
+
+    kind = "gauge"
+    # 적중으로 세는 result 값 (shared_hit: 다른 워커가 채운 공유 캐시 적중)
+    hit_results = ("hit", "shared_hit")
+
+    def __init__(self, name: str, documentation: str, requests: Counter):
+        super().__init__(name, documentation, ("cache",))
+        self.requests = requests
+
+    def samples(self) -> Dict[LabelValues, float]:
+        return {}
+
+    def compute(self, request_samples: Dict[LabelValues, float]) -> Dict[LabelValues, float]:
+        """(cache, result) 카운터 값 -> cache별 (hit + shared_hit) / 전체 조회"""
+        totals: Dict[str, List[float]] = {}
+        for (cache, result), value in request_samples.items():
+            hits_total = totals.setdefault(cache, [0.0, 0.0])
+            hits_total[1] += value
+            if result in self.hit_results:
+                hits_total[0] += value
+        return {(cache,): hits / total for cache, (hits, total) in totals.items() if total}
+
+
+class MetricsRegistry:
+    """지표 등록/스냅샷/텍스트 출력"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """JSON으로 공유할 수 있는 현재 값 {이름: {"samples": [[레이블 값 목록, 값], ...]}}"""
+        return {
+            name: {"samples": [[list(key), value] for key, value in metric.samples().items()]}
+            for name, metric in self._metrics.items()
+        }
+
+    def merge(self, snapshots: Iterable[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[LabelValues, Any]]:
+        """여러 워커의 스냅샷을 레이블별로 합산"""
+        merged: Dict[str, Dict[LabelValues, Any]] = {name: {} for name in self._metrics}
+        for snapshot in snapshots:
+            for name, data in snapshot.items():
+                if name not in merged:
+                    continue
+                values = merged[name]
+                for labels, value in data["samples"]:
+                    key = tuple(labels)
+                    if isinstance(value, list):
+                        current = values.get(key)
+                        values[key] = value if current is None else [a + b for a, b in zip(current, value)]
+                    else:
+                        values[key] = values.get(key, 0.0) + value
+        return merged
+
+    def render(self, snapshots: Optional[Iterable[Dict[str, Dict[str, Any]]]] = None) -> str:
+        """Prometheus 텍스트 형식 (snapshots를 주면 합산 결과, 아니면 이 프로세스 값)"""
+        merged = self.merge(snapshots if snapshots is not None else [self.snapshot()])
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            values = metric.compute(merged[metric.requests.name]) if isinstance(metric, HitRatio) else merged[name]
+            for key, value in sorted(values.items()):
+                if isinstance(metric, Histogram):
+                    cumulative = 0.0
+                    for bound, count in zip(metric.buckets + (float("inf"),), value[:-1]):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else _format_value(bound)
+                        lines.append(f"{name}_bucket{_labels(metric.labelnames + ('le',), key + (le,))} {_format_value(cumulative)}")
+                    lines.append(f"{name}_sum{_labels(metric.labelnames, key)} {_format_value(value[-1])}")
+                    lines.append(f"{name}_count{_labels(metric.labelnames, key)} {_format_value(cumulative)}")
+                else:
+                    lines.append(f"{name}{_labels(metric.labelnames, key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+# 전역 지표 레지스트리 (API 워커/컨슈머/스코어러가 공유)
+registry = MetricsRegistry()
+
+CANDLE_FETCH_SECONDS = registry.histogram(
+    "trading_candle_fetch_seconds", "캔들 조회 소요 시간 (캐시 적중 포함)"
+)
+FRAME_BUILD_SECONDS = registry.histogram(
+    "trading_indicator_frame_build_seconds", "지표 프레임(DataFrame) 생성 소요 시간", ["source"]
+)
+SUB_SCORE_SECONDS = registry.histogram(
+    "trading_sub_score_seconds", "세부 점수 계산 소요 시간", ["strategy", "component"]
+)
+SCORING_SECONDS = registry.histogram(
+    "trading_scoring_seconds", "스코어러 실행 소요 시간 (스레드 풀 대기 포함)", ["scorer"]
+)
+SERIALIZE_SECONDS = registry.histogram(
+    "trading_response_serialize_seconds", "점수 결과 응답 구성(타입 변환) 소요 시간", ["endpoint"]
+)
+REQUEST_SECONDS = registry.histogram(
+    "trading_http_request_seconds", "HTTP 요청 전체 소요 시간", ["method", "path", "status"]
+)
+CACHE_REQUESTS = registry.counter(
+    "trading_cache_requests_total", "캐시 조회 수", ["cache", "result"]
+)
+CACHE_HIT_RATIO = registry.register(HitRatio(
+    "trading_cache_hit_ratio", "캐시 적중률 (전체 워커 합산 기준)", CACHE_REQUESTS
+))
+CONSUMER_LAG = registry.gauge(
+    "trading_kafka_consumer_lag", "파티션별 Kafka 컨슈머 지연 (메시지 수)", ["partition"]
+)
+CONSUMER_MESSAGES = registry.counter(
+    "trading_kafka_consumer_messages_total", "처리 결과별 Kafka 메시지 수", ["result"]
+)
+CONSUMER_BATCH_SECONDS = registry.histogram(
+    "trading_kafka_batch_stage_seconds", "Kafka 배치 처리 단계별 소요 시간", ["stage"]
+)
+INFLIGHT_REQUESTS = registry.gauge(
+    "trading_inflight_requests", "진행 중인 HTTP 요청 수"
+)
+SCORING_JOBS = registry.gauge(
+    "trading_scoring_jobs", "스코어링 스레드 풀에 대기/실행 중인 작업 수"
+)
+
+
+def sub_score(strategy: str, component: str, compute, frame) -> float:
+    """세부 점수 하나를 계산하고 소요 시간을 기록"""
+    if not METRICS_ENABLED:
+        return compute(frame)
+    started = time.perf_counter()
+    try:
+        return compute(frame)
+    finally:
+        SUB_SCORE_SECONDS.observe(time.perf_counter() - started, strategy=strategy, component=component)
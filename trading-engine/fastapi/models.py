@@ -3,11 +3,13 @@ FastAPI Pydantic 모델 정의
 코인 트레이딩 시스템에서 사용하는 데이터 모델들
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, model_validator, validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+from candle_block import CandleBlock
+
 class TimeframeEnum(str, Enum):
     """타임프레임 열거형"""
     ONE_MINUTE = "1m"
@@ -332,6 +334,85 @@ class ScoreRequest(BaseModel):
             }
         }
 
+class CandleColumns(BaseModel):
+    """
+    컬럼형 캔들 데이터 모델
+    캔들별 객체 대신 OHLCV 병렬 배열로 전달하며, 검증은 NumPy 벡터 연산으로 한 번에 수행
+    """
+    
+    timestamp: List[int] = Field(
+        ..., 
+        description="캔들 시작 시간 배열 (Unix timestamp, milliseconds)",
+        example=[1640995200000, 1640995500000]
+    )
+    
+    open: List[float] = Field(..., description="시가 배열", example=[50000.0, 50500.0])
+    high: List[float] = Field(..., description="고가 배열", example=[51000.0, 51200.0])
+    low: List[float] = Field(..., description="저가 배열", example=[49000.0, 50100.0])
+    close: List[float] = Field(..., description="종가 배열", example=[50500.0, 51000.0])
+    volume: List[float] = Field(..., description="거래량 배열", example=[1000.5, 1200.0])
+    
+    _block: Optional[CandleBlock] = PrivateAttr(default=None)
+    
+    @model_validator(mode="after")
+    def build_block(self):
+        """병렬 배열을 하나의 float64 블록으로 변환하면서 벡터 검증"""
+        self._block = CandleBlock.from_columns(
+            self.timestamp, self.open, self.high, self.low, self.close, self.volume
+        )
+        return self
+    
+    def to_block(self) -> CandleBlock:
+        """검증된 캔들 블록 반환"""
+        return self._block
+
+class ColumnarScoreRequest(BaseModel):
+    """
+    컬럼형 점수 계산 요청 모델
+    ScoreRequest와 같은 의미이지만 캔들을 CandleColumns로 전달
+    """
+    
+    symbol: str = Field(
+        ..., 
+        description="분석할 심볼",
+        example="BTC/USDT",
+        pattern="^[A-Z0-9]+/[A-Z0-9]+$"
+    )
+    
+    timeframe: TimeframeEnum = Field(
+        default=TimeframeEnum.FIVE_MINUTES,
+        description="분석할 타임프레임",
+        example=TimeframeEnum.FIVE_MINUTES
+    )
+    
+    candles: CandleColumns = Field(
+        ..., 
+        description="분석할 캔들 데이터 (컬럼형, 20~1000개)"
+    )
+    
+    strategy_name: str = Field(
+        ..., 
+        description="사용할 전략 이름",
+        example="BreakoutStrategy"
+    )
+    
+    parameters: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="전략 파라미터 (선택사항)"
+    )
+    
+    include_indicators: bool = Field(
+        default=True,
+        description="지표값 포함 여부",
+        example=True
+    )
+    
+    include_signals: bool = Field(
+        default=True,
+        description="매수/매도 신호 포함 여부",
+        example=True
+    )
+
 class ScoreResponse(BaseModel):
     """
     점수 계산 응답 모델
@@ -545,4 +626,83 @@ class TradeScoreResponse(BaseModel):
                     "trend_score": 0.2
                 }
             }
-        } 
\ No newline at end of file
+        } 
+
+class StrategyScore(BaseModel):
+    """
+    단일 전략 점수 모델
+    다중 전략 응답에서 전략별 결과를 표현
+    """
+    
+    total_score: float = Field(
+        ..., 
+        description="전략 총점 (0.0 ~ 100.0)",
+        example=72.0,
+        ge=0.0,
+        le=100.0
+    )
+    
+    signal: str = Field(
+        ..., 
+        description="매수/매도 신호 (buy/sell/hold)",
+        example="hold",
+        pattern="^(buy|sell|hold)$"
+    )
+    
+    confidence: float = Field(
+        ..., 
+        description="신뢰도 (0.0 ~ 1.0)",
+        example=0.72,
+        ge=0.0,
+        le=1.0
+    )
+    
+    reasoning: Optional[str] = Field(
+        default=None,
+        description="점수 계산 근거"
+    )
+    
+    sub_scores: Optional[Dict[str, float]] = Field(
+        default=None,
+        description="세부 점수들"
+    )
+
+class MultiStrategyScoreResponse(BaseModel):
+    """
+    다중 전략 점수 응답 모델
+    한 번 조회한 캔들로 돌파/추세/역추세 점수를 함께 반환
+    """
+    
+    status: str = Field(
+        ..., 
+        description="응답 상태",
+        example="success"
+    )
+    
+    symbol: str = Field(
+        ..., 
+        description="분석한 심볼",
+        example="BTC/USDT"
+    )
+    
+    timestamp: str = Field(
+        ..., 
+        description="분석 시간",
+        example="2024-01-01T12:00:00Z"
+    )
+    
+    scores: Dict[str, StrategyScore] = Field(
+        ..., 
+        description="전략별 점수 (breakout, trend, mean_reversion)"
+    )
+    
+    trade_info: Dict[str, Any] = Field(
+        ..., 
+        description="원본 거래 정보"
+    )
+    
+    processed_at: str = Field(
+        ..., 
+        description="처리 완료 시간",
+        example="2024-01-01T12:00:00Z"
+    )
@@ -3,13 +3,14 @@
 pandas와 numpy를 사용하여 기술적 지표를 계산하고 점수를 산출
 """
 
-import pandas as pd
 import numpy as np
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any
 from datetime import datetime
 import logging
 
-from models import ScoreRequest, Candle
+from models import ScoreRequest
+from indicators import IndicatorEngine, IndicatorFrame, indicator_engine
+from metrics import sub_score
 
 logger = logging.getLogger(__name__)
 
@@ -19,9 +20,9 @@ class BreakoutScorer:
     다양한 기술적 지표를 종합하여 매매 점수를 계산
     """
     
-    def __init__(self):
-        """초기화"""
-        pass
+    def __init__(self, engine: IndicatorEngine = None):
+        """초기화 (지표 엔진은 다른 스코어러와 공유)"""
+        self.engine = engine or indicator_engine
     
     def breakout_score(self, request: ScoreRequest) -> Dict[str, Any]:
         """
@@ -34,21 +35,21 @@ class BreakoutScorer:
             점수 계산 결과 딕셔너리
         """
         try:
-            # 캔들 데이터를 DataFrame으로 변환
-            df = self._candles_to_dataframe(request.candles)
+            # 캔들 윈도우의 공유 지표 프레임 조회
+            frame = self.engine.frame_for_request(request)
             
-            if len(df) < 20:
+            if len(frame) < 20:
                 return {"error": "최소 20개의 캔들 데이터가 필요합니다"}
             
             # 각 점수 계산
-            bollinger_score = self._calculate_bollinger_score(df)
-            rsi_score = self._calculate_rsi_score(df)
-            volume_score = self._calculate_volume_score(df)
-            ma_score = self._calculate_ma_score(df)
-            momentum_score = self._calculate_momentum_score(df)
-            breakout_score = self._calculate_breakout_level_score(df)
-            volatility_score = self._calculate_volatility_score(df)
-            trend_score = self._calculate_trend_score(df)
+            bollinger_score = sub_score("breakout_legacy", "bollinger", self._calculate_bollinger_score, frame)
+            rsi_score = sub_score("breakout_legacy", "rsi", self._calculate_rsi_score, frame)
+            volume_score = sub_score("breakout_legacy", "volume", self._calculate_volume_score, frame)
+            ma_score = sub_score("breakout_legacy", "ma", self._calculate_ma_score, frame)
+            momentum_score = sub_score("breakout_legacy", "momentum", self._calculate_momentum_score, frame)
+            breakout_score = sub_score("breakout_legacy", "breakout_level", self._calculate_breakout_level_score, frame)
+            volatility_score = sub_score("breakout_legacy", "volatility", self._calculate_volatility_score, frame)
+            trend_score = sub_score("breakout_legacy", "trend", self._calculate_trend_score, frame)
             
             # 가중 평균으로 총점 계산
             weights = {
@@ -77,12 +78,12 @@ class BreakoutScorer:
             signal = self._determine_signal(total_score)
             
             # 신뢰도 계산
-            confidence = self._calculate_confidence(total_score, df)
+            confidence = self._calculate_confidence(total_score, frame)
             
             # 지표값 추출
             indicators = {}
             if request.include_indicators:
-                indicators = self._extract_indicators(df)
+                indicators = self._extract_indicators(frame)
             
             # 근거 생성
             reasoning = self._generate_reasoning(
@@ -115,43 +116,20 @@ class BreakoutScorer:
             logger.error(f"점수 계산 중 오류 발생: {e}")
             return {"error": f"점수 계산 중 오류가 발생했습니다: {str(e)}"}
     
-    def _candles_to_dataframe(self, candles: List[Candle]) -> pd.DataFrame:
-        """캔들 리스트를 DataFrame으로 변환"""
-        data = []
-        for candle in candles:
-            data.append({
-                'timestamp': candle.timestamp,
-                'open': candle.open,
-                'high': candle.high,
-                'low': candle.low,
-                'close': candle.close,
-                'volume': candle.volume
-            })
-        
-        df = pd.DataFrame(data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df = df.sort_values('timestamp').reset_index(drop=True)
-        return df
-    
-    def _calculate_bollinger_score(self, df: pd.DataFrame) -> float:
+    def _calculate_bollinger_score(self, frame: IndicatorFrame) -> float:
         """
         볼린저 밴드 점수 계산
         가격이 상단 밴드를 돌파하는 정도를 평가
         """
         try:
-            # 이동평균 계산
-            df['sma_20'] = df['close'].rolling(window=20).mean()
-            df['std_20'] = df['close'].rolling(window=20).std()
-            
-            # 볼린저 밴드 계산
-            df['bb_upper'] = df['sma_20'] + (df['std_20'] * 2)
-            df['bb_middle'] = df['sma_20']
-            df['bb_lower'] = df['sma_20'] - (df['std_20'] * 2)
+            # 이동평균 / 표준편차 (공유 프레임)
+            sma_20 = frame.sma(20)
+            std_20 = frame.rolling_std(20)
             
             # 최신 데이터
-            current_close = df['close'].iloc[-1]
-            current_upper = df['bb_upper'].iloc[-1]
-            current_middle = df['bb_middle'].iloc[-1]
+            current_close = frame.df['close'].iloc[-1]
+            current_upper = sma_20.iloc[-1] + (std_20.iloc[-1] * 2)
+            current_middle = sma_20.iloc[-1]
             
             # 돌파 정도 계산 (0~1)
             if current_close > current_upper:
@@ -176,20 +154,13 @@ class BreakoutScorer:
             logger.error(f"볼린저 밴드 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_rsi_score(self, df: pd.DataFrame) -> float:
+    def _calculate_rsi_score(self, frame: IndicatorFrame) -> float:
         """
         RSI 점수 계산
         RSI가 적정 범위에 있는지 평가
         """
         try:
-            # RSI 계산
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df['rsi'] = 100 - (100 / (1 + rs))
-            
-            current_rsi = df['rsi'].iloc[-1]
+            current_rsi = frame.rsi(14).iloc[-1]
             
             # RSI 점수 계산 (30~70이 적정)
             if 30 <= current_rsi <= 70:
@@ -208,17 +179,14 @@ class BreakoutScorer:
             logger.error(f"RSI 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_volume_score(self, df: pd.DataFrame) -> float:
+    def _calculate_volume_score(self, frame: IndicatorFrame) -> float:
         """
         거래량 점수 계산
         거래량이 증가하는지 평가
         """
         try:
-            # 거래량 이동평균
-            df['volume_sma_20'] = df['volume'].rolling(window=20).mean()
-            
-            current_volume = df['volume'].iloc[-1]
-            avg_volume = df['volume_sma_20'].iloc[-1]
+            current_volume = frame.df['volume'].iloc[-1]
+            avg_volume = frame.sma(20, 'volume').iloc[-1]
             
             # 거래량 비율
             volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1.0
@@ -237,19 +205,15 @@ class BreakoutScorer:
             logger.error(f"거래량 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_ma_score(self, df: pd.DataFrame) -> float:
+    def _calculate_ma_score(self, frame: IndicatorFrame) -> float:
         """
         이동평균 점수 계산
         단기/장기 이동평균의 관계를 평가
         """
         try:
-            # 이동평균 계산
-            df['sma_5'] = df['close'].rolling(window=5).mean()
-            df['sma_20'] = df['close'].rolling(window=20).mean()
-            
-            current_close = df['close'].iloc[-1]
-            current_sma_5 = df['sma_5'].iloc[-1]
-            current_sma_20 = df['sma_20'].iloc[-1]
+            current_close = frame.df['close'].iloc[-1]
+            current_sma_5 = frame.sma(5).iloc[-1]
+            current_sma_20 = frame.sma(20).iloc[-1]
             
             # 이동평균 관계 평가
             if current_sma_5 > current_sma_20:
@@ -274,16 +238,14 @@ class BreakoutScorer:
             logger.error(f"이동평균 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_momentum_score(self, df: pd.DataFrame) -> float:
+    def _calculate_momentum_score(self, frame: IndicatorFrame) -> float:
         """
         모멘텀 점수 계산
         가격 모멘텀을 평가
         """
         try:
             # 모멘텀 계산 (5일 수익률)
-            df['momentum_5'] = df['close'].pct_change(periods=5)
-            
-            current_momentum = df['momentum_5'].iloc[-1]
+            current_momentum = frame.pct_change(5).iloc[-1]
             
             # 모멘텀 점수 계산
             if current_momentum > 0.05:  # 5% 이상 상승
@@ -299,15 +261,15 @@ class BreakoutScorer:
             logger.error(f"모멘텀 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_breakout_level_score(self, df: pd.DataFrame) -> float:
+    def _calculate_breakout_level_score(self, frame: IndicatorFrame) -> float:
         """
         돌파 레벨 점수 계산
         최근 고점 돌파 여부를 평가
         """
         try:
             # 최근 20일 고점
-            recent_high = df['high'].rolling(window=20).max().iloc[-1]
-            current_close = df['close'].iloc[-1]
+            recent_high = frame.rolling_max(20, 'high').iloc[-1]
+            current_close = frame.df['close'].iloc[-1]
             
             # 돌파 정도 계산
             if current_close > recent_high:
@@ -324,24 +286,15 @@ class BreakoutScorer:
             logger.error(f"돌파 레벨 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_volatility_score(self, df: pd.DataFrame) -> float:
+    def _calculate_volatility_score(self, frame: IndicatorFrame) -> float:
         """
         변동성 점수 계산
         적정한 변동성인지 평가
         """
         try:
             # 변동성 계산 (ATR 기반)
-            df['tr'] = np.maximum(
-                df['high'] - df['low'],
-                np.maximum(
-                    abs(df['high'] - df['close'].shift(1)),
-                    abs(df['low'] - df['close'].shift(1))
-                )
-            )
-            df['atr'] = df['tr'].rolling(window=14).mean()
-            
-            current_atr = df['atr'].iloc[-1]
-            current_close = df['close'].iloc[-1]
+            current_atr = frame.atr(14).iloc[-1]
+            current_close = frame.df['close'].iloc[-1]
             
             # 변동성 비율
             volatility_ratio = current_atr / current_close
@@ -360,15 +313,15 @@ class BreakoutScorer:
             logger.error(f"변동성 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_trend_score(self, df: pd.DataFrame) -> float:
+    def _calculate_trend_score(self, frame: IndicatorFrame) -> float:
         """
         트렌드 점수 계산
         상승 트렌드인지 평가
         """
         try:
             # 트렌드 계산 (20일 선형 회귀)
-            x = np.arange(len(df))
-            y = df['close'].values
+            x = np.arange(len(frame))
+            y = frame.df['close'].values
             
             if len(x) >= 20:
                 recent_x = x[-20:]
@@ -400,39 +353,34 @@ class BreakoutScorer:
         else:
             return "hold"
     
-    def _calculate_confidence(self, total_score: float, df: pd.DataFrame) -> float:
+    def _calculate_confidence(self, total_score: float, frame: IndicatorFrame) -> float:
         """신뢰도 계산"""
         # 점수의 절댓값이 클수록 신뢰도 높음
         base_confidence = min(abs(total_score), 1.0)
         
         # 데이터 품질에 따른 보정
-        data_quality = min(len(df) / 100, 1.0)  # 데이터가 많을수록 신뢰도 높음
+        data_quality = min(len(frame) / 100, 1.0)  # 데이터가 많을수록 신뢰도 높음
         
         return min(base_confidence * data_quality, 1.0)
     
-    def _extract_indicators(self, df: pd.DataFrame) -> Dict[str, float]:
+    def _extract_indicators(self, frame: IndicatorFrame) -> Dict[str, float]:
         """지표값 추출"""
         try:
             indicators = {}
             
-            # 최신 값들 추출
-            if 'close' in df.columns and len(df) > 0:
-                indicators['close'] = float(df['close'].iloc[-1])
-            
-            if 'rsi' in df.columns and len(df) > 0:
-                indicators['rsi'] = float(df['rsi'].iloc[-1])
-            
-            if 'bb_upper' in df.columns and len(df) > 0:
-                indicators['bb_upper'] = float(df['bb_upper'].iloc[-1])
-            
-            if 'bb_lower' in df.columns and len(df) > 0:
-                indicators['bb_lower'] = float(df['bb_lower'].iloc[-1])
+            if len(frame) == 0:
+                return indicators
             
-            if 'sma_20' in df.columns and len(df) > 0:
-                indicators['sma_20'] = float(df['sma_20'].iloc[-1])
+            # 최신 값들 추출 (공유 프레임에서 이미 계산된 시리즈 재사용)
+            sma_20 = frame.sma(20).iloc[-1]
+            std_20 = frame.rolling_std(20).iloc[-1]
             
-            if 'volume_sma_20' in df.columns and len(df) > 0:
-                indicators['volume_ratio'] = float(df['volume'].iloc[-1] / df['volume_sma_20'].iloc[-1])
+            indicators['close'] = float(frame.df['close'].iloc[-1])
+            indicators['rsi'] = float(frame.rsi(14).iloc[-1])
+            indicators['bb_upper'] = float(sma_20 + (std_20 * 2))
+            indicators['bb_lower'] = float(sma_20 - (std_20 * 2))
+            indicators['sma_20'] = float(sma_20)
+            indicators['volume_ratio'] = float(frame.df['volume'].iloc[-1] / frame.sma(20, 'volume').iloc[-1])
             
             return indicators
             
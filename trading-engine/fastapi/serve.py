@@ -0,0 +1,108 @@
+"""
+멀티 워커 실행기
+테이블 생성을 워커 시작 전에 한 번만 수행하고, 전용 Kafka 컨슈머 프로세스 하나와
+HTTP 워커 N개(SERVICE_ROLE=api, uvicorn workers)를 띄운다.
+워커들은 SHARED_STATE_DIR(기본: /dev/shm 아래 tmpfs)로 캔들 캐시와 부하 정보를 공유한다.
+
+실행: python serve.py --workers 4 [--host 0.0.0.0] [--port 8000] [--no-consumer]
+"""
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONSUMER_RESTART_DELAY = 5.0
+
+
+def default_shared_dir(port: int) -> str:
+    """공유 상태 기본 경로 (tmpfs가 있으면 /dev/shm)"""
+    root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(root, f"trading-engine-{port}")
+
+
+def create_tables_once() -> bool:
+    """워커 시작 전 테이블 생성 (실패하면 워커 startup에서 다시 시도하도록 False)"""
+    sys.path.append(os.path.join(BASE_DIR, ".."))
+    try:
+        from app.database import create_tables
+        create_tables()
+        return True
+    except Exception as e:
+        logger.error(f"테이블 생성 중 오류 발생, 워커 시작 시 다시 시도합니다: {e}")
+        return False
+
+
+class ConsumerSupervisor:
+    """전용 컨슈머 프로세스 실행 및 비정상 종료 시 재시작"""
+
+    def __init__(self, env: dict):
+        self._env = env
+        self._process = None
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="consumer-supervisor", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._process = subprocess.Popen([sys.executable, "consumer.py"], cwd=BASE_DIR, env=self._env)
+            code = self._process.wait()
+            if self._stopping.is_set():
+                break
+            logger.error(f"컨슈머 프로세스 종료(code={code}), {CONSUMER_RESTART_DELAY}초 후 재시작")
+            self._stopping.wait(CONSUMER_RESTART_DELAY)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._thread.join(timeout=1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="트레이딩 API 멀티 워커 실행")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--no-consumer", action="store_true", help="컨슈머 프로세스를 띄우지 않음 (다른 곳에서 실행 중일 때)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    # 워커 수에 따라 main.py가 워커별 상태를 쓰는 기능(패턴 분석 라우터, 증분 지표)을 조정
+    os.environ["API_WORKERS"] = str(args.workers)
+    shared_dir = os.environ.setdefault("SHARED_STATE_DIR", default_shared_dir(args.port))
+    os.makedirs(shared_dir, exist_ok=True)
+    if create_tables_once():
+        os.environ["SKIP_CREATE_TABLES"] = "1"
+
+    supervisor = None
+    if not args.no_consumer:
+        supervisor = ConsumerSupervisor(dict(os.environ, SERVICE_ROLE="consumer"))
+        supervisor.start()
+
+    # uvicorn 워커 프로세스는 이 환경을 물려받는다
+    os.environ["SERVICE_ROLE"] = "api"
+    logger.info(f"HTTP 워커 {args.workers}개 시작 (공유 상태: {shared_dir})")
+    try:
+        uvicorn.run("main:app", host=args.host, port=args.port, workers=args.workers, app_dir=BASE_DIR)
+    finally:
+        if supervisor:
+            supervisor.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+멀티 워커 공유 상태
+여러 HTTP 워커 프로세스와 전용 컨슈머 프로세스가 같은 디렉토리(기본: /dev/shm 아래 tmpfs)를 통해
+캔들 캐시와 워커별 부하 정보를 공유한다. 파일은 임시 파일에 쓴 뒤 os.replace로 교체하므로
+다른 프로세스가 쓰는 도중의 파일을 읽는 일이 없다.
+"""
+
+import glob
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from candle_block import CandleBlock
+
+logger = logging.getLogger(__name__)
+
+# 하트비트가 이 시간(초) 이상 갱신되지 않은 워커는 종료된 것으로 본다
+WORKER_STALE_SECONDS = 15.0
+
+
+def _atomic_write(path: str, write: Callable[[Any], None], mtime: Optional[float] = None) -> None:
+    """같은 디렉토리의 임시 파일에 쓴 뒤 교체 (mtime을 주면 교체 전에 파일 시각을 맞춘다)"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        if mtime is not None:
+            os.utime(tmp_path, (mtime, mtime))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class SharedBlockCache:
+    """
+    프로세스 간 공유 캔들 블록 캐시
+
+    키는 KlineClient 캐시 키 (심볼, interval, limit, 봉 마감 경계)와 같고,
+    {root}/klines/{심볼}_{interval}_{limit}_{경계}.npy 파일 하나가 항목 하나다.
+    저장 시각(KlineClient 시계 기준)은 파일 mtime에 기록한다.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.join(root, "klines")
+        os.makedirs(self.root, exist_ok=True)
+
+    def _prefix(self, key: Tuple[str, str, int, int]) -> str:
+        symbol, interval, limit, _ = key
+        return os.path.join(self.root, f"{symbol}_{interval}_{limit}_")
+
+    def _path(self, key: Tuple[str, str, int, int]) -> str:
+        return f"{self._prefix(key)}{key[3]}.npy"
+
+    def get(self, key: Tuple[str, str, int, int]) -> Optional[Tuple[float, CandleBlock]]:
+        """(저장 시각, 블록) 반환, 없으면 None"""
+        path = self._path(key)
+        try:
+            stored_at = os.stat(path).st_mtime
+            values = np.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        # 저장 전에 이미 검증된 블록
+        return stored_at, CandleBlock(values, validate=False)
+
+    def put(self, key: Tuple[str, str, int, int], stored_at: float, block: CandleBlock) -> None:
+        """블록 저장 (같은 심볼/interval/limit의 이전 경계 파일은 삭제)"""
+        path = self._path(key)
+        try:
+            _atomic_write(path, lambda f: np.save(f, block.values, allow_pickle=False), mtime=stored_at)
+            for stale in glob.glob(f"{glob.escape(self._prefix(key))}*.npy"):
+                if stale != path:
+                    # 다른 워커가 먼저 지웠을 수 있음
+                    try:
+                        os.unlink(stale)
+                    except FileNotFoundError:
+                        pass
+        except OSError as e:
+            logger.error(f"공유 캔들 캐시 저장 실패: {e}")
+
+
+class WorkerRegistry:
+    """
+    워커별 상태(역할, 부하, 컨슈머 지연 등)를 {root}/workers/{pid}.json으로 공유
+
+    각 워커가 주기적으로 publish()를 호출하고, 준비 상태 확인 시 workers()로 모든 워커의 상태를 읽는다.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        stale_after: float = WORKER_STALE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.root = os.path.join(root, "workers")
+        self.stale_after = stale_after
+        self._clock = clock
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.root, f"{pid}.json")
+
+    def publish(self, status: Dict[str, Any], pid: Optional[int] = None) -> None:
+        """이 워커의 상태 기록"""
+        pid = pid or os.getpid()
+        record = {**status, "pid": pid, "updated_at": self._clock()}
+        data = json.dumps(record, default=str).encode("utf-8")
+        try:
+            _atomic_write(self._path(pid), lambda f: f.write(data))
+        except OSError as e:
+            logger.error(f"워커 상태 기록 실패: {e}")
+
+    def workers(self) -> List[Dict[str, Any]]:
+        """하트비트가 살아 있는 워커 상태 목록 (pid 순)"""
+        now = self._clock()
+        records = []
+        for path in glob.glob(os.path.join(self.root, "*.json")):
+            try:
+                with open(path, "rb") as f:
+                    record = json.loads(f.read())
+            except (OSError, ValueError):
+                continue
+            if now - record.get("updated_at", 0) <= self.stale_after:
+                records.append(record)
+        return sorted(records, key=lambda r: r["pid"])
+
+    def remove(self, pid: Optional[int] = None) -> None:
+        """종료 시 이 워커의 상태 삭제"""
+        try:
+            os.unlink(self._path(pid or os.getpid()))
+        except FileNotFoundError:
+            pass
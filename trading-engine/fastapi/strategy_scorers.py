@@ -5,47 +5,47 @@
 - Mean Reversion (역추세매매)
 """
 
-import pandas as pd
-import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any
 from datetime import datetime
 import logging
 
-from models import ScoreRequest, Candle
+from models import ScoreRequest
+from indicators import IndicatorEngine, IndicatorFrame, indicator_engine, last_value
+from metrics import sub_score
 
 logger = logging.getLogger(__name__)
 
 class BreakoutScorer:
     """돌파매매 점수 계산기"""
     
-    def __init__(self):
-        pass
+    def __init__(self, engine: IndicatorEngine = None):
+        self.engine = engine or indicator_engine
     
     def calculate_score(self, request: ScoreRequest) -> Dict[str, Any]:
         """돌파매매 점수 계산"""
         try:
-            df = self._candles_to_dataframe(request.candles)
+            frame = self.engine.frame_for_request(request)
             
-            if len(df) < 20:
+            if len(frame) < 20:
                 return {"error": "최소 20개의 캔들 데이터가 필요합니다"}
             
             # Z1 - 구간 정의 (15점)
-            zone_score = self._calculate_zone_score(df)
+            zone_score = sub_score("breakout", "zone", self._calculate_zone_score, frame)
             
             # Z2 - 트리거 확인 (25점)
-            trigger_score = self._calculate_trigger_score(df)
+            trigger_score = sub_score("breakout", "trigger", self._calculate_trigger_score, frame)
             
             # Z3 - 엔트리 (20점)
-            entry_score = self._calculate_entry_score(df)
+            entry_score = sub_score("breakout", "entry", self._calculate_entry_score, frame)
             
             # Z4 - 리스크 관리 (15점)
-            risk_score = self._calculate_risk_score(df)
+            risk_score = sub_score("breakout", "risk", self._calculate_risk_score, frame)
             
             # Z5 - 익절·청산 (15점)
-            exit_score = self._calculate_exit_score(df)
+            exit_score = sub_score("breakout", "exit", self._calculate_exit_score, frame)
             
             # Z6 - 후속 관리 (10점)
-            followup_score = self._calculate_followup_score(df)
+            followup_score = sub_score("breakout", "followup", self._calculate_followup_score, frame)
             
             # 총점 계산 (100점 만점)
             total_score = zone_score + trigger_score + entry_score + risk_score + exit_score + followup_score
@@ -74,37 +74,19 @@ class BreakoutScorer:
             logger.error(f"돌파매매 점수 계산 중 오류: {e}")
             return {"error": f"돌파매매 점수 계산 중 오류가 발생했습니다: {str(e)}"}
     
-    def _candles_to_dataframe(self, candles: List[Candle]) -> pd.DataFrame:
-        """캔들 리스트를 DataFrame으로 변환"""
-        data = []
-        for candle in candles:
-            data.append({
-                'timestamp': candle.timestamp,
-                'open': candle.open,
-                'high': candle.high,
-                'low': candle.low,
-                'close': candle.close,
-                'volume': candle.volume
-            })
-        
-        df = pd.DataFrame(data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df = df.sort_values('timestamp').reset_index(drop=True)
-        return df
-    
-    def _calculate_zone_score(self, df: pd.DataFrame) -> float:
+    def _calculate_zone_score(self, frame: IndicatorFrame) -> float:
         """Z1 - 구간 정의 점수 (15점)"""
         try:
             # 구간 길이 (7점)
-            zone_bars = len(df)
+            zone_bars = len(frame)
             zone_length_score = max(0, min(zone_bars, 30) - 20) / 10 * 7
             
             # 상단 재테스트 횟수 (5점) - 간단한 구현
-            tests = min(3, len(df[df['high'] > df['high'].rolling(5).mean()]))
+            tests = min(3, int((frame.df['high'] > frame.sma(5, 'high')).sum()))
             test_score = tests / 3 * 5
             
             # 변동성 수렴 (3점)
-            atr_ratio = self._calculate_atr_ratio(df)
+            atr_ratio = self._calculate_atr_ratio(frame)
             if atr_ratio <= 0.70:
                 volatility_score = 3
             elif atr_ratio <= 0.90:
@@ -118,13 +100,13 @@ class BreakoutScorer:
             logger.error(f"구간 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_trigger_score(self, df: pd.DataFrame) -> float:
+    def _calculate_trigger_score(self, frame: IndicatorFrame) -> float:
         """Z2 - 트리거 확인 점수 (25점)"""
         try:
             # 종가 돌파 강도 (10점)
-            current_close = df['close'].iloc[-1]
-            resistance = df['high'].rolling(20).max().iloc[-2]  # 이전 최고점
-            atr = self._calculate_atr(df)
+            current_close = frame.df['close'].iloc[-1]
+            resistance = frame.rolling_max(20, 'high').iloc[-2]  # 이전 최고점
+            atr = self._calculate_atr(frame)
             
             breakout_strength = (current_close - resistance) / atr if atr > 0 else 0
             if breakout_strength >= 1:
@@ -137,8 +119,8 @@ class BreakoutScorer:
                 breakout_score = 0
             
             # 거래량 증가율 (8점)
-            current_vol = df['volume'].iloc[-1]
-            avg_vol = df['volume'].rolling(20).mean().iloc[-1]
+            current_vol = frame.df['volume'].iloc[-1]
+            avg_vol = frame.sma(20, 'volume').iloc[-1]
             vol_ratio = current_vol / avg_vol if avg_vol > 0 else 1
             
             if vol_ratio >= 2:
@@ -151,8 +133,8 @@ class BreakoutScorer:
                 volume_score = 0
             
             # 밴드 폭 확장 (6점)
-            bb_width_now = self._calculate_bb_width(df)
-            bb_width_20ago = self._calculate_bb_width(df.iloc[:-20]) if len(df) > 20 else bb_width_now
+            bb_width_now = self._calculate_bb_width(frame)
+            bb_width_20ago = self._calculate_bb_width(frame, offset=21) if len(frame) > 20 else bb_width_now
             
             bb_ratio = bb_width_now / bb_width_20ago if bb_width_20ago > 0 else 1
             if bb_ratio >= 1.5:
@@ -163,8 +145,8 @@ class BreakoutScorer:
                 bb_score = 0
             
             # 모멘텀 양호 (1점)
-            cci = self._calculate_cci(df)
-            macd_hist = self._calculate_macd_hist(df)
+            cci = self._calculate_cci(frame)
+            macd_hist = self._calculate_macd_hist(frame)
             momentum_score = 1 if cci > 0 and macd_hist > 0 else 0
             
             return breakout_score + volume_score + bb_score + momentum_score
@@ -173,7 +155,7 @@ class BreakoutScorer:
             logger.error(f"트리거 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_entry_score(self, df: pd.DataFrame) -> float:
+    def _calculate_entry_score(self, frame: IndicatorFrame) -> float:
         """Z3 - 엔트리 점수 (20점)"""
         try:
             # 진입 타이밍 (10점) - 간단한 구현
@@ -191,11 +173,11 @@ class BreakoutScorer:
             logger.error(f"엔트리 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_risk_score(self, df: pd.DataFrame) -> float:
+    def _calculate_risk_score(self, frame: IndicatorFrame) -> float:
         """Z4 - 리스크 관리 점수 (15점)"""
         try:
             # 손절 거리 (7점)
-            atr = self._calculate_atr(df)
+            atr = self._calculate_atr(frame)
             stop_dist = atr * 1.5  # ATR의 1.5배
             stop_ratio = stop_dist / atr if atr > 0 else 1
             
@@ -218,7 +200,7 @@ class BreakoutScorer:
             logger.error(f"리스크 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_exit_score(self, df: pd.DataFrame) -> float:
+    def _calculate_exit_score(self, frame: IndicatorFrame) -> float:
         """Z5 - 익절·청산 점수 (15점)"""
         try:
             # 실제 RR 달성 (8점)
@@ -236,7 +218,7 @@ class BreakoutScorer:
             logger.error(f"익절 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_followup_score(self, df: pd.DataFrame) -> float:
+    def _calculate_followup_score(self, frame: IndicatorFrame) -> float:
         """Z6 - 후속 관리 점수 (10점)"""
         try:
             # 가짜 돌파 대응 (7점)
@@ -251,69 +233,41 @@ class BreakoutScorer:
             logger.error(f"후속 관리 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> float:
-        """ATR 계산"""
+    def _calculate_atr(self, frame: IndicatorFrame, period: int = 14, offset: int = 1) -> float:
+        """ATR 계산 (offset번째 마지막 봉 기준)"""
         try:
-            high = df['high']
-            low = df['low']
-            close = df['close']
-            
-            tr1 = high - low
-            tr2 = abs(high - close.shift(1))
-            tr3 = abs(low - close.shift(1))
-            
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(period).mean().iloc[-1]
-            
-            return atr if not pd.isna(atr) else 0.0
+            return last_value(frame.atr(period), 0.0, offset)
         except:
             return 0.0
     
-    def _calculate_atr_ratio(self, df: pd.DataFrame) -> float:
+    def _calculate_atr_ratio(self, frame: IndicatorFrame) -> float:
         """ATR 비율 계산"""
         try:
-            current_atr = self._calculate_atr(df)
-            prev_atr = self._calculate_atr(df.iloc[:-20]) if len(df) > 20 else current_atr
+            current_atr = self._calculate_atr(frame)
+            prev_atr = self._calculate_atr(frame, offset=21) if len(frame) > 20 else current_atr
             
             return current_atr / prev_atr if prev_atr > 0 else 1.0
         except:
             return 1.0
     
-    def _calculate_bb_width(self, df: pd.DataFrame) -> float:
-        """볼린저 밴드 폭 계산"""
+    def _calculate_bb_width(self, frame: IndicatorFrame, offset: int = 1) -> float:
+        """볼린저 밴드 폭 계산 (offset번째 마지막 봉 기준)"""
         try:
-            sma = df['close'].rolling(20).mean()
-            std = df['close'].rolling(20).std()
-            upper = sma + (std * 2)
-            lower = sma - (std * 2)
-            
-            width = (upper - lower) / sma
-            return width.iloc[-1] if not pd.isna(width.iloc[-1]) else 0.0
+            return last_value(frame.bb_width(20, 2), 0.0, offset)
         except:
             return 0.0
     
-    def _calculate_cci(self, df: pd.DataFrame, period: int = 14) -> float:
+    def _calculate_cci(self, frame: IndicatorFrame, period: int = 14) -> float:
         """CCI 계산"""
         try:
-            typical_price = (df['high'] + df['low'] + df['close']) / 3
-            sma = typical_price.rolling(period).mean()
-            mad = typical_price.rolling(period).apply(lambda x: np.mean(np.abs(x - x.mean())))
-            
-            cci = (typical_price - sma) / (0.015 * mad)
-            return cci.iloc[-1] if not pd.isna(cci.iloc[-1]) else 0.0
+            return last_value(frame.cci(period), 0.0)
         except:
             return 0.0
     
-    def _calculate_macd_hist(self, df: pd.DataFrame) -> float:
+    def _calculate_macd_hist(self, frame: IndicatorFrame) -> float:
         """MACD 히스토그램 계산"""
         try:
-            ema12 = df['close'].ewm(span=12).mean()
-            ema26 = df['close'].ewm(span=26).mean()
-            macd = ema12 - ema26
-            signal = macd.ewm(span=9).mean()
-            hist = macd - signal
-            
-            return hist.iloc[-1] if not pd.isna(hist.iloc[-1]) else 0.0
+            return last_value(frame.macd_hist(12, 26, 9), 0.0)
         except:
             return 0.0
     
@@ -354,34 +308,34 @@ class BreakoutScorer:
 class TrendScorer:
     """추세매매 점수 계산기"""
     
-    def __init__(self):
-        pass
+    def __init__(self, engine: IndicatorEngine = None):
+        self.engine = engine or indicator_engine
     
     def calculate_score(self, request: ScoreRequest) -> Dict[str, Any]:
         """추세매매 점수 계산"""
         try:
-            df = self._candles_to_dataframe(request.candles)
+            frame = self.engine.frame_for_request(request)
             
-            if len(df) < 20:
+            if len(frame) < 20:
                 return {"error": "최소 20개의 캔들 데이터가 필요합니다"}
             
             # T1 - 추세 정의 (15점)
-            trend_score = self._calculate_trend_score(df)
+            trend_score = sub_score("trend", "trend", self._calculate_trend_score, frame)
             
             # T2 - 트리거 확인 (25점)
-            trigger_score = self._calculate_trigger_score(df)
+            trigger_score = sub_score("trend", "trigger", self._calculate_trigger_score, frame)
             
             # T3 - 엔트리 (20점)
-            entry_score = self._calculate_entry_score(df)
+            entry_score = sub_score("trend", "entry", self._calculate_entry_score, frame)
             
             # T4 - 리스크 관리 (15점)
-            risk_score = self._calculate_risk_score(df)
+            risk_score = sub_score("trend", "risk", self._calculate_risk_score, frame)
             
             # T5 - 익절·청산 (15점)
-            exit_score = self._calculate_exit_score(df)
+            exit_score = sub_score("trend", "exit", self._calculate_exit_score, frame)
             
             # T6 - 후속 관리 (10점)
-            followup_score = self._calculate_followup_score(df)
+            followup_score = sub_score("trend", "followup", self._calculate_followup_score, frame)
             
             # 총점 계산 (100점 만점)
             total_score = trend_score + trigger_score + entry_score + risk_score + exit_score + followup_score
@@ -410,33 +364,15 @@ class TrendScorer:
             logger.error(f"추세매매 점수 계산 중 오류: {e}")
             return {"error": f"추세매매 점수 계산 중 오류가 발생했습니다: {str(e)}"}
     
-    def _candles_to_dataframe(self, candles: List[Candle]) -> pd.DataFrame:
-        """캔들 리스트를 DataFrame으로 변환"""
-        data = []
-        for candle in candles:
-            data.append({
-                'timestamp': candle.timestamp,
-                'open': candle.open,
-                'high': candle.high,
-                'low': candle.low,
-                'close': candle.close,
-                'volume': candle.volume
-            })
-        
-        df = pd.DataFrame(data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df = df.sort_values('timestamp').reset_index(drop=True)
-        return df
-    
-    def _calculate_trend_score(self, df: pd.DataFrame) -> float:
+    def _calculate_trend_score(self, frame: IndicatorFrame) -> float:
         """T1 - 추세 정의 점수 (15점)"""
         try:
             # MA 정착 기간 (7점)
-            trend_bars = len(df)
+            trend_bars = len(frame)
             trend_score = max(0, min(trend_bars, 30) - 20) / 10 * 7
             
             # MA 기울기 (5점)
-            slope = self._calculate_slope(df)
+            slope = self._calculate_slope(frame)
             if slope >= 0.04:
                 slope_score = 5
             elif slope >= 0.02:
@@ -445,7 +381,7 @@ class TrendScorer:
                 slope_score = 1
             
             # HH/HL 구조 (3점)
-            higher_lows = self._count_higher_lows(df)
+            higher_lows = self._count_higher_lows(frame)
             structure_score = min(higher_lows, 3) / 3 * 3
             
             return trend_score + slope_score + structure_score
@@ -454,11 +390,11 @@ class TrendScorer:
             logger.error(f"추세 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_trigger_score(self, df: pd.DataFrame) -> float:
+    def _calculate_trigger_score(self, frame: IndicatorFrame) -> float:
         """T2 - 트리거 확인 점수 (25점)"""
         try:
             # ADX (10점)
-            adx = self._calculate_adx(df)
+            adx = self._calculate_adx(frame)
             if adx >= 35:
                 adx_score = 10
             elif adx >= 25:
@@ -469,8 +405,8 @@ class TrendScorer:
                 adx_score = 0
             
             # 거래량 증가율 (8점)
-            current_vol = df['volume'].iloc[-1]
-            avg_vol = df['volume'].rolling(20).mean().iloc[-1]
+            current_vol = frame.df['volume'].iloc[-1]
+            avg_vol = frame.sma(20, 'volume').iloc[-1]
             vol_ratio = current_vol / avg_vol if avg_vol > 0 else 1
             
             if vol_ratio >= 2:
@@ -486,8 +422,8 @@ class TrendScorer:
             ma_fan_score = 4  # 기본 점수
             
             # 모멘텀 동조 (1점)
-            rsi = self._calculate_rsi(df)
-            macd_hist = self._calculate_macd_hist(df)
+            rsi = self._calculate_rsi(frame)
+            macd_hist = self._calculate_macd_hist(frame)
             momentum_score = 1 if rsi > 50 and macd_hist > 0 else 0
             
             return adx_score + volume_score + ma_fan_score + momentum_score
@@ -496,7 +432,7 @@ class TrendScorer:
             logger.error(f"트리거 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_entry_score(self, df: pd.DataFrame) -> float:
+    def _calculate_entry_score(self, frame: IndicatorFrame) -> float:
         """T3 - 엔트리 점수 (20점)"""
         try:
             # 진입 타이밍 (10점)
@@ -514,11 +450,11 @@ class TrendScorer:
             logger.error(f"엔트리 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_risk_score(self, df: pd.DataFrame) -> float:
+    def _calculate_risk_score(self, frame: IndicatorFrame) -> float:
         """T4 - 리스크 관리 점수 (15점)"""
         try:
             # 손절 거리 (7점)
-            atr = self._calculate_atr(df)
+            atr = self._calculate_atr(frame)
             stop_dist = atr * 1.5
             stop_ratio = stop_dist / atr if atr > 0 else 1
             
@@ -541,7 +477,7 @@ class TrendScorer:
             logger.error(f"리스크 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_exit_score(self, df: pd.DataFrame) -> float:
+    def _calculate_exit_score(self, frame: IndicatorFrame) -> float:
         """T5 - 익절·청산 점수 (15점)"""
         try:
             # RR 달성 (8점)
@@ -559,7 +495,7 @@ class TrendScorer:
             logger.error(f"익절 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_followup_score(self, df: pd.DataFrame) -> float:
+    def _calculate_followup_score(self, frame: IndicatorFrame) -> float:
         """T6 - 후속 관리 점수 (10점)"""
         try:
             # 추세 약화 대응 (7점)
@@ -574,10 +510,10 @@ class TrendScorer:
             logger.error(f"후속 관리 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_slope(self, df: pd.DataFrame) -> float:
+    def _calculate_slope(self, frame: IndicatorFrame) -> float:
         """MA 기울기 계산"""
         try:
-            ma = df['close'].rolling(20).mean()
+            ma = frame.sma(20)
             if len(ma) >= 2:
                 slope = (ma.iloc[-1] - ma.iloc[-2]) / ma.iloc[-2]
                 return slope
@@ -585,86 +521,39 @@ class TrendScorer:
         except:
             return 0.0
     
-    def _count_higher_lows(self, df: pd.DataFrame) -> int:
+    def _count_higher_lows(self, frame: IndicatorFrame) -> int:
         """HH/HL 구조 카운트"""
         try:
-            lows = df['low'].rolling(5).min()
-            higher_lows = 0
-            for i in range(1, len(lows)):
-                if lows.iloc[i] > lows.iloc[i-1]:
-                    higher_lows += 1
-            return higher_lows
+            lows = frame.rolling_min(5, 'low')
+            return int((lows.diff() > 0).sum())
         except:
             return 0
     
-    def _calculate_adx(self, df: pd.DataFrame, period: int = 14) -> float:
+    def _calculate_adx(self, frame: IndicatorFrame, period: int = 14) -> float:
         """ADX 계산"""
         try:
-            # 간단한 ADX 구현
-            high = df['high']
-            low = df['low']
-            close = df['close']
-            
-            plus_dm = high.diff()
-            minus_dm = low.diff()
-            
-            plus_dm = plus_dm.where(plus_dm > minus_dm, 0)
-            minus_dm = minus_dm.where(minus_dm > plus_dm, 0)
-            
-            tr = pd.concat([high - low, abs(high - close.shift(1)), abs(low - close.shift(1))], axis=1).max(axis=1)
-            
-            atr = tr.rolling(period).mean()
-            plus_di = 100 * (plus_dm.rolling(period).mean() / atr)
-            minus_di = 100 * (minus_dm.rolling(period).mean() / atr)
-            
-            dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-            adx = dx.rolling(period).mean()
-            
-            return adx.iloc[-1] if not pd.isna(adx.iloc[-1]) else 0.0
+            return last_value(frame.adx(period), 0.0)
         except:
             return 0.0
     
-    def _calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> float:
+    def _calculate_rsi(self, frame: IndicatorFrame, period: int = 14) -> float:
         """RSI 계산"""
         try:
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi.iloc[-1] if not pd.isna(rsi.iloc[-1]) else 50.0
+            return last_value(frame.rsi(period), 50.0)
         except:
             return 50.0
     
-    def _calculate_macd_hist(self, df: pd.DataFrame) -> float:
+    def _calculate_macd_hist(self, frame: IndicatorFrame) -> float:
         """MACD 히스토그램 계산"""
         try:
-            ema12 = df['close'].ewm(span=12).mean()
-            ema26 = df['close'].ewm(span=26).mean()
-            macd = ema12 - ema26
-            signal = macd.ewm(span=9).mean()
-            hist = macd - signal
-            
-            return hist.iloc[-1] if not pd.isna(hist.iloc[-1]) else 0.0
+            return last_value(frame.macd_hist(12, 26, 9), 0.0)
         except:
             return 0.0
     
-    def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> float:
-        """ATR 계산"""
+    def _calculate_atr(self, frame: IndicatorFrame, period: int = 14, offset: int = 1) -> float:
+        """ATR 계산 (offset번째 마지막 봉 기준)"""
         try:
-            high = df['high']
-            low = df['low']
-            close = df['close']
-            
-            tr1 = high - low
-            tr2 = abs(high - close.shift(1))
-            tr3 = abs(low - close.shift(1))
-            
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(period).mean().iloc[-1]
-            
-            return atr if not pd.isna(atr) else 0.0
+            return last_value(frame.atr(period), 0.0, offset)
         except:
             return 0.0
     
@@ -705,34 +594,34 @@ class TrendScorer:
 class MeanReversionScorer:
     """역추세매매 점수 계산기"""
     
-    def __init__(self):
-        pass
+    def __init__(self, engine: IndicatorEngine = None):
+        self.engine = engine or indicator_engine
     
     def calculate_score(self, request: ScoreRequest) -> Dict[str, Any]:
         """역추세매매 점수 계산"""
         try:
-            df = self._candles_to_dataframe(request.candles)
+            frame = self.engine.frame_for_request(request)
             
-            if len(df) < 20:
+            if len(frame) < 20:
                 return {"error": "최소 20개의 캔들 데이터가 필요합니다"}
             
             # R1 - 과열 구간 식별 (15점)
-            overheat_score = self._calculate_overheat_score(df)
+            overheat_score = sub_score("mean_reversion", "overheat", self._calculate_overheat_score, frame)
             
             # R2 - 반전 트리거 (25점)
-            trigger_score = self._calculate_trigger_score(df)
+            trigger_score = sub_score("mean_reversion", "trigger", self._calculate_trigger_score, frame)
             
             # R3 - 엔트리 (20점)
-            entry_score = self._calculate_entry_score(df)
+            entry_score = sub_score("mean_reversion", "entry", self._calculate_entry_score, frame)
             
             # R4 - 리스크 관리 (15점)
-            risk_score = self._calculate_risk_score(df)
+            risk_score = sub_score("mean_reversion", "risk", self._calculate_risk_score, frame)
             
             # R5 - 익절·청산 (15점)
-            exit_score = self._calculate_exit_score(df)
+            exit_score = sub_score("mean_reversion", "exit", self._calculate_exit_score, frame)
             
             # R6 - 후속 관리 (10점)
-            followup_score = self._calculate_followup_score(df)
+            followup_score = sub_score("mean_reversion", "followup", self._calculate_followup_score, frame)
             
             # 총점 계산 (100점 만점)
             total_score = overheat_score + trigger_score + entry_score + risk_score + exit_score + followup_score
@@ -761,31 +650,13 @@ class MeanReversionScorer:
             logger.error(f"역추세매매 점수 계산 중 오류: {e}")
             return {"error": f"역추세매매 점수 계산 중 오류가 발생했습니다: {str(e)}"}
     
-    def _candles_to_dataframe(self, candles: List[Candle]) -> pd.DataFrame:
-        """캔들 리스트를 DataFrame으로 변환"""
-        data = []
-        for candle in candles:
-            data.append({
-                'timestamp': candle.timestamp,
-                'open': candle.open,
-                'high': candle.high,
-                'low': candle.low,
-                'close': candle.close,
-                'volume': candle.volume
-            })
-        
-        df = pd.DataFrame(data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df = df.sort_values('timestamp').reset_index(drop=True)
-        return df
-    
-    def _calculate_overheat_score(self, df: pd.DataFrame) -> float:
+    def _calculate_overheat_score(self, frame: IndicatorFrame) -> float:
         """R1 - 과열 구간 식별 점수 (15점)"""
         try:
             # 과열 거리 (7점)
-            ema20 = df['close'].ewm(span=20).mean()
-            atr = self._calculate_atr(df)
-            dist = abs(df['close'].iloc[-1] - ema20.iloc[-1]) / atr if atr > 0 else 0
+            ema20 = frame.ema(20)
+            atr = self._calculate_atr(frame)
+            dist = abs(frame.df['close'].iloc[-1] - ema20.iloc[-1]) / atr if atr > 0 else 0
             
             if dist >= 3:
                 distance_score = 7
@@ -797,8 +668,8 @@ class MeanReversionScorer:
                 distance_score = 0
             
             # 오실레이터 극단 (4점)
-            rsi = self._calculate_rsi(df)
-            cci = self._calculate_cci(df)
+            rsi = self._calculate_rsi(frame)
+            cci = self._calculate_cci(frame)
             extremes = 0
             if rsi > 70 or rsi < 30:
                 extremes += 1
@@ -813,7 +684,7 @@ class MeanReversionScorer:
                 extreme_score = 0
             
             # 극단 봉 연속 (4점)
-            extreme_bars = self._count_extreme_bars(df)
+            extreme_bars = self._count_extreme_bars(frame)
             bar_score = min(extreme_bars, 3) / 3 * 4
             
             return distance_score + extreme_score + bar_score
@@ -822,7 +693,7 @@ class MeanReversionScorer:
             logger.error(f"과열 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_trigger_score(self, df: pd.DataFrame) -> float:
+    def _calculate_trigger_score(self, frame: IndicatorFrame) -> float:
         """R2 - 반전 트리거 점수 (25점)"""
         try:
             # 반전 패턴 (10점)
@@ -832,8 +703,8 @@ class MeanReversionScorer:
             divergence_score = 4  # 기본 점수
             
             # 거래량 고갈 (4점)
-            current_vol = df['volume'].iloc[-1]
-            avg_vol = df['volume'].rolling(20).mean().iloc[-1]
+            current_vol = frame.df['volume'].iloc[-1]
+            avg_vol = frame.sma(20, 'volume').iloc[-1]
             vol_ratio = current_vol / avg_vol if avg_vol > 0 else 1
             
             if vol_ratio <= 0.7:
@@ -852,7 +723,7 @@ class MeanReversionScorer:
             logger.error(f"트리거 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_entry_score(self, df: pd.DataFrame) -> float:
+    def _calculate_entry_score(self, frame: IndicatorFrame) -> float:
         """R3 - 엔트리 점수 (20점)"""
         try:
             # 진입 타이밍 (10점)
@@ -870,11 +741,11 @@ class MeanReversionScorer:
             logger.error(f"엔트리 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_risk_score(self, df: pd.DataFrame) -> float:
+    def _calculate_risk_score(self, frame: IndicatorFrame) -> float:
         """R4 - 리스크 관리 점수 (15점)"""
         try:
             # 손절 거리 (7점)
-            atr = self._calculate_atr(df)
+            atr = self._calculate_atr(frame)
             stop_dist = atr * 0.75  # ATR의 0.75배 (짧은 손절)
             stop_ratio = stop_dist / atr if atr > 0 else 1
             
@@ -897,7 +768,7 @@ class MeanReversionScorer:
             logger.error(f"리스크 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_exit_score(self, df: pd.DataFrame) -> float:
+    def _calculate_exit_score(self, frame: IndicatorFrame) -> float:
         """R5 - 익절·청산 점수 (15점)"""
         try:
             # 평균 회귀 달성 (8점)
@@ -915,7 +786,7 @@ class MeanReversionScorer:
             logger.error(f"익절 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_followup_score(self, df: pd.DataFrame) -> float:
+    def _calculate_followup_score(self, frame: IndicatorFrame) -> float:
         """R6 - 후속 관리 점수 (10점)"""
         try:
             # 추세 복귀 대응 (7점)
@@ -930,57 +801,36 @@ class MeanReversionScorer:
             logger.error(f"후속 관리 점수 계산 오류: {e}")
             return 0.0
     
-    def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> float:
-        """ATR 계산"""
+    def _calculate_atr(self, frame: IndicatorFrame, period: int = 14, offset: int = 1) -> float:
+        """ATR 계산 (offset번째 마지막 봉 기준)"""
         try:
-            high = df['high']
-            low = df['low']
-            close = df['close']
-            
-            tr1 = high - low
-            tr2 = abs(high - close.shift(1))
-            tr3 = abs(low - close.shift(1))
-            
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(period).mean().iloc[-1]
-            
-            return atr if not pd.isna(atr) else 0.0
+            return last_value(frame.atr(period), 0.0, offset)
         except:
             return 0.0
     
-    def _calculate_rsi(self, df: pd.DataFrame, period: int = 14) -> float:
+    def _calculate_rsi(self, frame: IndicatorFrame, period: int = 14) -> float:
         """RSI 계산"""
         try:
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            return rsi.iloc[-1] if not pd.isna(rsi.iloc[-1]) else 50.0
+            return last_value(frame.rsi(period), 50.0)
         except:
             return 50.0
     
-    def _calculate_cci(self, df: pd.DataFrame, period: int = 14) -> float:
+    def _calculate_cci(self, frame: IndicatorFrame, period: int = 14) -> float:
         """CCI 계산"""
         try:
-            typical_price = (df['high'] + df['low'] + df['close']) / 3
-            sma = typical_price.rolling(period).mean()
-            mad = typical_price.rolling(period).apply(lambda x: np.mean(np.abs(x - x.mean())))
-            
-            cci = (typical_price - sma) / (0.015 * mad)
-            return cci.iloc[-1] if not pd.isna(cci.iloc[-1]) else 0.0
+            return last_value(frame.cci(period), 0.0)
         except:
             return 0.0
     
-    def _count_extreme_bars(self, df: pd.DataFrame) -> int:
+    def _count_extreme_bars(self, frame: IndicatorFrame) -> int:
         """극단 봉 연속 카운트"""
         try:
-            ema20 = df['close'].ewm(span=20).mean()
+            ema20 = frame.ema(20)
+            close = frame.df['close']
             extreme_count = 0
             
-            for i in range(max(0, len(df)-5), len(df)):
-                if abs(df['close'].iloc[i] - ema20.iloc[i]) > df['close'].iloc[i] * 0.02:
+            for i in range(max(0, len(frame)-5), len(frame)):
+                if abs(close.iloc[i] - ema20.iloc[i]) > close.iloc[i] * 0.02:
                     extreme_count += 1
                 else:
                     break
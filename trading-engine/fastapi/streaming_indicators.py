@@ -0,0 +1,463 @@
+"""
+증분(스트리밍) 지표 상태
+심볼별로 지표 계산 상태를 유지하고 새 캔들이 들어올 때마다 O(1)로 갱신하여
+실시간 스코어링 비용이 윈도우 길이가 아닌 새 캔들 수에 비례하도록 한다.
+"""
+
+import math
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from candle_block import CandleBlock
+from indicators import IndicatorFrame
+
+# 스트리밍으로 유지하는 지표 (IndicatorFrame 메모 키와 동일)
+STREAM_KEYS: Tuple[Hashable, ...] = (
+    ("sma", "close", 5),
+    ("sma", "close", 20),
+    ("sma", "high", 5),
+    ("sma", "volume", 20),
+    ("std", "close", 20),
+    ("max", "high", 20),
+    ("min", "low", 5),
+    ("ema", "close", 12),
+    ("ema", "close", 20),
+    ("ema", "close", 26),
+    ("pct", "close", 5),
+    ("tr",),
+    ("atr", 14),
+    ("atr_wilder", 14),
+    ("rsi", 14),
+    ("rsi_wilder", 14),
+    ("cci", 14),
+    ("macd_hist", 12, 26, 9),
+    ("bb_width", 20, 2),
+    ("adx", 14),
+)
+STREAM_INDEX: Dict[Hashable, int] = {key: i for i, key in enumerate(STREAM_KEYS)}
+
+NAN = float("nan")
+
+
+def _div(a: float, b: float) -> float:
+    """numpy와 같은 규칙의 나눗셈 (0으로 나누면 inf/nan)"""
+    if b == 0:
+        if a == 0 or a != a:
+            return NAN
+        return math.copysign(math.inf, a)
+    return a / b
+
+
+class _Rolling:
+    """
+    고정 길이 윈도우의 평균/표준편차 (pandas rolling, min_periods=window와 동일)
+
+    누적 오차를 줄이기 위해 첫 값을 기준으로 한 편차의 합/제곱합을 유지하고 주기적으로 다시 합산한다.
+    """
+
+    __slots__ = ("window", "values", "total", "total_sq", "nans", "ref", "steps")
+
+    RESYNC_STEPS = 1024
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nans = 0
+        self.ref: Optional[float] = None
+        self.steps = 0
+
+    def clone(self) -> "_Rolling":
+        other = _Rolling.__new__(_Rolling)
+        other.window = self.window
+        other.values = self.values.copy()
+        other.total = self.total
+        other.total_sq = self.total_sq
+        other.nans = self.nans
+        other.ref = self.ref
+        other.steps = self.steps
+        return other
+
+    def _add(self, x: float, sign: int) -> None:
+        if x != x:
+            self.nans += sign
+            return
+        d = x - self.ref
+        self.total += sign * d
+        self.total_sq += sign * d * d
+
+    def push(self, x: float) -> "_Rolling":
+        if self.ref is None and x == x:
+            self.ref = x
+        if len(self.values) == self.window:
+            self._add(self.values.popleft(), -1)
+        self.values.append(x)
+        if self.ref is not None:
+            self._add(x, 1)
+        else:
+            self.nans += 1
+
+        self.steps += 1
+        if self.steps % self.RESYNC_STEPS == 0:
+            self._resync()
+        return self
+
+    def _resync(self) -> None:
+        self.total = self.total_sq = 0.0
+        self.nans = 0
+        for x in self.values:
+            self._add(x, 1)
+
+    def mean(self) -> float:
+        if len(self.values) < self.window or self.nans:
+            return NAN
+        return self.ref + self.total / self.window
+
+    def std(self) -> float:
+        if len(self.values) < self.window or self.nans or self.window < 2:
+            return NAN
+        var = (self.total_sq - self.total * self.total / self.window) / (self.window - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class _RollingExtreme:
+    """고정 길이 윈도우의 최댓값/최솟값 (단조 큐, 분할 상환 O(1))"""
+
+    __slots__ = ("window", "sign", "items", "index")
+
+    def __init__(self, window: int, maximum: bool = True):
+        self.window = window
+        self.sign = 1 if maximum else -1
+        self.items: deque = deque()
+        self.index = 0
+
+    def clone(self) -> "_RollingExtreme":
+        other = _RollingExtreme.__new__(_RollingExtreme)
+        other.window = self.window
+        other.sign = self.sign
+        other.items = self.items.copy()
+        other.index = self.index
+        return other
+
+    def push(self, x: float) -> float:
+        while self.items and self.items[-1][1] * self.sign <= x * self.sign:
+            self.items.pop()
+        self.items.append((self.index, x))
+        if self.items[0][0] <= self.index - self.window:
+            self.items.popleft()
+        self.index += 1
+        return self.items[0][1] if self.index >= self.window else NAN
+
+
+class _Ewm:
+    """지수 이동평균 (pandas ewm(span), adjust=True)"""
+
+    __slots__ = ("decay", "num", "den")
+
+    def __init__(self, span: int):
+        self.decay = 1 - 2 / (span + 1)
+        self.num = 0.0
+        self.den = 0.0
+
+    def clone(self) -> "_Ewm":
+        other = _Ewm.__new__(_Ewm)
+        other.decay, other.num, other.den = self.decay, self.num, self.den
+        return other
+
+    def push(self, x: float) -> float:
+        self.num = self.num * self.decay + x
+        self.den = self.den * self.decay + 1
+        return self.num / self.den
+
+
+class _Rma:
+    """Wilder 평활 (pandas ewm(alpha=1/period, adjust=False, min_periods=period))"""
+
+    __slots__ = ("period", "alpha", "value", "count")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 1 / period
+        self.value = NAN
+        self.count = 0
+
+    def clone(self) -> "_Rma":
+        other = _Rma.__new__(_Rma)
+        other.period, other.alpha, other.value, other.count = self.period, self.alpha, self.value, self.count
+        return other
+
+    def push(self, x: float) -> float:
+        if x == x:
+            self.value = x if self.count == 0 else self.value + self.alpha * (x - self.value)
+            self.count += 1
+        return self.value if self.count >= self.period else NAN
+
+
+class IndicatorState:
+    """
+    한 심볼의 지표 계산 상태
+    push()는 캔들 하나를 반영하고 STREAM_KEYS 순서의 지표 값을 반환한다.
+    """
+
+    _PARTS = (
+        "close5", "close20", "high5", "volume20", "high_max20", "low_min5",
+        "ema12", "ema20", "ema26", "macd_signal", "tr14", "rma_tr14",
+        "rsi_gain14", "rsi_loss14", "rma_gain14", "rma_loss14",
+        "plus_dm14", "minus_dm14", "dx14",
+    )
+
+    def __init__(self):
+        self.close5 = _Rolling(5)
+        self.close20 = _Rolling(20)
+        self.high5 = _Rolling(5)
+        self.volume20 = _Rolling(20)
+        self.high_max20 = _RollingExtreme(20, maximum=True)
+        self.low_min5 = _RollingExtreme(5, maximum=False)
+        self.ema12 = _Ewm(12)
+        self.ema20 = _Ewm(20)
+        self.ema26 = _Ewm(26)
+        self.macd_signal = _Ewm(9)
+        self.tr14 = _Rolling(14)
+        self.rma_tr14 = _Rma(14)
+        self.rsi_gain14 = _Rolling(14)
+        self.rsi_loss14 = _Rolling(14)
+        self.rma_gain14 = _Rma(14)
+        self.rma_loss14 = _Rma(14)
+        self.plus_dm14 = _Rolling(14)
+        self.minus_dm14 = _Rolling(14)
+        self.dx14 = _Rolling(14)
+        self.closes: deque = deque(maxlen=6)
+        self.typical14: deque = deque(maxlen=14)
+        self.prev: Optional[Tuple[float, float, float]] = None
+
+    def clone(self) -> "IndicatorState":
+        """상태 복사 (진행 중인 봉을 임시로 반영할 때 사용, 윈도우 길이와 무관한 비용)"""
+        other = IndicatorState.__new__(IndicatorState)
+        for name in self._PARTS:
+            setattr(other, name, getattr(self, name).clone())
+        other.closes = self.closes.copy()
+        other.typical14 = self.typical14.copy()
+        other.prev = self.prev
+        return other
+
+    def push(self, row: Sequence[float]) -> List[float]:
+        _, _, high, low, close, volume = (float(x) for x in row)
+
+        sma5 = self.close5.push(close).mean()
+        sma20 = self.close20.push(close).mean()
+        std20 = self.close20.std()
+
+        ema12 = self.ema12.push(close)
+        ema20 = self.ema20.push(close)
+        ema26 = self.ema26.push(close)
+        macd = ema12 - ema26
+        macd_hist = macd - self.macd_signal.push(macd)
+
+        self.closes.append(close)
+        pct5 = close / self.closes[0] - 1 if len(self.closes) == 6 else NAN
+
+        # True Range / ATR
+        if self.prev is None:
+            tr = high - low
+            delta = dh = dl = NAN
+        else:
+            prev_high, prev_low, prev_close = self.prev
+            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+            delta = close - prev_close
+            dh = high - prev_high
+            dl = low - prev_low
+        atr = self.tr14.push(tr).mean()
+        atr_wilder = self.rma_tr14.push(tr)
+
+        # RSI (단순 이동평균 방식, 첫 봉의 변화량은 0으로 취급)
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        rsi = 100 - _div(100, 1 + _div(self.rsi_gain14.push(gain).mean(), self.rsi_loss14.push(loss).mean()))
+
+        # Wilder RSI (첫 봉은 제외)
+        if delta == delta:
+            avg_gain = self.rma_gain14.push(max(delta, 0.0))
+            avg_loss = self.rma_loss14.push(max(-delta, 0.0))
+        else:
+            avg_gain = self.rma_gain14.push(NAN)
+            avg_loss = self.rma_loss14.push(NAN)
+        rsi_wilder = 100 - _div(100, 1 + _div(avg_gain, avg_loss))
+
+        # CCI (윈도우 크기가 고정이므로 봉당 O(period))
+        self.typical14.append((high + low + close) / 3)
+        if len(self.typical14) == 14:
+            tp_mean = sum(self.typical14) / 14
+            mad = sum(abs(tp - tp_mean) for tp in self.typical14) / 14
+            cci = _div(self.typical14[-1] - tp_mean, 0.015 * mad)
+        else:
+            cci = NAN
+
+        bb_width = _div((sma20 + std20 * 2) - (sma20 - std20 * 2), sma20)
+
+        # ADX (IndicatorFrame.adx와 같은 방식)
+        plus_dm = dh if dh > dl else 0.0
+        minus_dm = dl if dl > plus_dm else 0.0
+        plus_di = 100 * _div(self.plus_dm14.push(plus_dm).mean(), atr)
+        minus_di = 100 * _div(self.minus_dm14.push(minus_dm).mean(), atr)
+        dx = 100 * _div(abs(plus_di - minus_di), plus_di + minus_di)
+        adx = self.dx14.push(dx).mean()
+
+        self.prev = (high, low, close)
+
+        return [
+            sma5,
+            sma20,
+            self.high5.push(high).mean(),
+            self.volume20.push(volume).mean(),
+            std20,
+            self.high_max20.push(high),
+            self.low_min5.push(low),
+            ema12,
+            ema20,
+            ema26,
+            pct5,
+            tr,
+            atr,
+            atr_wilder,
+            rsi,
+            rsi_wilder,
+            cci,
+            macd_hist,
+            bb_width,
+            adx,
+        ]
+
+
+class _SymbolStream:
+    """심볼 하나의 지표 상태와 마감된 봉의 지표 이력"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.history = np.empty((capacity * 2, len(STREAM_KEYS)), dtype=np.float64)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """상태와 이력 초기화"""
+        self.state = IndicatorState()
+        self.size = 0
+        self.count = 0
+        self.last_ts: Optional[float] = None
+
+    def commit(self, rows: np.ndarray) -> None:
+        """마감된 봉 반영 (봉당 O(1), 이력 배열은 가득 차면 뒤쪽 절반을 앞으로 옮긴다)"""
+        for row in rows:
+            if self.size == len(self.history):
+                self.history[:self.capacity] = self.history[self.size - self.capacity:self.size]
+                self.size = self.capacity
+            self.history[self.size] = self.state.push(row)
+            self.size += 1
+            self.count += 1
+            self.last_ts = row[0]
+
+    def new_rows(self, timestamps: np.ndarray) -> Optional[int]:
+        """
+        블록에서 아직 반영하지 않은 마감 봉의 시작 위치
+
+        블록이 스트림에 이어지지 않으면 None (마지막 봉은 진행 중인 봉으로 보고 제외)
+        """
+        if self.last_ts is None:
+            return None
+        idx = int(np.searchsorted(timestamps, self.last_ts))
+        if idx >= len(timestamps) - 1 or timestamps[idx] != self.last_ts:
+            return None
+        if (np.diff(timestamps[idx:]) <= 0).any():
+            return None
+        return idx + 1
+
+    def window(self, last_row: np.ndarray, n: int) -> np.ndarray:
+        """마감 봉 이력 n-1개 + 진행 중인 봉을 임시 반영한 지표 값 (n, 지표 수)"""
+        tentative = self.state.clone().push(last_row)
+        values = np.empty((n, len(STREAM_KEYS)), dtype=np.float64)
+        values[:n - 1] = self.history[self.size - (n - 1):self.size]
+        values[n - 1] = tentative
+        return values
+
+
+class StreamingFrame(IndicatorFrame):
+    """
+    스트리밍 상태에서 만든 IndicatorFrame
+    STREAM_KEYS에 있는 지표는 저장된 값을 그대로 쓰고, 나머지는 기존처럼 윈도우에서 계산한다.
+    """
+
+    def __init__(self, block: CandleBlock, values: np.ndarray):
+        super().__init__(block)
+        self._stream_values = values
+
+    def _memo(self, key: Hashable, compute):
+        if key not in self._series:
+            column = STREAM_INDEX.get(key)
+            if column is not None:
+                self._series[key] = pd.Series(self._stream_values[:, column])
+        return super()._memo(key, compute)
+
+
+class StreamingIndicatorStore:
+    """
+    (심볼, 타임프레임)별 증분 지표 상태 저장소
+
+    같은 심볼의 다음 윈도우가 들어오면 새로 마감된 봉만 상태에 반영하고, 마지막(진행 중인) 봉은
+    상태 복사본에 임시로 반영한다. 지표 값은 윈도우가 아니라 스트림 전체 이력을 기준으로 한다.
+    스트림에 이어지지 않는 더 최신 윈도우는 상태를 다시 만들고, 과거 윈도우는 기존 방식으로 계산한다.
+    """
+
+    def __init__(self, capacity: int = 256, max_symbols: int = 1024):
+        self.capacity = capacity
+        self.max_symbols = max_symbols
+        self._streams: "OrderedDict[Tuple[str, str], _SymbolStream]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+        self.updates = 0
+
+    def _stream(self, key: Tuple[str, str]) -> _SymbolStream:
+        with self._lock:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = _SymbolStream(self.capacity)
+                while len(self._streams) > self.max_symbols:
+                    self._streams.popitem(last=False)
+            self._streams.move_to_end(key)
+            return stream
+
+    def frame(self, block: CandleBlock, symbol: str, timeframe: str = "") -> IndicatorFrame:
+        """캔들 블록에 대한 프레임 반환 (스트리밍 불가한 입력은 IndicatorFrame으로 계산)"""
+        n = len(block)
+        if n < 2 or n - 1 > self.capacity:
+            return IndicatorFrame(block)
+
+        timestamps = block.timestamp
+        stream = self._stream((symbol, timeframe))
+        with stream.lock:
+            start = stream.new_rows(timestamps)
+            # 이력이 블록 앞부분을 모두 덮고 있어야 새 봉만 반영해도 윈도우가 완성된다
+            if start is not None and stream.size >= start:
+                stream.commit(block.values[start:n - 1])
+                self.updates += n - 1 - start
+            elif stream.last_ts is None or timestamps[-1] > stream.last_ts:
+                if (np.diff(timestamps) <= 0).any():
+                    return IndicatorFrame(block)
+                stream.reset()
+                stream.commit(block.values[:n - 1])
+                self.rebuilds += 1
+            else:
+                return IndicatorFrame(block)
+
+            values = stream.window(block.values[-1], n)
+        return StreamingFrame(block, values)
+
+    def clear(self) -> None:
+        """상태 초기화"""
+        with self._lock:
+            self._streams.clear()
+            self.rebuilds = 0
+            self.updates = 0
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# app 디렉토리 모듈(플랫 import) 경로 추가 (테스트 모듈 import 전에 한 번만)
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "app")
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import date
+
+from fastapi import HTTPException
+
+from analysis_jobs import AnalysisJobQueue, AnalysisResultSaver
+from pattern_analyzers import TokenBudgetExceededError
+from schemas import WeeklyAnalysisResponse
+
+START, END = date(2024, 1, 8), date(2024, 1, 14)
+
+
+def test_jobs_run_with_bounded_workers_and_retry_server_errors():
+    attempts = {}
+    running = []
+    peak = []
+
+    async def runner(user_id, start_date, end_date):
+        attempts[user_id] = attempts.get(user_id, 0) + 1
+        running.append(user_id)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(user_id)
+        if user_id == "flaky" and attempts[user_id] == 1:
+            raise HTTPException(status_code=500, detail="LLM 실패")
+        if user_id == "empty":
+            raise HTTPException(status_code=404, detail="데이터 없음")
+        if user_id == "over_budget":
+            raise TokenBudgetExceededError("토큰 예산 초과")
+        return WeeklyAnalysisResponse(success=True, message=user_id)
+
+    async def run():
+        queue = AnalysisJobQueue(workers=2, max_attempts=3, retry_delay=0, runner=runner)
+        jobs = [queue.submit(user, START, END) for user in ("a", "b", "c", "flaky", "empty", "over_budget")]
+        duplicate = queue.submit("a", START, END)
+        await queue.start()
+        await queue._queue.join()
+        await queue.stop()
+        return queue, jobs, duplicate
+
+    queue, jobs, duplicate = asyncio.run(run())
+    by_user = {job.user_id: job for job in jobs}
+
+    assert duplicate is by_user["a"]
+    assert max(peak) == 2
+    assert by_user["a"].to_response().result.message == "a"
+    assert (by_user["flaky"].status, by_user["flaky"].attempts) == ("succeeded", 2)
+    assert (by_user["empty"].status, by_user["empty"].attempts, by_user["empty"].error) == ("failed", 1, "데이터 없음")
+    assert (by_user["over_budget"].status, by_user["over_budget"].attempts) == ("failed", 1)
+    assert queue.get(by_user["b"].id) is by_user["b"]
+    assert queue.stats() == {"succeeded": 4, "failed": 2, "pending": 0}
+    # 끝난 작업은 진행 중 목록에서 빠지고, 같은 사용자/기간은 새 작업으로 등록됨
+    assert queue._active == {}
+    assert queue.submit("a", START, END) is not by_user["a"]
+
+
+def test_saver_writes_concurrent_results_in_one_batch():
+    batches = []
+
+    def writer(rows):
+        batches.append(rows)
+        return {(user_id, start, end): i for i, (user_id, start, end, _) in enumerate(rows)}
+
+    users = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(3)]
+
+    async def run():
+        saver = AnalysisResultSaver(writer=writer, delay=0.01)
+        return await asyncio.gather(*(saver.save(user, START, END, {"n": i}) for i, user in enumerate(users)))
+
+    assert asyncio.run(run()) == [0, 1, 2]
+    assert len(batches) == 1 and [row[0] for row in batches[0]] == users
+
+
+def test_saver_failure_returns_none_to_every_waiter():
+    def writer(rows):
+        raise RuntimeError("db down")
+
+    async def run():
+        saver = AnalysisResultSaver(writer=writer, delay=0, max_batch=2)
+        return await asyncio.gather(*(saver.save(f"user-{i}", START, END, {}) for i in range(2)))
+
+    assert asyncio.run(run()) == [None, None]
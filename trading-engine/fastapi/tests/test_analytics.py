@@ -0,0 +1,63 @@
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+
+from analytics import PERIOD_AGGREGATES_QUERY, generate_weekly_analysis_data
+
+Row = namedtuple("Row", [
+    "section", "period", "strategy", "hour_of_day", "rule_code", "total_trades", "winning_trades",
+    "avg_win", "avg_loss", "avg_pnl", "total_pnl", "avg_score",
+    "violation_count", "trades_with_violation", "avg_penalty", "total_penalty",
+])
+
+
+def _row(section, period, **values):
+    defaults = dict.fromkeys(Row._fields)
+    defaults.update(section=section, period=period, **values)
+    return Row(**defaults)
+
+
+class _FakeDb:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def execute(self, query, params):
+        self.calls.append((query, params))
+        rows = self.rows
+
+        class Result:
+            def fetchall(self):
+                return rows
+        return Result()
+
+
+def test_weekly_data_comes_from_one_rollup_query_with_half_open_range():
+    db = _FakeDb([
+        _row("total", "this", total_trades=4),
+        _row("strategy", "this", strategy="trend", total_trades=1, winning_trades=1, avg_win=Decimal("5.00"), avg_pnl=Decimal("5.00"), total_pnl=Decimal("5.00"), avg_score=Decimal("70.0")),
+        _row("strategy", "this", strategy="breakout", total_trades=3, winning_trades=1, avg_win=Decimal("9.00"), avg_loss=Decimal("-2.00"), avg_pnl=Decimal("1.67"), total_pnl=Decimal("5.00"), avg_score=Decimal("55.0")),
+        _row("time", "this", hour_of_day=Decimal(9), total_trades=3, winning_trades=2, avg_pnl=Decimal("1.00"), total_pnl=Decimal("3.00"), avg_score=Decimal("60.0")),
+        _row("time", "this", hour_of_day=Decimal(15), total_trades=1, winning_trades=0),
+        _row("penalty", "this", rule_code="overtrade", violation_count=2, trades_with_violation=1, avg_penalty=Decimal("5.0"), total_penalty=Decimal("10.0")),
+        _row("total", "last", total_trades=0),
+    ])
+
+    data = generate_weekly_analysis_data(db, "00000000-0000-0000-0000-000000000001", date(2024, 1, 8), date(2024, 1, 14))
+
+    assert len(db.calls) == 1
+    query, params = db.calls[0]
+    assert query is PERIOD_AGGREGATES_QUERY
+    assert params["range_start"] == date(2024, 1, 1)
+    assert params["start_day"] == date(2024, 1, 8)
+    assert params["end_day"] == date(2024, 1, 15)
+    assert "FROM trades_daily_rollup" in str(query)
+    assert "user_id::text" not in str(query) and "DATE(entry_time)" not in str(query)
+
+    assert data["this_week_strategy_csv"].splitlines()[1:] == [
+        "breakout,3,1,33.3%,9.00,-2.00,1.67,5.00,55.0",
+        "trend,1,1,100.0%,5.00,0,5.00,5.00,70.0",
+    ]
+    assert data["this_week_time_csv"].splitlines()[1:] == ["09:00,3,2,66.7%,1.00,3.00,60.0"]
+    assert data["this_week_penalty_csv"].splitlines()[1:] == ["overtrade,2,1,25.0%,5.0,10.0"]
+    assert data["last_week_strategy_csv"].count("\n") == 0
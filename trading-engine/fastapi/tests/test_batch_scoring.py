@@ -0,0 +1,92 @@
+import random
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from schemas import Indicators, Trade
+from scoring import batch_columns, batch_score_dicts, compute_strategy_score, ladder_scores, score_batch, score_by_thresholds
+from trade_rescore import rescore_rows
+
+Row = namedtuple("Row", "id type trading_type entry_price stop_loss indicators strategy_score forbidden_penalty final_score")
+
+
+def _random_trades(trading_type, count, seed):
+    rng = random.Random(seed)
+
+    def maybe(make):
+        return None if rng.random() < 0.25 else make()
+
+    trades = []
+    for i in range(count):
+        indicators = Indicators(
+            volume=maybe(lambda: rng.uniform(0, 300)),
+            averageVolume=maybe(lambda: rng.choice([0, rng.uniform(50, 200)])),
+            prevRangeHigh=maybe(lambda: rng.uniform(90, 110)),
+            trendlineHigh=maybe(lambda: rng.uniform(90, 110)),
+            atr=maybe(lambda: rng.choice([0, rng.uniform(0, 3)])),
+            stopLossWithinLimit=maybe(lambda: rng.random() < 0.5),
+            htfTrend=maybe(lambda: rng.choice(["up", "down", "sideways"])),
+            htfTrend2=maybe(lambda: rng.choice(["up", "down", "sideways"])),
+            pullbackOk=maybe(lambda: rng.random() < 0.5),
+            trailStopCorrect=maybe(lambda: rng.random() < 0.5),
+            zscore=maybe(lambda: rng.uniform(-4, 4)),
+            reversalSignal=maybe(lambda: rng.random() < 0.5),
+            riskReward=maybe(lambda: rng.uniform(0, 3)),
+            entryCandleUpperWickRatio=maybe(lambda: rng.uniform(-0.1, 0.8)),
+            entryCandleLowerWickRatio=maybe(lambda: rng.uniform(-0.1, 0.8)),
+            bollingerPercent=maybe(lambda: rng.uniform(-0.3, 1.3)),
+        )
+        trades.append(Trade(
+            id=str(i), symbol="BTCUSDT", type=rng.choice(["buy", "sell"]), tradingType=trading_type,
+            quantity=1, entryPrice=rng.uniform(95, 115), stopLoss=maybe(lambda: rng.uniform(90, 115)),
+            status="open", indicators=indicators, entryTime=datetime(2024, 1, 1),
+            createdAt=datetime(2024, 1, 1), updatedAt=datetime(2024, 1, 1),
+        ))
+    return trades
+
+
+def test_ladder_scores_matches_score_by_thresholds():
+    thresholds = [(1.5, 15), (1.4, 12), (1.2, 8), (1.1, 5)]
+    values = np.array([0.5, 1.1, 1.15, 1.2, 1.39, 1.4, 1.5, 9.0])
+    expected = [score_by_thresholds(v, thresholds, 3) for v in values]
+    assert ladder_scores(values, thresholds, 3).tolist() == expected
+
+
+@pytest.mark.parametrize("trading_type", ["breakout", "trend", "counter_trend"])
+def test_batch_scores_match_row_scorer(trading_type):
+    trades = _random_trades(trading_type, 500, seed=len(trading_type))
+    cols = batch_columns(
+        [t.type for t in trades],
+        [t.entryPrice for t in trades],
+        [t.stopLoss for t in trades],
+        [t.indicators.model_dump() for t in trades],
+    )
+
+    batch = batch_score_dicts(score_batch(trading_type, cols))
+
+    assert batch == [compute_strategy_score(t).model_dump() for t in trades]
+
+
+def test_rescore_rows_returns_only_changed_trades():
+    trades = _random_trades("breakout", 3, seed=7)
+    current = [compute_strategy_score(t).model_dump() for t in trades]
+    rows = [
+        # 점수 그대로
+        Row(1, trades[0].type, "breakout", trades[0].entryPrice, trades[0].stopLoss,
+            trades[0].indicators.model_dump(), current[0], 0, current[0]["totalScore"] + 40),
+        # 가중치 변경 전 점수
+        Row(2, trades[1].type, "breakout", trades[1].entryPrice, trades[1].stopLoss,
+            trades[1].indicators.model_dump(), {"strategy": "breakout", "totalScore": -1, "criteria": []}, 0, 0),
+        # 금기룰 감점만 반영되지 않은 final_score
+        Row(3, trades[2].type, "breakout", trades[2].entryPrice, trades[2].stopLoss,
+            trades[2].indicators.model_dump(), current[2], 10, current[2]["totalScore"] + 40),
+    ]
+
+    updates = rescore_rows(rows)
+
+    assert [u["id"] for u in updates] == [2, 3]
+    assert updates[0]["strategy_score"] == current[1]
+    assert updates[0]["final_score"] == current[1]["totalScore"] + 40
+    assert updates[1]["final_score"] == current[2]["totalScore"] + 30
@@ -0,0 +1,99 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Ensure imports work when running tests from repo root
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from candle_block import CandleBlock
+from models import Candle, CandleColumns, ColumnarScoreRequest, ScoreRequest
+from scorer import BreakoutScorer as LegacyBreakoutScorer
+from strategy_scorers import BreakoutScorer, TrendScorer, MeanReversionScorer
+
+
+def _columns(n=60):
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    high = np.maximum(open_, close) + rng.uniform(0.1, 1.0, n)
+    low = np.minimum(open_, close) - rng.uniform(0.1, 1.0, n)
+    return {
+        "timestamp": [1_700_000_000_000 + i * 300_000 for i in range(n)],
+        "open": open_.tolist(),
+        "high": high.tolist(),
+        "low": low.tolist(),
+        "close": close.tolist(),
+        "volume": rng.uniform(100, 200, n).tolist(),
+    }
+
+
+def _list_request(cols):
+    candles = [
+        Candle(
+            timestamp=cols["timestamp"][i],
+            open=cols["open"][i],
+            high=cols["high"][i],
+            low=cols["low"][i],
+            close=cols["close"][i],
+            volume=cols["volume"][i],
+            symbol="BTC/USDT",
+        )
+        for i in range(len(cols["timestamp"]))
+    ]
+    return ScoreRequest(symbol="BTC/USDT", candles=candles, strategy_name="test")
+
+
+def _strip_timestamp(result):
+    return {k: v for k, v in result.items() if k != "timestamp"}
+
+
+@pytest.mark.parametrize(
+    "scorer, method",
+    [
+        (LegacyBreakoutScorer(), "breakout_score"),
+        (BreakoutScorer(), "calculate_score"),
+        (TrendScorer(), "calculate_score"),
+        (MeanReversionScorer(), "calculate_score"),
+    ],
+)
+def test_columnar_request_matches_candle_list(scorer, method):
+    cols = _columns()
+    columnar = ColumnarScoreRequest(symbol="BTC/USDT", candles=cols, strategy_name="test")
+
+    expected = getattr(scorer, method)(_list_request(cols))
+    actual = getattr(scorer, method)(columnar)
+
+    assert "error" not in actual
+    assert _strip_timestamp(actual) == _strip_timestamp(expected)
+
+
+def test_block_from_klines_parses_string_prices():
+    cols = _columns(20)
+    klines = [
+        [cols["timestamp"][i], str(cols["open"][i]), str(cols["high"][i]),
+         str(cols["low"][i]), str(cols["close"][i]), str(cols["volume"][i]), 0]
+        for i in range(20)
+    ]
+    block = CandleBlock.from_klines(klines)
+    assert len(block) == 20
+    assert block.values.dtype == np.float64
+    assert block.last_timestamp == cols["timestamp"][-1]
+
+
+@pytest.mark.parametrize(
+    "mutate, message",
+    [
+        (lambda c: c["timestamp"].reverse(), "시간순"),
+        (lambda c: c["high"].__setitem__(3, c["low"][3] - 1), "고가"),
+        (lambda c: c["volume"].__setitem__(0, -1.0), "거래량"),
+        (lambda c: c["close"].pop(), "길이"),
+    ],
+)
+def test_columns_vectorized_validation(mutate, message):
+    cols = _columns(30)
+    mutate(cols)
+    with pytest.raises(ValueError, match=message):
+        CandleColumns(**cols)
@@ -0,0 +1,47 @@
+
+import numpy as np
+import pytest
+
+from advanced_indicators import AdvancedIndicators
+from benchmark_indicators import (
+    legacy_atr, legacy_bollinger, legacy_macd_line, legacy_rsi,
+    legacy_stochastic_k, legacy_support_resistance, make_bars,
+)
+from indicator_kernels import ArrayIndicators, last
+from market_data import TechnicalAnalyzer
+
+
+@pytest.mark.parametrize("n", [30, 500])
+def test_scalar_api_matches_legacy_loops(n):
+    bars = make_bars(n, seed=n)
+    highs, lows, closes = (bars[k].tolist() for k in ("high", "low", "close"))
+
+    assert AdvancedIndicators.calculate_rsi(closes) == pytest.approx(legacy_rsi(closes))
+    assert AdvancedIndicators.calculate_macd(closes)[0] == pytest.approx(legacy_macd_line(closes))
+    assert AdvancedIndicators.calculate_stochastic(highs, lows, closes)[0] == pytest.approx(
+        legacy_stochastic_k(highs, lows, closes)
+    )
+    assert AdvancedIndicators.detect_support_resistance(highs, lows) == legacy_support_resistance(highs, lows)
+    assert TechnicalAnalyzer.calculate_atr(highs, lows, closes) == pytest.approx(legacy_atr(highs, lows, closes))
+    assert TechnicalAnalyzer.calculate_bollinger_bands(closes) == pytest.approx(legacy_bollinger(closes))
+
+
+def test_full_series_last_value_matches_scalar():
+    bars = make_bars(200)
+    rsi = ArrayIndicators.rsi(bars["close"], 14)
+
+    assert rsi.shape == (200,)
+    assert np.isnan(rsi[:14]).all()
+    assert last(rsi) == pytest.approx(legacy_rsi(bars["close"][:200].tolist()))
+    assert rsi[99] == pytest.approx(legacy_rsi(bars["close"][:100].tolist()))
+
+
+def test_batch_matches_per_symbol_computation():
+    universe = {"BTCUSDT": make_bars(300, seed=1), "ETHUSDT": make_bars(300, seed=2), "XRPUSDT": make_bars(120, seed=3)}
+
+    batch = ArrayIndicators.compute_batch(universe)
+
+    for symbol, bars in universe.items():
+        single = ArrayIndicators.compute_all(bars)
+        for name, series in single.items():
+            assert batch[symbol][name] == pytest.approx(last(series, np.nan), nan_ok=True)
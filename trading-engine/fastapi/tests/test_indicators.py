@@ -0,0 +1,67 @@
+import os
+import sys
+
+import numpy as np
+
+# Ensure imports work when running tests from repo root
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from candle_block import CandleBlock
+from indicators import IndicatorEngine
+from models import ColumnarScoreRequest
+from scorer import BreakoutScorer as LegacyBreakoutScorer
+from strategy_scorers import BreakoutScorer, TrendScorer, MeanReversionScorer
+
+
+def _block(n=50, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    values = np.column_stack([
+        1_700_000_000_000 + np.arange(n) * 300_000,
+        close,
+        close + 1.0,
+        close - 1.0,
+        close,
+        rng.uniform(100, 200, n),
+    ])
+    return CandleBlock(values)
+
+
+def test_all_scorers_share_one_frame_per_window():
+    engine = IndicatorEngine()
+    block = _block()
+    request = ColumnarScoreRequest.model_construct(
+        symbol="BTC/USDT", timeframe="5m", candles=block, strategy_name="test", include_indicators=True
+    )
+
+    LegacyBreakoutScorer(engine).breakout_score(request)
+    for scorer in (BreakoutScorer(engine), TrendScorer(engine), MeanReversionScorer(engine)):
+        assert "error" not in scorer.calculate_score(request)
+
+    assert engine.misses == 1
+    assert engine.hits == 3
+    frame = engine.frame(block, "BTC/USDT", "5m")
+    assert frame.atr(14) is frame.atr(14)
+
+
+def test_changed_last_candle_invalidates_window():
+    engine = IndicatorEngine()
+    block = _block()
+    first = engine.frame(block, "BTC/USDT", "5m")
+
+    updated = block.values.copy()
+    updated[-1, 4] += 0.5
+    second = engine.frame(CandleBlock(updated), "BTC/USDT", "5m")
+
+    assert first is not second
+    assert engine.misses == 2
+
+
+def test_engine_evicts_least_recently_used():
+    engine = IndicatorEngine(max_entries=2)
+    blocks = [_block(seed=s) for s in range(3)]
+    for block in blocks:
+        engine.frame(block, "BTC/USDT", "5m")
+
+    engine.frame(blocks[0], "BTC/USDT", "5m")
+    assert engine.misses == 4
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import sys
+
+import httpx
+
+# Ensure imports work when running tests from repo root
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from kline_client import KlineClient
+
+
+def _klines(n=30, start=1_700_000_000_000):
+    return [
+        [start + i * 300_000, "100.0", "101.0", "99.0", "100.5", "10.0", 0]
+        for i in range(n)
+    ]
+
+
+def _client(now, calls):
+    async def handler(request):
+        calls.append(request.url.params["symbol"])
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json=_klines())
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return KlineClient(client=http, clock=lambda: now[0])
+
+
+def test_concurrent_requests_share_one_fetch():
+    calls = []
+    kline_client = _client([1_700_000_010.0], calls)
+
+    async def run():
+        blocks = await asyncio.gather(*(kline_client.get_klines("BTCUSDT") for _ in range(10)))
+        await kline_client.close()
+        return blocks
+
+    blocks = asyncio.run(run())
+    assert calls == ["BTCUSDT"]
+    assert all(block is blocks[0] for block in blocks)
+    assert len(blocks[0]) == 30
+
+
+def test_cache_refreshes_after_candle_close():
+    calls = []
+    now = [1_700_000_010.0]
+    kline_client = _client(now, calls)
+
+    async def run():
+        await kline_client.get_klines("BTCUSDT")
+        now[0] += 60
+        await kline_client.get_klines("BTCUSDT")
+        now[0] += 300
+        await kline_client.get_klines("BTCUSDT")
+        await kline_client.get_klines("ETHUSDT")
+        await kline_client.close()
+
+    asyncio.run(run())
+    assert calls == ["BTCUSDT", "BTCUSDT", "ETHUSDT"]
@@ -0,0 +1,62 @@
+import asyncio
+
+import llm_analyzer
+from llm_cache import AnalysisCache
+
+DATA = {key: f"{key}\nrow" for key in (
+    "this_week_strategy_csv", "this_week_penalty_csv", "this_week_time_csv",
+    "last_week_strategy_csv", "last_week_penalty_csv", "last_week_time_csv",
+)}
+RESULT = {
+    "improvements": ["승률 개선"],
+    "top_loss_pattern": {"title": "t", "why": "w", "actions": ["a"]},
+    "top_profit_pattern": {"title": "t", "why": "w", "actions": ["a"]},
+}
+
+
+def _cache(analyzer):
+    """DB 대신 딕셔너리에 저장하는 캐시"""
+    cache = AnalysisCache(analyzer=analyzer)
+    store = {}
+    cache._load = store.get
+    cache._store = store.__setitem__
+    return cache, store
+
+
+def test_concurrent_identical_requests_share_one_llm_call():
+    calls = []
+
+    async def analyzer(data):
+        calls.append(data)
+        await asyncio.sleep(0.01)
+        return RESULT
+
+    cache, store = _cache(analyzer)
+
+    async def run():
+        first = await asyncio.gather(*(cache.get_or_analyze(dict(DATA)) for _ in range(5)))
+        again = await cache.get_or_analyze(dict(DATA))
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r == RESULT for r in first) and again == RESULT
+    assert cache.stats() == {"hits": 1, "misses": 1, "coalesced": 4, "inflight": 0}
+    assert list(store) == [llm_analyzer.analysis_cache_key(DATA)]
+
+
+def test_key_changes_with_input_and_prompt_version(monkeypatch):
+    key = llm_analyzer.analysis_cache_key(DATA)
+    assert llm_analyzer.analysis_cache_key(dict(DATA, this_week_time_csv="other")) != key
+    monkeypatch.setattr(llm_analyzer, "PROMPT_VERSION", "weekly-v2")
+    assert llm_analyzer.analysis_cache_key(DATA) != key
+
+
+def test_invalid_results_are_not_cached():
+    async def analyzer(data):
+        return {"improvements": "not a list"}
+
+    cache, store = _cache(analyzer)
+
+    assert asyncio.run(cache.get_or_analyze(DATA)) == {"improvements": "not a list"}
+    assert store == {}
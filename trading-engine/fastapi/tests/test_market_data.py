@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+
+from market_data import MarketDataProvider, MarketDataService
+
+
+def _kline(open_ms):
+    return [open_ms, "100", "101", "99", "100.5", "10", open_ms + 3_599_999, "1000", 5, "4", "400", "0"]
+
+
+def _provider(calls):
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path.endswith("/exchangeInfo"):
+            return httpx.Response(200, json={"symbols": [
+                {"symbol": "BTCUSDT", "status": "TRADING"},
+                {"symbol": "LUNAUSDT", "status": "BREAK"},
+            ]})
+        start = int(request.url.params.get("startTime", 1_700_000_000_000))
+        return httpx.Response(200, json=[_kline(start + i * 3_600_000) for i in range(3)])
+
+    return MarketDataProvider(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+def test_symbol_validation_uses_cached_exchange_table():
+    calls = []
+    service = MarketDataService()
+    service.provider = _provider(calls)
+
+    async def run():
+        return await asyncio.gather(*(service.validate_symbol(s) for s in ["btcusdt", "BTCUSDT", "LUNAUSDT", "FAKE"]))
+
+    assert asyncio.run(run()) == [True, True, False, False]
+    assert calls == ["/api/v3/exchangeInfo"]
+
+
+def test_klines_cached_per_symbol_interval_and_range():
+    calls = []
+    provider = _provider(calls)
+    past = datetime(2024, 1, 1)
+
+    async def run():
+        first = await provider.get_klines("BTCUSDT", "1h", 3, start_time=past, end_time=past + timedelta(hours=3))
+        again = await provider.get_klines("BTCUSDT", "1h", 3, start_time=past, end_time=past + timedelta(hours=3))
+        other = await provider.get_klines("BTCUSDT", "1h", 3, start_time=past, end_time=past + timedelta(hours=4))
+        return first, again, other
+
+    first, again, other = asyncio.run(run())
+    assert first is again
+    assert len(other) == 3
+    assert calls == ["/api/v3/klines", "/api/v3/klines"]
+
+
+def test_client_from_previous_event_loop_is_closed():
+    provider = MarketDataProvider()
+
+    async def first():
+        return provider._get_client()
+
+    async def second():
+        client = provider._get_client()
+        await asyncio.sleep(0)
+        return client
+
+    stale = asyncio.run(first())
+    fresh = asyncio.run(second())
+
+    assert fresh is not stale
+    assert stale.is_closed and not fresh.is_closed
+    asyncio.run(provider.close())
@@ -0,0 +1,92 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import numpy as np
+
+from market_data import MarketDataProvider, MarketDataService
+from market_store import CANDLE_COLUMNS, SNAPSHOT_COLUMNS, OhlcvStore, snapshot_columns
+
+START_MS = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+START = datetime.fromtimestamp(START_MS / 1000)
+
+
+def _service(store=None, hours=900):
+    rng = np.random.default_rng(5)
+    close = 100 + np.cumsum(rng.normal(0, 1, hours))
+    klines = [
+        [START_MS + i * 3_600_000, str(close[i] - 0.2), str(close[i] + rng.uniform(0.1, 1)),
+         str(close[i] - rng.uniform(0.3, 1)), str(close[i]), str(rng.uniform(10, 50)),
+         START_MS + (i + 1) * 3_600_000 - 1, "0", 1, "0", "0", "0"]
+        for i in range(hours)
+    ]
+    requests = []
+
+    def handler(request):
+        params = request.url.params
+        requests.append(params)
+        start, end = int(params["startTime"]), int(params["endTime"])
+        rows = [k for k in klines if start <= k[0] <= end]
+        return httpx.Response(200, json=rows[:int(params["limit"])])
+
+    service = MarketDataService(store=store)
+    service.provider = MarketDataProvider(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return service, requests
+
+
+def test_store_snapshots_match_network_path_and_skip_refetch(tmp_path):
+    entries = [(START + timedelta(hours=h, minutes=m), 100.0 + h % 5) for h, m in
+               [(300, 0), (301, 17), (450, 59), (600, 5), (20, 30)]]
+    network, _ = _service()
+    stored, requests = _service(OhlcvStore(str(tmp_path)))
+
+    async def run():
+        expected = await network.get_trade_indicators_batch("BTCUSDT", entries)
+        first = await stored.get_trade_indicators_batch("BTCUSDT", entries)
+        fetched = len(requests)
+        # 이미 받은 구간 안의 거래는 저장소만 읽음
+        later = [(t + timedelta(minutes=1), p) for t, p in entries[:3]]
+        again = [await stored.get_trade_indicators("BTCUSDT", t, p) for t, p in later]
+        return expected, first, fetched, again, [await network.get_trade_indicators("BTCUSDT", t, p) for t, p in later]
+
+    expected, first, fetched, again, again_expected = asyncio.run(run())
+
+    assert fetched > 0 and len(requests) == fetched
+    assert first == expected
+    assert again == again_expected
+    assert (tmp_path / "1h" / "BTCUSDT.npz").exists()
+
+
+def test_incremental_merge_matches_full_snapshot(tmp_path):
+    store = OhlcvStore(str(tmp_path))
+    service, requests = _service(store)
+
+    async def run():
+        # 가운데 구간 → 뒤쪽 확장 → 앞쪽 확장 순서로 채움
+        for start_h, end_h in [(300, 500), (480, 800), (0, 320)]:
+            assert await service.sync_candles(
+                "BTCUSDT", "1h", START + timedelta(hours=start_h), START + timedelta(hours=end_h)
+            )
+
+    asyncio.run(run())
+    cols = store.load("BTCUSDT", "1h")
+    full = snapshot_columns({name: cols[name] for name in CANDLE_COLUMNS})
+
+    assert len(cols["open_ms"]) == 801
+    assert np.all(np.diff(cols["open_ms"]) == 3_600_000)
+    assert int(cols["covered_from"]) == START_MS
+    for name in SNAPSHOT_COLUMNS:
+        if cols[name].dtype.kind == "U":
+            assert cols[name].tolist() == full[name].tolist()
+        else:
+            np.testing.assert_allclose(cols[name], full[name], rtol=1e-12, equal_nan=True)
+
+
+def test_missing_ranges_keep_coverage_contiguous():
+    cols = {"covered_from": np.int64(1000), "covered_to": np.int64(2000)}
+
+    assert OhlcvStore.missing_ranges(None, 0, 10) == [(0, 10)]
+    assert OhlcvStore.missing_ranges(cols, 1200, 1800) == []
+    assert OhlcvStore.missing_ranges(cols, 500, 2500) == [(500, 999), (2001, 2500)]
+    assert OhlcvStore.missing_ranges(cols, 3000, 4000) == [(2001, 4000)]
+    assert OhlcvStore.covers(cols, np.array([1000, 900]), np.array([2000, 1500])).tolist() == [True, False]
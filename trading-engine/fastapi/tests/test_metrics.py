@@ -0,0 +1,66 @@
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+# Ensure imports work when running tests from repo root
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import main
+from metrics import MetricsRegistry, HitRatio
+from test_scores import _sample_trade, mock_candles  # noqa: F401
+
+
+def _sample_value(text, line_prefix):
+    return float(next(line for line in text.splitlines() if line.startswith(line_prefix)).rsplit(" ", 1)[1])
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "지연", ["stage"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, stage="fetch")
+
+    text = registry.render()
+
+    assert 'latency_seconds_bucket{stage="fetch",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{stage="fetch",le="1"} 3' in text
+    assert 'latency_seconds_bucket{stage="fetch",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{stage="fetch"} 4' in text
+    assert _sample_value(text, 'latency_seconds_sum{stage="fetch"}') == 3.65
+
+
+def test_worker_snapshots_are_summed_before_hit_ratio():
+    registry = MetricsRegistry()
+    requests = registry.counter("cache_requests_total", "조회", ["cache", "result"])
+    registry.register(HitRatio("cache_hit_ratio", "적중률", requests))
+
+    requests.set_total(9, cache="kline", result="hit")
+    requests.set_total(1, cache="kline", result="miss")
+    first = registry.snapshot()
+    requests.set_total(0, cache="kline", result="hit")
+    requests.set_total(10, cache="kline", result="miss")
+    requests.set_total(2, cache="kline", result="shared_hit")
+    second = registry.snapshot()
+
+    text = registry.render([first, second])
+
+    assert 'cache_requests_total{cache="kline",result="hit"} 9' in text
+    assert 'cache_requests_total{cache="kline",result="miss"} 11' in text
+    # shared_hit도 적중으로 셈: (9 + 2) / (9 + 2 + 11)
+    assert 'cache_hit_ratio{cache="kline"} 0.5' in text
+
+
+def test_metrics_endpoint_reports_scoring_stages():
+    client = TestClient(main.app)
+    assert client.post("/api/v1/trade/breakout", json=_sample_trade()).status_code == 200
+
+    text = client.get("/metrics").text
+
+    assert _sample_value(text, 'trading_sub_score_seconds_count{strategy="breakout",component="zone"}') >= 1
+    assert _sample_value(text, 'trading_response_serialize_seconds_count{endpoint="breakout"}') >= 1
+    assert _sample_value(
+        text, 'trading_http_request_seconds_count{method="POST",path="/api/v1/trade/breakout",status="200"}'
+    ) >= 1
+    assert "trading_indicator_frame_build_seconds_count" in text
+    assert 'trading_cache_requests_total{cache="indicator_frame",result="miss"}' in text
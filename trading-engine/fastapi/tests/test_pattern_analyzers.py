@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from llm_analyzer import validate_analysis_result
+from pattern_analyzers import (
+    AnalysisDispatcher, AnalysisOutcome, LocalPatternAnalyzer, PatternAnalyzer, TokenBudgetExceededError,
+)
+
+STRATEGY_HEADER = "strategy,total_trades,winning_trades,win_rate,avg_win,avg_loss,avg_pnl,total_pnl,avg_score"
+TIME_HEADER = "hour_of_day,total_trades,winning_trades,win_rate,avg_pnl,total_pnl,avg_score"
+PENALTY_HEADER = "rule_code,violation_count,trades_with_violation,violation_rate,avg_penalty,total_penalty"
+DATA = {
+    "this_week_strategy_csv": f"{STRATEGY_HEADER}\nbreakout,4,3,75.0%,20,-5,13.75,55.00,70\ntrend,3,0,0.0%,0,-10,-10,-30.00,40",
+    "this_week_penalty_csv": f"{PENALTY_HEADER}\nfomo,2,2,28.6%,5.0,10.0",
+    "this_week_time_csv": f"{TIME_HEADER}\n09:00,5,3,60.0%,8,40.00,65",
+    "last_week_strategy_csv": f"{STRATEGY_HEADER}\nbreakout,4,2,50.0%,10,-5,2.5,10.00,60",
+    "last_week_penalty_csv": f"{PENALTY_HEADER}\nfomo,3,3,60.0%,5.0,15.0",
+    "last_week_time_csv": TIME_HEADER,
+}
+
+
+class _CountingAnalyzer(PatternAnalyzer):
+    name = "fake"
+    model = "fake-1"
+
+    def __init__(self):
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+
+    async def analyze(self, analysis_data):
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return AnalysisOutcome({"input": analysis_data["this_week_time_csv"]}, prompt_tokens=100, completion_tokens=50)
+
+    def estimate_tokens(self, analysis_data):
+        return 150
+
+
+def test_local_backend_is_deterministic_and_valid():
+    result = asyncio.run(LocalPatternAnalyzer().analyze(DATA)).result
+
+    assert validate_analysis_result(result)
+    assert result == LocalPatternAnalyzer().build_result(dict(reversed(list(DATA.items()))))
+    assert result["top_loss_pattern"]["title"] == "trend 전략 손실"
+    assert result["top_profit_pattern"]["title"] == "breakout 전략 수익"
+    assert any("fomo" in action for action in result["top_loss_pattern"]["actions"])
+    assert result["improvements"] == [
+        "breakout 전략 승률이 50.0%에서 75.0%로 올랐습니다",
+        "breakout 전략 총 손익이 10.00에서 55.00로 늘었습니다",
+        "금기룰 fomo 위반율이 60.0%에서 28.6%로 줄었습니다",
+    ]
+
+
+def test_local_backend_handles_empty_week():
+    empty = {key: "" for key in DATA}
+    assert validate_analysis_result(LocalPatternAnalyzer().build_result(empty))
+
+
+def test_dispatcher_bounds_concurrency_and_enforces_budget():
+    analyzer = _CountingAnalyzer()
+    dispatcher = AnalysisDispatcher(analyzer, max_concurrency=2, requests_per_minute=None, token_budget=600)
+    inputs = [dict(DATA, this_week_time_csv=str(i)) for i in range(5)]
+
+    async def run():
+        return await asyncio.gather(*(dispatcher.dispatch(data) for data in inputs), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert analyzer.calls == 4 and analyzer.peak <= 2
+    assert dispatcher.budget_rejections == 1
+    assert isinstance(results[-1], TokenBudgetExceededError)
+    assert results[0] == {"input": "0"}
+    assert dispatcher._reserved == 0
+    summary = dispatcher.summary()
+    assert (summary["calls"], summary["tokens_used"], summary["failures"]) == (4, 600, 0)
+    assert [m["prompt_tokens"] for m in dispatcher.metrics] == [100] * 4
+
+
+def test_dispatcher_releases_reservation_when_cancelled():
+    dispatcher = AnalysisDispatcher(_CountingAnalyzer(), max_concurrency=1, requests_per_minute=None, token_budget=300)
+
+    async def run():
+        first = asyncio.ensure_future(dispatcher.dispatch(DATA))
+        waiting = asyncio.ensure_future(dispatcher.dispatch(DATA))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(first, waiting, return_exceptions=True)
+        return await dispatcher.dispatch(DATA)
+
+    assert asyncio.run(run()) == {"input": DATA["this_week_time_csv"]}
+    assert dispatcher._reserved == 0 and dispatcher.calls == 2
+
+
+def test_pattern_analyzer_requires_analyze():
+    class _Incomplete(PatternAnalyzer):
+        pass
+
+    with pytest.raises(TypeError):
+        _Incomplete()
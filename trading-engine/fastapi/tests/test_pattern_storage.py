@@ -0,0 +1,91 @@
+import uuid
+from collections import namedtuple
+from datetime import date, datetime
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from pattern_storage import get_pattern_history_page, save_weekly_analyses
+from trade_queries import encode_cursor
+
+USER_A = "6f1c1f0e-1f2b-4c61-9a59-3b1c6f0d2a01"
+USER_B = "0b7e1d7a-5a54-4a0e-8f57-8f0b0f7c9e02"
+START, END = date(2024, 1, 1), date(2024, 1, 7)
+
+SummaryRow = namedtuple("SummaryRow", "id user_id period_start period_end")
+HistoryRow = namedtuple("HistoryRow", "id period_start period_end pattern_type title why actions summary_id created_at")
+
+
+def _result(title):
+    pattern = {"title": title, "why": "이유", "actions": ["행동"]}
+    return {"top_loss_pattern": pattern, "top_profit_pattern": pattern}
+
+
+class _FakeDb:
+    """실행된 문장을 기록하고 summary INSERT에는 RETURNING 행을 돌려주는 세션 대역"""
+
+    def __init__(self):
+        self.statements = []
+        self.committed = False
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        if statement.table.name != "patterns_summary_weekly":
+            return []
+        params = statement.compile(dialect=postgresql.dialect()).params
+        rows, index = [], 0
+        while f"user_id_m{index}" in params:
+            rows.append(SummaryRow(100 + index, uuid.UUID(params[f"user_id_m{index}"]),
+                                   params[f"period_start_m{index}"], params[f"period_end_m{index}"]))
+            index += 1
+        return rows
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+def test_bulk_save_upserts_each_table_in_one_statement():
+    db = _FakeDb()
+    summary_ids = save_weekly_analyses(db, [
+        (USER_A, START, END, _result("첫 분석")),
+        (USER_B, START, END, _result("B 분석")),
+        (USER_A.upper(), START, END, _result("다시 분석")),  # 같은 사용자/기간은 마지막 결과만
+    ])
+
+    assert db.committed and len(db.statements) == 2
+    summary_sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    history = db.statements[1].compile(dialect=postgresql.dialect())
+    assert "ON CONFLICT (user_id, period_start, period_end) DO UPDATE" in summary_sql
+    assert "RETURNING patterns_summary_weekly.id" in summary_sql
+    assert "ON CONFLICT (user_id, period_start, period_end, pattern_type) DO UPDATE" in str(history)
+
+    assert summary_ids == {(USER_A, START, END): 100, (USER_B, START, END): 101}
+    titles = [history.params[f"title_m{i}"] for i in range(4)]
+    summary_refs = [history.params[f"summary_id_m{i}"] for i in range(4)]
+    assert titles == ["다시 분석", "다시 분석", "B 분석", "B 분석"]
+    assert summary_refs == [100, 100, 101, 101]
+    assert [history.params[f"pattern_type_m{i}"] for i in range(4)] == ["loss", "profit"] * 2
+
+
+def test_history_page_projects_columns_and_uses_keyset(monkeypatch):
+    captured = []
+    rows = [
+        HistoryRow(9 - i, START, date(2024, 1, 7 - i), "loss", "t", "w", ["a"], 1, datetime(2024, 1, 8))
+        for i in range(3)
+    ]
+    monkeypatch.setattr(Query, "all", lambda self: captured.append(self.statement) or rows)
+
+    patterns, next_cursor = get_pattern_history_page(
+        Session(), USER_A, "loss", limit=2, cursor=encode_cursor(date(2024, 1, 14), 20)
+    )
+
+    sql = str(captured[0].compile(dialect=postgresql.dialect()))
+    assert "(pattern_history.period_end, pattern_history.id) < (" in sql
+    assert "ORDER BY pattern_history.period_end DESC, pattern_history.id DESC" in sql
+    assert "pattern_history.user_id," not in sql.split("FROM")[0]
+    assert [p["id"] for p in patterns] == [9, 8]
+    assert patterns[0]["period_end"] == "2024-01-07"
+    assert next_cursor == encode_cursor(date(2024, 1, 6), 8)
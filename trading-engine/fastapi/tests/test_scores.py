@@ -71,3 +71,21 @@ def test_mean_reversion_endpoint(client):
     assert resp.status_code == 200
     body = resp.json()
     assert "total_score" in body
+
+
+def test_multi_strategy_endpoint_fetches_candles_once(client, monkeypatch):
+    calls = []
+    original = main._get_candles_for_trade
+
+    async def _counting_get_candles(trade_data):
+        calls.append(trade_data["pair"])
+        return await original(trade_data)
+
+    monkeypatch.setattr(main, "_get_candles_for_trade", _counting_get_candles)
+
+    resp = client.post("/api/v1/trade/strategies", json=_sample_trade())
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body["scores"]) == {"breakout", "trend", "mean_reversion"}
+    assert all("sub_scores" in score for score in body["scores"].values())
+    assert calls == ["BTC/USDT"]
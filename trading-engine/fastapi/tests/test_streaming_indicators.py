@@ -0,0 +1,88 @@
+import os
+import sys
+
+import numpy as np
+
+# Ensure imports work when running tests from repo root
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from candle_block import CandleBlock
+from indicators import IndicatorEngine, IndicatorFrame
+from models import ColumnarScoreRequest
+from strategy_scorers import TrendScorer
+from streaming_indicators import StreamingFrame, StreamingIndicatorStore
+
+
+def _values(n=300, seed=11):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    return np.column_stack([
+        1_700_000_000_000 + np.arange(n) * 300_000,
+        open_,
+        np.maximum(open_, close) + rng.uniform(0.1, 1.0, n),
+        np.minimum(open_, close) - rng.uniform(0.1, 1.0, n),
+        close,
+        rng.uniform(100, 200, n),
+    ])
+
+
+def test_streaming_matches_full_history_recompute():
+    values = _values()
+    full = IndicatorFrame(CandleBlock(values))
+    store = StreamingIndicatorStore()
+
+    for end in range(100, len(values) + 1):
+        frame = store.frame(CandleBlock(values[end - 100:end]), "BTC/USDT", "5m")
+
+    assert isinstance(frame, StreamingFrame)
+    assert store.rebuilds == 1
+    assert store.updates == len(values) - 100
+    for streamed, expected in [
+        (frame.rsi(14), full.rsi(14)),
+        (frame.rsi_wilder(14), full.rsi_wilder(14)),
+        (frame.atr(14), full.atr(14)),
+        (frame.adx(14), full.adx(14)),
+        (frame.macd_hist(12, 26, 9), full.macd_hist(12, 26, 9)),
+        (frame.bb_width(20, 2), full.bb_width(20, 2)),
+        (frame.cci(14), full.cci(14)),
+    ]:
+        np.testing.assert_allclose(streamed.to_numpy(), expected.to_numpy()[-100:], rtol=1e-9)
+
+
+def test_forming_candle_is_not_committed():
+    values = _values(120)
+    store = StreamingIndicatorStore()
+    store.frame(CandleBlock(values[:100]), "BTC/USDT", "5m")
+
+    revised = values[:100].copy()
+    revised[-1, 4] = revised[-1, 2]
+    frame = store.frame(CandleBlock(revised), "BTC/USDT", "5m")
+
+    assert store.updates == 0
+    assert frame.sma(20).iloc[-1] == IndicatorFrame(CandleBlock(revised)).sma(20).iloc[-1]
+
+
+def test_older_window_falls_back_without_touching_stream():
+    values = _values(150)
+    store = StreamingIndicatorStore()
+    store.frame(CandleBlock(values[50:150]), "BTC/USDT", "5m")
+
+    frame = store.frame(CandleBlock(values[:100]), "BTC/USDT", "5m")
+
+    assert not isinstance(frame, StreamingFrame)
+    assert store.rebuilds == 1
+
+
+def test_scorer_runs_on_streaming_engine():
+    engine = IndicatorEngine(streaming=StreamingIndicatorStore())
+    block = CandleBlock(_values(100))
+    request = ColumnarScoreRequest.model_construct(
+        symbol="BTC/USDT", timeframe="5m", candles=block, strategy_name="test", include_indicators=True
+    )
+
+    result = TrendScorer(engine).calculate_score(request)
+
+    assert "error" not in result
+    assert isinstance(engine.frame_for_request(request), StreamingFrame)
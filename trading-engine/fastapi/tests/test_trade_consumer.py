@@ -0,0 +1,66 @@
+import asyncio
+import os
+import sys
+from collections import namedtuple
+from datetime import datetime
+
+import numpy as np
+
+# Ensure imports work when running tests from repo root
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import main
+from candle_block import CandleBlock
+
+Record = namedtuple("Record", ["value", "offset"])
+
+
+class FakeProducer:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, topic, value):
+        self.sent.append((topic, value))
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(None)
+        return future
+
+
+def _block(n=40):
+    close = 100 + np.sin(np.arange(n))
+    return CandleBlock(np.column_stack([
+        1_700_000_000_000 + np.arange(n) * 300_000,
+        close, close + 1.0, close - 1.0, close, np.full(n, 50.0),
+    ]))
+
+
+def _trade(pair, side="buy"):
+    return {
+        "pair": pair,
+        "side": side,
+        "amount": 1.0,
+        "price": 100.0,
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+def test_batch_groups_by_pair_and_publishes_all(monkeypatch):
+    fetched = []
+
+    async def _fake_get_candles(trade_data):
+        fetched.append(trade_data["pair"])
+        return _block()
+
+    producer = FakeProducer()
+    monkeypatch.setattr(main, "_get_candles_for_trade", _fake_get_candles)
+    monkeypatch.setattr(main, "kafka_producer", producer)
+
+    trades = [_trade("BTC/USDT"), _trade("ETH/USDT"), _trade("BTC/USDT", "sell"), {"pair": "BAD"}]
+    records = [Record(value=t, offset=i) for i, t in enumerate(trades)]
+
+    timings = asyncio.run(main._process_trade_batch(records))
+
+    assert sorted(fetched) == ["BTC/USDT", "ETH/USDT"]
+    assert len(producer.sent) == 3
+    assert all(topic == "trade.score" for topic, _ in producer.sent)
+    assert {"fetch", "score", "publish", "total"} <= set(timings)
@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import numpy as np
+import pytest
+
+from market_data import MarketDataProvider, MarketDataService
+from trade_import import allocate_trade_ids, parse_csv, parse_ndjson
+
+START_MS = 1_704_067_200_000  # 2024-01-01 00:00 UTC
+
+
+def _service(hours=600):
+    rng = np.random.default_rng(3)
+    close = 100 + np.cumsum(rng.normal(0, 1, hours))
+    klines = [
+        [START_MS + i * 3_600_000, str(close[i] - 0.2), str(close[i] + rng.uniform(0.1, 1)),
+         str(close[i] - rng.uniform(0.3, 1)), str(close[i]), str(rng.uniform(10, 50)),
+         START_MS + (i + 1) * 3_600_000 - 1, "0", 1, "0", "0", "0"]
+        for i in range(hours)
+    ]
+
+    def handler(request):
+        params = request.url.params
+        start, end = int(params["startTime"]), int(params["endTime"])
+        rows = [k for k in klines if start <= k[0] <= end]
+        return httpx.Response(200, json=rows[:int(params["limit"])])
+
+    service = MarketDataService()
+    service.provider = MarketDataProvider(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return service
+
+
+def test_batch_indicators_match_single_trade_computation():
+    service = _service()
+    start = datetime.utcfromtimestamp(START_MS / 1000)
+    entries = [(start + timedelta(hours=h, minutes=17), 100.0 + h % 7) for h in (2, 30, 200, 450, 599, 650)]
+
+    async def run():
+        batch = await service.get_trade_indicators_batch("BTCUSDT", entries)
+        single = [await service.get_trade_indicators("BTCUSDT", t, p) for t, p in entries]
+        return batch, single
+
+    batch, single = asyncio.run(run())
+    assert len(batch) == len(entries)
+    for got, expected in zip(batch, single):
+        assert got.keys() == expected.keys()
+        for key, value in expected.items():
+            assert got[key] == (value if isinstance(value, str) else pytest.approx(value, rel=1e-9, abs=1e-9))
+
+
+def test_parsers_keep_row_positions_for_errors():
+    csv_items = parse_csv(
+        "symbol,type,tradingType,quantity,entryPrice,entryTime,exitPrice,indicators\n"
+        'BTCUSDT,buy,breakout,1,100,2024-01-01T00:00:00,,"{""atr"": 1.5}"\n'
+        "ETHUSDT,sell,trend,2,50,2024-01-02T00:00:00,45,{bad\n"
+    )
+    ndjson_items = parse_ndjson('{"symbol": "BTCUSDT"}\n\nnot json\n[1]\n')
+
+    assert csv_items[0]["indicators"] == {"atr": 1.5}
+    assert "exitPrice" not in csv_items[0]
+    assert isinstance(csv_items[1], ValueError)
+    assert ndjson_items[0] == {"symbol": "BTCUSDT"}
+    assert [type(i) for i in ndjson_items[1:]] == [ValueError, ValueError]
+
+
+def test_trade_ids_come_from_the_shared_sequence():
+    calls = []
+
+    class Db:
+        def execute(self, statement, params):
+            calls.append((str(statement), params))
+            return [(101,), (102,), (103,)]
+
+    assert allocate_trade_ids(Db(), 3) == [101, 102, 103]
+    assert allocate_trade_ids(Db(), 0) == []
+    assert len(calls) == 1
+    assert "nextval('trade_id_seq')" in calls[0][0] and calls[0][1] == {"count": 3}
@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query, Session
+
+from trade_queries import decode_cursor, encode_cursor, list_trade_page
+
+
+def _sql(monkeypatch, **kwargs):
+    """실행 대신 마지막 SELECT 문을 컴파일해 반환"""
+    captured = []
+    monkeypatch.setattr(Query, "all", lambda self: captured.append(self.statement) or [])
+    list_trade_page(Session(), limit=20, **kwargs)
+    return str(captured[0].compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    entry_time = datetime(2024, 3, 1, 12, 30, 15, 123000)
+    assert decode_cursor(encode_cursor(entry_time, 42)) == (entry_time, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_page_uses_row_comparison_and_skips_jsonb(monkeypatch):
+    sql = _sql(monkeypatch, cursor=encode_cursor(datetime(2024, 3, 1), 7), offset=500,
+               user_id=uuid.uuid4(), include_details=False)
+
+    assert "(trades.entry_time, trades.id) < (" in sql
+    assert "trades.user_id = " in sql
+    assert "OFFSET" not in sql
+    assert "indicators" not in sql and "strategy_score" not in sql
+    assert "ORDER BY trades.entry_time DESC, trades.id DESC" in sql
+
+
+def test_detail_columns_included_by_default(monkeypatch):
+    sql = _sql(monkeypatch)
+    assert "trades.indicators" in sql and "trades.strategy_score" in sql
+    assert "forbidden_violations" not in sql
@@ -0,0 +1,92 @@
+from datetime import date, datetime
+
+from sqlalchemy.dialects import postgresql
+
+from trade_rollup import REBUILD_QUERY, apply_rollup, backfill_rollup_if_empty, rollup_deltas
+
+USER = "00000000-0000-0000-0000-000000000001"
+
+
+def _trade(hour, pnl, score=50, violations=None, trading_type="breakout", user_id=USER):
+    return {
+        "user_id": user_id, "entry_time": datetime(2024, 1, 8, hour, 30), "trading_type": trading_type,
+        "pnl": pnl, "final_score": score, "forbidden_violations": violations,
+    }
+
+
+def test_deltas_group_by_user_day_strategy_hour():
+    deltas = rollup_deltas([
+        _trade(9, 10.0, violations=[{"rule_code": "fomo", "penalty_score": 5}, {"rule_code": "fomo", "penalty_score": 3}]),
+        _trade(9, -4.0, score=None, violations=[{"rule_code": "fomo"}]),
+        _trade(9, None),
+        _trade(15, 2.0),
+        _trade(9, 1.0, user_id=None),
+    ])
+
+    assert len(deltas) == 2
+    nine = next(d for d in deltas if d["hour"] == 9)
+    assert (nine["user_id"], nine["day"], nine["trading_type"]) == (USER, date(2024, 1, 8), "breakout")
+    assert nine["trade_count"] == 3
+    assert (nine["pnl_count"], nine["pnl_sum"]) == (2, 6.0)
+    assert (nine["win_count"], nine["win_pnl_sum"], nine["loss_count"], nine["loss_pnl_sum"]) == (1, 10.0, 1, -4.0)
+    assert (nine["score_count"], nine["score_sum"]) == (2, 100)
+    assert nine["violations"] == {"fomo": {"count": 3, "trades": 2, "penalty_sum": 8, "penalty_count": 2}}
+
+
+def test_apply_rollup_upserts_additively():
+    statements = []
+
+    class Db:
+        def execute(self, statement, params=None):
+            statements.append(str(statement.compile(dialect=postgresql.dialect())))
+
+    assert apply_rollup(Db(), [_trade(9, 1.0), _trade(10, 2.0)]) == 2
+    assert apply_rollup(Db(), [_trade(9, 1.0, user_id=None)]) == 0
+    assert len(statements) == 2
+    # 재구축(배타 잠금)과 겹치지 않도록 공유 잠금을 먼저 잡음
+    assert "pg_advisory_xact_lock_shared" in statements[0]
+    assert "ON CONFLICT (user_id, day, trading_type, hour) DO UPDATE" in statements[1]
+    assert "trade_count = (trades_daily_rollup.trade_count + excluded.trade_count)" in statements[1]
+
+
+def test_offset_aware_entry_time_uses_stored_utc_day_and_hour():
+    from datetime import timedelta, timezone
+
+    from schemas import CreateTradeRequest
+    from trade_import import build_trade, trade_to_row
+
+    # 한국 시간 1월 9일 02:30 = UTC 1월 8일 17:30 (저장 값과 재구축 키 기준)
+    kst = timezone(timedelta(hours=9))
+    deltas = rollup_deltas([{**_trade(0, 1.0), "entry_time": datetime(2024, 1, 9, 2, 30, tzinfo=kst)}])
+    assert (deltas[0]["day"], deltas[0]["hour"]) == (date(2024, 1, 8), 17)
+
+    request = CreateTradeRequest(
+        symbol="BTCUSDT", type="buy", tradingType="breakout", quantity=1, entryPrice=100.0,
+        entryTime="2024-01-09T02:30:00+09:00",
+    )
+    row = trade_to_row(build_trade(request, "1", {}))
+    assert row["entry_time"] == datetime(2024, 1, 8, 17, 30) and row["entry_time"].tzinfo is None
+
+
+def test_backfill_runs_only_when_rollup_is_empty():
+    class Result:
+        def __init__(self, value):
+            self.value, self.rowcount = value, 7
+
+        def scalar(self):
+            return self.value
+
+    class Conn:
+        def __init__(self, has_rows):
+            self.has_rows = has_rows
+            self.statements = []
+
+        def execute(self, statement, params=None):
+            self.statements.append(statement)
+            return Result(self.has_rows)
+
+    empty, filled = Conn(False), Conn(True)
+    assert backfill_rollup_if_empty(empty) == 7
+    assert empty.statements[-1] is REBUILD_QUERY
+    assert backfill_rollup_if_empty(filled) == 0
+    assert REBUILD_QUERY not in filled.statements
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import sys
+
+import httpx
+
+# Ensure imports work when running tests from repo root
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+import main
+from kline_client import KlineClient
+from shared_state import SharedBlockCache, WorkerRegistry
+
+
+def _klines(n=30, start=1_700_000_000_000):
+    return [
+        [start + i * 300_000, "100.0", "101.0", "99.0", "100.5", "10.0", 0]
+        for i in range(n)
+    ]
+
+
+def _client(now, calls, shared):
+    async def handler(request):
+        calls.append(request.url.params["symbol"])
+        return httpx.Response(200, json=_klines())
+
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return KlineClient(client=http, clock=lambda: now[0], shared_cache=shared)
+
+
+def test_workers_share_kline_cache(tmp_path):
+    now = [1_700_000_010.0]
+    calls = []
+    # 같은 공유 디렉토리를 쓰는 두 워커
+    first = _client(now, calls, SharedBlockCache(str(tmp_path)))
+    second = _client(now, calls, SharedBlockCache(str(tmp_path)))
+
+    async def run():
+        a = await first.get_klines("BTCUSDT")
+        b = await second.get_klines("BTCUSDT")
+        # 다음 봉 마감 후에는 다시 조회하고 이전 경계 파일은 정리
+        now[0] += 300
+        await second.get_klines("BTCUSDT")
+        await first.close()
+        await second.close()
+        return a, b
+
+    a, b = asyncio.run(run())
+
+    assert calls == ["BTCUSDT", "BTCUSDT"]
+    assert second.shared_hits == 1 and second.fetches == 1
+    assert (a.values == b.values).all()
+    assert len(list((tmp_path / "klines").glob("BTCUSDT_5m_100_*.npy"))) == 1
+
+
+def test_registry_skips_stale_workers(tmp_path):
+    now = [1000.0]
+    registry = WorkerRegistry(str(tmp_path), stale_after=15, clock=lambda: now[0])
+    registry.publish({"role": "api", "inflight_requests": 2}, pid=11)
+    now[0] += 10
+    registry.publish({"role": "consumer", "consumer_lag": 5}, pid=12)
+    now[0] += 10
+
+    assert [(w["pid"], w["role"]) for w in registry.workers()] == [(12, "consumer")]
+
+    registry.remove(pid=12)
+    assert registry.workers() == []
+
+
+def test_ready_reports_all_workers_and_backlog(tmp_path, monkeypatch):
+    registry = WorkerRegistry(str(tmp_path))
+    registry.publish({"role": "consumer", "consumer_lag": 7}, pid=1)
+    registry.publish({"role": "api", "inflight_requests": 99}, pid=os.getpid())  # 오래된 자기 하트비트
+    monkeypatch.setattr(main, "worker_registry", registry)
+    monkeypatch.setattr(main, "worker_load", {"inflight": 1, "requests": 3, "scoring": 0})
+
+    response = asyncio.run(main.readiness_check())
+    body = json.loads(response.body)
+
+    assert response.status_code == 200 and body["status"] == "ready"
+    assert [w["pid"] for w in body["workers"]] == sorted([1, os.getpid()])
+    assert body["worker"]["inflight_requests"] == 1
+    assert {w["pid"]: w for w in body["workers"]}[1]["consumer_lag"] == 7
+
+    monkeypatch.setattr(main, "worker_load", {"inflight": 1, "requests": 3, "scoring": main.READY_MAX_SCORING_JOBS})
+    assert asyncio.run(main.readiness_check()).status_code == 503
+
+
+def test_multi_worker_skips_only_pattern_job_routes(monkeypatch):
+    from fastapi import FastAPI
+
+    monkeypatch.setattr(main, "MULTI_WORKER", True)
+    application = FastAPI()
+    assert main.include_pattern_routes(application) is False
+    paths = {route.path for route in application.routes}
+    assert {"/patterns/weekly/analyze", "/patterns/history", "/patterns/weekly/{summary_id}"} <= paths
+    assert not any(path.startswith("/patterns/weekly/jobs") for path in paths)
+
+    monkeypatch.setattr(main, "MULTI_WORKER", False)
+    application = FastAPI()
+    assert main.include_pattern_routes(application) is True
+    assert "/patterns/weekly/jobs/{job_id}" in {route.path for route in application.routes}
+
+
+def test_multi_worker_live_engine_recomputes_windows(monkeypatch):
+    # 증분 지표 상태는 워커별 이력에 좌우되므로 멀티 워커에서는 사용하지 않음
+    monkeypatch.setattr(main, "MULTI_WORKER", True)
+    assert main.create_live_indicator_engine().streaming is None
+
+    monkeypatch.setattr(main, "MULTI_WORKER", False)
+    assert main.create_live_indicator_engine().streaming is not None